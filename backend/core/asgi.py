@@ -13,4 +13,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up (it touches models and settings).
+from interviews.live_transcription import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """HTTP goes to Django; WebSockets serve the optional live transcription relay."""
+    if scope["type"] == "websocket":
+        await websocket_application(scope, receive, send)
+        return
+    await django_application(scope, receive, send)
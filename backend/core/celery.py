@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 # Respect environment-provided Django settings module
 # Fallback is safe for development only
@@ -18,6 +19,14 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
 
+@worker_process_init.connect
+def preload_worker_resources(**kwargs):
+    # Parse the OpenCV face cascade once per worker process, not once per video.
+    from interviews.ai.script_detection import preload_face_detector
+
+    preload_face_detector()
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f"Celery debug task executed. Request: {self.request!r}")
@@ -328,6 +328,49 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": 1200}
 CELERY_RESULT_EXPIRES = int(os.getenv('CELERY_RESULT_EXPIRES', '3600'))
 
+# Buffered TokenUsage writes (monitoring/usage_buffer.py): provider calls push usage
+# events to Redis; a Celery task bulk-inserts them (size or time threshold).
+TOKEN_USAGE_BUFFER_ENABLED = os.getenv("TOKEN_USAGE_BUFFER_ENABLED", "true").lower() == "true"
+TOKEN_USAGE_FLUSH_BATCH_SIZE = int(os.getenv("TOKEN_USAGE_FLUSH_BATCH_SIZE", "200"))
+TOKEN_USAGE_FLUSH_INTERVAL_SECONDS = int(os.getenv("TOKEN_USAGE_FLUSH_INTERVAL_SECONDS", "10"))
+
+# Daily rollups (monitoring/rollups.py) behind the token usage statistics endpoints;
+# each run also re-rolls the last N days to include late-flushed rows.
+TOKEN_USAGE_ROLLUP_LOOKBACK_DAYS = int(os.getenv("TOKEN_USAGE_ROLLUP_LOOKBACK_DAYS", "2"))
+TOKEN_USAGE_ROLLUP_INTERVAL_SECONDS = int(os.getenv("TOKEN_USAGE_ROLLUP_INTERVAL_SECONDS", "3600"))
+
+# TokenUsage storage (monitoring/partitions.py): monthly partitions on PostgreSQL;
+# `manage.py archive_token_usage` exports months past retention to gzip CSV and drops them.
+TOKEN_USAGE_RETENTION_MONTHS = int(os.getenv("TOKEN_USAGE_RETENTION_MONTHS", "12"))
+TOKEN_USAGE_ARCHIVE_DIR = os.getenv("TOKEN_USAGE_ARCHIVE_DIR", str(BASE_DIR / "archives" / "token_usage"))
+# Default window of the token-usage list endpoint when no date_from/interview_id is given
+TOKEN_USAGE_LIST_DEFAULT_DAYS = int(os.getenv("TOKEN_USAGE_LIST_DEFAULT_DAYS", "31"))
+
+# HR review queue projection (results/review_queue.py): pending results older than
+# this many days are "urgent"; the beat task below moves entries into that bucket.
+REVIEW_URGENT_AFTER_DAYS = int(os.getenv("REVIEW_URGENT_AFTER_DAYS", "3"))
+REVIEW_QUEUE_URGENCY_REFRESH_SECONDS = int(os.getenv("REVIEW_QUEUE_URGENCY_REFRESH_SECONDS", "600"))
+
+# Periodic tasks (run `celery -A core beat`)
+CELERY_BEAT_SCHEDULE = {
+    "flush-token-usage-buffer": {
+        "task": "monitoring.flush_token_usage_buffer",
+        "schedule": float(TOKEN_USAGE_FLUSH_INTERVAL_SECONDS * 3),
+    },
+    "rollup-daily-token-usage": {
+        "task": "monitoring.rollup_daily_token_usage",
+        "schedule": float(TOKEN_USAGE_ROLLUP_INTERVAL_SECONDS),
+    },
+    "ensure-token-usage-partitions": {
+        "task": "monitoring.ensure_token_usage_partitions",
+        "schedule": 24 * 3600.0,
+    },
+    "refresh-review-queue-urgency": {
+        "task": "results.refresh_review_queue_urgency",
+        "schedule": float(REVIEW_QUEUE_URGENCY_REFRESH_SECONDS),
+    },
+}
+
 
 # ============================
 # EMAIL (SMTP) CONFIGURATION
@@ -350,9 +393,70 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY", "")
+# Optional override (self-hosted Deepgram or a local fake endpoint for tests).
+DEEPGRAM_API_URL = os.getenv("DEEPGRAM_API_URL", "").strip()
 DEEPGRAM_TTS_MODEL = os.getenv("DEEPGRAM_TTS_MODEL", "aura-2-thalia-en")
 TTS_PROVIDER = os.getenv("TTS_PROVIDER", "deepgram")
 STT_PROVIDER = os.getenv("STT_PROVIDER", "deepgram")
+# Audio track extracted once per upload for STT: "opus" (16kHz mono Ogg/Opus) or "flac".
+STT_AUDIO_FORMAT = os.getenv("STT_AUDIO_FORMAT", "opus").strip().lower()
+
+# Optional live transcription relay (WebSocket via core/asgi.py) that streams
+# answer audio to an STT backend while the applicant records.
+LIVE_TRANSCRIPTION_ENABLED = os.getenv("LIVE_TRANSCRIPTION_ENABLED", "false").lower() == "true"
+LIVE_STT_BACKEND = os.getenv("LIVE_STT_BACKEND", "interviews.live_transcription.DeepgramLiveBackend")
+LIVE_STT_FINALIZE_TIMEOUT_SECONDS = int(os.getenv("LIVE_STT_FINALIZE_TIMEOUT_SECONDS", "5"))
+LIVE_TRANSCRIPT_TTL_SECONDS = int(os.getenv("LIVE_TRANSCRIPT_TTL_SECONDS", "3600"))
+
+# Content-addressed transcript cache (interviews/transcript_cache.py): keyed by
+# audio hash + provider/model/options; unused entries expire after the TTL.
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").lower() == "true"
+TRANSCRIPT_CACHE_TTL_SECONDS = int(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+# LLM analysis cache (interviews/analysis_cache.py): keyed by prompt inputs +
+# prompt version + model; invalidate with `manage.py invalidate_analysis_cache`.
+ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(14 * 24 * 3600)))
+
+# Token budgets for analysis prompts (interviews/prompt_builder.py). Tokens are
+# counted locally with tiktoken; overlong transcripts are trimmed and batches
+# that exceed the prompt budget are split into several calls.
+PROMPT_TOKENIZER_ENCODING = os.getenv("PROMPT_TOKENIZER_ENCODING", "cl100k_base").strip()
+ANALYSIS_TRANSCRIPT_TOKEN_LIMIT = int(os.getenv("ANALYSIS_TRANSCRIPT_TOKEN_LIMIT", "1500"))
+ANALYSIS_PROMPT_TOKEN_BUDGET = int(os.getenv("ANALYSIS_PROMPT_TOKEN_BUDGET", "12000"))
+
+# Opt-in cross-interview micro-batching (interviews/analysis_batcher.py): interviews
+# for the same position completing within the window share one LLM call.
+ANALYSIS_MICROBATCH_ENABLED = os.getenv("ANALYSIS_MICROBATCH_ENABLED", "false").lower() == "true"
+ANALYSIS_MICROBATCH_WINDOW_SECONDS = float(os.getenv("ANALYSIS_MICROBATCH_WINDOW_SECONDS", "2"))
+ANALYSIS_MICROBATCH_TOKEN_BUDGET = int(os.getenv("ANALYSIS_MICROBATCH_TOKEN_BUDGET", "24000"))
+ANALYSIS_MICROBATCH_RESULT_TIMEOUT_SECONDS = int(os.getenv("ANALYSIS_MICROBATCH_RESULT_TIMEOUT_SECONDS", "120"))
+ANALYSIS_MICROBATCH_SLOT_GRACE_SECONDS = float(os.getenv("ANALYSIS_MICROBATCH_SLOT_GRACE_SECONDS", "5"))
+
+# Gemini File API uploads (interviews/gemini_uploads.py): processing is polled with
+# exponential backoff; uploaded handles are reused per worker process by file hash.
+GEMINI_UPLOAD_POLL_INITIAL_SECONDS = float(os.getenv("GEMINI_UPLOAD_POLL_INITIAL_SECONDS", "0.5"))
+GEMINI_UPLOAD_POLL_MAX_SECONDS = float(os.getenv("GEMINI_UPLOAD_POLL_MAX_SECONDS", "4"))
+GEMINI_UPLOAD_MAX_WAIT_SECONDS = float(os.getenv("GEMINI_UPLOAD_MAX_WAIT_SECONDS", "30"))
+GEMINI_UPLOAD_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_UPLOAD_CACHE_TTL_SECONDS", "900"))
+GEMINI_UPLOAD_CACHE_MAX_ENTRIES = int(os.getenv("GEMINI_UPLOAD_CACHE_MAX_ENTRIES", "32"))
+
+# Async provider clients (interviews/async_clients.py): one pooled httpx client per event loop.
+GEMINI_API_BASE_URL = os.getenv("GEMINI_API_BASE_URL", "").strip()
+PROVIDER_HTTP_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_HTTP_TIMEOUT_SECONDS", "60"))
+PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+PROVIDER_HTTP_MAX_CONNECTIONS = int(os.getenv("PROVIDER_HTTP_MAX_CONNECTIONS", "20"))
+
+# Shared circuit breaker + concurrency slots per provider (interviews/provider_guard.py).
+# While a circuit is open, provider calls fail fast and Celery tasks are deferred.
+PROVIDER_BREAKER_FAILURE_THRESHOLD = int(os.getenv("PROVIDER_BREAKER_FAILURE_THRESHOLD", "5"))
+PROVIDER_BREAKER_WINDOW_SECONDS = int(os.getenv("PROVIDER_BREAKER_WINDOW_SECONDS", "60"))
+PROVIDER_BREAKER_OPEN_SECONDS = int(os.getenv("PROVIDER_BREAKER_OPEN_SECONDS", "60"))
+PROVIDER_MAX_CONCURRENCY_GEMINI = int(os.getenv("PROVIDER_MAX_CONCURRENCY_GEMINI", "8"))
+PROVIDER_MAX_CONCURRENCY_DEEPGRAM = int(os.getenv("PROVIDER_MAX_CONCURRENCY_DEEPGRAM", "8"))
+PROVIDER_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_ACQUIRE_TIMEOUT_SECONDS", "10"))
+PROVIDER_SLOT_LEASE_SECONDS = int(os.getenv("PROVIDER_SLOT_LEASE_SECONDS", "300"))
+PROVIDER_DEFER_MAX_RETRIES = int(os.getenv("PROVIDER_DEFER_MAX_RETRIES", "10"))
 
 TTS_ENABLED = bool(DEEPGRAM_API_KEY and TTS_PROVIDER == "deepgram")
 STT_ENABLED = bool(DEEPGRAM_API_KEY and STT_PROVIDER == "deepgram")
@@ -361,6 +465,34 @@ INTERVIEW_PROCESSING_SYNC = os.getenv("INTERVIEW_PROCESSING_SYNC", "false").lowe
 if not DEBUG:
     INTERVIEW_PROCESSING_SYNC = False
 
+# Practice-session coaching (training/tasks.py) runs in Celery; submit_response
+# returns 202 and feedback is polled from the per-session cache.
+TRAINING_PROCESSING_SYNC = os.getenv("TRAINING_PROCESSING_SYNC", "false").lower() == "true"
+if not DEBUG:
+    TRAINING_PROCESSING_SYNC = False
+TRAINING_FEEDBACK_CACHE_TTL_SECONDS = int(os.getenv("TRAINING_FEEDBACK_CACHE_TTL_SECONDS", str(24 * 3600)))
+
+# "monolithic" (default) runs the whole interview in process_complete_interview;
+# "chord" fans out per-video transcription/script detection across workers and
+# fans in to finalize_interview_analysis.
+INTERVIEW_PIPELINE_MODE = os.getenv("INTERVIEW_PIPELINE_MODE", "monolithic").strip().lower()
+
+# Script reading detection runs in a pool alongside transcription/LLM analysis.
+# "process" (default) or "thread"; thread mode is used automatically when the
+# worker cannot fork child processes.
+SCRIPT_DETECTION_EXECUTOR = os.getenv("SCRIPT_DETECTION_EXECUTOR", "process").strip().lower()
+SCRIPT_DETECTION_MAX_WORKERS = int(os.getenv("SCRIPT_DETECTION_MAX_WORKERS", "4"))
+SCRIPT_DETECTION_JOIN_TIMEOUT_SECONDS = int(os.getenv("SCRIPT_DETECTION_JOIN_TIMEOUT_SECONDS", "180"))
+# Frames analysed per second of video and the width frames are downscaled to
+# before face detection (0 = every 3rd frame / full resolution).
+SCRIPT_DETECTION_TARGET_FPS = float(os.getenv("SCRIPT_DETECTION_TARGET_FPS", "4"))
+SCRIPT_DETECTION_MAX_FRAME_WIDTH = int(os.getenv("SCRIPT_DETECTION_MAX_FRAME_WIDTH", "480"))
+
+# Fallback Deepgram transcription inside process_complete_interview: concurrent
+# calls and the overall deadline for the batch (seconds).
+FALLBACK_TRANSCRIPTION_MAX_WORKERS = int(os.getenv("FALLBACK_TRANSCRIPTION_MAX_WORKERS", "4"))
+FALLBACK_TRANSCRIPTION_TIMEOUT_SECONDS = int(os.getenv("FALLBACK_TRANSCRIPTION_TIMEOUT_SECONDS", "90"))
+
 logger.info("TTS enabled: %s", TTS_ENABLED)
 logger.info("TTS provider: %s", TTS_PROVIDER)
 logger.info("TTS model: %s", DEEPGRAM_TTS_MODEL)
@@ -1,17 +1,22 @@
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 
 from django.db.models import Avg, Count, Q
-from django.utils.timezone import now
+from django.utils.timezone import make_aware, now
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from applicants.models import Applicant
 from interviews.models import Interview
-from results.models import InterviewResult
+from results.models import PENDING_DECISION_Q, InterviewResult
 from common.permissions import IsHRUser
 
 
+def _day_start(day):
+    """Local midnight of `day`, so result_date filters stay index range scans (unlike __date)"""
+    return make_aware(datetime.combine(day, time.min))
+
+
 class HRDashboardOverview(APIView):
     """
     Lightweight overview for HR dashboard.
@@ -42,13 +47,13 @@ class HRDashboardOverview(APIView):
             avg_score=Avg("final_score"),
         )
 
-        pending_decisions = Q(hr_decision__isnull=True) | Q(
-            hr_decision__in=["pending_hr_review", "pending", "on_hold", "hold"]
-        )
-        pending_reviews = results_qs.filter(pending_decisions, interview__status="completed").count()
-        completed_today = results_qs.filter(result_date__date=today).count()
-        completed_7d = results_qs.filter(result_date__date__gte=seven_days_ago).count()
-        completed_30d = results_qs.filter(result_date__date__gte=thirty_days_ago).count()
+        pending_reviews = results_qs.filter(PENDING_DECISION_Q, interview__status="completed").count()
+        completed_today = results_qs.filter(
+            result_date__gte=_day_start(today),
+            result_date__lt=_day_start(today + timedelta(days=1)),
+        ).count()
+        completed_7d = results_qs.filter(result_date__gte=_day_start(seven_days_ago)).count()
+        completed_30d = results_qs.filter(result_date__gte=_day_start(thirty_days_ago)).count()
 
         in_progress_interviews = Interview.objects.filter(
             status__in=["submitted", "processing", "in_progress"]
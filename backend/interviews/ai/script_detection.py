@@ -6,16 +6,147 @@ Detects if applicant is reading from another screen or paper
 import cv2
 import numpy as np
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
 
-def detect_script_reading(video_path):
+# The risk thresholds below were tuned while analysing every 3rd decoded frame;
+# scanning-per-minute is still normalised against that cadence.
+LEGACY_FRAME_STEP = 3
+DEFAULT_TARGET_FPS = 4.0
+DEFAULT_MAX_FRAME_WIDTH = 480
+FALLBACK_FPS = 30.0
+HAAR_MIN_WINDOW = 24
+
+
+FACE_CASCADE_FILE = 'haarcascade_frontalface_default.xml'
+
+_detector_local = threading.local()
+
+
+class FaceDetector:
+    """
+    Holds a loaded Haar face cascade.
+
+    CascadeClassifier is not documented as thread-safe, so get_face_detector()
+    hands out one instance per thread; each process parses the XML once per
+    thread instead of once per video.
+    """
+
+    def __init__(self, cascade_path=None):
+        self.cascade_path = cascade_path or cv2.data.haarcascades + FACE_CASCADE_FILE
+        self.face_cascade = cv2.CascadeClassifier(self.cascade_path)
+        if self.face_cascade.empty():
+            raise RuntimeError(f"Could not load face cascade: {self.cascade_path}")
+
+    def detect_faces(self, gray, min_size=(30, 30)):
+        return self.face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.1,
+            minNeighbors=5,
+            minSize=min_size
+        )
+
+
+def get_face_detector():
+    """Return this thread's FaceDetector, loading the cascade on first use."""
+    detector = getattr(_detector_local, 'detector', None)
+    if detector is None:
+        detector = FaceDetector()
+        _detector_local.detector = detector
+    return detector
+
+
+def preload_face_detector(**kwargs):
+    """Load the cascade ahead of the first video (Celery worker / pool initializer)."""
+    try:
+        get_face_detector()
+        logger.info("Face cascade preloaded for script reading detection")
+    except Exception as e:
+        logger.warning(f"Could not preload face cascade: {e}")
+
+
+def _sampling_settings():
+    try:
+        from django.conf import settings
+
+        target_fps = float(getattr(settings, "SCRIPT_DETECTION_TARGET_FPS", DEFAULT_TARGET_FPS))
+        max_frame_width = int(getattr(settings, "SCRIPT_DETECTION_MAX_FRAME_WIDTH", DEFAULT_MAX_FRAME_WIDTH))
+    except Exception:
+        target_fps, max_frame_width = DEFAULT_TARGET_FPS, DEFAULT_MAX_FRAME_WIDTH
+    return target_fps, max_frame_width
+
+
+def _iter_sampled_frames(video, fps, target_fps=None, frame_step=LEGACY_FRAME_STEP, stats=None):
+    """
+    Yield frames from an open cv2.VideoCapture at roughly target_fps.
+
+    Every frame is grab()bed to advance the stream, but only sampled frames are
+    retrieve()d and converted. Sampling follows the container timestamps, so
+    WebM files with unreliable FPS metadata are still sampled evenly. When
+    target_fps is falsy every frame_step-th frame is returned instead.
+    """
+    stats = stats if stats is not None else {}
+    nominal_fps = fps if fps and 0 < fps <= 240 else FALLBACK_FPS
+    interval_ms = 1000.0 / target_fps if target_fps and target_fps > 0 else None
+    next_sample_ms = 0.0
+    last_timestamp_ms = -1.0
+    frames_read = 0
+    frames_sampled = 0
+
+    while video.grab():
+        frames_read += 1
+        timestamp_ms = video.get(cv2.CAP_PROP_POS_MSEC)
+        if not timestamp_ms >= 0 or (frames_read > 1 and timestamp_ms <= last_timestamp_ms):
+            timestamp_ms = (frames_read - 1) * 1000.0 / nominal_fps
+        last_timestamp_ms = timestamp_ms
+        stats['frames_read'] = frames_read
+        stats['duration_seconds'] = timestamp_ms / 1000.0
+
+        if interval_ms is None:
+            if frames_read % frame_step != 0:
+                continue
+        else:
+            if timestamp_ms + 1e-6 < next_sample_ms:
+                continue
+            next_sample_ms += interval_ms
+            if next_sample_ms <= timestamp_ms:
+                next_sample_ms = timestamp_ms + interval_ms
+
+        ok, frame = video.retrieve()
+        if not ok:
+            continue
+        frames_sampled += 1
+        stats['frames_sampled'] = frames_sampled
+        yield frame
+
+
+def _prepare_gray(frame, max_frame_width):
+    """Grayscale and downscale a frame; returns (gray, scale)."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    width = gray.shape[1]
+    if max_frame_width and width > max_frame_width:
+        scale = max_frame_width / float(width)
+        height = max(1, int(round(gray.shape[0] * scale)))
+        gray = cv2.resize(gray, (max_frame_width, height), interpolation=cv2.INTER_AREA)
+        return gray, scale
+    return gray, 1.0
+
+
+def detect_script_reading(video_path, target_fps=None, max_frame_width=None, stats=None, fps=None):
     """
     Analyze video for script reading patterns using OpenCV face detection
     
     Args:
         video_path: Path to video file
+        target_fps: Frames per second to analyse (SCRIPT_DETECTION_TARGET_FPS);
+            0 analyses every 3rd frame like the original implementation
+        max_frame_width: Frames wider than this are downscaled before face
+            detection (SCRIPT_DETECTION_MAX_FRAME_WIDTH); 0 disables it
+        stats: Optional dict filled with frames_read / frames_sampled counters
+        fps: Frame rate from the upload-time media probe; preferred over
+            OpenCV's estimate, which is often wrong for browser WebM files
         
     Returns:
         dict: {
@@ -24,12 +155,18 @@ def detect_script_reading(video_path):
             'data': {...}
         }
     """
+    default_fps, default_width = _sampling_settings()
+    if target_fps is None:
+        target_fps = default_fps
+    if max_frame_width is None:
+        max_frame_width = default_width
+    stats = stats if stats is not None else {}
+
     try:
         logger.info(f"Starting script reading detection for: {video_path}")
         
-        # Initialize face and eye cascade classifiers (built into OpenCV)
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+        # Face cascade is loaded once per worker thread and reused across videos
+        detector = get_face_detector()
         
         # Open video
         video = cv2.VideoCapture(video_path)
@@ -38,10 +175,12 @@ def detect_script_reading(video_path):
             return _default_result("error", "Could not open video file")
         
         # Get video properties
-        fps = video.get(cv2.CAP_PROP_FPS)
+        fps = fps or video.get(cv2.CAP_PROP_FPS)
         total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        if not fps or fps <= 0 or fps > 240:
+            fps = FALLBACK_FPS
         
-        logger.info(f"Video properties: {total_frames} frames at {fps} FPS")
+        logger.info(f"Video properties: {total_frames} frames at {fps} FPS, sampling at {target_fps or 'every 3rd frame'}")
         
         # Counters
         processed_frames = 0
@@ -60,96 +199,83 @@ def detect_script_reading(video_path):
         previous_horizontal_zone = None
         previous_vertical_zone = None
         
-        # Sample every 3rd frame for performance (still ~10 FPS analysis)
-        frame_skip = 3
-        frame_count = 0
-        
-        while video.isOpened():
-            ret, frame = video.read()
-            if not ret:
-                break
-            
-            frame_count += 1
-            
-            # Skip frames for performance
-            if frame_count % frame_skip != 0:
-                continue
-            
-            processed_frames += 1
-            
-            # Convert to grayscale for detection
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
-            # Detect faces
-            faces = face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,
-                minNeighbors=5,
-                minSize=(30, 30)
-            )
-            
-            if len(faces) == 0:
-                # No face detected - might be looking away
-                continue
-            
-            face_detected_frames += 1
-            
-            # Use the largest face (closest to camera)
-            faces_sorted = sorted(faces, key=lambda x: x[2] * x[3], reverse=True)
-            (x, y, w, h) = faces_sorted[0]
-            
-            # Define face regions for gaze estimation
-            face_center_x = x + w // 2
-            face_center_y = y + h // 2
-            frame_center_x = frame.shape[1] // 2
-            frame_center_y = frame.shape[0] // 2
-            
-            # Calculate relative position
-            # Horizontal zones
-            horizontal_offset = face_center_x - frame_center_x
-            horizontal_threshold = frame.shape[1] * 0.15  # 15% of frame width
-            
-            if abs(horizontal_offset) < horizontal_threshold:
-                center_frames += 1
-                current_h_zone = 'center'
-            elif horizontal_offset < 0:
-                left_frames += 1
-                current_h_zone = 'left'
-            else:
-                right_frames += 1
-                current_h_zone = 'right'
-            
-            # Vertical zones
-            vertical_offset = face_center_y - frame_center_y
-            vertical_threshold = frame.shape[0] * 0.15  # 15% of frame height
-            
-            if abs(vertical_offset) < vertical_threshold:
-                current_v_zone = 'center'
-            elif vertical_offset < 0:
-                up_frames += 1
-                current_v_zone = 'up'
-            else:
-                down_frames += 1
-                current_v_zone = 'down'
-            
-            # Detect horizontal scanning (reading pattern)
-            if previous_horizontal_zone and previous_horizontal_zone != current_h_zone:
-                if (previous_horizontal_zone == 'left' and current_h_zone == 'right') or \
-                   (previous_horizontal_zone == 'right' and current_h_zone == 'left'):
-                    horizontal_movements += 1
-            
-            # Detect vertical scanning
-            if previous_vertical_zone and previous_vertical_zone != current_v_zone:
-                if (previous_vertical_zone == 'up' and current_v_zone == 'down') or \
-                   (previous_vertical_zone == 'down' and current_v_zone == 'up'):
-                    vertical_movements += 1
-            
-            previous_horizontal_zone = current_h_zone
-            previous_vertical_zone = current_v_zone
-        
-        video.release()
+        try:
+            for frame in _iter_sampled_frames(video, fps, target_fps=target_fps, stats=stats):
+                processed_frames += 1
+                
+                # Convert to grayscale (and downscale) for detection
+                gray, scale = _prepare_gray(frame, max_frame_width)
+                min_face = max(HAAR_MIN_WINDOW, int(round(30 * scale)))
+                
+                # Detect faces
+                faces = detector.detect_faces(gray, min_size=(min_face, min_face))
+                
+                if len(faces) == 0:
+                    # No face detected - might be looking away
+                    continue
+                
+                face_detected_frames += 1
+                
+                # Use the largest face (closest to camera)
+                faces_sorted = sorted(faces, key=lambda x: x[2] * x[3], reverse=True)
+                (x, y, w, h) = faces_sorted[0]
+                
+                # Define face regions for gaze estimation
+                face_center_x = x + w // 2
+                face_center_y = y + h // 2
+                frame_center_x = gray.shape[1] // 2
+                frame_center_y = gray.shape[0] // 2
+                
+                # Calculate relative position
+                # Horizontal zones
+                horizontal_offset = face_center_x - frame_center_x
+                horizontal_threshold = gray.shape[1] * 0.15  # 15% of frame width
+                
+                if abs(horizontal_offset) < horizontal_threshold:
+                    center_frames += 1
+                    current_h_zone = 'center'
+                elif horizontal_offset < 0:
+                    left_frames += 1
+                    current_h_zone = 'left'
+                else:
+                    right_frames += 1
+                    current_h_zone = 'right'
+                
+                # Vertical zones
+                vertical_offset = face_center_y - frame_center_y
+                vertical_threshold = gray.shape[0] * 0.15  # 15% of frame height
+                
+                if abs(vertical_offset) < vertical_threshold:
+                    current_v_zone = 'center'
+                elif vertical_offset < 0:
+                    up_frames += 1
+                    current_v_zone = 'up'
+                else:
+                    down_frames += 1
+                    current_v_zone = 'down'
+                
+                # Detect horizontal scanning (reading pattern)
+                if previous_horizontal_zone and previous_horizontal_zone != current_h_zone:
+                    if (previous_horizontal_zone == 'left' and current_h_zone == 'right') or \
+                       (previous_horizontal_zone == 'right' and current_h_zone == 'left'):
+                        horizontal_movements += 1
+                
+                # Detect vertical scanning
+                if previous_vertical_zone and previous_vertical_zone != current_v_zone:
+                    if (previous_vertical_zone == 'up' and current_v_zone == 'down') or \
+                       (previous_vertical_zone == 'down' and current_v_zone == 'up'):
+                        vertical_movements += 1
+                
+                previous_horizontal_zone = current_h_zone
+                previous_vertical_zone = current_v_zone
+        finally:
+            video.release()
         
-        logger.info(f"Processed {processed_frames} frames, face detected in {face_detected_frames}")
+        stats['frames_analyzed'] = processed_frames
+        logger.info(
+            f"Processed {processed_frames} of {stats.get('frames_read', 0)} frames, "
+            f"face detected in {face_detected_frames}"
+        )
         
         # Calculate percentages
         if face_detected_frames == 0:
@@ -198,7 +324,11 @@ def detect_script_reading(video_path):
             flags.append(f"Frequent gaze to {primary_direction} ({max_direction_percent:.1f}%)")
         
         # Factor 3: Horizontal scanning (20% weight)
-        scanning_frequency = horizontal_movements / (processed_frames / fps) * 60  # per minute
+        # Normalised to the every-3rd-frame cadence the thresholds were tuned on
+        legacy_sampled_seconds = (stats.get('frames_read', 0) / LEGACY_FRAME_STEP) / fps
+        scanning_frequency = (
+            horizontal_movements / legacy_sampled_seconds * 60 if legacy_sampled_seconds else 0.0
+        )  # per minute
         if scanning_frequency > 15:
             risk_score += 20
             flags.append(f"High horizontal scanning ({int(scanning_frequency)}/min - reading pattern)")
@@ -3,14 +3,41 @@ AI Service for Interview Video Analysis
 Uses Google Gemini 2.5 Flash for transcript analysis
 """
 
+import asyncio
 import os
 import json
+import time
 from typing import Dict, Any
 import google.generativeai as genai
+from asgiref.sync import sync_to_async
 from django.conf import settings
 
+from interviews import analysis_cache, gemini_uploads, prompt_builder, provider_guard, transcript_cache
+from interviews.async_clients import AsyncGeminiClient, LoopLocalClient
+
+ANALYSIS_MODEL = 'gemini-2.5-flash'
+# Part of the analysis cache key: bump when the matching prompt text or parsing changes
+ANALYSIS_PROMPT_VERSION = 'analyze-v1'
+BATCH_ANALYSIS_PROMPT_VERSION = 'batch-v2'
+
+TRANSCRIPTION_MODEL = 'gemini-2.5-flash'
+TRANSCRIPTION_OPTIONS = {'temperature': 0.1}
+
 MAX_ANSWER_SECONDS = 120
 
+
+def _split_by_weight(total: int, weights: list) -> list:
+    """Split an integer count by weight (largest remainder, so the parts sum to total)"""
+    weight_sum = sum(weights)
+    if len(weights) == 1 or weight_sum <= 0:
+        return [total] + [0] * (len(weights) - 1)
+    exact = [total * weight / weight_sum for weight in weights]
+    parts = [int(value) for value in exact]
+    by_remainder = sorted(range(len(weights)), key=lambda index: exact[index] - parts[index], reverse=True)
+    for index in by_remainder[:total - sum(parts)]:
+        parts[index] += 1
+    return parts
+
 class AIAnalysisService:
     """Service class for AI-powered video interview analysis"""
     
@@ -23,17 +50,30 @@ class AIAnalysisService:
         genai.configure(api_key=api_key)
         # Using stable Gemini 2.5 Flash model
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        # Pooled httpx client per event loop for the async methods
+        self._async_clients = LoopLocalClient(lambda: AsyncGeminiClient(api_key, model_name='gemini-2.5-flash'))
+    
+    def get_async_client(self) -> AsyncGeminiClient:
+        """Async Gemini client bound to the running event loop (connections are reused)"""
+        return self._async_clients.get()
     
     def _log_token_usage(self, operation_type, prompt, response_text, response_time, 
                         interview_id=None, video_response_id=None, response_obj=None, 
-                        success=True, error=""):
-        """Log token usage to monitoring system"""
+                        success=True, error="", predicted_input_tokens=None, usage_shares=None):
+        """
+        Log token usage to monitoring system
+        
+        predicted_input_tokens: local tokenizer count for text-only prompts, stored
+        next to the provider-reported input_tokens
+        usage_shares: [(interview_id, weight)] when one call served several
+        interviews; the counts are split into one row per interview by weight
+        """
         try:
-            from monitoring.models import TokenUsage
+            from monitoring import usage_buffer
             
-            # Estimate tokens (rough approximation: 1 token ≈ 4 characters)
-            input_tokens = len(prompt) // 4
-            output_tokens = len(response_text) // 4
+            # Local estimate, replaced by the provider's counts when available
+            input_tokens = predicted_input_tokens if predicted_input_tokens is not None else prompt_builder.count_tokens(prompt)
+            output_tokens = prompt_builder.count_tokens(response_text)
             
             # Try to get actual token count from response metadata if available
             if response_obj and hasattr(response_obj, 'usage_metadata'):
@@ -44,19 +84,32 @@ class AIAnalysisService:
                 except:
                     pass
             
-            TokenUsage.objects.create(
-                operation_type=operation_type,
-                interview_id=interview_id,
-                video_response_id=video_response_id,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                model_name='gemini-2.5-flash',
-                api_response_time=response_time,
-                prompt_length=len(prompt),
-                response_length=len(response_text),
-                success=success,
-                error_message=error
+            shares = usage_shares or [(interview_id, 1)]
+            weights = [weight for _, weight in shares]
+            split_input = _split_by_weight(input_tokens, weights)
+            split_output = _split_by_weight(output_tokens, weights)
+            split_predicted = (
+                _split_by_weight(predicted_input_tokens, weights) if predicted_input_tokens is not None
+                else [None] * len(shares)
             )
+            split_prompt_length = _split_by_weight(len(prompt), weights)
+            split_response_length = _split_by_weight(len(response_text), weights)
+            for index, (share_interview_id, _) in enumerate(shares):
+                # Buffered; written in bulk (with cost) by the usage flush task
+                usage_buffer.record_usage(
+                    operation_type=operation_type,
+                    interview_id=share_interview_id,
+                    video_response_id=video_response_id,
+                    input_tokens=split_input[index],
+                    output_tokens=split_output[index],
+                    predicted_input_tokens=split_predicted[index],
+                    model_name='gemini-2.5-flash',
+                    api_response_time=response_time,
+                    prompt_length=split_prompt_length[index],
+                    response_length=split_response_length[index],
+                    success=success,
+                    error_message=error
+                )
         except Exception as e:
             # Don't fail the operation if logging fails
             print(f"Warning: Failed to log token usage: {e}")
@@ -113,6 +166,27 @@ class AIAnalysisService:
                 'issue_type': 'no_audio'
             }
         
+        # Same inputs + prompt version + model -> reuse the earlier score
+        cache_key = analysis_cache.analysis_cache_key(
+            'analyze_transcript',
+            ANALYSIS_PROMPT_VERSION,
+            ANALYSIS_MODEL,
+            {
+                'transcript': transcript_text,
+                'question_text': question_text,
+                'question_type': question_type,
+                'question_competency': question_competency,
+                'role_name': role_name,
+                'role_code': role_code,
+                'role_context': role_context,
+                'role_profile': role_profile,
+                'core_competencies': core_competencies,
+            },
+        )
+        cached = analysis_cache.get_cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+        
         prompt = f"""
 You are an AI assistant acting as a JUNIOR HR ANALYST.
 You provide structured, conservative, evidence-based evaluations.
@@ -139,7 +213,7 @@ Interview Context:
 
 Candidate Response (verbatim transcript):
 \"\"\"
-{transcript_text}
+{prompt_builder.fit_transcript(transcript_text)}
 \"\"\"
 
 EVALUATION CRITERIA (score each from 0 to 100):
@@ -206,39 +280,17 @@ Do NOT include explanations outside JSON.
         
         try:
             # Generate content with Gemini
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    'temperature': 0.3,  # Lower temperature for more consistent scoring
-                    'response_mime_type': 'application/json'
-                }
-            )
+            with provider_guard.provider_call('gemini'):
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config={
+                        'temperature': 0.3,  # Lower temperature for more consistent scoring
+                        'response_mime_type': 'application/json'
+                    }
+                )
             
-            # Parse the JSON response
-            analysis = json.loads(response.text)
-            
-            # Validate required fields
-            required_fields = ['sentiment_score', 'confidence_score', 'speech_clarity_score', 
-                             'content_relevance_score', 'overall_score', 'recommendation']
-            for field in required_fields:
-                if field not in analysis:
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Clamp numeric scores to integers in [0, 100]
-            score_fields = [
-                'sentiment_score',
-                'confidence_score',
-                'speech_clarity_score',
-                'content_relevance_score',
-                'overall_score',
-            ]
-            for field in score_fields:
-                raw_value = analysis.get(field)
-                try:
-                    normalized = int(round(float(raw_value)))
-                except (TypeError, ValueError):
-                    normalized = 0
-                analysis[field] = max(0, min(100, normalized))
+            # Parse the JSON response, validate and clamp scores
+            analysis = self._normalize_analysis(json.loads(response.text))
             
             # Log token usage
             response_time = time.time() - start_time
@@ -248,11 +300,16 @@ Do NOT include explanations outside JSON.
                 response_text=response.text,
                 response_time=response_time,
                 success=True,
-                response_obj=response
+                response_obj=response,
+                predicted_input_tokens=prompt_builder.count_tokens(prompt)
             )
             
+            analysis_cache.store_analysis(cache_key, analysis)
             return analysis
             
+        except provider_guard.ProviderUnavailable:
+            # Not a scoring failure: let the task defer instead of storing default scores
+            raise
         except Exception as e:
             # Log failed analysis
             response_time = time.time() - start_time
@@ -262,7 +319,8 @@ Do NOT include explanations outside JSON.
                 response_text="",
                 response_time=response_time,
                 success=False,
-                error=str(e)
+                error=str(e),
+                predicted_input_tokens=prompt_builder.count_tokens(prompt)
             )
             
             # Return default low scores if analysis fails
@@ -277,7 +335,7 @@ Do NOT include explanations outside JSON.
                 'error': str(e)
             }
     
-    def transcribe_video(self, video_file_path: str, video_response_id: int = None) -> str:
+    def transcribe_video(self, video_file_path: str, video_response_id: int = None, audio_path: str = None) -> str:
         """
         Transcribe audio from video using Gemini's multimodal capabilities
         WITH FALLBACK: If video processing fails, extract audio and try again
@@ -285,16 +343,47 @@ Do NOT include explanations outside JSON.
         Args:
             video_file_path: Path to the video file
             video_response_id: Optional ID to link token usage
+            audio_path: Optional STT audio track stored at upload (see media_service);
+                uploaded instead of the full video when present
         
         Returns:
             Transcribed text
         """
-        import time
+        # Same audio + model + options -> reuse the stored transcript
+        cache_key = transcript_cache.cache_key_for_file(
+            audio_path or video_file_path,
+            provider='gemini',
+            model=TRANSCRIPTION_MODEL,
+            options=TRANSCRIPTION_OPTIONS,
+        )
+        cached = transcript_cache.get_cached_transcript(cache_key)
+        if cached is not None:
+            print(f"♻️ Reusing cached Gemini transcript for video {video_response_id}")
+            return cached
+        
+        transcript = self._transcribe_video_uncached(video_file_path, video_response_id, audio_path)
+        transcript_cache.store_transcript(cache_key, transcript)
+        return transcript
+    
+    def _transcribe_video_uncached(self, video_file_path: str, video_response_id: int = None,
+                                   audio_path: str = None) -> str:
+        """Stored audio -> direct video -> extracted audio fallback chain"""
         start_time = time.time()
         
+        # The compact upload-time audio track is much smaller than the video
+        if audio_path:
+            try:
+                return self._transcribe_audio_file(audio_path, video_response_id, start_time)
+            except provider_guard.ProviderUnavailable:
+                raise
+            except Exception as stored_audio_error:
+                print(f"⚠️ Stored audio transcription failed: {stored_audio_error}")
+        
         # Try direct video upload first
         try:
             return self._transcribe_video_direct(video_file_path, video_response_id, start_time)
+        except provider_guard.ProviderUnavailable:
+            raise
         except Exception as video_error:
             print(f"⚠️ Direct video transcription failed: {video_error}")
             print(f"🔄 Attempting audio extraction fallback...")
@@ -302,6 +391,8 @@ Do NOT include explanations outside JSON.
             # Fallback: Extract audio and transcribe
             try:
                 return self._transcribe_audio_extracted(video_file_path, video_response_id, start_time)
+            except provider_guard.ProviderUnavailable:
+                raise
             except Exception as audio_error:
                 print(f"❌ Audio extraction also failed: {audio_error}")
                 # Final fallback: return a message indicating no audio
@@ -319,49 +410,9 @@ Do NOT include explanations outside JSON.
     
     def _transcribe_video_direct(self, video_file_path: str, video_response_id: int, start_time: float) -> str:
         """Direct video upload to Gemini (original method)"""
-        import time
-        
-        # Upload video file to Gemini
-        print(f"📤 Uploading video to Gemini...")
-        video_file = genai.upload_file(path=video_file_path)
-        print(f"✓ Video uploaded: {video_file.name}")
-        
-        # Wait for processing with optimized polling
-        max_wait_time = 30  # Maximum 30 seconds wait
-        poll_interval = 0.5  # Check every 0.5 seconds
-        elapsed = 0
-        
-        print(f"⏳ Waiting for Gemini to process video...")
-        while video_file.state.name == "PROCESSING" and elapsed < max_wait_time:
-            time.sleep(poll_interval)
-            elapsed += poll_interval
-            video_file = genai.get_file(video_file.name)
-            if elapsed % 2 == 0:  # Log every 2 seconds
-                print(f"  ... still processing ({elapsed}s)")
-        
-        print(f"📊 Final state: {video_file.state.name}")
-        
-        if video_file.state.name == "FAILED":
-            genai.delete_file(video_file.name)
-            raise Exception("Gemini rejected video file (possibly unsupported format)")
-        
-        if video_file.state.name == "PROCESSING":
-            genai.delete_file(video_file.name)
-            raise Exception("Video processing timeout")
-        
-        # Generate transcription
-        print(f"🎯 Generating transcription...")
         prompt = "Transcribe the spoken content from this video. Return only the transcribed text."
-        
-        response = self.model.generate_content(
-            [prompt, video_file],
-            generation_config={'temperature': 0.1}
-        )
-        
-        # Clean up
-        genai.delete_file(video_file.name)
-        
-        transcript = response.text.strip()
+        print(f"📤 Uploading video to Gemini...")
+        transcript, response = self._transcribe_uploaded(video_file_path, prompt)
         
         # Log success
         response_time = time.time() - start_time
@@ -377,6 +428,26 @@ Do NOT include explanations outside JSON.
         
         return transcript
     
+    def _transcribe_uploaded(self, file_path: str, prompt: str):
+        """
+        Upload (or reuse) file_path via the upload manager and transcribe it
+        
+        The remote file is released for background deletion on success. On a
+        failed generate call it stays cached so a retry skips the upload.
+        """
+        uploads = gemini_uploads.get_upload_manager()
+        with provider_guard.provider_call('gemini'):
+            remote_file = uploads.upload(file_path)
+            print(f"✓ File ready: {remote_file.name}")
+            
+            print(f"🎯 Generating transcription...")
+            response = self.model.generate_content(
+                [prompt, remote_file],
+                generation_config=dict(TRANSCRIPTION_OPTIONS)
+            )
+        uploads.release(remote_file)
+        return response.text.strip(), response
+    
     def _transcribe_audio_extracted(self, video_file_path: str, video_response_id: int, start_time: float) -> str:
         """Extract audio from video and transcribe (fallback method)"""
         import time
@@ -438,58 +509,7 @@ Do NOT include explanations outside JSON.
         
         # Now transcribe the extracted audio
         try:
-            print(f"📤 Uploading audio to Gemini...")
-            
-            # Upload audio file
-            audio_file = genai.upload_file(path=audio_path)
-            
-            # Wait for processing
-            max_wait_time = 30
-            poll_interval = 0.5
-            elapsed = 0
-            
-            while audio_file.state.name == "PROCESSING" and elapsed < max_wait_time:
-                time.sleep(poll_interval)
-                elapsed += poll_interval
-                audio_file = genai.get_file(audio_file.name)
-            
-            if audio_file.state.name == "FAILED":
-                genai.delete_file(audio_file.name)
-                raise Exception("Audio processing failed")
-            
-            if audio_file.state.name == "PROCESSING":
-                genai.delete_file(audio_file.name)
-                raise Exception("Audio processing timeout")
-            
-            # Transcribe
-            print(f"🎯 Transcribing audio...")
-            prompt = "Transcribe the spoken content from this audio. Return only the transcribed text."
-            
-            response = self.model.generate_content(
-                [prompt, audio_file],
-                generation_config={'temperature': 0.1}
-            )
-            
-            # Clean up
-            genai.delete_file(audio_file.name)
-            
-            transcript = response.text.strip()
-            
-            # Log success
-            response_time = time.time() - start_time
-            self._log_token_usage(
-                operation_type='transcription',
-                prompt=prompt + " (audio extracted)",
-                response_text=transcript,
-                response_time=response_time,
-                video_response_id=video_response_id,
-                success=True,
-                response_obj=response
-            )
-            
-            print(f"✓ Audio transcription successful!")
-            return transcript
-            
+            return self._transcribe_audio_file(audio_path, video_response_id, start_time, extracted=True)
         finally:
             # Clean up temp audio file
             if audio_path and os.path.exists(audio_path):
@@ -499,6 +519,171 @@ Do NOT include explanations outside JSON.
                 except:
                     pass
     
+    def _transcribe_audio_file(self, audio_path: str, video_response_id: int, start_time: float,
+                               extracted: bool = False) -> str:
+        """Upload an audio file to Gemini and transcribe it"""
+        print(f"📤 Uploading audio to Gemini...")
+        prompt = "Transcribe the spoken content from this audio. Return only the transcribed text."
+        transcript, response = self._transcribe_uploaded(audio_path, prompt)
+        
+        # Log success
+        response_time = time.time() - start_time
+        self._log_token_usage(
+            operation_type='transcription',
+            prompt=prompt + (" (audio extracted)" if extracted else " (stored audio)"),
+            response_text=transcript,
+            response_time=response_time,
+            video_response_id=video_response_id,
+            success=True,
+            response_obj=response
+        )
+        
+        print(f"✓ Audio transcription successful!")
+        return transcript
+    
+    def _normalize_analysis(self, analysis: Any) -> Dict[str, Any]:
+        """Validate required fields and clamp numeric scores to integers in [0, 100]"""
+        if not isinstance(analysis, dict):
+            raise ValueError("Analysis is not a JSON object")
+        
+        # Validate required fields
+        required_fields = ['sentiment_score', 'confidence_score', 'speech_clarity_score', 
+                         'content_relevance_score', 'overall_score', 'recommendation']
+        for field in required_fields:
+            if field not in analysis:
+                raise ValueError(f"Missing required field: {field}")
+
+        # Clamp numeric scores to integers in [0, 100]
+        score_fields = [
+            'sentiment_score',
+            'confidence_score',
+            'speech_clarity_score',
+            'content_relevance_score',
+            'overall_score',
+        ]
+        for field in score_fields:
+            raw_value = analysis.get(field)
+            try:
+                normalized = int(round(float(raw_value)))
+            except (TypeError, ValueError):
+                normalized = 0
+            analysis[field] = max(0, min(100, normalized))
+        return analysis
+    
+    def _salvage_batch_response(self, response_text: str, items: list):
+        """
+        Match batch response elements to requested items
+        
+        Elements are matched by response_index (1-based), then by video_id, and
+        by position only when the element count is exact. Returns
+        ({item index: analysis}, error message or "").
+        """
+        try:
+            parsed = json.loads(response_text)
+        except (TypeError, ValueError) as e:
+            return {}, f"Invalid JSON: {e}"
+        if isinstance(parsed, dict):
+            parsed = parsed.get('results') or parsed.get('responses') or [parsed]
+        if not isinstance(parsed, list):
+            return {}, "Batch response is not a JSON array"
+        
+        by_video_id = {
+            str(item['video_id']): index for index, item in enumerate(items) if item.get('video_id') is not None
+        }
+        positional = len(parsed) == len(items)
+        results = {}
+        invalid = 0
+        for position, element in enumerate(parsed):
+            if not isinstance(element, dict):
+                invalid += 1
+                continue
+            element = dict(element)
+            response_index = element.pop('response_index', None)
+            video_id = element.pop('video_id', None)
+            try:
+                index = int(response_index) - 1
+            except (TypeError, ValueError):
+                index = None
+            if index is None or not 0 <= index < len(items):
+                index = by_video_id.get(str(video_id)) if video_id is not None else None
+            if index is None and positional:
+                index = position
+            if index is None or index in results:
+                invalid += 1
+                continue
+            try:
+                results[index] = self._normalize_analysis(element)
+            except ValueError:
+                invalid += 1
+        
+        if len(results) == len(items):
+            return results, ""
+        return results, f"Salvaged {len(results)}/{len(items)} items ({invalid} invalid element(s))"
+    
+    def _build_batch_prompt(
+        self,
+        transcripts_data: list,
+        role_name: str | None = None,
+        role_code: str | None = None,
+        role_context: str | None = None,
+        role_profile: str | None = None,
+        core_competencies: str | None = None,
+    ) -> str:
+        """Build the single-call prompt shared by the sync and async batch paths"""
+        return prompt_builder.build_batch_prompt(
+            transcripts_data,
+            {
+                'role_name': role_name,
+                'role_code': role_code,
+                'role_context': role_context,
+                'role_profile': role_profile,
+                'core_competencies': core_competencies,
+            },
+        ).text
+    
+    def _analyze_individually(
+        self,
+        transcripts_data: list,
+        role_name: str | None = None,
+        role_code: str | None = None,
+        role_context: str | None = None,
+        role_profile: str | None = None,
+        core_competencies: str | None = None,
+    ) -> list:
+        """Per-item fallback when the batch call fails or returns the wrong count"""
+        return [
+            self.analyze_transcript(
+                d.get('transcript_text') or d.get('transcript', ''),
+                d.get('question_text', ''),
+                d.get('question_type', ''),
+                role_name=role_name,
+                role_code=role_code,
+                role_context=role_context,
+                question_competency=d.get('question_competency'),
+                role_profile=role_profile,
+                core_competencies=core_competencies,
+            )
+            for d in transcripts_data
+        ]
+    
+    def _batch_cache_keys(self, transcripts_data: list, role_kwargs: dict) -> list:
+        """Per-item analysis cache keys for the batch prompt"""
+        return analysis_cache.analysis_cache_keys(
+            'batch_analyze_transcripts',
+            BATCH_ANALYSIS_PROMPT_VERSION,
+            ANALYSIS_MODEL,
+            [
+                {
+                    'transcript': d.get('transcript', d.get('transcript_text', '')),
+                    'question_text': d.get('question_text'),
+                    'question_type': d.get('question_type'),
+                    'question_competency': d.get('question_competency', 'N/A'),
+                    **role_kwargs,
+                }
+                for d in transcripts_data
+            ],
+        )
+    
     def batch_analyze_transcripts(
         self,
         transcripts_data: list,
@@ -508,157 +693,333 @@ Do NOT include explanations outside JSON.
         role_context: str | None = None,
         role_profile: str | None = None,
         core_competencies: str | None = None,
+        usage_shares: list | None = None,
     ) -> list:
         """
         Analyze multiple transcripts in a SINGLE API call for maximum speed
         OPTIMIZED: 5x faster than individual calls
         
+        Items already scored with the same inputs, prompt version and model are
+        served from the analysis cache; only the rest go into the LLM call.
+        
         Args:
             transcripts_data: List of dicts with:
                 - transcript_text: The transcribed text
                 - question_text: The interview question
                 - question_type: Type of question
             interview_id: Optional ID to link token usage
+            usage_shares: [(interview_id, weight)] when the call serves several
+                interviews (micro-batching); token usage is split between them
         
         Returns:
             List of analysis results in same order
         """
-        import time
-        import json
+        role_kwargs = {
+            'role_name': role_name,
+            'role_code': role_code,
+            'role_context': role_context,
+            'role_profile': role_profile,
+            'core_competencies': core_competencies,
+        }
+        cache_keys = self._batch_cache_keys(transcripts_data, role_kwargs)
+        results = analysis_cache.get_cached_analyses(cache_keys)
+        pending = [index for index, result in enumerate(results) if result is None]
+        if not pending:
+            print(f"♻️ All {len(transcripts_data)} analyses served from cache")
+            return results
         
-        # Build batch prompt with all questions
-        batch_prompt = f"""You are an expert HR interviewer analyzing multiple video interview responses.
-Analyze ALL responses and return a JSON array with results for each in order.
-
-Role Context:
-- Role: {role_name or "N/A"}
-- Role Code: {role_code or "N/A"}
-- Role Focus: {role_context or "N/A"}
-- Role Profile: {role_profile or "N/A"}
-- Core Competencies for this role: {core_competencies or "N/A"}
-
-Role-aware scoring rules:
-- Prioritize role-critical competencies in your judgment.
-- Do not over-penalize non-core competencies unless they directly affect task performance.
-
-For each response, provide scores (0-100) for:
-- sentiment_score: Emotional tone and enthusiasm
-- confidence_score: Self-assurance and certainty
-- speech_clarity_score: Articulation and grammar
-- content_relevance_score: How well the answer addresses the question
-- overall_score: Average of above scores
-- recommendation: "pass" (≥70), "review" (50-69), or "fail" (<50)
-- analysis_summary: Brief 2-3 sentence explanation
-
-"""
+        fresh = self._batch_analyze_uncached(
+            [transcripts_data[index] for index in pending],
+            interview_id=interview_id,
+            usage_shares=usage_shares,
+            **role_kwargs,
+        )
+        for index, analysis in zip(pending, fresh):
+            results[index] = analysis
+            analysis_cache.store_analysis(cache_keys[index], analysis)
+        return results
+    
+    def _batch_analyze_uncached(
+        self,
+        transcripts_data: list,
+        interview_id: int | None = None,
+        role_name: str | None = None,
+        role_code: str | None = None,
+        role_context: str | None = None,
+        role_profile: str | None = None,
+        core_competencies: str | None = None,
+        usage_shares: list | None = None,
+    ) -> list:
+        """
+        One LLM call for all items (split when the prompt would exceed
+        ANALYSIS_PROMPT_TOKEN_BUDGET), salvaging every item that validates
         
-        # Add each Q&A to the prompt
-        for i, data in enumerate(transcripts_data, 1):
-            batch_prompt += f"""
-=== RESPONSE {i} ===
-Question: {data['question_text']}
-Type: {data['question_type']}
-Competency: {data.get('question_competency', 'N/A')}
-Answer: {data.get('transcript', data.get('transcript_text', ''))}
-
-"""
+        Items missing from the response or malformed are re-requested together in
+        a single follow-up batch call (per budget group); only what is still
+        missing after that falls back to per-item analysis. Each path logs its own TokenUsage row
+        (batch_analysis / batch_analysis_retry / analysis).
+        """
+        role_kwargs = {
+            'role_name': role_name,
+            'role_code': role_code,
+            'role_context': role_context,
+            'role_profile': role_profile,
+            'core_competencies': core_competencies,
+        }
+        # One call per budget-sized group of items (usually a single call)
+        results = {}
+        groups = prompt_builder.split_batch(transcripts_data, role_kwargs)
+        print(f"📊 Batch analyzing {len(transcripts_data)} transcripts in {len(groups)} API call(s)...")
+        for group in groups:
+            group_results = self._request_batch(
+                [transcripts_data[index] for index in group], interview_id, role_kwargs, 'batch_analysis',
+                usage_shares=usage_shares,
+            )
+            for sub_index, analysis in group_results.items():
+                results[group[sub_index]] = analysis
         
-        batch_prompt += """
-Return ONLY a JSON array with {len(transcripts_data)} objects, one for each response in order:
-[
-  {
-    "sentiment_score": <number>,
-    "confidence_score": <number>,
-    "speech_clarity_score": <number>,
-    "content_relevance_score": <number>,
-    "overall_score": <number>,
-    "recommendation": "<pass|review|fail>",
-    "analysis_summary": "<explanation>"
-  },
-  ... (repeat for all responses)
-]
-"""
+        missing = [index for index in range(len(transcripts_data)) if index not in results]
+        if missing:
+            print(f"⚠️ Salvaged {len(results)}/{len(transcripts_data)} batch items, re-requesting {len(missing)}")
+            missing_items = [transcripts_data[index] for index in missing]
+            for group in prompt_builder.split_batch(missing_items, role_kwargs):
+                retried = self._request_batch(
+                    [missing_items[sub_index] for sub_index in group], interview_id, role_kwargs, 'batch_analysis_retry',
+                    usage_shares=usage_shares,
+                )
+                for position, analysis in retried.items():
+                    results[missing[group[position]]] = analysis
+            missing = [index for index in missing if index not in results]
+        
+        if missing:
+            print(f"❌ {len(missing)} item(s) still missing after retry. Falling back to individual analysis...")
+            individual = self._analyze_individually([transcripts_data[index] for index in missing], **role_kwargs)
+            for index, analysis in zip(missing, individual):
+                results[index] = analysis
         
+        return [results[index] for index in range(len(transcripts_data))]
+    
+    def _request_batch(self, items: list, interview_id: int | None, role_kwargs: dict,
+                       operation_type: str, usage_shares: list | None = None) -> Dict[int, Dict[str, Any]]:
+        """Run one batch prompt; returns {item index: validated analysis}"""
+        built = prompt_builder.build_batch_prompt(items, role_kwargs)
+        batch_prompt = built.text
         start_time = time.time()
         
         try:
-            print(f"📊 Batch analyzing {len(transcripts_data)} transcripts in single API call...")
-            
-            response = self.model.generate_content(
-                batch_prompt,
-                generation_config={
-                    'temperature': 0.3,
-                    'response_mime_type': 'application/json'
-                }
-            )
-            
-            response_time = time.time() - start_time
-            print(f"✅ Batch analysis completed in {response_time:.2f}s")
-            
-            # Parse JSON array
-            analyses = json.loads(response.text)
-            
-            # Log token usage
+            with provider_guard.provider_call('gemini'):
+                response = self.model.generate_content(
+                    batch_prompt,
+                    generation_config={
+                        'temperature': 0.3,
+                        'response_mime_type': 'application/json'
+                    }
+                )
+        except provider_guard.ProviderUnavailable:
+            raise
+        except Exception as e:
             self._log_token_usage(
-                operation_type='analysis',
+                operation_type=operation_type,
                 prompt=batch_prompt,
-                response_text=response.text,
-                response_time=response_time,
+                response_text="",
+                response_time=time.time() - start_time,
                 interview_id=interview_id,
-                success=True,
-                response_obj=response
+                success=False,
+                error=str(e),
+                predicted_input_tokens=built.predicted_tokens,
+                usage_shares=usage_shares
             )
-            
-            # Ensure we got the right number of results
-            if len(analyses) != len(transcripts_data):
-                print(f"⚠️ Expected {len(transcripts_data)} results, got {len(analyses)}")
-                # Fall back to individual analysis if batch fails
-                return [
-                    self.analyze_transcript(
-                        d.get('transcript_text') or d.get('transcript', ''),
-                        d.get('question_text', ''),
-                        d.get('question_type', ''),
-                        role_name=role_name,
-                        role_code=role_code,
-                        role_context=role_context,
-                        question_competency=d.get('question_competency'),
-                        role_profile=role_profile,
-                        core_competencies=core_competencies,
-                    )
-                    for d in transcripts_data
-                ]
-            
-            return analyses
-            
+            print(f"❌ Batch analysis call failed: {e}")
+            return {}
+        
+        response_time = time.time() - start_time
+        results, error = self._salvage_batch_response(response.text, items)
+        print(f"✅ Batch call ({operation_type}) completed in {response_time:.2f}s: {len(results)}/{len(items)} valid")
+        self._log_token_usage(
+            operation_type=operation_type,
+            prompt=batch_prompt,
+            response_text=response.text,
+            response_time=response_time,
+            interview_id=interview_id,
+            success=bool(results),
+            error=error,
+            response_obj=response,
+            predicted_input_tokens=built.predicted_tokens,
+            usage_shares=usage_shares
+        )
+        return results
+    
+    async def abatch_analyze_transcripts(
+        self,
+        transcripts_data: list,
+        interview_id: int | None = None,
+        role_name: str | None = None,
+        role_code: str | None = None,
+        role_context: str | None = None,
+        role_profile: str | None = None,
+        core_competencies: str | None = None,
+    ) -> list:
+        """
+        Async variant of batch_analyze_transcripts
+        
+        Uses the pooled httpx client, so many interviews can be analyzed from one
+        event loop. Cancelling the awaiting task aborts the in-flight request.
+        """
+        role_kwargs = {
+            'role_name': role_name,
+            'role_code': role_code,
+            'role_context': role_context,
+            'role_profile': role_profile,
+            'core_competencies': core_competencies,
+        }
+        cache_keys = await sync_to_async(self._batch_cache_keys)(transcripts_data, role_kwargs)
+        results = await sync_to_async(analysis_cache.get_cached_analyses)(cache_keys)
+        pending = [index for index, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        fresh = await self._abatch_analyze_uncached(
+            [transcripts_data[index] for index in pending],
+            interview_id=interview_id,
+            role_kwargs=role_kwargs,
+        )
+        for index, analysis in zip(pending, fresh):
+            results[index] = analysis
+            await sync_to_async(analysis_cache.store_analysis)(cache_keys[index], analysis)
+        return results
+    
+    async def _abatch_analyze_uncached(self, transcripts_data: list, interview_id: int | None,
+                                       role_kwargs: dict) -> list:
+        """Async variant of _batch_analyze_uncached (same budget, salvage and retry rules)"""
+        groups = prompt_builder.split_batch(transcripts_data, role_kwargs)
+        group_results = await asyncio.gather(*[
+            self._arequest_batch([transcripts_data[index] for index in group], interview_id, role_kwargs, 'batch_analysis')
+            for group in groups
+        ])
+        results = {}
+        for group, matched in zip(groups, group_results):
+            for sub_index, analysis in matched.items():
+                results[group[sub_index]] = analysis
+        
+        missing = [index for index in range(len(transcripts_data)) if index not in results]
+        if missing:
+            missing_items = [transcripts_data[index] for index in missing]
+            for group in prompt_builder.split_batch(missing_items, role_kwargs):
+                retried = await self._arequest_batch(
+                    [missing_items[sub_index] for sub_index in group], interview_id, role_kwargs, 'batch_analysis_retry'
+                )
+                for position, analysis in retried.items():
+                    results[missing[group[position]]] = analysis
+            missing = [index for index in missing if index not in results]
+        
+        if missing:
+            print(f"❌ {len(missing)} item(s) still missing after retry. Falling back to individual analysis...")
+            individual = await sync_to_async(self._analyze_individually)(
+                [transcripts_data[index] for index in missing], **role_kwargs
+            )
+            for index, analysis in zip(missing, individual):
+                results[index] = analysis
+        
+        return [results[index] for index in range(len(transcripts_data))]
+    
+    async def _arequest_batch(self, items: list, interview_id: int | None, role_kwargs: dict,
+                              operation_type: str) -> Dict[int, Dict[str, Any]]:
+        built = prompt_builder.build_batch_prompt(items, role_kwargs)
+        batch_prompt = built.text
+        start_time = time.time()
+        
+        try:
+            async with provider_guard.aprovider_call('gemini'):
+                response = await self.get_async_client().generate_content(
+                    batch_prompt,
+                    generation_config={
+                        'temperature': 0.3,
+                        'response_mime_type': 'application/json'
+                    }
+                )
+        except provider_guard.ProviderUnavailable:
+            raise
         except Exception as e:
-            # Log failed batch analysis
-            response_time = time.time() - start_time
-            self._log_token_usage(
-                operation_type='analysis',
+            await sync_to_async(self._log_token_usage)(
+                operation_type=operation_type,
                 prompt=batch_prompt,
                 response_text="",
-                response_time=response_time,
+                response_time=time.time() - start_time,
                 interview_id=interview_id,
                 success=False,
-                error=str(e)
+                error=str(e),
+                predicted_input_tokens=built.predicted_tokens
             )
-            
-            print(f"❌ Batch analysis failed: {e}. Falling back to individual analysis...")
-            # Fallback: analyze individually
-            return [
-                self.analyze_transcript(
-                    d.get('transcript_text') or d.get('transcript', ''),
-                    d.get('question_text', ''),
-                    d.get('question_type', ''),
-                    role_name=role_name,
-                    role_code=role_code,
-                    role_context=role_context,
-                    question_competency=d.get('question_competency'),
-                    role_profile=role_profile,
-                    core_competencies=core_competencies,
+            print(f"❌ Async batch analysis call failed: {e}")
+            return {}
+        
+        response_time = time.time() - start_time
+        results, error = self._salvage_batch_response(response.text, items)
+        await sync_to_async(self._log_token_usage)(
+            operation_type=operation_type,
+            prompt=batch_prompt,
+            response_text=response.text,
+            response_time=response_time,
+            interview_id=interview_id,
+            success=bool(results),
+            error=error,
+            response_obj=response,
+            predicted_input_tokens=built.predicted_tokens
+        )
+        return results
+    
+    async def atranscribe_audio_file(self, audio_path: str, video_response_id: int = None) -> str:
+        """
+        Async transcription of a stored STT audio track
+        
+        The remote Gemini file is deleted even if the awaiting task is cancelled
+        """
+        from interviews.media_service import audio_mimetype
+        
+        start_time = time.time()
+        prompt = "Transcribe the spoken content from this audio. Return only the transcribed text."
+        
+        cache_key = await sync_to_async(transcript_cache.cache_key_for_file, thread_sensitive=False)(
+            audio_path, 'gemini', TRANSCRIPTION_MODEL, TRANSCRIPTION_OPTIONS
+        )
+        cached = await sync_to_async(transcript_cache.get_cached_transcript)(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            async with provider_guard.aprovider_call('gemini'):
+                response = await self.get_async_client().generate_from_file(
+                    prompt,
+                    audio_path,
+                    audio_mimetype(audio_path),
+                    generation_config=dict(TRANSCRIPTION_OPTIONS),
                 )
-                for d in transcripts_data
-            ]
+        except provider_guard.ProviderUnavailable:
+            raise
+        except Exception as e:
+            await sync_to_async(self._log_token_usage)(
+                operation_type='transcription',
+                prompt=prompt + " (stored audio)",
+                response_text="",
+                response_time=time.time() - start_time,
+                video_response_id=video_response_id,
+                success=False,
+                error=str(e)
+            )
+            raise Exception(f"Transcription failed: {str(e)}")
+        
+        transcript = response.text.strip()
+        await sync_to_async(self._log_token_usage)(
+            operation_type='transcription',
+            prompt=prompt + " (stored audio)",
+            response_text=transcript,
+            response_time=time.time() - start_time,
+            video_response_id=video_response_id,
+            success=True,
+            response_obj=response
+        )
+        await sync_to_async(transcript_cache.store_transcript)(cache_key, transcript)
+        return transcript
     
     def batch_transcribe_and_analyze(
         self,
@@ -678,6 +1039,7 @@ Return ONLY a JSON array with {len(transcripts_data)} objects, one for each resp
             video_responses_data: List of dicts with keys:
                 - video_id: ID of the video response
                 - video_file_path: Path to video file
+                - audio_path: Optional STT audio track stored at upload
                 - question_text: The interview question
                 - question_type: Type of question
             interview_id: Optional ID to link token usage
@@ -702,7 +1064,8 @@ Return ONLY a JSON array with {len(transcripts_data)} objects, one for each resp
                 video_id = data.get('video_id', 'unknown')
                 transcript = self.transcribe_video(
                     data['video_file_path'],
-                    video_response_id=video_id
+                    video_response_id=video_id,
+                    audio_path=data.get('audio_path'),
                 )
                 print(f"  ✓ Transcribed video {video_id}")
                 return {
@@ -794,6 +1157,8 @@ Return ONLY a JSON array with {len(transcripts_data)} objects, one for each resp
         """
         Analyze transcript for coaching feedback.
         Returns a dict with strengths, improvements, coaching_tips, etc.
+        Errors (including ProviderUnavailable) propagate so the training task
+        can retry them or store a failure instead of caching a placeholder.
         """
         import time
         start_time = time.time()
@@ -822,10 +1187,11 @@ Return ONLY a JSON array with {len(transcripts_data)} objects, one for each resp
         """
         
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config={'temperature': 0.7, 'response_mime_type': 'application/json'}
-            )
+            with provider_guard.provider_call('gemini'):
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config={'temperature': 0.7, 'response_mime_type': 'application/json'}
+                )
             
             result_text = response.text.strip()
             # Clean up markdown code blocks if present
@@ -849,21 +1215,17 @@ Return ONLY a JSON array with {len(transcripts_data)} objects, one for each resp
             
         except Exception as e:
             print(f"Coaching generation failed: {e}")
-            self._log_token_usage(
-                operation_type='coaching',
-                prompt=prompt,
-                response_text="",
-                response_time=time.time() - start_time,
-                success=False,
-                error=str(e)
-            )
-            return {
-                "strengths": ["Could not analyze"],
-                "improvements": ["Please try again"],
-                "coaching_tips": ["AI service temporarily unavailable"],
-                "example_phrasing": "",
-                "scores": {"clarity": 0, "confidence": 0, "relevance": 0}
-            }
+            # A call rejected by the breaker never reached Gemini
+            if not isinstance(e, provider_guard.ProviderUnavailable):
+                self._log_token_usage(
+                    operation_type='coaching',
+                    prompt=prompt,
+                    response_text="",
+                    response_time=time.time() - start_time,
+                    success=False,
+                    error=str(e)
+                )
+            raise
 
 
 # Singleton instance
@@ -0,0 +1,264 @@
+"""
+Cross-interview micro-batching of LLM analysis (opt-in)
+
+With ANALYSIS_MICROBATCH_ENABLED, interview tasks that complete at about the
+same time for the same PositionType (same role context) share one Gemini call
+instead of each paying the per-request overhead and the role preamble of the
+batch prompt.
+
+Coordination uses only atomic cache operations (add/incr), so it works across
+Celery worker processes on Redis:
+
+1. Each task stores its transcripts under a request id and appends a slot to
+   the group's sequence.
+2. Whoever acquires the group's leader lock waits up to
+   ANALYSIS_MICROBATCH_WINDOW_SECONDS (less once ANALYSIS_MICROBATCH_TOKEN_BUDGET
+   is reached). It then claims the pending slots in order and runs one
+   batch_analyze_transcripts call for all of them.
+3. The leader writes each request's slice of the results back under its
+   request id; the other tasks poll for it. Token usage of the shared call is
+   split into one row per interview, weighted by estimated tokens.
+
+Each request has one owner, decided by cache.add on its owner key: the leader
+when it claims the request, or the requester when it gives up. A task that
+gets no result within ANALYSIS_MICROBATCH_RESULT_TIMEOUT_SECONDS and still owns
+its request withdraws it, gets None back and analyzes its own interview; if a
+leader already claimed it, the task keeps waiting for that call (up to another
+timeout) so the same transcripts are not paid for twice. A slot that is still unwritten
+ANALYSIS_MICROBATCH_SLOT_GRACE_SECONDS after a leader first saw it missing (its
+writer failed or died between incr and set) is skipped so later slots are not
+blocked forever.
+"""
+
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from interviews import prompt_builder
+from interviews.ai_service import get_ai_service
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "analysis_microbatch"
+DEFAULT_WINDOW_SECONDS = 2.0
+DEFAULT_TOKEN_BUDGET = 24000
+DEFAULT_RESULT_TIMEOUT_SECONDS = 120
+DEFAULT_SLOT_GRACE_SECONDS = 5.0
+POLL_INTERVAL_SECONDS = 0.1
+# Rough per-item prompt overhead (response header, question, JSON object)
+ITEM_OVERHEAD_TOKENS = 120
+
+
+def is_enabled() -> bool:
+    return bool(getattr(settings, "ANALYSIS_MICROBATCH_ENABLED", False))
+
+
+def microbatch_group_key(position_type_id, role_kwargs: Dict[str, Any]) -> str:
+    """Interviews only share a call when the role preamble is identical"""
+    fingerprint = hashlib.sha256(
+        json.dumps(role_kwargs, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    return f"{position_type_id or 'none'}:{fingerprint}"
+
+
+def estimate_tokens(transcripts_data: List[Dict[str, Any]]) -> int:
+    return sum(
+        prompt_builder.count_tokens(prompt_builder.fit_transcript(item.get('transcript') or item.get('transcript_text') or ''))
+        + prompt_builder.count_tokens(item.get('question_text') or '')
+        for item in transcripts_data
+    ) + ITEM_OVERHEAD_TOKENS * len(transcripts_data)
+
+
+def _key(*parts) -> str:
+    return ":".join([KEY_PREFIX, *[str(part) for part in parts]])
+
+
+def _pending_tokens(group: str) -> int:
+    claimed = int(cache.get(_key(group, "claimed")) or 0)
+    end = int(cache.get(_key(group, "seq")) or 0)
+    if end <= claimed:
+        return 0
+    slots = cache.get_many([_key(group, "slot", slot) for slot in range(claimed + 1, end + 1)])
+    return sum(entry.get('tokens', 0) for entry in slots.values())
+
+
+def _missing_slot_expired(group: str, slot: int) -> bool:
+    """True once a slot has stayed unwritten for the grace period since it was first seen missing"""
+    grace = float(getattr(settings, "ANALYSIS_MICROBATCH_SLOT_GRACE_SECONDS", DEFAULT_SLOT_GRACE_SECONDS))
+    missing_key = _key(group, "missing", slot)
+    now = time.time()
+    cache.add(missing_key, now, timeout=int(grace) + 60)
+    first_seen = cache.get(missing_key)
+    if first_seen is None or now - first_seen < grace:
+        return False
+    cache.delete(missing_key)
+    return True
+
+
+def _take_ownership(request_id: str, owner: str, ttl: int) -> bool:
+    """Atomically decide who serves a request: the leader's batch or the requester itself"""
+    return bool(cache.add(_key("owner", request_id), owner, timeout=ttl))
+
+
+def _claim_pending(group: str, token_budget: int, ttl: int = DEFAULT_RESULT_TIMEOUT_SECONDS):
+    """
+    Claim pending slots in order, stopping at the budget or at a slot not yet
+    written (abandoned slots are skipped once their grace period has passed).
+    Returns ([(request_id, request, tokens)], total tokens).
+    """
+    claimed = int(cache.get(_key(group, "claimed")) or 0)
+    end = int(cache.get(_key(group, "seq")) or 0)
+    batch = []
+    tokens = 0
+    last = claimed
+    for slot in range(claimed + 1, end + 1):
+        entry = cache.get(_key(group, "slot", slot))
+        if entry is None:
+            if not _missing_slot_expired(group, slot):
+                break
+            logger.warning("Skipping abandoned micro-batch slot", extra={"group": group, "slot": slot})
+            last = slot
+            continue
+        if batch and tokens + entry['tokens'] > token_budget:
+            break
+        last = slot
+        cache.delete(_key(group, "slot", slot))
+        request = cache.get(_key("request", entry['request_id']))
+        if request is None or not _take_ownership(entry['request_id'], "leader", ttl):
+            # The requester gave up and analyzes on its own
+            continue
+        batch.append((entry['request_id'], request, entry['tokens']))
+        tokens += entry['tokens']
+    cache.set(_key(group, "claimed"), last, timeout=None)
+    return batch, tokens
+
+
+def _lead_batch(group: str, role_kwargs: Dict[str, Any], window_seconds: float, token_budget: int,
+                result_ttl: int) -> None:
+    window_end = time.monotonic() + window_seconds
+    while time.monotonic() < window_end and _pending_tokens(group) < token_budget:
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+    batch, tokens = _claim_pending(group, token_budget, result_ttl)
+    if not batch:
+        return
+
+    combined = [item for _, request, _ in batch for item in request['items']]
+    interview_ids = [request.get('interview_id') for _, request, _ in batch]
+    logger.info(
+        "Running micro-batched LLM analysis",
+        extra={
+            "stage": "llm_microbatch",
+            "group": group,
+            "interviews": len(batch),
+            "count": len(combined),
+            "estimated_tokens": tokens,
+        },
+    )
+    try:
+        analyses = get_ai_service().batch_analyze_transcripts(
+            combined,
+            interview_id=interview_ids[0] if len(batch) == 1 else None,
+            # One TokenUsage row per interview so per-interview cost stays complete
+            usage_shares=[(request.get('interview_id'), request_tokens) for _, request, request_tokens in batch]
+            if len(batch) > 1 else None,
+            **role_kwargs,
+        )
+        if len(analyses) != len(combined):
+            raise ValueError(f"Expected {len(combined)} analyses, got {len(analyses)}")
+    except Exception as exc:
+        logger.exception("Micro-batched analysis failed", extra={"group": group, "interviews": len(batch)})
+        for request_id, _, _ in batch:
+            cache.set(_key("result", request_id), {'error': str(exc)}, timeout=result_ttl)
+        return
+
+    offset = 0
+    for request_id, request, _ in batch:
+        count = len(request['items'])
+        cache.set(_key("result", request_id), {'analyses': analyses[offset:offset + count]}, timeout=result_ttl)
+        offset += count
+
+
+def analyze_in_microbatch(
+    transcripts_data: List[Dict[str, Any]],
+    group: str,
+    role_kwargs: Dict[str, Any],
+    interview_id: Optional[int] = None,
+    window_seconds: Optional[float] = None,
+    token_budget: Optional[int] = None,
+    result_timeout_seconds: Optional[float] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Analyze one interview's transcripts as part of a shared cross-interview call
+
+    Returns the analyses in input order, or None when the shared call failed or
+    timed out (callers then run their own batch_analyze_transcripts).
+    """
+    if window_seconds is None:
+        window_seconds = float(getattr(settings, "ANALYSIS_MICROBATCH_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS))
+    if token_budget is None:
+        token_budget = int(getattr(settings, "ANALYSIS_MICROBATCH_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+    if result_timeout_seconds is None:
+        result_timeout_seconds = float(
+            getattr(settings, "ANALYSIS_MICROBATCH_RESULT_TIMEOUT_SECONDS", DEFAULT_RESULT_TIMEOUT_SECONDS)
+        )
+    # Covers the extended wait for a request a leader has already claimed
+    ttl = int(window_seconds + 2 * result_timeout_seconds) + 60
+
+    request_id = uuid.uuid4().hex
+    request_key = _key("request", request_id)
+    result_key = _key("result", request_id)
+    leader_key = _key(group, "leader")
+    try:
+        cache.set(request_key, {'items': transcripts_data, 'interview_id': interview_id}, timeout=ttl)
+        cache.add(_key(group, "seq"), 0, timeout=None)
+        slot = cache.incr(_key(group, "seq"))
+        cache.set(
+            _key(group, "slot", slot),
+            {'request_id': request_id, 'tokens': estimate_tokens(transcripts_data)},
+            timeout=ttl,
+        )
+    except Exception:
+        logger.warning("Micro-batch enqueue failed", extra={"interview_id": interview_id, "group": group})
+        return None
+
+    deadline = time.monotonic() + result_timeout_seconds
+    extended = False
+    while True:
+        if time.monotonic() >= deadline:
+            if extended or _take_ownership(request_id, "requester", ttl):
+                break
+            # A leader claimed this request and its call is still running
+            logger.info(
+                "Micro-batch result pending in a claimed call; waiting longer",
+                extra={"interview_id": interview_id, "group": group},
+            )
+            deadline = time.monotonic() + result_timeout_seconds
+            extended = True
+        result = cache.get(result_key)
+        if result is not None:
+            cache.delete_many([result_key, request_key, _key("owner", request_id)])
+            if 'error' in result:
+                return None
+            return result['analyses']
+        if cache.add(leader_key, request_id, timeout=ttl):
+            try:
+                _lead_batch(group, role_kwargs, window_seconds, token_budget, ttl)
+            finally:
+                cache.delete(leader_key)
+            continue
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+    # Withdrawn: the owner key makes any later leader skip this request
+    cache.delete(request_key)
+    logger.warning(
+        "Micro-batch result timed out; analyzing interview on its own",
+        extra={"interview_id": interview_id, "group": group},
+    )
+    return None
@@ -0,0 +1,149 @@
+"""
+LLM analysis result cache
+
+Analyses are keyed by a SHA-256 of the prompt inputs (transcript, question,
+role context) plus the prompt name, prompt version and model. Retries after a
+crash, forced reprocessing and the per-item fallback of batch analysis reuse
+earlier scores instead of calling Gemini again.
+
+Entries live in the default cache (Redis in production) with a sliding TTL
+(ANALYSIS_CACHE_TTL_SECONDS); Redis' maxmemory LRU policy handles pressure.
+invalidate_analysis_cache() bumps a generation counter that is part of every
+key, so all earlier entries become unreachable at once and simply age out.
+Bump the prompt version constants in ai_service when a prompt changes.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "analysis_cache:v1"
+GENERATION_CACHE_KEY = "analysis_cache:generation"
+HITS_CACHE_KEY = "analysis_cache:hits"
+MISSES_CACHE_KEY = "analysis_cache:misses"
+STORES_CACHE_KEY = "analysis_cache:stores"
+DEFAULT_TTL_SECONDS = 14 * 24 * 3600
+
+
+def is_enabled() -> bool:
+    return bool(getattr(settings, "ANALYSIS_CACHE_ENABLED", True))
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "ANALYSIS_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+
+def _increment(key: str, delta: int = 1) -> None:
+    if delta <= 0:
+        return
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, delta)
+    except Exception:
+        logger.debug("Unable to increment cache counter %s", key)
+
+
+def _generation() -> int:
+    try:
+        return int(cache.get(GENERATION_CACHE_KEY) or 0)
+    except Exception:
+        return 0
+
+
+def prompt_fingerprint(inputs: Dict[str, Any]) -> str:
+    """Stable hash of the prompt inputs (key order and whitespace independent)"""
+    payload = json.dumps(inputs, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def analysis_cache_keys(prompt_name: str, prompt_version: str, model: str,
+                        inputs_list: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """One key per inputs dict; all None when caching is disabled"""
+    if not is_enabled():
+        return [None] * len(inputs_list)
+    generation = _generation()
+    return [
+        f"{KEY_PREFIX}:{generation}:{prompt_name}:{prompt_version}:{model}:{prompt_fingerprint(inputs)}"
+        for inputs in inputs_list
+    ]
+
+
+def analysis_cache_key(prompt_name: str, prompt_version: str, model: str, inputs: Dict[str, Any]) -> Optional[str]:
+    return analysis_cache_keys(prompt_name, prompt_version, model, [inputs])[0]
+
+
+def get_cached_analyses(keys: List[Optional[str]]) -> List[Optional[Dict[str, Any]]]:
+    """Cached analyses aligned with keys (None for misses); refreshes TTL on hits"""
+    lookup = [key for key in keys if key]
+    if not lookup:
+        return [None] * len(keys)
+    try:
+        found = cache.get_many(lookup)
+    except Exception:
+        logger.warning("Analysis cache read failed")
+        found = {}
+
+    ttl = _ttl_seconds()
+    for key in found:
+        try:
+            cache.touch(key, ttl)
+        except Exception:
+            pass
+    _increment(HITS_CACHE_KEY, len(found))
+    _increment(MISSES_CACHE_KEY, len(lookup) - len(found))
+    if found:
+        logger.info("Analysis cache hit", extra={"hits": len(found), "lookups": len(lookup)})
+    return [dict(found[key]) if key in found else None for key in keys]
+
+
+def get_cached_analysis(key: Optional[str]) -> Optional[Dict[str, Any]]:
+    return get_cached_analyses([key])[0]
+
+
+def store_analysis(key: Optional[str], analysis: Optional[Dict[str, Any]]) -> None:
+    """Store a successful analysis; fallback results carrying an 'error' are skipped"""
+    if not key or not isinstance(analysis, dict) or analysis.get('error'):
+        return
+    try:
+        cache.set(key, analysis, timeout=_ttl_seconds())
+        _increment(STORES_CACHE_KEY)
+    except Exception:
+        logger.warning("Analysis cache write failed")
+
+
+def invalidate_analysis_cache() -> int:
+    """Make every cached analysis unreachable (e.g. after a prompt or scoring change)"""
+    try:
+        cache.add(GENERATION_CACHE_KEY, 0, timeout=None)
+        generation = cache.incr(GENERATION_CACHE_KEY)
+    except Exception:
+        logger.exception("Analysis cache invalidation failed")
+        raise
+    logger.warning("Analysis cache invalidated", extra={"generation": generation})
+    return generation
+
+
+def get_analysis_cache_stats() -> Dict[str, Any]:
+    """Counters for the monitoring endpoints (cumulative)"""
+    try:
+        counters = cache.get_many([HITS_CACHE_KEY, MISSES_CACHE_KEY, STORES_CACHE_KEY])
+    except Exception:
+        counters = {}
+    hits = int(counters.get(HITS_CACHE_KEY) or 0)
+    misses = int(counters.get(MISSES_CACHE_KEY) or 0)
+    lookups = hits + misses
+    return {
+        "enabled": is_enabled(),
+        "hits": hits,
+        "misses": misses,
+        "stores": int(counters.get(STORES_CACHE_KEY) or 0),
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "generation": _generation(),
+        "ttl_seconds": _ttl_seconds(),
+    }
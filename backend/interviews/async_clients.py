@@ -0,0 +1,290 @@
+"""
+Asyncio-native HTTP clients for the AI providers (Gemini and Deepgram)
+
+The SDK-based services are synchronous and pin a worker thread for every
+in-flight call. These clients use one pooled httpx.AsyncClient per event loop,
+so a single process (async task runner, gevent/eventlet pool, ASGI) can
+multiplex many provider calls. They are reached through the existing
+singletons: get_ai_service().get_async_client() and
+get_deepgram_service().get_async_client().
+"""
+
+import asyncio
+import json
+import logging
+import os
+import weakref
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_CONNECTIONS = 20
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com"
+
+DEEPGRAM_API_BASE_URL = "https://api.deepgram.com"
+
+
+def _http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        float(getattr(settings, "PROVIDER_HTTP_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS)),
+        connect=float(getattr(settings, "PROVIDER_HTTP_CONNECT_TIMEOUT_SECONDS", DEFAULT_CONNECT_TIMEOUT_SECONDS)),
+    )
+
+
+def _http_limits() -> httpx.Limits:
+    max_connections = int(getattr(settings, "PROVIDER_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
+async def iter_file_chunks(path: str, chunk_size: int = UPLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Read a file in chunks off the event loop (bounded memory upload body)"""
+    handle = await asyncio.to_thread(open, path, 'rb')
+    try:
+        while True:
+            chunk = await asyncio.to_thread(handle.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await asyncio.to_thread(handle.close)
+
+
+async def iter_stream_chunks(stream, chunk_size: int = UPLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Yield chunks from an asyncio.StreamReader until EOF"""
+    while True:
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class LoopLocalClient:
+    """
+    Keeps one client per running event loop
+
+    httpx.AsyncClient connections belong to the loop that opened them, and
+    Celery tasks typically call asyncio.run() (a fresh loop) per task. Within a
+    loop the pooled client and its keep-alive connections are reused.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._clients = weakref.WeakKeyDictionary()
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._factory()
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+class _BaseAsyncProviderClient:
+    base_url = ""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self._default_headers(),
+            timeout=_http_timeout(),
+            limits=_http_limits(),
+            transport=transport,
+        )
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {}
+
+    @property
+    def is_closed(self) -> bool:
+        return self._http.is_closed
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Gemini
+# ---------------------------------------------------------------------------
+
+@dataclass
+class GeminiResponse:
+    """Mirrors the attributes the services read from SDK responses"""
+
+    text: str
+    usage_metadata: Any = None
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, payload: Dict[str, Any]) -> "GeminiResponse":
+        candidates = payload.get('candidates') or []
+        if not candidates:
+            feedback = payload.get('promptFeedback') or {}
+            raise ValueError(f"Gemini returned no candidates: {feedback.get('blockReason', 'unknown reason')}")
+        parts = (candidates[0].get('content') or {}).get('parts') or []
+        text = "".join(part.get('text', '') for part in parts)
+        usage = payload.get('usageMetadata') or {}
+        usage_metadata = SimpleNamespace(
+            prompt_token_count=usage.get('promptTokenCount', 0),
+            candidates_token_count=usage.get('candidatesTokenCount', 0),
+            total_token_count=usage.get('totalTokenCount', 0),
+        )
+        return cls(text=text, usage_metadata=usage_metadata, raw=payload)
+
+
+class AsyncGeminiClient(_BaseAsyncProviderClient):
+    """Gemini REST API (generateContent + Files API) over httpx"""
+
+    def __init__(self, api_key: str, model_name: str = 'gemini-2.5-flash',
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.base_url = getattr(settings, "GEMINI_API_BASE_URL", "") or GEMINI_API_BASE_URL
+        super().__init__(transport=transport)
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {'x-goog-api-key': self.api_key}
+
+    async def generate_content(self, parts: Iterable[Any], generation_config: Optional[Dict] = None) -> GeminiResponse:
+        """parts: strings and/or uploaded file dicts returned by upload_file()"""
+        if isinstance(parts, str):
+            parts = [parts]
+        content_parts = []
+        for part in parts:
+            if isinstance(part, str):
+                content_parts.append({'text': part})
+            else:
+                content_parts.append({'file_data': {'mime_type': part['mimeType'], 'file_uri': part['uri']}})
+        body: Dict[str, Any] = {'contents': [{'role': 'user', 'parts': content_parts}]}
+        if generation_config:
+            body['generationConfig'] = {
+                'temperature': generation_config.get('temperature'),
+                'responseMimeType': generation_config.get('response_mime_type'),
+            }
+            body['generationConfig'] = {k: v for k, v in body['generationConfig'].items() if v is not None}
+        response = await self._http.post(f"/v1beta/models/{self.model_name}:generateContent", json=body)
+        response.raise_for_status()
+        return GeminiResponse.from_json(response.json())
+
+    async def upload_file(self, path: str, mime_type: str, display_name: Optional[str] = None) -> Dict[str, Any]:
+        """Resumable upload (start + upload/finalize); the body is streamed from disk"""
+        size = os.path.getsize(path)
+        start = await self._http.post(
+            "/upload/v1beta/files",
+            headers={
+                'X-Goog-Upload-Protocol': 'resumable',
+                'X-Goog-Upload-Command': 'start',
+                'X-Goog-Upload-Header-Content-Length': str(size),
+                'X-Goog-Upload-Header-Content-Type': mime_type,
+            },
+            json={'file': {'display_name': display_name or os.path.basename(path)}},
+        )
+        start.raise_for_status()
+        upload_url = start.headers.get('x-goog-upload-url')
+        if not upload_url:
+            raise ValueError("Gemini did not return an upload URL")
+        response = await self._http.post(
+            upload_url,
+            headers={
+                'Content-Length': str(size),
+                'X-Goog-Upload-Offset': '0',
+                'X-Goog-Upload-Command': 'upload, finalize',
+            },
+            content=iter_file_chunks(path),
+        )
+        response.raise_for_status()
+        return response.json()['file']
+
+    async def get_file(self, name: str) -> Dict[str, Any]:
+        response = await self._http.get(f"/v1beta/{name}")
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_file(self, name: str) -> None:
+        response = await self._http.delete(f"/v1beta/{name}")
+        if response.status_code not in (200, 204, 404):
+            response.raise_for_status()
+
+    async def wait_for_file(self, file_info: Dict[str, Any], max_wait_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Poll until the file leaves PROCESSING, backing off between checks (same settings as the sync path)"""
+        from interviews.gemini_uploads import poll_settings
+
+        interval, max_interval, default_max_wait = poll_settings()
+        if max_wait_seconds is None:
+            max_wait_seconds = default_max_wait
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait_seconds
+        while file_info.get('state') == 'PROCESSING':
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise TimeoutError("Gemini file processing timeout")
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+            file_info = await self.get_file(file_info['name'])
+        if file_info.get('state') == 'FAILED':
+            raise ValueError("Gemini rejected file (possibly unsupported format)")
+        return file_info
+
+    async def generate_from_file(self, prompt: str, path: str, mime_type: str,
+                                 generation_config: Optional[Dict] = None) -> GeminiResponse:
+        """Upload, wait, generate and always delete the remote file (also on cancel)"""
+        file_info = await self.upload_file(path, mime_type)
+        try:
+            file_info = await self.wait_for_file(file_info)
+            return await self.generate_content([prompt, file_info], generation_config=generation_config)
+        finally:
+            try:
+                await asyncio.shield(self.delete_file(file_info['name']))
+            except Exception:
+                logger.warning("Failed to delete Gemini file %s", file_info.get('name'))
+
+
+# ---------------------------------------------------------------------------
+# Deepgram
+# ---------------------------------------------------------------------------
+
+class AsyncDeepgramClient(_BaseAsyncProviderClient):
+    """Deepgram pre-recorded transcription (POST /v1/listen) over httpx"""
+
+    def __init__(self, api_key: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.api_key = api_key
+        self.base_url = (getattr(settings, "DEEPGRAM_API_URL", "") or DEEPGRAM_API_BASE_URL).rstrip('/')
+        if not self.base_url.startswith(('http://', 'https://')):
+            self.base_url = f"https://{self.base_url}"
+        super().__init__(transport=transport)
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {'Authorization': f"Token {self.api_key}"}
+
+    async def transcribe(self, body, mimetype: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """body: bytes or an async iterator of chunks (sent with chunked encoding)"""
+        params = {key: json.dumps(value) if isinstance(value, bool) else value for key, value in options.items()}
+        response = await self._http.post(
+            "/v1/listen",
+            params=params,
+            headers={'Content-Type': mimetype},
+            content=body,
+        )
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,220 @@
+"""
+Vectorized rescoring of stored InterviewResults
+
+Used after ROLE_PROFILES weights or the SystemSettings passing threshold
+change. It recomputes final_score for many interviews at once, without going
+through calculate_interview_score one interview at a time.
+
+1. One grouped query loads the per-(interview, competency) score sums and
+   counts, together with each interview's role code and current result.
+2. These become interviews x competencies NumPy arrays. Averages are weighted
+   by each interview's role-profile row of the weight matrix in one pass.
+   This gives the same numbers as scoring.compute_competency_scores: weights
+   are renormalized over the competencies an interview actually has, and
+   equal weights are used when the profile gives them none.
+3. Changed results are written back with bulk_update (final_score, passed)
+   and their review-queue entries are re-synced.
+
+Applicant statuses and HR decisions are left alone.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.db.models import Count, FloatField, Q, Sum
+from django.db.models.functions import Coalesce
+
+from interviews.scoring import DEFAULT_COMPETENCY, ROLE_PROFILES, get_role_profile
+
+DEFAULT_TOLERANCE = 1e-6
+DEFAULT_WRITE_BATCH_SIZE = 500
+
+
+@dataclass
+class ScoreChange:
+    result_id: int
+    interview_id: int
+    role_code: str
+    old_score: float
+    new_score: float
+    old_passed: bool
+    new_passed: bool
+
+
+@dataclass
+class RescoreReport:
+    interviews: int = 0
+    changed: int = 0
+    pass_flips: int = 0
+    written: int = 0
+    load_seconds: float = 0.0
+    compute_seconds: float = 0.0
+    write_seconds: float = 0.0
+    changes: List[ScoreChange] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.load_seconds + self.compute_seconds + self.write_seconds
+
+    @property
+    def interviews_per_second(self) -> float:
+        return self.interviews / self.total_seconds if self.total_seconds else 0.0
+
+
+@dataclass
+class CompetencyMatrix:
+    """Per-interview competency sums/counts aligned on interview_ids x competencies"""
+    interview_ids: np.ndarray
+    result_ids: np.ndarray
+    role_codes: List[str]
+    competencies: List[str]
+    sums: np.ndarray
+    counts: np.ndarray
+    old_scores: np.ndarray
+    old_passed: np.ndarray
+
+
+def load_competency_matrix(role_code: Optional[str] = None, interview_ids=None) -> CompetencyMatrix:
+    """One grouped query over VideoResponse for every interview that has an InterviewResult"""
+    from interviews.models import VideoResponse
+
+    queryset = VideoResponse.objects.filter(interview__result__isnull=False)
+    if role_code:
+        queryset = queryset.filter(interview__position_type__code=role_code)
+    if interview_ids is not None:
+        queryset = queryset.filter(interview_id__in=interview_ids)
+    rows = list(
+        queryset.values(
+            'interview_id',
+            'interview__position_type__code',
+            'interview__result__id',
+            'interview__result__final_score',
+            'interview__result__passed',
+            'question__competency',
+        )
+        .annotate(
+            total=Sum(Coalesce('hr_override_score', 'ai_score', output_field=FloatField())),
+            scored=Count('id', filter=Q(hr_override_score__isnull=False) | Q(ai_score__isnull=False)),
+        )
+        .order_by('interview_id')
+    )
+
+    interview_index: Dict[int, int] = {}
+    competency_index: Dict[str, int] = {}
+    for row in rows:
+        interview_index.setdefault(row['interview_id'], len(interview_index))
+        competency_index.setdefault(row['question__competency'] or DEFAULT_COMPETENCY, len(competency_index))
+
+    n, c = len(interview_index), len(competency_index)
+    sums = np.zeros((n, c))
+    counts = np.zeros((n, c))
+    result_ids = np.zeros(n, dtype=np.int64)
+    old_scores = np.zeros(n)
+    old_passed = np.zeros(n, dtype=bool)
+    role_codes = [''] * n
+    for row in rows:
+        i = interview_index[row['interview_id']]
+        j = competency_index[row['question__competency'] or DEFAULT_COMPETENCY]
+        sums[i, j] += row['total'] or 0.0
+        counts[i, j] += row['scored']
+        result_ids[i] = row['interview__result__id']
+        old_scores[i] = row['interview__result__final_score'] or 0.0
+        old_passed[i] = bool(row['interview__result__passed'])
+        role_codes[i] = row['interview__position_type__code'] or ''
+
+    return CompetencyMatrix(
+        interview_ids=np.fromiter(interview_index.keys(), dtype=np.int64, count=n),
+        result_ids=result_ids,
+        role_codes=role_codes,
+        competencies=list(competency_index.keys()),
+        sums=sums,
+        counts=counts,
+        old_scores=old_scores,
+        old_passed=old_passed,
+    )
+
+
+def weight_matrix(role_codes: List[str], competencies: List[str], profiles=None) -> np.ndarray:
+    """interviews x competencies base weights; unknown profiles weigh every competency 1.0"""
+    profiles = ROLE_PROFILES if profiles is None else profiles
+    profile_names = sorted(profiles)
+    table = np.ones((len(profile_names) + 1, len(competencies)))
+    for row, name in enumerate(profile_names):
+        table[row] = [float(profiles[name].get(competency, 0.0)) for competency in competencies]
+    row_for_profile = {name: row for row, name in enumerate(profile_names)}
+    unknown = len(profile_names)
+    rows = np.fromiter(
+        (row_for_profile.get(get_role_profile(code), unknown) for code in role_codes),
+        dtype=np.int64,
+        count=len(role_codes),
+    )
+    return table[rows]
+
+
+def compute_scores(matrix: CompetencyMatrix, profiles=None) -> np.ndarray:
+    """Final weighted score per interview (0 when every answer had a technical issue)"""
+    present = matrix.counts > 0
+    averages = np.divide(matrix.sums, matrix.counts, out=np.zeros_like(matrix.sums), where=present)
+    weights = weight_matrix(matrix.role_codes, matrix.competencies, profiles) * present
+    # A profile giving none of the interview's competencies any weight falls back to equal weights
+    no_weight = weights.sum(axis=1) <= 0
+    weights[no_weight] = present[no_weight]
+    totals = weights.sum(axis=1)
+    return np.divide((averages * weights).sum(axis=1), totals, out=np.zeros(len(totals)), where=totals > 0)
+
+
+def rescore_results(
+    passing_threshold: float,
+    role_code: Optional[str] = None,
+    interview_ids=None,
+    profiles=None,
+    dry_run: bool = False,
+    tolerance: float = DEFAULT_TOLERANCE,
+    batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+) -> RescoreReport:
+    from django.db import transaction
+    from results.models import InterviewResult
+    from results.review_queue import sync_review_queue
+
+    report = RescoreReport()
+    started = time.perf_counter()
+    matrix = load_competency_matrix(role_code=role_code, interview_ids=interview_ids)
+    report.load_seconds = time.perf_counter() - started
+    report.interviews = len(matrix.interview_ids)
+
+    started = time.perf_counter()
+    new_scores = compute_scores(matrix, profiles)
+    new_passed = new_scores >= passing_threshold
+    changed = (np.abs(new_scores - matrix.old_scores) > tolerance) | (new_passed != matrix.old_passed)
+    report.compute_seconds = time.perf_counter() - started
+
+    indexes = np.flatnonzero(changed)
+    report.changed = len(indexes)
+    report.pass_flips = int((new_passed[indexes] != matrix.old_passed[indexes]).sum())
+    report.changes = [
+        ScoreChange(
+            result_id=int(matrix.result_ids[i]),
+            interview_id=int(matrix.interview_ids[i]),
+            role_code=matrix.role_codes[i],
+            old_score=float(matrix.old_scores[i]),
+            new_score=float(new_scores[i]),
+            old_passed=bool(matrix.old_passed[i]),
+            new_passed=bool(new_passed[i]),
+        )
+        for i in indexes
+    ]
+    if dry_run or not report.changes:
+        return report
+
+    started = time.perf_counter()
+    results = [
+        InterviewResult(id=change.result_id, final_score=change.new_score, passed=change.new_passed)
+        for change in report.changes
+    ]
+    with transaction.atomic():
+        report.written = InterviewResult.objects.bulk_update(results, ['final_score', 'passed'], batch_size=batch_size)
+        sync_review_queue([change.result_id for change in report.changes], batch_size=batch_size)
+    report.write_seconds = time.perf_counter() - started
+    return report
@@ -2,19 +2,42 @@
 Deepgram Speech-to-Text Service for Interview Video Transcription
 
 This service handles:
-1. Audio extraction from video files
+1. Audio extraction from video files (streamed from ffmpeg, no temp files)
 2. Transcription using Deepgram API
 3. Token/cost tracking
 """
 
-import os
+import asyncio
 import time
-import tempfile
 from typing import Dict, Any
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from deepgram import DeepgramClient, PrerecordedOptions, FileSource
+from deepgram import DeepgramClient, DeepgramClientOptions, PrerecordedOptions, PrerecordedResponse, FileSource
+
+from interviews import provider_guard, transcript_cache
+from interviews.async_clients import AsyncDeepgramClient, LoopLocalClient, iter_file_chunks, iter_stream_chunks
+from interviews.media_service import STT_AUDIO_FORMATS, STT_CHANNELS, STT_SAMPLE_RATE, audio_mimetype
 
 MAX_ANSWER_SECONDS = 120
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Shared by the SDK (sync) and httpx (async) paths
+TRANSCRIBE_OPTIONS = {
+    'model': "nova-2",              # Latest model
+    'smart_format': True,           # Automatic punctuation and formatting
+    'language': "en",               # English
+    'diarize': False,               # Single speaker (applicant)
+    'punctuate': True,              # Add punctuation
+}
+
+
+def _iter_chunks(stream, chunk_size: int = STREAM_CHUNK_BYTES):
+    """Yield fixed-size chunks from a binary stream until EOF"""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
 
 
 class DeepgramTranscriptionService:
@@ -26,16 +49,25 @@ class DeepgramTranscriptionService:
         if not api_key:
             raise ValueError("DEEPGRAM_API_KEY not configured in settings")
         
-        self.client = DeepgramClient(api_key)
+        api_url = getattr(settings, "DEEPGRAM_API_URL", "")
+        if api_url:
+            self.client = DeepgramClient(api_key, DeepgramClientOptions(url=api_url))
+        else:
+            self.client = DeepgramClient(api_key)
+        # Pooled httpx client per event loop for the async methods
+        self._async_clients = LoopLocalClient(lambda: AsyncDeepgramClient(api_key))
         print("✓ Deepgram client initialized")
     
-    def transcribe_video(self, video_file_path: str, video_response_id: int = None) -> Dict[str, Any]:
+    def transcribe_video(self, video_file_path: str, video_response_id: int = None,
+                         audio_path: str = None) -> Dict[str, Any]:
         """
         Extract audio from video and transcribe using Deepgram
         
         Args:
             video_file_path: Path to video file
             video_response_id: Optional ID for logging
+            audio_path: Optional pre-extracted STT audio track (see media_service);
+                streamed from disk instead of re-encoding the video
             
         Returns:
             Dict with:
@@ -46,16 +78,25 @@ class DeepgramTranscriptionService:
                 - processing_time: Time taken to process
         """
         start_time = time.time()
-        audio_path = None
+        
+        # Same audio + model + options -> reuse the stored transcript
+        cache_key = self._transcript_cache_key(video_file_path, audio_path)
+        cached = transcript_cache.get_cached_transcript(cache_key)
+        if cached is not None:
+            print(f"♻️ Reusing cached Deepgram transcript for video {video_response_id}")
+            return {**cached, 'processing_time': time.time() - start_time, 'cached': True}
         
         try:
             print(f"\n🎤 Starting Deepgram transcription for video {video_response_id}...")
             
-            # Step 1: Extract audio from video
-            audio_path = self._extract_audio(video_file_path)
-            
-            # Step 2: Transcribe audio with Deepgram
-            result = self._transcribe_audio(audio_path)
+            # Stream the stored audio track, or pipe ffmpeg's output straight
+            # into the request body; nothing is buffered in memory or /tmp.
+            # The guard is entered first so an open circuit never starts ffmpeg.
+            with provider_guard.provider_call('deepgram'):
+                if audio_path:
+                    result = self._transcribe_audio(audio_path)
+                else:
+                    result = self._transcribe_video_stream(video_file_path)
             
             processing_time = time.time() - start_time
             
@@ -75,8 +116,11 @@ class DeepgramTranscriptionService:
                 processing_time=processing_time
             )
             
+            transcript_cache.store_transcript(cache_key, transcript_data)
             return transcript_data
             
+        except provider_guard.ProviderUnavailable:
+            raise
         except Exception as e:
             processing_time = time.time() - start_time
             print(f"❌ Deepgram transcription failed: {e}")
@@ -92,76 +136,196 @@ class DeepgramTranscriptionService:
             )
             
             raise Exception(f"Transcription failed: {str(e)}")
-            
-        finally:
-            # Clean up temp audio file
-            if audio_path and os.path.exists(audio_path):
-                try:
-                    os.unlink(audio_path)
-                    print(f"🗑️ Cleaned up temp audio file")
-                except Exception as cleanup_error:
-                    print(f"⚠️ Failed to clean up temp file: {cleanup_error}")
     
-    def _extract_audio(self, video_file_path: str) -> str:
+    def _transcript_cache_key(self, video_file_path: str, audio_path: str = None):
+        """Content-addressed key for the audio actually sent to Deepgram"""
+        return transcript_cache.cache_key_for_file(
+            audio_path or video_file_path,
+            provider='deepgram',
+            model=TRANSCRIBE_OPTIONS['model'],
+            options=TRANSCRIBE_OPTIONS,
+        )
+    
+    def get_async_client(self) -> AsyncDeepgramClient:
+        """Async Deepgram client bound to the running event loop (connections are reused)"""
+        return self._async_clients.get()
+    
+    async def atranscribe_video(self, video_file_path: str, video_response_id: int = None,
+                                audio_path: str = None) -> Dict[str, Any]:
         """
-        Extract audio from video file using ffmpeg
+        Async variant of transcribe_video (same return shape)
         
-        Returns path to temporary audio file
+        Audio is streamed from disk or from an ffmpeg subprocess without blocking
+        the event loop; cancelling the awaiting task aborts the upload and kills
+        ffmpeg.
         """
+        start_time = time.time()
+        
+        cache_key = await sync_to_async(self._transcript_cache_key, thread_sensitive=False)(video_file_path, audio_path)
+        cached = await sync_to_async(transcript_cache.get_cached_transcript)(cache_key)
+        if cached is not None:
+            return {**cached, 'processing_time': time.time() - start_time, 'cached': True}
+        
+        try:
+            async with provider_guard.aprovider_call('deepgram'):
+                if audio_path:
+                    payload = await self._atranscribe_audio(audio_path)
+                else:
+                    payload = await self._atranscribe_video_stream(video_file_path)
+            
+            processing_time = time.time() - start_time
+            transcript_data = self._parse_deepgram_response(PrerecordedResponse.from_dict(payload), processing_time)
+            
+            await sync_to_async(self._log_usage)(
+                video_response_id=video_response_id,
+                transcript=transcript_data['transcript'],
+                duration=transcript_data['duration'],
+                processing_time=processing_time
+            )
+            await sync_to_async(transcript_cache.store_transcript)(cache_key, transcript_data)
+            return transcript_data
+        
+        except provider_guard.ProviderUnavailable:
+            raise
+        except Exception as e:
+            processing_time = time.time() - start_time
+            print(f"❌ Deepgram transcription failed: {e}")
+            await sync_to_async(self._log_usage)(
+                video_response_id=video_response_id,
+                transcript="",
+                duration=0,
+                processing_time=processing_time,
+                success=False,
+                error=str(e)
+            )
+            raise Exception(f"Transcription failed: {str(e)}")
+    
+    async def _atranscribe_audio(self, audio_path: str) -> Dict[str, Any]:
+        return await self.get_async_client().transcribe(
+            iter_file_chunks(audio_path, STREAM_CHUNK_BYTES),
+            audio_mimetype(audio_path),
+            TRANSCRIBE_OPTIONS,
+        )
+    
+    async def _atranscribe_video_stream(self, video_file_path: str) -> Dict[str, Any]:
         import ffmpeg
         
-        print(f"🎵 Extracting audio from video...")
+        args = ffmpeg.compile(self._audio_stream_spec(video_file_path))
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            payload = await self.get_async_client().transcribe(
+                iter_stream_chunks(process.stdout, STREAM_CHUNK_BYTES),
+                STT_AUDIO_FORMATS['opus']['mimetype'],
+                TRANSCRIBE_OPTIONS,
+            )
+        except BaseException:
+            # Also on cancellation: never leave ffmpeg running
+            if process.returncode is None:
+                process.kill()
+            await asyncio.shield(process.wait())
+            raise
         
-        # Create temp file for audio
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_audio:
-            audio_path = temp_audio.name
+        stderr = await process.stderr.read()
+        return_code = await process.wait()
+        if return_code != 0:
+            message = stderr.decode(errors='replace').strip() if stderr else 'Unknown error'
+            raise Exception(f"Failed to extract audio: {message}")
+        return payload
+    
+    def _audio_stream_spec(self, video_file_path: str):
+        """ffmpeg spec encoding the video's speech track to stdout as Ogg/Opus"""
+        import ffmpeg
+        
+        stream = ffmpeg.input(video_file_path)
+        stream = ffmpeg.output(
+            stream,
+            'pipe:1',
+            format='ogg',
+            vn=None,
+            ar=STT_SAMPLE_RATE,
+            ac=STT_CHANNELS,
+            t=MAX_ANSWER_SECONDS,
+            **STT_AUDIO_FORMATS['opus']['output_options'],
+        )
+        # Keep stderr small so an unread pipe can never block ffmpeg
+        return stream.global_args('-loglevel', 'error', '-nostdin')
+    
+    def _open_audio_stream(self, video_file_path: str):
+        """
+        Start ffmpeg encoding the video's speech track to stdout
         
+        Returns the running process; its stdout is an Ogg/Opus stream
+        (16kHz mono, capped at MAX_ANSWER_SECONDS)
+        """
+        print(f"🎵 Streaming audio from video...")
+        return self._audio_stream_spec(video_file_path).run_async(pipe_stdout=True, pipe_stderr=True)
+    
+    def _transcribe_video_stream(self, video_file_path: str) -> Any:
+        """
+        Transcribe a video by piping ffmpeg's stdout into the Deepgram upload
+        
+        Peak memory is one HTTP chunk regardless of clip length
+        """
+        process = self._open_audio_stream(video_file_path)
         try:
-            # Extract audio using ffmpeg (mp3 format, 44.1kHz, stereo)
-            stream = ffmpeg.input(video_file_path)
-            stream = ffmpeg.output(stream, audio_path,
-                                 acodec='libmp3lame', 
-                                 ar='44100',  # Sample rate
-                                 ac=2,        # Stereo
-                                 ab='128k',
-                                 t=MAX_ANSWER_SECONDS)   # Bitrate + hard cap
-            ffmpeg.run(stream, capture_stdout=True, capture_stderr=True, overwrite_output=True)
-            
-            print(f"✓ Audio extracted: {audio_path}")
-            return audio_path
-            
-        except ffmpeg.Error as e:
-            stderr = e.stderr.decode() if e.stderr else 'Unknown error'
-            raise Exception(f"Failed to extract audio: {stderr}")
+            # A generator (not the pipe object) so httpx uses chunked encoding
+            # instead of trusting the pipe's fstat size as Content-Length
+            response = self._transcribe_stream(
+                _iter_chunks(process.stdout),
+                STT_AUDIO_FORMATS['opus']['mimetype'],
+            )
+        except Exception:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            process.stdout.close()
+        
+        stderr = process.stderr.read() if process.stderr else b''
+        return_code = process.wait()
+        if process.stderr:
+            process.stderr.close()
+        if return_code != 0:
+            message = stderr.decode(errors='replace').strip() if stderr else 'Unknown error'
+            raise Exception(f"Failed to extract audio: {message}")
+        return response
     
     def _transcribe_audio(self, audio_path: str) -> Any:
         """
         Transcribe audio file using Deepgram API
         
+        The file is streamed in chunks rather than read into memory
+        
+        Returns Deepgram response object
+        """
+        with open(audio_path, 'rb') as audio_file:
+            return self._transcribe_stream(audio_file, audio_mimetype(audio_path))
+    
+    def _transcribe_stream(self, audio_stream, mimetype: str) -> Any:
+        """
+        Send a file-like audio source to Deepgram as a chunked upload
+        
         Returns Deepgram response object
         """
         print(f"🎯 Transcribing audio with Deepgram...")
         
-        # Read audio file
-        with open(audio_path, 'rb') as audio_file:
-            audio_bytes = audio_file.read()
-
         # Configure Deepgram options (use simple kwargs to avoid typing.Union instantiation issues)
-        options = PrerecordedOptions(
-            model="nova-2",              # Latest model
-            smart_format=True,           # Automatic punctuation and formatting
-            language="en",               # English
-            diarize=False,               # Single speaker (applicant)
-            punctuate=True,              # Add punctuation
-        )
+        options = PrerecordedOptions(**TRANSCRIBE_OPTIONS)
 
-        # Create file source as a plain dict per SDK examples
-        source: FileSource = {"buffer": audio_bytes, "mimetype": "audio/mp3"}
+        # Stream source (file object or chunk iterator): httpx uploads it
+        # incrementally instead of holding the whole clip in memory
+        source: FileSource = {"stream": audio_stream}
 
         # Transcribe
         response = self.client.listen.rest.v("1").transcribe_file(
             source=source,
             options=options,
+            headers={"Content-Type": mimetype},
         )
         
         return response
@@ -211,13 +375,13 @@ class DeepgramTranscriptionService:
         Note: Deepgram charges by audio duration, not tokens
         """
         try:
-            from monitoring.models import TokenUsage
+            from monitoring import usage_buffer
             
             # Estimate pseudo-token count based on words
             word_count = len(transcript.split()) if transcript else 0
 
-            # Log to monitoring system using existing TokenUsage fields
-            TokenUsage.objects.create(
+            # Log to monitoring system using existing TokenUsage fields (buffered, bulk-written)
+            usage_buffer.record_usage(
                 operation_type='transcription',  # reuse existing type bucket
                 video_response_id=video_response_id,
                 input_tokens=0,
@@ -0,0 +1,203 @@
+"""
+Gemini File API upload manager
+
+Used by AIAnalysisService's blocking transcription paths:
+
+- Processing is polled with exponential backoff, starting at
+  GEMINI_UPLOAD_POLL_INITIAL_SECONDS and doubling up to
+  GEMINI_UPLOAD_POLL_MAX_SECONDS, within GEMINI_UPLOAD_MAX_WAIT_SECONDS. The old
+  loops polled every 0.5s.
+- ACTIVE file handles are cached per process, keyed by the SHA-256 of the file
+  contents, for GEMINI_UPLOAD_CACHE_TTL_SECONDS. A transcription that failed
+  after the upload (generate error, retried task) reuses the remote file
+  instead of uploading it again.
+- Remote files are deleted on a background thread once released, failed,
+  expired or evicted, and at interpreter exit. The worker doesn't wait for the
+  delete round-trip.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import google.generativeai as genai
+from django.conf import settings
+
+from interviews.transcript_cache import audio_fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INITIAL_SECONDS = 0.5
+DEFAULT_POLL_MAX_SECONDS = 4.0
+DEFAULT_MAX_WAIT_SECONDS = 30.0
+DEFAULT_CACHE_TTL_SECONDS = 15 * 60
+DEFAULT_CACHE_MAX_ENTRIES = 32
+
+
+def _setting(name: str, default):
+    return type(default)(getattr(settings, name, default))
+
+
+def poll_settings():
+    """(initial interval, max interval, max wait) for polling a file out of PROCESSING"""
+    return (
+        _setting("GEMINI_UPLOAD_POLL_INITIAL_SECONDS", DEFAULT_POLL_INITIAL_SECONDS),
+        _setting("GEMINI_UPLOAD_POLL_MAX_SECONDS", DEFAULT_POLL_MAX_SECONDS),
+        _setting("GEMINI_UPLOAD_MAX_WAIT_SECONDS", DEFAULT_MAX_WAIT_SECONDS),
+    )
+
+
+@dataclass
+class _CachedUpload:
+    remote: Any
+    expires_at: float
+
+
+class GeminiUploadManager:
+    """Uploads local files to Gemini once per process and cleans them up off the hot path"""
+
+    def __init__(self, client=genai):
+        self._client = client
+        self._entries: "OrderedDict[str, _CachedUpload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {'uploads': 0, 'reused': 0, 'polls': 0, 'deleted': 0}
+
+    # -- public API ---------------------------------------------------------
+
+    def upload(self, path: str, mime_type: Optional[str] = None):
+        """Return an ACTIVE remote file for path, uploading only when not cached"""
+        digest = audio_fingerprint(path)
+        remote = self._get(digest)
+        if remote is not None:
+            self._stats['reused'] += 1
+            logger.info("Reusing Gemini upload", extra={"file_name": remote.name})
+            return remote
+
+        remote = self._client.upload_file(path=path, mime_type=mime_type)
+        self._stats['uploads'] += 1
+        try:
+            remote = self.wait_until_active(remote)
+        except Exception:
+            self.delete_later(remote.name)
+            raise
+        self._put(digest, remote)
+        return remote
+
+    def wait_until_active(self, remote, max_wait_seconds: Optional[float] = None):
+        """Poll until the file leaves PROCESSING, backing off between checks"""
+        interval, max_interval, default_max_wait = poll_settings()
+        if max_wait_seconds is None:
+            max_wait_seconds = default_max_wait
+        deadline = time.monotonic() + max_wait_seconds
+        while remote.state.name == "PROCESSING":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Gemini file processing timeout")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+            remote = self._client.get_file(remote.name)
+            self._stats['polls'] += 1
+        if remote.state.name == "FAILED":
+            raise ValueError("Gemini rejected file (possibly unsupported format)")
+        return remote
+
+    def release(self, remote) -> None:
+        """The caller is done with remote: drop it from the cache and delete it in the background"""
+        with self._lock:
+            for digest in [d for d, entry in self._entries.items() if entry.remote.name == remote.name]:
+                del self._entries[digest]
+        self.delete_later(remote.name)
+
+    def delete_later(self, name: str) -> None:
+        try:
+            self._get_executor().submit(self._delete, name)
+        except RuntimeError:
+            # Executor already shut down (interpreter exit)
+            self._delete(name)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'cached_files': len(self._entries)}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Delete every cached remote file and stop the cleanup thread"""
+        with self._lock:
+            names = [entry.remote.name for entry in self._entries.values()]
+            self._entries.clear()
+        for name in names:
+            self.delete_later(name)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    # -- internals ----------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gemini-file-cleanup")
+        return self._executor
+
+    def _delete(self, name: str) -> None:
+        try:
+            self._client.delete_file(name)
+            self._stats['deleted'] += 1
+        except Exception as exc:
+            # Gemini expires uploads after 48h anyway
+            logger.warning("Failed to delete Gemini file", extra={"file_name": name, "error": str(exc)})
+
+    def _expire_locked(self) -> list:
+        now = time.monotonic()
+        expired = [digest for digest, entry in self._entries.items() if entry.expires_at <= now]
+        return [self._entries.pop(digest).remote.name for digest in expired]
+
+    def _get(self, digest: str):
+        with self._lock:
+            stale = self._expire_locked()
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+        for name in stale:
+            self.delete_later(name)
+        return entry.remote if entry is not None else None
+
+    def _put(self, digest: str, remote) -> None:
+        ttl = _setting("GEMINI_UPLOAD_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)
+        max_entries = _setting("GEMINI_UPLOAD_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES)
+        if ttl <= 0 or max_entries <= 0:
+            return
+        with self._lock:
+            stale = self._expire_locked()
+            previous = self._entries.pop(digest, None)
+            if previous is not None and previous.remote.name != remote.name:
+                # Another thread uploaded the same file concurrently
+                stale.append(previous.remote.name)
+            self._entries[digest] = _CachedUpload(remote=remote, expires_at=time.monotonic() + ttl)
+            while len(self._entries) > max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                stale.append(evicted.remote.name)
+        for name in stale:
+            self.delete_later(name)
+
+
+# Per-process instance (Celery prefork children each get their own after fork)
+_upload_manager = None
+_upload_manager_lock = threading.Lock()
+
+
+def get_upload_manager() -> GeminiUploadManager:
+    """Get or create the per-process upload manager"""
+    global _upload_manager
+    if _upload_manager is None:
+        with _upload_manager_lock:
+            if _upload_manager is None:
+                _upload_manager = GeminiUploadManager()
+                atexit.register(_upload_manager.shutdown)
+    return _upload_manager
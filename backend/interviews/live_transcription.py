@@ -0,0 +1,430 @@
+"""
+Live speech-to-text relay for interview answers (optional)
+
+While the applicant records an answer, the browser can stream the same audio
+over a WebSocket served by core/asgi.py:
+
+    ws/public/interviews/<public_id>/live-transcript/?token=<interview token>&question_id=<id>
+
+Binary frames are MediaRecorder audio chunks and are relayed to a pluggable
+streaming STT backend (LIVE_STT_BACKEND). A text frame {"type": "stop"} (or a
+disconnect) finalizes the stream. The final transcript is kept until the
+answer upload lands, so the upload can store it immediately instead of
+queueing a batch transcription.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+LIVE_TRANSCRIPT_CACHE_KEY = "live_transcript:{interview_id}:{question_id}"
+DEFAULT_LIVE_TRANSCRIPT_TTL_SECONDS = 3600
+DEFAULT_FINALIZE_TIMEOUT_SECONDS = 5
+DEFAULT_LIVE_STT_BACKEND = "interviews.live_transcription.DeepgramLiveBackend"
+
+LIVE_TRANSCRIPT_PATH = re.compile(
+    r"^/?ws/public/interviews/(?P<public_id>[0-9a-fA-F-]{32,36})/live-transcript/?$"
+)
+
+# WebSocket close codes (4000-4999 are application defined)
+CLOSE_NORMAL = 1000
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+CLOSE_CONFLICT = 4409
+CLOSE_BACKEND_ERROR = 4502
+
+TranscriptCallback = Callable[[str, bool], Awaitable[None]]
+
+
+# ---------------------------------------------------------------------------
+# STT backends
+# ---------------------------------------------------------------------------
+
+class BaseLiveSTTBackend:
+    """
+    Interface for streaming STT backends
+
+    start() is called once before audio arrives, send_audio() for every chunk,
+    finish() once at the end and must return the final transcript data:
+    {'transcript', 'confidence', 'duration', 'provider'}. close() must be safe
+    to call at any time. interview_id is set by the session before start() so
+    billable backends can attribute their usage.
+    """
+
+    provider = "unknown"
+    interview_id = None
+
+    async def start(self, on_transcript: Optional[TranscriptCallback] = None) -> None:
+        raise NotImplementedError
+
+    async def send_audio(self, chunk: bytes) -> None:
+        raise NotImplementedError
+
+    async def finish(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class MockLiveSTTBackend(BaseLiveSTTBackend):
+    """Local stand-in for tests and development; never leaves the process"""
+
+    provider = "mock"
+    transcript = "mock live transcript"
+
+    def __init__(self):
+        self.chunks = 0
+        self.bytes_received = 0
+        self.on_transcript = None
+
+    async def start(self, on_transcript: Optional[TranscriptCallback] = None) -> None:
+        self.on_transcript = on_transcript
+
+    async def send_audio(self, chunk: bytes) -> None:
+        self.chunks += 1
+        self.bytes_received += len(chunk)
+        if self.on_transcript:
+            await self.on_transcript(f"{self.transcript} ({self.chunks})", False)
+
+    async def finish(self) -> Dict[str, Any]:
+        return {
+            'transcript': self.transcript if self.bytes_received else "",
+            'confidence': 1.0 if self.bytes_received else 0.0,
+            'duration': 0.0,
+            'provider': self.provider,
+            'bytes_received': self.bytes_received,
+        }
+
+
+class DeepgramLiveBackend(BaseLiveSTTBackend):
+    """Relay to Deepgram's streaming (live) transcription API"""
+
+    provider = "deepgram"
+
+    def __init__(self):
+        api_key = getattr(settings, "DEEPGRAM_API_KEY", "")
+        if not api_key:
+            raise ValueError("DEEPGRAM_API_KEY not configured in settings")
+        self.api_key = api_key
+        self.connection = None
+        self.final_segments = []
+        self.confidences = []
+        self.duration = 0.0
+        self.started_at = None
+        self._finalized = asyncio.Event()
+
+    async def start(self, on_transcript: Optional[TranscriptCallback] = None) -> None:
+        from deepgram import DeepgramClient, DeepgramClientOptions, LiveOptions, LiveTranscriptionEvents
+
+        api_url = getattr(settings, "DEEPGRAM_API_URL", "")
+        if api_url:
+            client = DeepgramClient(self.api_key, DeepgramClientOptions(url=api_url))
+        else:
+            client = DeepgramClient(self.api_key)
+        self.connection = client.listen.asyncwebsocket.v("1")
+        self.started_at = time.monotonic()
+
+        async def handle_transcript(_connection, result, **kwargs):
+            try:
+                alternative = result.channel.alternatives[0]
+            except (AttributeError, IndexError):
+                return
+            text = (alternative.transcript or "").strip()
+            if result.is_final and text:
+                self.final_segments.append(text)
+                self.confidences.append(alternative.confidence or 0.0)
+            self.duration = max(self.duration, (result.start or 0.0) + (result.duration or 0.0))
+            if getattr(result, "from_finalize", False):
+                self._finalized.set()
+            if on_transcript and text:
+                await on_transcript(text, bool(result.is_final))
+
+        async def handle_close(_connection, *args, **kwargs):
+            self._finalized.set()
+
+        self.connection.on(LiveTranscriptionEvents.Transcript, handle_transcript)
+        self.connection.on(LiveTranscriptionEvents.Close, handle_close)
+        options = LiveOptions(
+            model="nova-2",
+            language="en",
+            smart_format=True,
+            punctuate=True,
+            interim_results=True,
+        )
+        if await self.connection.start(options) is False:
+            raise ConnectionError("Could not open Deepgram live connection")
+
+    async def send_audio(self, chunk: bytes) -> None:
+        await self.connection.send(chunk)
+
+    async def finish(self) -> Dict[str, Any]:
+        timeout = getattr(settings, "LIVE_STT_FINALIZE_TIMEOUT_SECONDS", DEFAULT_FINALIZE_TIMEOUT_SECONDS)
+        if self.connection is not None:
+            await self.connection.finalize()
+            try:
+                await asyncio.wait_for(self._finalized.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Deepgram live finalize timed out; using segments received so far")
+        transcript = " ".join(self.final_segments).strip()
+        confidence = sum(self.confidences) / len(self.confidences) if self.confidences else 0.0
+        # The batch transcription this replaces is skipped, so record the stream instead
+        stream_seconds = time.monotonic() - self.started_at if self.started_at else 0.0
+        await sync_to_async(_record_live_usage)(self.interview_id, transcript, self.duration, stream_seconds)
+        return {
+            'transcript': transcript,
+            'confidence': confidence,
+            'duration': self.duration,
+            'provider': self.provider,
+        }
+
+    async def close(self) -> None:
+        if self.connection is not None:
+            try:
+                await self.connection.finish()
+            except Exception:
+                logger.debug("Deepgram live connection close failed", exc_info=True)
+            self.connection = None
+
+
+def _record_live_usage(interview_id, transcript: str, duration: float, stream_seconds: float) -> None:
+    """TokenUsage row for a live stream, shaped like DeepgramTranscriptionService._log_usage"""
+    try:
+        from monitoring import usage_buffer
+
+        usage_buffer.record_usage(
+            operation_type='transcription',
+            interview_id=interview_id,
+            input_tokens=0,
+            output_tokens=len(transcript.split()) if transcript else 0,
+            api_response_time=stream_seconds,
+            model_name='deepgram-nova-2',
+            prompt_length=len(f"Audio duration: {duration:.2f}s"),
+            response_length=len(transcript),
+            success=True,
+            error_message="",
+        )
+    except Exception as exc:
+        logger.warning("Failed to log live Deepgram usage", extra={"interview_id": interview_id, "error": str(exc)})
+
+
+def get_live_stt_backend() -> BaseLiveSTTBackend:
+    backend_path = getattr(settings, "LIVE_STT_BACKEND", DEFAULT_LIVE_STT_BACKEND) or DEFAULT_LIVE_STT_BACKEND
+    return import_string(backend_path)()
+
+
+# ---------------------------------------------------------------------------
+# Transcript hand-off to the upload
+# ---------------------------------------------------------------------------
+
+def _cache_key(interview_id, question_id) -> str:
+    return LIVE_TRANSCRIPT_CACHE_KEY.format(interview_id=interview_id, question_id=question_id)
+
+
+def store_live_transcript(interview_id: int, question_id: int, transcript_data: Dict[str, Any]) -> bool:
+    """
+    Keep a finished live transcript for the upload to pick up
+
+    If the answer was already uploaded without a transcript, it is written to
+    the VideoResponse directly. Returns True when a VideoResponse was updated.
+    """
+    from interviews.models import VideoResponse
+
+    transcript = (transcript_data or {}).get('transcript') or ""
+    if not transcript:
+        return False
+    updated = VideoResponse.objects.filter(
+        interview_id=interview_id,
+        question_id=question_id,
+        transcript="",
+    ).update(transcript=transcript)
+    if not updated:
+        ttl = getattr(settings, "LIVE_TRANSCRIPT_TTL_SECONDS", DEFAULT_LIVE_TRANSCRIPT_TTL_SECONDS)
+        try:
+            cache.set(_cache_key(interview_id, question_id), transcript_data, timeout=ttl)
+        except Exception:
+            logger.warning(
+                "Failed to cache live transcript",
+                extra={"interview_id": interview_id, "question_id": question_id},
+            )
+    logger.info(
+        "Live transcript stored",
+        extra={
+            "interview_id": interview_id,
+            "question_id": question_id,
+            "provider": transcript_data.get('provider'),
+            "applied_to_upload": bool(updated),
+        },
+    )
+    return bool(updated)
+
+
+def pop_live_transcript(interview_id: int, question_id: int) -> Optional[Dict[str, Any]]:
+    """Return and forget the live transcript for an answer, if one finished"""
+    key = _cache_key(interview_id, question_id)
+    try:
+        transcript_data = cache.get(key)
+        if transcript_data is not None:
+            cache.delete(key)
+    except Exception:
+        logger.debug("Live transcript cache unavailable for %s", key)
+        return None
+    return transcript_data
+
+
+# ---------------------------------------------------------------------------
+# ASGI WebSocket application
+# ---------------------------------------------------------------------------
+
+def _resolve_session(public_id: str, token: Optional[str], question_id: Optional[str]):
+    """Validate the socket request; returns (interview_id, question_id) or a close code"""
+    from interviews.models import Interview, InterviewQuestion, VideoResponse
+    from security.interview_tokens import verify_interview_token
+
+    if not token or not verify_interview_token(token, public_id):
+        return CLOSE_UNAUTHORIZED
+    try:
+        question_id = int(question_id)
+    except (TypeError, ValueError):
+        return CLOSE_NOT_FOUND
+    interview = (
+        Interview.objects.filter(public_id=public_id)
+        .only('id', 'status', 'position_type_id', 'selected_question_ids')
+        .first()
+    )
+    if interview is None:
+        return CLOSE_NOT_FOUND
+    question = InterviewQuestion.objects.filter(id=question_id, is_active=True).only('id', 'position_type_id').first()
+    if question is None:
+        return CLOSE_NOT_FOUND
+    # Only questions this interview actually asks (its selected set, else its position's bank)
+    selected_ids = list(interview.selected_question_ids or [])
+    if selected_ids:
+        if question.id not in selected_ids:
+            return CLOSE_NOT_FOUND
+    elif question.position_type_id != interview.position_type_id:
+        return CLOSE_NOT_FOUND
+    if interview.status in ["submitted", "processing", "completed"]:
+        return CLOSE_CONFLICT
+    if VideoResponse.objects.filter(interview=interview, question_id=question_id).exclude(transcript="").exists():
+        return CLOSE_CONFLICT
+    return interview.id, question_id
+
+
+async def _reject(receive, send, code: int) -> None:
+    message = await receive()
+    if message["type"] == "websocket.connect":
+        await send({"type": "websocket.close", "code": code})
+
+
+async def websocket_application(scope, receive, send):
+    """ASGI entry point for WebSocket scopes (see core/asgi.py)"""
+    if not getattr(settings, "LIVE_TRANSCRIPTION_ENABLED", False):
+        await _reject(receive, send, CLOSE_NOT_FOUND)
+        return
+    match = LIVE_TRANSCRIPT_PATH.match(scope.get("path", ""))
+    if not match:
+        await _reject(receive, send, CLOSE_NOT_FOUND)
+        return
+
+    query = parse_qs((scope.get("query_string") or b"").decode())
+    session = await sync_to_async(_resolve_session)(
+        match.group("public_id"),
+        (query.get("token") or [None])[0],
+        (query.get("question_id") or [None])[0],
+    )
+    if isinstance(session, int):
+        await _reject(receive, send, session)
+        return
+    interview_id, question_id = session
+    await LiveTranscriptionSession(interview_id, question_id, receive, send).run()
+
+
+class LiveTranscriptionSession:
+    """One WebSocket: relay audio chunks to the STT backend, store the result"""
+
+    def __init__(self, interview_id: int, question_id: int, receive, send):
+        self.interview_id = interview_id
+        self.question_id = question_id
+        self.receive = receive
+        self.send = send
+        self.backend = None
+        self.audio_bytes = 0
+        self.socket_open = False
+
+    async def send_json(self, payload: Dict[str, Any]) -> None:
+        if self.socket_open:
+            await self.send({"type": "websocket.send", "text": json.dumps(payload)})
+
+    async def on_transcript(self, text: str, is_final: bool) -> None:
+        await self.send_json({"type": "final" if is_final else "interim", "transcript": text})
+
+    async def run(self) -> None:
+        message = await self.receive()
+        if message["type"] != "websocket.connect":
+            return
+        try:
+            self.backend = get_live_stt_backend()
+            self.backend.interview_id = self.interview_id
+            await self.backend.start(on_transcript=self.on_transcript)
+        except Exception as exc:
+            logger.error(
+                "Live STT backend unavailable",
+                extra={"interview_id": self.interview_id, "question_id": self.question_id, "error": str(exc)},
+            )
+            await self.send({"type": "websocket.close", "code": CLOSE_BACKEND_ERROR})
+            return
+
+        await self.send({"type": "websocket.accept"})
+        self.socket_open = True
+        try:
+            while True:
+                message = await self.receive()
+                if message["type"] == "websocket.disconnect":
+                    self.socket_open = False
+                    break
+                if message.get("bytes"):
+                    self.audio_bytes += len(message["bytes"])
+                    await self.backend.send_audio(message["bytes"])
+                elif message.get("text"):
+                    try:
+                        command = json.loads(message["text"])
+                    except ValueError:
+                        continue
+                    if command.get("type") == "stop":
+                        break
+
+            transcript_data = await self.backend.finish() if self.audio_bytes else {}
+            applied = False
+            if transcript_data.get('transcript'):
+                applied = await sync_to_async(store_live_transcript)(
+                    self.interview_id, self.question_id, transcript_data
+                )
+            await self.send_json(
+                {
+                    "type": "complete",
+                    "transcript": transcript_data.get('transcript', ""),
+                    "applied_to_upload": applied,
+                }
+            )
+        except Exception as exc:
+            logger.error(
+                "Live transcription failed",
+                extra={"interview_id": self.interview_id, "question_id": self.question_id, "error": str(exc)},
+            )
+        finally:
+            await self.backend.close()
+            if self.socket_open:
+                self.socket_open = False
+                await self.send({"type": "websocket.close", "code": CLOSE_NORMAL})
@@ -0,0 +1,114 @@
+"""
+Management command to benchmark script reading detection sampling settings
+against the original every-3rd-frame, full-resolution analysis.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.ai.script_detection import detect_script_reading
+
+
+GAZE_KEYS = (
+    'gaze_at_camera_percent',
+    'gaze_left_percent',
+    'gaze_right_percent',
+    'gaze_up_percent',
+    'gaze_down_percent',
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark script reading detection frame sampling on sample WebM/MP4 clips'
+
+    def add_arguments(self, parser):
+        parser.add_argument('videos', nargs='+', help='Paths to sample video files')
+        parser.add_argument(
+            '--target-fps',
+            type=float,
+            nargs='+',
+            default=None,
+            help='Sampling rates to compare (default: SCRIPT_DETECTION_TARGET_FPS)',
+        )
+        parser.add_argument(
+            '--max-frame-width',
+            type=int,
+            default=None,
+            help='Downscale width for sampled runs (default: SCRIPT_DETECTION_MAX_FRAME_WIDTH)',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=5.0,
+            help='Maximum allowed gaze percentage difference from the baseline (percentage points)',
+        )
+
+    def _run(self, video_path, target_fps, max_frame_width):
+        stats = {}
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        result = detect_script_reading(
+            video_path,
+            target_fps=target_fps,
+            max_frame_width=max_frame_width,
+            stats=stats,
+        )
+        wall_seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+        frames_read = stats.get('frames_read', 0)
+        return {
+            'result': result,
+            'wall_seconds': wall_seconds,
+            'cpu_seconds': cpu_seconds,
+            'frames_read': frames_read,
+            'frames_analyzed': stats.get('frames_analyzed', 0),
+            'decoded_fps': frames_read / wall_seconds if wall_seconds else 0.0,
+        }
+
+    def _report(self, label, run, baseline=None, tolerance=None):
+        data = run['result']['data']
+        line = (
+            f"  {label:<18} status={run['result']['status']:<10} risk={run['result']['risk_score']:<3} "
+            f"decoded={run['frames_read']} analyzed={run['frames_analyzed']} "
+            f"frames/s={run['decoded_fps']:.1f} cpu_s={run['cpu_seconds']:.2f} wall_s={run['wall_seconds']:.2f}"
+        )
+        if baseline is None:
+            self.stdout.write(line)
+            return True
+
+        base_data = baseline['result']['data']
+        max_delta = max(abs(float(data.get(key, 0)) - float(base_data.get(key, 0))) for key in GAZE_KEYS)
+        speedup = baseline['cpu_seconds'] / run['cpu_seconds'] if run['cpu_seconds'] else 0.0
+        line += f" gaze_delta={max_delta:.1f}pp cpu_speedup={speedup:.1f}x"
+        within = max_delta <= tolerance
+        if within:
+            self.stdout.write(self.style.SUCCESS(line))
+        else:
+            self.stdout.write(self.style.WARNING(f"{line} (outside {tolerance:.1f}pp tolerance)"))
+        return within
+
+    def handle(self, *args, **options):
+        target_rates = options.get('target_fps') or [getattr(settings, 'SCRIPT_DETECTION_TARGET_FPS', 4.0)]
+        max_frame_width = options.get('max_frame_width')
+        if max_frame_width is None:
+            max_frame_width = getattr(settings, 'SCRIPT_DETECTION_MAX_FRAME_WIDTH', 480)
+        tolerance = options['tolerance']
+
+        all_within = True
+        for video_path in options['videos']:
+            self.stdout.write(f"\n{video_path}")
+            baseline = self._run(video_path, target_fps=0, max_frame_width=0)
+            if baseline['result']['status'] == 'error':
+                self.stdout.write(self.style.ERROR(f"  baseline failed: {baseline['result']['data']['flags']}"))
+                all_within = False
+                continue
+            self._report('baseline (1/3)', baseline)
+            for rate in target_rates:
+                run = self._run(video_path, target_fps=rate, max_frame_width=max_frame_width)
+                label = f"{rate:g}fps@{max_frame_width or 'full'}px"
+                all_within = self._report(label, run, baseline=baseline, tolerance=tolerance) and all_within
+
+        if not all_within:
+            raise CommandError("One or more videos failed or fell outside the gaze tolerance")
+        self.stdout.write(self.style.SUCCESS("\nAll sampled runs within tolerance"))
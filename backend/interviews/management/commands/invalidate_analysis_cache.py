@@ -0,0 +1,20 @@
+"""
+Management command to invalidate cached LLM analyses after a prompt or
+scoring change.
+"""
+from django.core.management.base import BaseCommand
+
+from interviews.analysis_cache import get_analysis_cache_stats, invalidate_analysis_cache
+
+
+class Command(BaseCommand):
+    help = 'Invalidate every cached LLM analysis (entries become unreachable and expire)'
+
+    def handle(self, *args, **options):
+        before = get_analysis_cache_stats()
+        generation = invalidate_analysis_cache()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Analysis cache invalidated (generation {before['generation']} -> {generation})"
+            )
+        )
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from interviews.models import Interview
 from interviews.ai_service import AIInterviewService
+from interviews.media_service import get_stt_audio_path
 
 
 class Command(BaseCommand):
@@ -40,7 +41,12 @@ class Command(BaseCommand):
             try:
                 # Step 1: Transcribe video
                 self.stdout.write('  Transcribing video...')
-                transcript = ai_service.transcribe_video(video_response.video_file_path.path)
+                # Goes through the transcript cache, keyed by the stored STT audio track
+                transcript = ai_service.transcribe_video(
+                    video_response.video_file_path.path,
+                    video_response_id=video_response.id,
+                    audio_path=get_stt_audio_path(video_response),
+                )
                 self.stdout.write(f'  Transcribed: {transcript[:100]}...')
                 
                 # Step 2: Analyze transcript
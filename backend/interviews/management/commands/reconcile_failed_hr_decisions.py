@@ -4,6 +4,7 @@ from django.utils import timezone
 
 from interviews.models import Interview
 from results.models import InterviewResult
+from results.review_queue import sync_review_queue
 
 
 class Command(BaseCommand):
@@ -19,8 +20,11 @@ class Command(BaseCommand):
         interview_qs.update(hr_decision="reject", hr_decision_at=now)
 
         result_qs = InterviewResult.objects.filter(interview__status="failed").filter(pending_filter)
-        result_count = result_qs.count()
-        result_qs.update(hr_decision="reject", hr_decision_at=now)
+        result_ids = list(result_qs.values_list("id", flat=True))
+        result_count = len(result_ids)
+        InterviewResult.objects.filter(id__in=result_ids).update(hr_decision="reject", hr_decision_at=now)
+        # queryset.update() skips the post_save sync of the review queue
+        sync_review_queue(result_ids)
 
         self.stdout.write(
             f"Updated {interview_count} interview(s) and {result_count} result(s) to hr_decision=reject."
@@ -4,6 +4,7 @@ Management command to reprocess old video responses that don't have AI analysis
 from django.core.management.base import BaseCommand
 from interviews.models import VideoResponse, AIAnalysis
 from interviews.ai_service import get_ai_service
+from interviews.media_service import get_stt_audio_path
 import traceback
 
 
@@ -66,7 +67,11 @@ class Command(BaseCommand):
 
                 # Transcribe video
                 self.stdout.write("  Transcribing...")
-                transcript = ai_service.transcribe_video(video_path)
+                transcript = ai_service.transcribe_video(
+                    video_path,
+                    video_response_id=video.id,
+                    audio_path=get_stt_audio_path(video),
+                )
                 self.stdout.write(f"  Transcript: {transcript[:100]}...")
 
                 # Analyze transcript
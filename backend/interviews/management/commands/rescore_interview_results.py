@@ -0,0 +1,88 @@
+"""
+Management command to recompute stored InterviewResult scores after a
+ROLE_PROFILES weight or passing threshold change (see interviews/batch_rescoring.py).
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.batch_rescoring import DEFAULT_TOLERANCE, DEFAULT_WRITE_BATCH_SIZE, rescore_results
+
+
+class Command(BaseCommand):
+    help = 'Rescore historical interview results in one vectorized pass (use --dry-run to preview the diff)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Show the score diff without writing it')
+        parser.add_argument('--role-code', default=None, help='Only rescore interviews for this position code')
+        parser.add_argument(
+            '--weights-file',
+            default=None,
+            help='JSON {profile: {competency: weight}} to use instead of ROLE_PROFILES (e.g. to preview new weights)',
+        )
+        parser.add_argument(
+            '--passing-threshold',
+            type=float,
+            default=None,
+            help='Score needed to pass (default: SystemSettings passing_score_threshold)',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help='Smallest score difference treated as a change',
+        )
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_WRITE_BATCH_SIZE, help='bulk_update batch size')
+        parser.add_argument('--show', type=int, default=20, help='Number of changed results to list')
+
+    def _load_profiles(self, path):
+        if not path:
+            return None
+        try:
+            with open(path) as weights_file:
+                profiles = json.load(weights_file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read weights file {path}: {exc}")
+        if not isinstance(profiles, dict) or not all(isinstance(weights, dict) for weights in profiles.values()):
+            raise CommandError("Weights file must map profile names to {competency: weight} objects")
+        return profiles
+
+    def handle(self, *args, **options):
+        from results.models import SystemSettings
+
+        threshold = options['passing_threshold']
+        if threshold is None:
+            threshold = SystemSettings.get_passing_threshold()
+
+        report = rescore_results(
+            passing_threshold=threshold,
+            role_code=options['role_code'],
+            profiles=self._load_profiles(options['weights_file']),
+            dry_run=options['dry_run'],
+            tolerance=options['tolerance'],
+            batch_size=options['batch_size'],
+        )
+
+        for change in report.changes[:options['show']]:
+            flip = ''
+            if change.old_passed != change.new_passed:
+                flip = f"  passed {change.old_passed} -> {change.new_passed}"
+            self.stdout.write(
+                f"  interview {change.interview_id:<8} {change.role_code or '-':<20} "
+                f"{change.old_score:7.2f} -> {change.new_score:7.2f} ({change.new_score - change.old_score:+.2f}){flip}"
+            )
+        if len(report.changes) > options['show']:
+            self.stdout.write(f"  ... {len(report.changes) - options['show']} more")
+
+        self.stdout.write(
+            f"Interviews: {report.interviews}  changed: {report.changed}  pass/fail flips: {report.pass_flips}  "
+            f"threshold: {threshold:g}"
+        )
+        self.stdout.write(
+            f"Load {report.load_seconds:.3f}s  compute {report.compute_seconds:.3f}s  "
+            f"write {report.write_seconds:.3f}s  ({report.interviews_per_second:,.0f} interviews/s)"
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING("Dry run: no results were updated"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Updated {report.written} result(s)"))
@@ -0,0 +1,210 @@
+"""
+Media preprocessing for uploaded video responses
+
+Each VideoResponse is probed (duration, codecs, frame rate) and has a compact
+16kHz mono audio track extracted once, right after upload. Transcription and
+script detection reuse the stored artifacts instead of decoding the video
+container again.
+"""
+
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.files import File
+
+logger = logging.getLogger(__name__)
+
+MAX_ANSWER_SECONDS = 120
+STT_SAMPLE_RATE = 16000
+STT_CHANNELS = 1
+
+STT_AUDIO_FORMATS = {
+    'opus': {
+        'extension': '.ogg',
+        'mimetype': 'audio/ogg',
+        'output_options': {'acodec': 'libopus', 'audio_bitrate': '24k', 'application': 'voip'},
+    },
+    'flac': {
+        'extension': '.flac',
+        'mimetype': 'audio/flac',
+        'output_options': {'acodec': 'flac'},
+    },
+}
+DEFAULT_STT_AUDIO_FORMAT = 'opus'
+
+AUDIO_MIMETYPES = {
+    '.ogg': 'audio/ogg',
+    '.opus': 'audio/ogg',
+    '.flac': 'audio/flac',
+    '.mp3': 'audio/mp3',
+    '.wav': 'audio/wav',
+}
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_frame_rate(value) -> Optional[float]:
+    """ffprobe reports rates as '30000/1001'."""
+    if not value:
+        return None
+    try:
+        if '/' in str(value):
+            numerator, denominator = str(value).split('/', 1)
+            denominator = float(denominator)
+            return round(float(numerator) / denominator, 3) if denominator else None
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def stt_audio_format() -> str:
+    audio_format = (getattr(settings, 'STT_AUDIO_FORMAT', DEFAULT_STT_AUDIO_FORMAT) or '').strip().lower()
+    return audio_format if audio_format in STT_AUDIO_FORMATS else DEFAULT_STT_AUDIO_FORMAT
+
+
+def audio_mimetype(audio_path: str) -> str:
+    return AUDIO_MIMETYPES.get(os.path.splitext(audio_path)[1].lower(), 'audio/mp3')
+
+
+def probe_media(video_path: str) -> Dict[str, Any]:
+    """Read container/stream metadata with ffprobe (no decoding)."""
+    import ffmpeg
+
+    info = ffmpeg.probe(video_path)
+    streams = info.get('streams', [])
+    container = info.get('format', {})
+    video_stream = next((s for s in streams if s.get('codec_type') == 'video'), None) or {}
+    audio_stream = next((s for s in streams if s.get('codec_type') == 'audio'), None) or {}
+
+    duration = _to_float(container.get('duration')) or _to_float(video_stream.get('duration'))
+    frame_rate = _parse_frame_rate(video_stream.get('avg_frame_rate')) or _parse_frame_rate(
+        video_stream.get('r_frame_rate')
+    )
+    return {
+        'duration': duration,
+        'format_name': container.get('format_name'),
+        'size_bytes': int(container['size']) if container.get('size') else None,
+        'video_codec': video_stream.get('codec_name'),
+        'width': video_stream.get('width'),
+        'height': video_stream.get('height'),
+        'fps': frame_rate,
+        'has_audio': bool(audio_stream),
+        'audio_codec': audio_stream.get('codec_name'),
+        'audio_sample_rate': int(audio_stream['sample_rate']) if audio_stream.get('sample_rate') else None,
+        'audio_channels': audio_stream.get('channels'),
+    }
+
+
+def extract_stt_audio(video_path: str, output_path: str, audio_format: str = DEFAULT_STT_AUDIO_FORMAT) -> str:
+    """Extract a 16kHz mono speech track (capped at MAX_ANSWER_SECONDS)."""
+    import ffmpeg
+
+    spec = STT_AUDIO_FORMATS[audio_format]
+    stream = ffmpeg.input(video_path)
+    stream = ffmpeg.output(
+        stream,
+        output_path,
+        vn=None,
+        ar=STT_SAMPLE_RATE,
+        ac=STT_CHANNELS,
+        t=MAX_ANSWER_SECONDS,
+        **spec['output_options'],
+    )
+    try:
+        ffmpeg.run(stream, capture_stdout=True, capture_stderr=True, overwrite_output=True)
+    except ffmpeg.Error as e:
+        stderr = e.stderr.decode() if e.stderr else 'Unknown error'
+        raise Exception(f"Failed to extract audio: {stderr}")
+    return output_path
+
+
+def stt_audio_path(video_response) -> Optional[str]:
+    """Local path of the stored STT audio track, or None if it is not available."""
+    audio_file = getattr(video_response, 'audio_file_path', None)
+    if not audio_file or not audio_file.name:
+        return None
+    try:
+        path = audio_file.path
+    except Exception:
+        return None
+    return path if os.path.exists(path) else None
+
+
+def prepare_video_media(video_response, force: bool = False) -> Dict[str, Any]:
+    """
+    Probe the uploaded video and store its STT audio track next to it.
+
+    Idempotent: returns the stored metadata when both artifacts already exist.
+    """
+    metadata = video_response.media_metadata or {}
+    has_audio_artifact = stt_audio_path(video_response) is not None
+    if not force and metadata and (has_audio_artifact or metadata.get('has_audio') is False):
+        return metadata
+
+    video_path = video_response.video_file_path.path
+    metadata = probe_media(video_path)
+    update_fields = ['media_metadata']
+
+    if metadata.get('has_audio'):
+        audio_format = stt_audio_format()
+        spec = STT_AUDIO_FORMATS[audio_format]
+        handle, temp_path = tempfile.mkstemp(suffix=spec['extension'])
+        os.close(handle)
+        try:
+            extract_stt_audio(video_path, temp_path, audio_format)
+            stem = os.path.splitext(os.path.basename(video_response.video_file_path.name))[0]
+            with open(temp_path, 'rb') as audio_file:
+                video_response.audio_file_path.save(f"{stem}{spec['extension']}", File(audio_file), save=False)
+            metadata['stt_audio'] = {
+                'format': audio_format,
+                'sample_rate': STT_SAMPLE_RATE,
+                'channels': STT_CHANNELS,
+                'size_bytes': os.path.getsize(temp_path),
+            }
+            update_fields.append('audio_file_path')
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    video_response.media_metadata = metadata
+    video_response.save(update_fields=update_fields)
+    logger.info(
+        "Video media prepared",
+        extra={
+            "video_response_id": video_response.id,
+            "duration": metadata.get('duration'),
+            "has_audio": metadata.get('has_audio'),
+        },
+    )
+    return metadata
+
+
+def get_stt_audio_path(video_response) -> Optional[str]:
+    """
+    Return the stored STT audio track, preparing it first if needed.
+
+    Never raises; None means callers should fall back to extracting audio from
+    the video themselves.
+    """
+    try:
+        prepare_video_media(video_response)
+    except Exception as exc:
+        logger.warning(
+            "Media preprocessing failed",
+            extra={"video_response_id": getattr(video_response, 'id', None), "error": str(exc)},
+        )
+    return stt_audio_path(video_response)
+
+
+def get_probed_fps(video_response) -> Optional[float]:
+    """Frame rate from the upload-time probe (WebM headers often confuse OpenCV)."""
+    metadata = getattr(video_response, 'media_metadata', None) or {}
+    return metadata.get('fps') or None
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_interview_public_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoresponse',
+            name='audio_file_path',
+            field=models.FileField(blank=True, help_text='16kHz mono speech track extracted once at upload for transcription', null=True, upload_to='video_responses/audio/%Y/%m/%d/'),
+        ),
+        migrations.AddField(
+            model_name='videoresponse',
+            name='media_metadata',
+            field=models.JSONField(blank=True, default=dict, help_text='ffprobe summary (duration, codecs, fps, resolution, audio track)'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_video_response_media_artifacts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='videoresponse',
+            name='idx_vr_interview',
+        ),
+        migrations.AddIndex(
+            model_name='videoresponse',
+            index=models.Index(fields=['interview', 'status'], name='idx_vr_interview_status'),
+        ),
+    ]
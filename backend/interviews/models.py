@@ -330,28 +330,22 @@ class Interview(models.Model):
                     result.hr_decision_at = timezone.now()
                 result.save(update_fields=["hr_decision", "hr_decision_at"])
     
+    def apply_authenticity(self, script_reading_statuses):
+        """
+        Set authenticity_flag and authenticity_status from the video responses'
+        script reading statuses (not saved)
+        """
+        flagged = {'suspicious', 'high_risk'} & set(script_reading_statuses)
+        self.authenticity_flag = bool(flagged)
+        self.authenticity_status = 'under_investigation' if flagged else 'verified'
+        return self.authenticity_status
+    
     def check_authenticity(self):
         """
         Check if any video responses are flagged for script reading
         Updates authenticity_flag and authenticity_status
         """
-        suspicious_count = self.video_responses.filter(
-            script_reading_status='suspicious'
-        ).count()
-        high_risk_count = self.video_responses.filter(
-            script_reading_status='high_risk'
-        ).count()
-        
-        if high_risk_count > 0:
-            self.authenticity_flag = True
-            self.authenticity_status = 'under_investigation'
-        elif suspicious_count > 0:
-            self.authenticity_flag = True
-            self.authenticity_status = 'under_investigation'
-        else:
-            self.authenticity_flag = False
-            self.authenticity_status = 'verified'
-        
+        self.apply_authenticity(self.video_responses.values_list('script_reading_status', flat=True))
         self.save()
         return self.authenticity_status
     
@@ -429,6 +423,17 @@ class VideoResponse(models.Model):
     question = models.ForeignKey(InterviewQuestion, on_delete=models.CASCADE, related_name='responses')
     video_file_path = models.FileField(upload_to='video_responses/%Y/%m/%d/')
     duration = models.DurationField(help_text="Duration of the video response")
+    audio_file_path = models.FileField(
+        upload_to='video_responses/audio/%Y/%m/%d/',
+        null=True,
+        blank=True,
+        help_text="16kHz mono speech track extracted once at upload for transcription"
+    )
+    media_metadata = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="ffprobe summary (duration, codecs, fps, resolution, audio track)"
+    )
     uploaded_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploaded')
     
@@ -486,7 +491,8 @@ class VideoResponse(models.Model):
         indexes = [
             models.Index(fields=['uploaded_at'], name='idx_vr_uploaded_at'),
             models.Index(fields=['status'], name='idx_vr_status'),
-            models.Index(fields=['interview'], name='idx_vr_interview'),
+            # (interview, question) is served by the unique_together index
+            models.Index(fields=['interview', 'status'], name='idx_vr_interview_status'),
         ]
     
     def __str__(self):
@@ -0,0 +1,207 @@
+"""
+Token-budget-aware prompt building for AIAnalysisService
+
+Tokens are counted locally with tiktoken (PROMPT_TOKENIZER_ENCODING). When the
+package or its encoding file is unavailable, the old 4-characters-per-token
+estimate is used instead. Gemini's own tokenizer differs slightly, so the
+prediction is stored next to the provider-reported count on every TokenUsage
+row (predicted_input_tokens vs input_tokens) to keep the budget honest.
+
+Overlong transcripts are trimmed to ANALYSIS_TRANSCRIPT_TOKEN_LIMIT, keeping
+the opening and the conclusion of the answer. Batches whose prompt would exceed
+ANALYSIS_PROMPT_TOKEN_BUDGET are split into several calls.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+DEFAULT_TRANSCRIPT_TOKEN_LIMIT = 1500
+DEFAULT_PROMPT_TOKEN_BUDGET = 12000
+CHARS_PER_TOKEN = 4
+TRIM_MARKER = " [... trimmed for length ...] "
+# Share of the kept tokens taken from the start of the answer (rest from the end)
+TRIM_HEAD_RATIO = 0.7
+
+
+@lru_cache(maxsize=4)
+def _load_encoding(name: str):
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception as exc:
+        logger.warning("Local tokenizer unavailable, estimating tokens from length", extra={"error": str(exc)})
+        return None
+
+
+def _encoding():
+    return _load_encoding(getattr(settings, "PROMPT_TOKENIZER_ENCODING", DEFAULT_ENCODING) or DEFAULT_ENCODING)
+
+
+def tokenizer_name() -> str:
+    encoding = _encoding()
+    return encoding.name if encoding is not None else "chars/4"
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the head and tail of text within max_tokens (returns text unchanged if it fits)"""
+    if not text or max_tokens <= 0 or count_tokens(text) <= max_tokens:
+        return text
+    head_tokens = int(max_tokens * TRIM_HEAD_RATIO)
+    tail_tokens = max(max_tokens - head_tokens, 0)
+    encoding = _encoding()
+    if encoding is None:
+        tokens = None
+        head = text[:head_tokens * CHARS_PER_TOKEN]
+        tail = text[len(text) - tail_tokens * CHARS_PER_TOKEN:] if tail_tokens else ""
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        head = encoding.decode(tokens[:head_tokens])
+        tail = encoding.decode(tokens[len(tokens) - tail_tokens:]) if tail_tokens else ""
+    return f"{head.rstrip()}{TRIM_MARKER}{tail.lstrip()}"
+
+
+def transcript_token_limit() -> int:
+    return int(getattr(settings, "ANALYSIS_TRANSCRIPT_TOKEN_LIMIT", DEFAULT_TRANSCRIPT_TOKEN_LIMIT))
+
+
+def prompt_token_budget() -> int:
+    return int(getattr(settings, "ANALYSIS_PROMPT_TOKEN_BUDGET", DEFAULT_PROMPT_TOKEN_BUDGET))
+
+
+def fit_transcript(transcript: str, max_tokens: Optional[int] = None) -> str:
+    return trim_to_tokens(transcript or "", transcript_token_limit() if max_tokens is None else max_tokens)
+
+
+# ---------------------------------------------------------------------------
+# Batch analysis prompt
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BatchPrompt:
+    text: str
+    predicted_tokens: int
+    trimmed_items: List[int] = field(default_factory=list)
+
+
+def batch_prompt_header(role_kwargs: Dict[str, Any]) -> str:
+    return f"""You are an expert HR interviewer analyzing multiple video interview responses.
+Analyze ALL responses and return a JSON array with results for each in order.
+
+Role Context:
+- Role: {role_kwargs.get('role_name') or "N/A"}
+- Role Code: {role_kwargs.get('role_code') or "N/A"}
+- Role Focus: {role_kwargs.get('role_context') or "N/A"}
+- Role Profile: {role_kwargs.get('role_profile') or "N/A"}
+- Core Competencies for this role: {role_kwargs.get('core_competencies') or "N/A"}
+
+Role-aware scoring rules:
+- Prioritize role-critical competencies in your judgment.
+- Do not over-penalize non-core competencies unless they directly affect task performance.
+
+For each response, provide scores (0-100) for:
+- sentiment_score: Emotional tone and enthusiasm
+- confidence_score: Self-assurance and certainty
+- speech_clarity_score: Articulation and grammar
+- content_relevance_score: How well the answer addresses the question
+- overall_score: Average of above scores
+- recommendation: "pass" (≥70), "review" (50-69), or "fail" (<50)
+- analysis_summary: Brief 2-3 sentence explanation
+
+"""
+
+
+def batch_prompt_item(position: int, data: Dict[str, Any], transcript: str) -> str:
+    return f"""
+=== RESPONSE {position} ===
+response_index: {position}
+video_id: {data.get('video_id', 'N/A')}
+Question: {data['question_text']}
+Type: {data['question_type']}
+Competency: {data.get('question_competency', 'N/A')}
+Answer: {transcript}
+
+"""
+
+
+def batch_prompt_footer(count: int) -> str:
+    return f"""
+Return ONLY a JSON array with {count} objects, one for each response.
+Copy each response's response_index and video_id into its object:
+[
+  {{
+    "response_index": <number>,
+    "video_id": <video_id>,
+    "sentiment_score": <number>,
+    "confidence_score": <number>,
+    "speech_clarity_score": <number>,
+    "content_relevance_score": <number>,
+    "overall_score": <number>,
+    "recommendation": "<pass|review|fail>",
+    "analysis_summary": "<explanation>"
+  }},
+  ... (repeat for all responses)
+]
+"""
+
+
+def _item_transcript(data: Dict[str, Any]) -> str:
+    return data.get('transcript', data.get('transcript_text', '')) or ''
+
+
+def build_batch_prompt(transcripts_data: List[Dict[str, Any]], role_kwargs: Dict[str, Any]) -> BatchPrompt:
+    """Render the batch prompt with overlong transcripts trimmed"""
+    parts = [batch_prompt_header(role_kwargs)]
+    trimmed = []
+    for position, data in enumerate(transcripts_data, 1):
+        original = _item_transcript(data)
+        transcript = fit_transcript(original)
+        if transcript != original:
+            trimmed.append(position - 1)
+        parts.append(batch_prompt_item(position, data, transcript))
+    parts.append(batch_prompt_footer(len(transcripts_data)))
+    text = "".join(parts)
+    return BatchPrompt(text=text, predicted_tokens=count_tokens(text), trimmed_items=trimmed)
+
+
+def split_batch(transcripts_data: List[Dict[str, Any]], role_kwargs: Dict[str, Any],
+                budget: Optional[int] = None) -> List[List[int]]:
+    """
+    Group item indexes into batches whose prompts fit the token budget
+
+    Items keep their order; an item that cannot fit with any other gets a batch
+    of its own.
+    """
+    if budget is None:
+        budget = prompt_token_budget()
+    if not transcripts_data:
+        return []
+    fixed = count_tokens(batch_prompt_header(role_kwargs)) + count_tokens(batch_prompt_footer(len(transcripts_data)))
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = fixed
+    for index, data in enumerate(transcripts_data):
+        item_tokens = count_tokens(batch_prompt_item(index + 1, data, fit_transcript(_item_transcript(data))))
+        if current and used + item_tokens > budget:
+            batches.append(current)
+            current, used = [], fixed
+        current.append(index)
+        used += item_tokens
+    batches.append(current)
+    return batches
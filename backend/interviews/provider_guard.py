@@ -0,0 +1,350 @@
+"""
+Per-provider circuit breaker and concurrency limit (Gemini, Deepgram)
+
+State is kept in the default cache (Redis in production), so every worker and
+web process shares one breaker and one set of concurrency slots per provider.
+
+Breaker: provider failures (429, 5xx, timeouts, connection errors) are counted
+in a PROVIDER_BREAKER_WINDOW_SECONDS window. At
+PROVIDER_BREAKER_FAILURE_THRESHOLD the circuit opens for
+PROVIDER_BREAKER_OPEN_SECONDS and calls raise ProviderUnavailable without
+reaching the provider. After that one caller is let through as a half-open
+probe: its success closes the circuit and its failure re-opens it.
+
+Concurrency: each provider has PROVIDER_MAX_CONCURRENCY_<PROVIDER> slots. A
+slot is a cache key added with a lease timeout (PROVIDER_SLOT_LEASE_SECONDS),
+so slots held by a killed worker free themselves. Callers wait up to
+PROVIDER_ACQUIRE_TIMEOUT_SECONDS for a slot before raising ProviderUnavailable.
+
+Celery tasks turn ProviderUnavailable into a deferred retry that fires when
+the circuit may close (see tasks._retry_with_backoff). If the cache is
+unreachable, calls go through unguarded.
+"""
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ('gemini', 'deepgram')
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_WINDOW_SECONDS = 60
+DEFAULT_OPEN_SECONDS = 60
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_ACQUIRE_TIMEOUT_SECONDS = 10
+DEFAULT_SLOT_LEASE_SECONDS = 300
+SLOT_POLL_INITIAL_SECONDS = 0.05
+SLOT_POLL_MAX_SECONDS = 0.5
+REJECTED_TTL_SECONDS = 900
+
+
+class ProviderUnavailable(Exception):
+    """The provider's circuit is open or all its slots are busy; retry after retry_after seconds"""
+
+    def __init__(self, provider: str, retry_after: float, reason: str = "circuit_open"):
+        self.provider = provider
+        self.retry_after = max(1.0, float(retry_after))
+        self.reason = reason
+        super().__init__(f"{provider} unavailable ({reason}), retry in {self.retry_after:.0f}s")
+
+
+def _key(provider: str, *parts) -> str:
+    return ":".join(["provider_guard", provider, *[str(part) for part in parts]])
+
+
+def _failure_threshold() -> int:
+    return int(getattr(settings, "PROVIDER_BREAKER_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD))
+
+
+def _window_seconds() -> int:
+    return int(getattr(settings, "PROVIDER_BREAKER_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS))
+
+
+def _open_seconds() -> int:
+    return int(getattr(settings, "PROVIDER_BREAKER_OPEN_SECONDS", DEFAULT_OPEN_SECONDS))
+
+
+def _max_concurrency(provider: str) -> int:
+    return int(getattr(settings, f"PROVIDER_MAX_CONCURRENCY_{provider.upper()}", DEFAULT_MAX_CONCURRENCY))
+
+
+def _acquire_timeout() -> float:
+    return float(getattr(settings, "PROVIDER_ACQUIRE_TIMEOUT_SECONDS", DEFAULT_ACQUIRE_TIMEOUT_SECONDS))
+
+
+def _slot_lease() -> int:
+    return int(getattr(settings, "PROVIDER_SLOT_LEASE_SECONDS", DEFAULT_SLOT_LEASE_SECONDS))
+
+
+def extract_http_status(exc: Exception) -> Optional[int]:
+    """HTTP status carried by an SDK/httpx/requests exception, if any"""
+    response = getattr(exc, "response", None)
+    candidates = [
+        getattr(response, "status_code", None) if response is not None else None,
+        getattr(exc, "status_code", None),
+        getattr(exc, "status", None),
+    ]
+    for candidate in candidates:
+        if candidate:
+            try:
+                return int(candidate)
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+def _network_exceptions():
+    network = [TimeoutError, ConnectionError]
+    try:
+        import httpx
+        network.append(httpx.TransportError)
+    except Exception:
+        pass
+    try:
+        from requests import exceptions as requests_exceptions
+        network.extend([requests_exceptions.ConnectionError, requests_exceptions.Timeout])
+    except Exception:
+        pass
+    try:
+        from google.api_core import exceptions as google_exceptions
+        network.extend([
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.TooManyRequests,
+            google_exceptions.InternalServerError,
+        ])
+    except Exception:
+        pass
+    return tuple(network)
+
+
+NETWORK_EXCEPTIONS = _network_exceptions()
+
+
+def is_provider_failure(exc: BaseException) -> bool:
+    """Failures that say the provider is degraded (and count toward opening the circuit)"""
+    status_code = extract_http_status(exc)
+    if status_code == 429 or (status_code and status_code >= 500):
+        return True
+    return isinstance(exc, NETWORK_EXCEPTIONS)
+
+
+def _increment(key: str, ttl_seconds: int) -> int:
+    cache.add(key, 0, timeout=ttl_seconds)
+    return cache.incr(key)
+
+
+def _record_rejection(provider: str) -> None:
+    try:
+        _increment(_key(provider, "rejected"), REJECTED_TTL_SECONDS)
+    except Exception:
+        pass
+
+
+def record_deferral(provider: str) -> None:
+    """Count a task deferred because the provider was unavailable (shown in traffic_monitor)"""
+    try:
+        _increment(_key(provider, "deferred"), REJECTED_TTL_SECONDS)
+    except Exception:
+        pass
+
+
+def _open_circuit(provider: str) -> None:
+    open_seconds = _open_seconds()
+    # Outlives the open period so the half-open state is visible until a probe finishes
+    cache.set(_key(provider, "open_until"), time.time() + open_seconds, timeout=open_seconds + _slot_lease())
+    cache.delete_many([_key(provider, "failures"), _key(provider, "probe")])
+    logger.warning("Provider circuit opened", extra={"provider": provider, "open_seconds": open_seconds})
+
+
+def _before_call(provider: str) -> bool:
+    """Raise while the circuit is open; returns True when this call is the half-open probe"""
+    try:
+        open_until = cache.get(_key(provider, "open_until"))
+        if open_until is None:
+            return False
+        remaining = float(open_until) - time.time()
+        if remaining <= 0 and cache.add(_key(provider, "probe"), 1, timeout=_slot_lease()):
+            logger.info("Provider circuit half-open, probing", extra={"provider": provider})
+            return True
+    except Exception:
+        logger.debug("Provider breaker state unavailable for %s", provider)
+        return False
+    _record_rejection(provider)
+    raise ProviderUnavailable(provider, remaining if remaining > 0 else _open_seconds())
+
+
+def _after_call(provider: str, probe: bool, exc: Optional[BaseException] = None) -> None:
+    try:
+        if exc is not None and is_provider_failure(exc):
+            if probe or _increment(_key(provider, "failures"), _window_seconds()) >= _failure_threshold():
+                _open_circuit(provider)
+        elif probe:
+            cache.delete_many([
+                _key(provider, "open_until"), _key(provider, "probe"), _key(provider, "failures"),
+            ])
+            logger.info("Provider circuit closed", extra={"provider": provider})
+    except Exception:
+        logger.debug("Unable to update provider breaker for %s", provider)
+
+
+def _try_acquire_slot(provider: str, token: str):
+    """Slot key now held with token, None when all slots are busy, False when unlimited/unavailable"""
+    limit = _max_concurrency(provider)
+    if limit <= 0:
+        return False
+    try:
+        offset = random.randrange(limit)
+        for index in range(limit):
+            key = _key(provider, "slot", (offset + index) % limit)
+            if cache.add(key, token, timeout=_slot_lease()):
+                return key
+    except Exception:
+        logger.debug("Provider concurrency slots unavailable for %s", provider)
+        return False
+    return None
+
+
+def _release_slot(slot, token: str) -> None:
+    if not slot:
+        return
+    try:
+        # Only free the slot if its lease has not expired and been taken by another caller
+        if cache.get(slot) == token:
+            cache.delete(slot)
+    except Exception:
+        pass
+
+
+def _saturated(provider: str) -> ProviderUnavailable:
+    _record_rejection(provider)
+    return ProviderUnavailable(provider, _acquire_timeout(), reason="concurrency_limit")
+
+
+def acquire_slot(provider: str, token: str):
+    deadline = time.monotonic() + _acquire_timeout()
+    delay = SLOT_POLL_INITIAL_SECONDS
+    while True:
+        slot = _try_acquire_slot(provider, token)
+        if slot is not None:
+            return slot
+        if time.monotonic() >= deadline:
+            raise _saturated(provider)
+        time.sleep(delay)
+        delay = min(delay * 2, SLOT_POLL_MAX_SECONDS)
+
+
+async def aacquire_slot(provider: str, token: str):
+    deadline = time.monotonic() + _acquire_timeout()
+    delay = SLOT_POLL_INITIAL_SECONDS
+    while True:
+        slot = await sync_to_async(_try_acquire_slot)(provider, token)
+        if slot is not None:
+            return slot
+        if time.monotonic() >= deadline:
+            raise _saturated(provider)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, SLOT_POLL_MAX_SECONDS)
+
+
+@contextmanager
+def provider_call(provider: str):
+    """
+    Guard one provider request
+
+    Raises ProviderUnavailable before the request when the circuit is open or
+    no slot frees up in time. Exceptions from the body are re-raised after
+    being counted against the breaker.
+    """
+    probe = _before_call(provider)
+    token = uuid.uuid4().hex
+    try:
+        slot = acquire_slot(provider, token)
+    except ProviderUnavailable:
+        if probe:
+            cache.delete(_key(provider, "probe"))
+        raise
+    try:
+        yield
+    except Exception as exc:
+        _after_call(provider, probe, exc)
+        raise
+    else:
+        _after_call(provider, probe)
+    finally:
+        _release_slot(slot, token)
+
+
+@asynccontextmanager
+async def aprovider_call(provider: str):
+    """Async variant of provider_call (cancellation releases the slot but is not counted as a failure)"""
+    probe = await sync_to_async(_before_call)(provider)
+    token = uuid.uuid4().hex
+    try:
+        slot = await aacquire_slot(provider, token)
+    except ProviderUnavailable:
+        if probe:
+            await sync_to_async(cache.delete)(_key(provider, "probe"))
+        raise
+    try:
+        yield
+    except Exception as exc:
+        await sync_to_async(_after_call)(provider, probe, exc)
+        raise
+    except BaseException:
+        if probe:
+            # Let the next caller probe instead of waiting for the lease to expire
+            await asyncio.shield(sync_to_async(cache.delete)(_key(provider, "probe")))
+        raise
+    else:
+        await sync_to_async(_after_call)(provider, probe)
+    finally:
+        await asyncio.shield(sync_to_async(_release_slot)(slot, token))
+
+
+def breaker_state(provider: str) -> Dict[str, Any]:
+    limit = _max_concurrency(provider)
+    keys = {
+        'open_until': _key(provider, "open_until"),
+        'failures': _key(provider, "failures"),
+        'rejected': _key(provider, "rejected"),
+        'deferred': _key(provider, "deferred"),
+    }
+    slot_keys = [_key(provider, "slot", index) for index in range(max(limit, 0))]
+    try:
+        values = cache.get_many(list(keys.values()) + slot_keys)
+    except Exception:
+        return {"state": "unknown", "max_concurrency": limit}
+
+    open_until = values.get(keys['open_until'])
+    remaining = float(open_until) - time.time() if open_until is not None else 0.0
+    if open_until is None:
+        state = "closed"
+    elif remaining > 0:
+        state = "open"
+    else:
+        state = "half_open"
+    return {
+        "state": state,
+        "retry_after_seconds": round(max(remaining, 0.0), 1),
+        "recent_failures": int(values.get(keys['failures']) or 0),
+        "failure_threshold": _failure_threshold(),
+        "in_flight": sum(1 for key in slot_keys if key in values),
+        "max_concurrency": limit,
+        "rejected_calls_last_15m": int(values.get(keys['rejected']) or 0),
+        "deferred_tasks_last_15m": int(values.get(keys['deferred']) or 0),
+    }
+
+
+def get_breaker_states() -> Dict[str, Dict[str, Any]]:
+    return {provider: breaker_state(provider) for provider in PROVIDERS}
@@ -35,7 +35,8 @@ from common.throttles import (
     PublicInterviewSubmitThrottle,
     PublicInterviewTtsThrottle,
 )
-from interviews.tasks import process_complete_interview, transcribe_video_response
+from interviews.tasks import process_complete_interview, prepare_video_response_media, transcribe_video_response
+from interviews.live_transcription import pop_live_transcript
 from interviews.question_selection import select_questions_for_interview, select_questions_for_interview_with_metadata
 from interviews.services import enqueue_interview_processing, build_processing_status_payload
 from security.interview_tokens import extract_bearer_token, generate_interview_token, verify_interview_token
@@ -510,15 +511,28 @@ class PublicInterviewViewSet(viewsets.ModelViewSet):
             transcript_text = ""
             transcription_task_id = None
 
-            if getattr(settings, "STT_ENABLED", False):
+            # A live transcript streamed while recording makes batch STT unnecessary
+            live_transcript = None
+            if getattr(settings, "LIVE_TRANSCRIPTION_ENABLED", False):
+                live_transcript = pop_live_transcript(interview.id, question.id)
+            if live_transcript and live_transcript.get("transcript"):
+                transcript_text = live_transcript["transcript"]
+                video_response.transcript = transcript_text
+                video_response.save(update_fields=["transcript"])
+                # Batch STT is skipped, but later stages still need the probe and audio track
+                video_response_id = video_response.id
+                transaction.on_commit(lambda: prepare_video_response_media.delay(video_response_id))
+            elif getattr(settings, "STT_ENABLED", False):
                 if getattr(settings, "INTERVIEW_PROCESSING_SYNC", False):
                     try:
                         from interviews.deepgram_service import get_deepgram_service
+                        from interviews.media_service import get_stt_audio_path
 
                         deepgram_service = get_deepgram_service()
                         transcript_data = deepgram_service.transcribe_video(
                             video_response.video_file_path.path,
                             video_response_id=video_response.id,
+                            audio_path=get_stt_audio_path(video_response),
                         )
                         transcript_text = transcript_data.get("transcript", "") or ""
                         video_response.transcript = transcript_text
@@ -132,3 +132,103 @@ def compute_competency_scores(
         "role_profile": role_profile,
         "ai_recommendation_explanation": explanation,
     }
+
+
+DEFAULT_COMPETENCY = "communication"
+
+
+def recommendation_for_score(overall_score: float) -> str:
+    if overall_score >= 70:
+        return "pass"
+    if overall_score >= 50:
+        return "review"
+    return "fail"
+
+
+def competency_buckets(video_responses) -> Tuple[Dict[str, Tuple[float, int]], int, int]:
+    """
+    (scores_by_competency, total_responses, technical_issues_count) from loaded
+    VideoResponses; load them with select_related('question')
+
+    Scores use final_score (HR override, else AI score). Responses without a
+    score (technical issues) are counted but excluded from the buckets.
+    """
+    scores_by_competency: Dict[str, Tuple[float, int]] = {}
+    total_responses = 0
+    technical_issues_count = 0
+    for video_response in video_responses:
+        total_responses += 1
+        score = video_response.final_score
+        if score is None:
+            technical_issues_count += 1
+            continue
+        competency = getattr(video_response.question, "competency", None) or DEFAULT_COMPETENCY
+        bucket_total, bucket_count = scores_by_competency.get(competency, (0.0, 0))
+        scores_by_competency[competency] = (bucket_total + score, bucket_count + 1)
+    return scores_by_competency, total_responses, technical_issues_count
+
+
+def competency_buckets_from_db(interview_id: int) -> Tuple[Dict[str, Tuple[float, int]], int, int]:
+    """Same as competency_buckets, computed with one grouped query"""
+    from django.db.models import Count, FloatField, Q, Sum
+    from django.db.models.functions import Coalesce
+
+    from interviews.models import VideoResponse
+
+    rows = (
+        VideoResponse.objects.filter(interview_id=interview_id)
+        .values("question__competency")
+        .annotate(
+            total=Sum(Coalesce("hr_override_score", "ai_score", output_field=FloatField())),
+            scored=Count("id", filter=Q(hr_override_score__isnull=False) | Q(ai_score__isnull=False)),
+            responses=Count("id"),
+        )
+        .order_by()
+    )
+    scores_by_competency: Dict[str, Tuple[float, int]] = {}
+    total_responses = 0
+    technical_issues_count = 0
+    for row in rows:
+        total_responses += row["responses"]
+        technical_issues_count += row["responses"] - row["scored"]
+        if not row["scored"]:
+            continue
+        competency = row["question__competency"] or DEFAULT_COMPETENCY
+        bucket_total, bucket_count = scores_by_competency.get(competency, (0.0, 0))
+        scores_by_competency[competency] = (bucket_total + (row["total"] or 0.0), bucket_count + row["scored"])
+    return scores_by_competency, total_responses, technical_issues_count
+
+
+def build_interview_score(
+    scores_by_competency: Dict[str, Tuple[float, int]],
+    total_responses: int,
+    technical_issues_count: int,
+    role_code: str | None,
+) -> Dict[str, object]:
+    """Score payload stored on InterviewResult and used for the applicant status"""
+    if not scores_by_competency:
+        # Every response had a technical issue
+        return {
+            "overall_score": 0,
+            "recommendation": "technical_issue",
+            "total_responses": total_responses,
+            "technical_issues_count": technical_issues_count,
+            "all_technical_issues": True,
+            "raw_scores_per_competency": {},
+            "weighted_scores_per_competency": {},
+            "final_weighted_score": 0,
+            "weights_used": {},
+            "role_profile": "",
+            "ai_recommendation_explanation": "",
+        }
+
+    competency_score_data = compute_competency_scores(scores_by_competency, role_code)
+    overall_score = competency_score_data["final_weighted_score"]
+    return {
+        "overall_score": overall_score,
+        "recommendation": recommendation_for_score(overall_score),
+        "total_responses": total_responses,
+        "technical_issues_count": technical_issues_count,
+        "all_technical_issues": False,
+        **competency_score_data,
+    }
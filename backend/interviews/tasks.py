@@ -2,20 +2,39 @@
 Celery tasks for bulk interview processing
 """
 
-from celery import shared_task, group
+from celery import shared_task, group, chord
 from celery.exceptions import Retry
+from django.conf import settings
 from django.utils import timezone
-from django.db import transaction
+from django.db import OperationalError, transaction
 from django.core.cache import cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 import logging
+import math
+import threading
 import time
 import random
 
+from interviews.provider_guard import ProviderUnavailable, extract_http_status, record_deferral
+
 logger = logging.getLogger(__name__)
 
 RETRY_BASE_SECONDS = 60
 RETRY_MAX_SECONDS = 600
 RETRY_JITTER_SECONDS = 30
+PROVIDER_DEFER_JITTER_SECONDS = 15
+PROVIDER_DEFER_DEFAULT_MAX_RETRIES = 10
+# Deferrals per task id; Celery's request.retries counts them together with real failures
+PROVIDER_DEFER_COUNT_CACHE_KEY = "provider_deferrals:{task_id}"
+PROVIDER_DEFER_COUNT_TTL_SECONDS = 24 * 3600
+
+SCRIPT_DETECTION_DEFAULT_WORKERS = 4
+SCRIPT_DETECTION_DEFAULT_JOIN_TIMEOUT_SECONDS = 180
+
+FALLBACK_TRANSCRIPTION_DEFAULT_WORKERS = 4
+FALLBACK_TRANSCRIPTION_DEFAULT_TIMEOUT_SECONDS = 90
 
 
 def _build_transient_exceptions():
@@ -46,19 +65,7 @@ GUARD_HIT_TTL_SECONDS = 3600
 RETRY_COUNT_TTL_SECONDS = 900
 
 
-def _extract_http_status(exc: Exception):
-    response = getattr(exc, "response", None)
-    if response is not None:
-        status_code = getattr(response, "status_code", None)
-        if status_code:
-            return int(status_code)
-    status_code = getattr(exc, "status_code", None)
-    if status_code:
-        return int(status_code)
-    status_code = getattr(exc, "status", None)
-    if status_code:
-        return int(status_code)
-    return None
+_extract_http_status = extract_http_status
 
 
 def _is_non_retryable_provider_error(exc: Exception) -> bool:
@@ -110,14 +117,57 @@ def _mark_terminal_failure(interview, queue_entry, error_message: str):
         )
 
 
+def _provider_deferrals(self) -> int:
+    try:
+        return int(cache.get(PROVIDER_DEFER_COUNT_CACHE_KEY.format(task_id=self.request.id)) or 0)
+    except Exception:
+        return 0
+
+
+def _defer_for_provider(self, exc: ProviderUnavailable, target_id: int):
+    """
+    Re-queue the task for when the provider's circuit may close
+
+    Deferrals do not call the provider, so they are counted apart from real
+    failures and get their own (larger) cap; the jitter spreads waiting tasks
+    out so they do not all probe at once.
+    """
+    deferrals = _provider_deferrals(self)
+    max_defers = int(getattr(settings, "PROVIDER_DEFER_MAX_RETRIES", PROVIDER_DEFER_DEFAULT_MAX_RETRIES))
+    if deferrals >= max_defers:
+        logger.error("Provider %s still unavailable for task target %s, giving up", exc.provider, target_id)
+        raise exc
+    try:
+        cache.set(
+            PROVIDER_DEFER_COUNT_CACHE_KEY.format(task_id=self.request.id),
+            deferrals + 1,
+            timeout=PROVIDER_DEFER_COUNT_TTL_SECONDS,
+        )
+    except Exception:
+        logger.debug("Failed to record provider deferral for task target %s", target_id)
+    record_deferral(exc.provider)
+    delay = math.ceil(exc.retry_after) + random.randint(0, PROVIDER_DEFER_JITTER_SECONDS)
+    logger.warning(
+        "Deferring task target %s for %ss (%s %s)",
+        target_id,
+        delay,
+        exc.provider,
+        exc.reason,
+    )
+    # Our own caps decide; Celery's counter also includes the deferrals
+    raise self.retry(exc=exc, countdown=delay, max_retries=self.request.retries + 1)
+
+
 def _retry_with_backoff(self, exc: Exception, target_id: int, queue_entry=None):
+    if isinstance(exc, ProviderUnavailable):
+        _defer_for_provider(self, exc, target_id)
     if _is_non_retryable_provider_error(exc):
         logger.error("Non-retryable provider error for task target %s: %s", target_id, exc)
         raise
     if not _is_transient_error(exc):
         logger.error("Non-transient error for task target %s: %s", target_id, exc)
         raise
-    retries = self.request.retries
+    retries = self.request.retries - _provider_deferrals(self)
     max_retries = getattr(self, "max_retries", 3)
     if retries >= max_retries:
         logger.error("Max retries reached for task target %s", target_id)
@@ -131,7 +181,538 @@ def _retry_with_backoff(self, exc: Exception, target_id: int, queue_entry=None):
         retries + 1,
         max_retries,
     )
-    raise self.retry(exc=exc, countdown=delay)
+    raise self.retry(exc=exc, countdown=delay, max_retries=self.request.retries + 1)
+
+
+def _script_detection_error_result(error_message: str) -> dict:
+    return {'status': 'clear', 'risk_score': 0, 'data': {'error': error_message}}
+
+
+_detection_executor = None
+_detection_executor_mode = None
+_detection_executor_lock = threading.Lock()
+# Set once this worker fails to start child processes; later interviews use threads
+_process_pool_unavailable = False
+
+
+def _create_detection_executor(mode, max_workers):
+    from interviews.ai.script_detection import preload_face_detector
+
+    if mode == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=preload_face_detector)
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="script-detection",
+        initializer=preload_face_detector,
+    )
+
+
+def _get_detection_executor(mode=None):
+    """
+    The worker process's script detection pool, created on first use and kept
+    for later interviews so each pool worker parses the face cascade once.
+    """
+    global _detection_executor, _detection_executor_mode
+
+    if mode is None:
+        mode = (getattr(settings, "SCRIPT_DETECTION_EXECUTOR", "process") or "process").lower()
+    if mode == "process" and _process_pool_unavailable:
+        mode = "thread"
+    with _detection_executor_lock:
+        if _detection_executor is not None and _detection_executor_mode != mode:
+            _detection_executor.shutdown(wait=False, cancel_futures=True)
+            _detection_executor = None
+        if _detection_executor is None:
+            max_workers = max(
+                1, int(getattr(settings, "SCRIPT_DETECTION_MAX_WORKERS", SCRIPT_DETECTION_DEFAULT_WORKERS))
+            )
+            _detection_executor = _create_detection_executor(mode, max_workers)
+            _detection_executor_mode = mode
+        return _detection_executor
+
+
+def _recycle_detection_executor(executor):
+    """
+    Drop a pool whose workers are stuck on timed-out videos. Process workers are
+    terminated so they stop using CPU; the next interview gets a fresh pool.
+    """
+    global _detection_executor, _detection_executor_mode
+
+    with _detection_executor_lock:
+        if _detection_executor is executor:
+            _detection_executor = None
+            _detection_executor_mode = None
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.join(timeout=5)
+
+
+def _start_script_detection(video_responses, interview_id):
+    """
+    Submit script reading detection for every video to the shared worker pool.
+
+    OpenCV decoding is CPU-bound, so a process pool is used by default; a thread
+    pool is used when SCRIPT_DETECTION_EXECUTOR is "thread" or when the current
+    worker cannot spawn child processes. Returns futures keyed by video_response id.
+    """
+    from interviews.ai import detect_script_reading
+    from interviews.media_service import get_probed_fps
+
+    if not video_responses:
+        return {}
+
+    def submit_all(executor):
+        futures = {}
+        for vr in video_responses:
+            try:
+                video_path = vr.video_file_path.path
+            except Exception as exc:
+                futures[vr.id] = exc
+                continue
+            futures[vr.id] = executor.submit(detect_script_reading, video_path, fps=get_probed_fps(vr))
+        return futures
+
+    global _process_pool_unavailable
+
+    executor = _get_detection_executor()
+    try:
+        return submit_all(executor)
+    except BrokenProcessPool:
+        # A pool worker died (e.g. OOM-killed); start a fresh pool
+        _recycle_detection_executor(executor)
+        executor = _get_detection_executor()
+    except Exception as exc:
+        if isinstance(executor, ThreadPoolExecutor):
+            raise
+        logger.warning(
+            "Process pool unavailable for script detection; using threads",
+            extra={"interview_id": interview_id, "error": str(exc)},
+        )
+        _process_pool_unavailable = True
+        _recycle_detection_executor(executor)
+        executor = _get_detection_executor()
+    return submit_all(executor)
+
+
+def _cancel_script_detection(futures):
+    """Cancel detections that have not started (the shared pool itself stays up)"""
+    for future in futures.values():
+        if not isinstance(future, Exception):
+            future.cancel()
+
+
+def _collect_script_detection(futures, interview_id, timeout_seconds=None):
+    """
+    Join pending script detection futures; failures map to a 'clear' result with the error.
+
+    A detection still running at the deadline cannot be cancelled, so a process
+    pool is recycled (its workers terminated) instead of left decoding.
+    """
+    if timeout_seconds is None:
+        timeout_seconds = int(
+            getattr(
+                settings,
+                "SCRIPT_DETECTION_JOIN_TIMEOUT_SECONDS",
+                SCRIPT_DETECTION_DEFAULT_JOIN_TIMEOUT_SECONDS,
+            )
+        )
+    deadline = time.monotonic() + timeout_seconds
+    results = {}
+    stuck = False
+    for video_response_id, future in futures.items():
+        if isinstance(future, Exception):
+            error = str(future)
+        else:
+            try:
+                results[video_response_id] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                continue
+            except FutureTimeoutError:
+                stuck = not future.cancel() or stuck
+                error = "Script detection timed out"
+            except BrokenProcessPool as exc:
+                stuck = True
+                error = str(exc) or "Script detection worker died"
+            except Exception as exc:
+                error = str(exc)
+        logger.error(
+            "Script detection failed",
+            extra={"interview_id": interview_id, "video_response_id": video_response_id, "error": error},
+        )
+        results[video_response_id] = _script_detection_error_result(error)
+    executor = _detection_executor
+    if stuck and isinstance(executor, ProcessPoolExecutor):
+        logger.warning("Recycling script detection pool", extra={"interview_id": interview_id})
+        _recycle_detection_executor(executor)
+    return results
+
+
+def _transcribe_missing_videos(video_responses, interview_id, max_workers=None, timeout_seconds=None):
+    """
+    Fallback Deepgram transcription for videos the upload step did not finish.
+
+    Calls run on a bounded thread pool (FALLBACK_TRANSCRIPTION_MAX_WORKERS) with a
+    shared deadline (FALLBACK_TRANSCRIPTION_TIMEOUT_SECONDS); failures and
+    timeouts leave an empty transcript. All transcripts are written with one
+    bulk_update. If the Deepgram circuit rejected a call, ProviderUnavailable is
+    raised after that write so the task defers and retries only the rest.
+    """
+    from django.db import connection
+    from interviews.deepgram_service import get_deepgram_service
+    from interviews.media_service import get_stt_audio_path
+    from interviews.models import VideoResponse
+
+    if not video_responses:
+        return
+    if max_workers is None:
+        max_workers = int(
+            getattr(settings, "FALLBACK_TRANSCRIPTION_MAX_WORKERS", FALLBACK_TRANSCRIPTION_DEFAULT_WORKERS)
+        )
+    if timeout_seconds is None:
+        timeout_seconds = int(
+            getattr(settings, "FALLBACK_TRANSCRIPTION_TIMEOUT_SECONDS", FALLBACK_TRANSCRIPTION_DEFAULT_TIMEOUT_SECONDS)
+        )
+
+    logger.warning(
+        "Transcribing missing transcripts",
+        extra={
+            "interview_id": interview_id,
+            "stage": "transcribe_missing",
+            "count": len(video_responses),
+            "provider": "deepgram",
+            "max_workers": max_workers,
+        },
+    )
+    deepgram_service = get_deepgram_service()
+
+    def transcribe(vr):
+        try:
+            logger.info(
+                "Deepgram transcription request",
+                extra={"interview_id": interview_id, "video_response_id": vr.id, "provider": "deepgram"},
+            )
+            transcript_data = deepgram_service.transcribe_video(
+                vr.video_file_path.path,
+                video_response_id=vr.id,
+                audio_path=get_stt_audio_path(vr),
+            )
+            return transcript_data.get('transcript', '') or ''
+        finally:
+            # close_old_connections() keeps the connection when CONN_MAX_AGE > 0,
+            # and nothing reuses this thread's connection once the pool is gone
+            connection.close()
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(video_responses))),
+        thread_name_prefix="fallback-transcription",
+    )
+    unavailable = None
+    try:
+        futures = [(vr, executor.submit(transcribe, vr)) for vr in video_responses]
+        deadline = time.monotonic() + timeout_seconds
+        for vr, future in futures:
+            try:
+                vr.transcript = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                logger.info(
+                    "Deepgram transcription stored",
+                    extra={"interview_id": interview_id, "video_response_id": vr.id, "provider": "deepgram"},
+                )
+                continue
+            except FutureTimeoutError:
+                future.cancel()
+                error = "Transcription timed out"
+            except ProviderUnavailable as trans_error:
+                unavailable = trans_error
+                error = str(trans_error)
+            except Exception as trans_error:
+                error = str(trans_error)
+            logger.error(
+                "Deepgram transcription failed",
+                extra={
+                    "interview_id": interview_id,
+                    "video_response_id": vr.id,
+                    "provider": "deepgram",
+                    "error": error,
+                },
+            )
+            vr.transcript = ""
+    finally:
+        # Never wait on a hung provider call; its result is discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    VideoResponse.objects.bulk_update(video_responses, ['transcript'])
+    if unavailable is not None:
+        raise unavailable
+
+
+def _pipeline_mode() -> str:
+    return (getattr(settings, "INTERVIEW_PIPELINE_MODE", "monolithic") or "monolithic").strip().lower()
+
+
+def _run_batch_analysis(interview, video_responses):
+    """Analyze every stored transcript for the interview in one LLM call."""
+    from interviews import analysis_batcher
+    from interviews.ai_service import get_ai_service
+    from interviews.scoring import get_role_prompt_context
+
+    role = interview.position_type
+    role_name = role.name if role else None
+    role_code = role.code if role else None
+    role_context = role.description_context or role.description if role else None
+
+    prompt_context = get_role_prompt_context(role_code)
+    core_competencies = prompt_context.get("core_competencies") or None
+    role_profile = prompt_context.get("role_profile") or None
+
+    # Prepare data for BATCH LLM ANALYSIS (transcripts already stored)
+    transcripts_data = [
+        {
+            'video_id': vr.id,
+            'transcript': vr.transcript,
+            'question_text': vr.question.question_text,
+            'question_type': vr.question.question_type.name if vr.question.question_type else 'general',
+            'question_competency': vr.question.competency,
+        }
+        for vr in video_responses
+    ]
+
+    role_kwargs = {
+        'role_name': role_name,
+        'role_code': role_code,
+        'role_context': role_context,
+        'role_profile': role_profile,
+        'core_competencies': core_competencies,
+    }
+
+    if analysis_batcher.is_enabled():
+        # Share one LLM call with other interviews for the same position
+        analyses = analysis_batcher.analyze_in_microbatch(
+            transcripts_data,
+            analysis_batcher.microbatch_group_key(role.id if role else None, role_kwargs),
+            role_kwargs,
+            interview_id=interview.id,
+        )
+        if analyses is not None:
+            return analyses
+
+    logger.info(
+        "Running batch LLM analysis",
+        extra={"interview_id": interview.id, "stage": "llm_batch", "count": len(transcripts_data)},
+    )
+    ai_service = get_ai_service()
+    return ai_service.batch_analyze_transcripts(
+        transcripts_data,
+        interview_id=interview.id,
+        **role_kwargs,
+    )
+
+
+AI_ANALYSIS_UPDATE_FIELDS = [
+    'transcript_text',
+    'sentiment_score',
+    'confidence_score',
+    'speech_clarity_score',
+    'content_relevance_score',
+    'overall_score',
+    'recommendation',
+    'body_language_analysis',
+    'langchain_analysis_data',
+]
+VIDEO_ANALYSIS_FIELDS = ['ai_score', 'sentiment', 'processed', 'status']
+SCRIPT_READING_FIELDS = ['script_reading_status', 'script_reading_data']
+
+
+def _build_ai_analysis(video_response, analysis_result):
+    from interviews.models import AIAnalysis
+
+    return AIAnalysis(
+        video_response=video_response,
+        transcript_text=video_response.transcript,  # Already stored from upload
+        sentiment_score=analysis_result.get('sentiment_score', 50.0),
+        confidence_score=analysis_result.get('confidence_score', 50.0),
+        speech_clarity_score=analysis_result.get('speech_clarity_score', 50.0),
+        content_relevance_score=analysis_result.get('content_relevance_score', 50.0),
+        overall_score=analysis_result.get('overall_score', 50.0),
+        recommendation=analysis_result.get('recommendation', 'review'),
+        body_language_analysis={},
+        langchain_analysis_data={
+            'analysis_summary': analysis_result.get('analysis_summary', ''),
+            'raw_scores': analysis_result,
+        },
+    )
+
+
+def _save_video_analyses(interview_id, video_responses, analyses, script_detections=None, interview=None):
+    """
+    Persist per-video LLM analysis and script detection results.
+
+    All AIAnalysis rows are upserted with one bulk_create(update_conflicts=True)
+    and the VideoResponse fields with one bulk_update, in a single transaction.
+    When interview is given its authenticity flags are computed from the
+    in-memory script reading statuses and saved in the same transaction
+    (video_responses must then be all of the interview's responses).
+
+    When script_detections is None the script reading fields already stored on
+    each VideoResponse (chord mode) are left untouched.
+    """
+    from interviews.models import AIAnalysis, VideoResponse
+
+    analysis_rows = []
+    for video_response, analysis_result in zip(video_responses, analyses):
+        if script_detections is not None:
+            script_detection = script_detections.get(video_response.id) or _script_detection_error_result(
+                "Script detection unavailable"
+            )
+            video_response.script_reading_status = script_detection['status']
+            video_response.script_reading_data = script_detection['data']
+
+        video_response.processed = True
+        video_response.status = 'analyzed'
+        # Check if transcript is empty (technical issue)
+        if not video_response.transcript or len(video_response.transcript.strip()) == 0:
+            # For technical issues, don't create AI analysis, just flag the video
+            video_response.ai_score = None
+            video_response.sentiment = None
+            logger.warning(f"Video {video_response.id} has no transcript (technical issue)")
+            continue
+        analysis_rows.append(_build_ai_analysis(video_response, analysis_result))
+        video_response.ai_score = analysis_result.get('overall_score', 50.0)
+        video_response.sentiment = analysis_result.get('sentiment_score', 50.0)
+
+    video_fields = VIDEO_ANALYSIS_FIELDS + (SCRIPT_READING_FIELDS if script_detections is not None else [])
+    try:
+        with transaction.atomic():
+            AIAnalysis.objects.bulk_create(
+                analysis_rows,
+                update_conflicts=True,
+                unique_fields=['video_response'],
+                update_fields=AI_ANALYSIS_UPDATE_FIELDS,
+            )
+            VideoResponse.objects.bulk_update(video_responses, video_fields)
+            if interview is not None:
+                interview.apply_authenticity(vr.script_reading_status for vr in video_responses)
+                interview.save(update_fields=['authenticity_flag', 'authenticity_status'])
+    except OperationalError:
+        raise
+    except Exception as save_error:
+        logger.error(
+            "Bulk analysis save failed, saving videos individually",
+            extra={"interview_id": interview_id, "error": str(save_error)},
+        )
+        _save_video_analyses_individually(interview_id, video_responses, analysis_rows, video_fields, interview)
+        return
+    logger.info(
+        "Saved LLM analysis",
+        extra={"interview_id": interview_id, "count": len(analysis_rows)},
+    )
+
+
+def _save_video_analyses_individually(interview_id, video_responses, analysis_rows, video_fields, interview=None):
+    """Per-video fallback for _save_video_analyses: a failing video is marked failed, the rest are kept"""
+    from interviews.models import AIAnalysis
+
+    rows_by_video = {row.video_response_id: row for row in analysis_rows}
+    for video_response in video_responses:
+        row = rows_by_video.get(video_response.id)
+        try:
+            with transaction.atomic():
+                if row is not None:
+                    AIAnalysis.objects.update_or_create(
+                        video_response=video_response,
+                        defaults={field: getattr(row, field) for field in AI_ANALYSIS_UPDATE_FIELDS},
+                    )
+                video_response.save(update_fields=video_fields)
+        except Exception as save_error:
+            logger.error(
+                "Failed to save analysis",
+                extra={
+                    "interview_id": interview_id,
+                    "video_response_id": video_response.id,
+                    "error": str(save_error),
+                },
+            )
+            video_response.status = 'failed'
+            video_response.save(update_fields=['status'])
+    if interview is not None:
+        interview.check_authenticity()
+
+
+def _complete_interview_processing(interview, queue_entry, video_responses=None):
+    """
+    Scoring, result creation, status updates and notification.
+
+    The score is computed once (from video_responses when given) and reused
+    for the result and the applicant status.
+    """
+    interview_id = interview.id
+    # Authenticity flags are saved together with the analyses (_save_video_analyses)
+    logger.info("All video analyses complete", extra={"interview_id": interview_id, "stage": "score"})
+
+    logger.info("Calculating interview score", extra={"interview_id": interview_id, "stage": "score"})
+
+    # Calculate overall score
+    score_data = calculate_interview_score(interview_id, interview=interview, video_responses=video_responses)
+
+    # Create final result
+    create_interview_result(interview_id, score_data=score_data, interview=interview)
+
+    # Update interview status
+    interview.status = 'completed'
+    interview.completed_at = timezone.now()
+    interview.processing_status = "SUCCEEDED"
+    interview.processing_finished_at = timezone.now()
+    interview.save(update_fields=['status', 'completed_at', 'processing_status', 'processing_finished_at'])
+
+    # Update queue
+    if queue_entry:
+        queue_entry.status = 'completed'
+        queue_entry.completed_at = timezone.now()
+        queue_entry.save(update_fields=['status', 'completed_at'])
+
+    # Send notification (async)
+    try:
+        from notifications.tasks import send_result_notification
+        send_result_notification.delay(interview_id)
+    except Exception:
+        logger.exception("Failed to queue notification for interview %s", interview_id)
+
+
+def _dispatch_interview_chord(interview, video_responses):
+    """
+    Fan out per-video transcription and script detection, then fan in to
+    finalize_interview_analysis once every header task has finished.
+    """
+    header = [
+        transcribe_video_response.si(vr.id)
+        for vr in video_responses
+        if not vr.transcript
+    ]
+    header.extend(detect_script_reading_for_video.si(vr.id) for vr in video_responses)
+    # Without an errback a failed header task leaves the interview 'processing' for good
+    callback = finalize_interview_analysis.s(interview.id).on_error(fail_interview_pipeline.s(interview.id))
+    if header:
+        result = chord(header)(callback)
+    else:
+        result = callback.delay([])
+    logger.info(
+        "Interview pipeline dispatched",
+        extra={
+            "interview_id": interview.id,
+            "stage": "dispatch",
+            "pipeline_mode": "chord",
+            "header_tasks": len(header),
+            "finalize_task_id": getattr(result, "id", None),
+        },
+    )
+    return {
+        'status': 'dispatched',
+        'interview_id': interview.id,
+        'pipeline_mode': 'chord',
+        'header_tasks': len(header),
+    }
 
 
 @shared_task(
@@ -157,17 +738,21 @@ def process_complete_interview(self, interview_id):
     - Faster: Parallel transcription + Single API call for analysis
     - Cost-effective: Fewer API calls
     - Consistent: Uses same optimized logic as synchronous fallback
+
+    With INTERVIEW_PIPELINE_MODE="chord" this task only claims the interview and
+    fans out per-video transcription/script detection; finalize_interview_analysis
+    runs the batch analysis, scoring and result once they have all finished.
     """
-    from interviews.models import Interview, VideoResponse, AIAnalysis
+    from interviews.models import Interview
     from processing.models import ProcessingQueue
-    from interviews.ai_service import get_ai_service
-    from interviews.ai import detect_script_reading
     
     monotonic_start = time.monotonic()
     interview = None
     queue_entry = None
     lock_key = f"interview_processing_lock:{interview_id}"
     lock_acquired = False
+    detection_futures = {}
+    stage_timings = {}
 
     logger.info("Interview %s task start (task_id=%s)", interview_id, self.request.id)
 
@@ -190,7 +775,9 @@ def process_complete_interview(self, interview_id):
                     interview=interview,
                     processing_type='bulk_analysis'
                 ).latest('created_at')
-                if queue_entry.status in ['processing', 'completed']:
+                # A retry of this same task (deferral/backoff) left the entry 'processing'
+                is_own_retry = queue_entry.status == 'processing' and queue_entry.celery_task_id == self.request.id
+                if queue_entry.status in ['processing', 'completed'] and not is_own_retry:
                     _record_guard_hit(interview_id, f"queue_{queue_entry.status}")
                     return {'status': 'skipped', 'reason': f"queue_{queue_entry.status}"}
                 queue_entry.status = 'processing'
@@ -199,7 +786,7 @@ def process_complete_interview(self, interview_id):
                 queue_entry.save(update_fields=['status', 'started_at', 'celery_task_id'])
             except ProcessingQueue.DoesNotExist:
                 queue_entry = None
-                if interview.status == 'processing':
+                if interview.status == 'processing' and interview.processing_task_id != self.request.id:
                     _record_guard_hit(interview_id, "processing_no_queue")
                     return {'status': 'skipped', 'reason': 'processing'}
 
@@ -222,212 +809,69 @@ def process_complete_interview(self, interview_id):
         logger.info("AI analysis started", extra={"interview_id": interview_id, "stage": "start"})
         
         # Get all video responses
-        video_responses = list(interview.video_responses.all())
+        stage_start = time.monotonic()
+        video_responses = list(interview.video_responses.select_related('question__question_type'))
+        stage_timings['load_videos_ms'] = int((time.monotonic() - stage_start) * 1000)
         logger.info(
             "Video responses loaded",
             extra={"interview_id": interview_id, "stage": "load_videos", "count": len(video_responses)},
         )
+
+        if _pipeline_mode() == "chord":
+            return _dispatch_interview_chord(interview, video_responses)
+
+        # Script reading detection only needs the video files, so start it now and
+        # let the OpenCV work overlap the transcription fallback and the LLM call.
+        detection_start = time.monotonic()
+        detection_futures = _start_script_detection(video_responses, interview_id)
         
         # Check if transcripts are already available (from upload step)
-        from interviews.deepgram_service import get_deepgram_service
-        
         videos_needing_transcription = [vr for vr in video_responses if not vr.transcript]
         
         # Transcribe any videos that don't have transcripts yet (fallback)
+        stage_start = time.monotonic()
         if videos_needing_transcription:
-            logger.warning(
-                "Transcribing missing transcripts",
-                extra={
-                    "interview_id": interview_id,
-                    "stage": "transcribe_missing",
-                    "count": len(videos_needing_transcription),
-                    "provider": "deepgram",
-                },
-            )
-            deepgram_service = get_deepgram_service()
-            for vr in videos_needing_transcription:
-                try:
-                    logger.info(
-                        "Deepgram transcription request",
-                        extra={"interview_id": interview_id, "video_response_id": vr.id, "provider": "deepgram"},
-                    )
-                    transcript_data = deepgram_service.transcribe_video(
-                        vr.video_file_path.path,
-                        video_response_id=vr.id
-                    )
-                    vr.transcript = transcript_data['transcript']
-                    vr.save()
-                    logger.info(
-                        "Deepgram transcription stored",
-                        extra={"interview_id": interview_id, "video_response_id": vr.id, "provider": "deepgram"},
-                    )
-                except Exception as trans_error:
-                    logger.error(
-                        "Deepgram transcription failed",
-                        extra={
-                            "interview_id": interview_id,
-                            "video_response_id": vr.id,
-                            "provider": "deepgram",
-                            "error": str(trans_error),
-                        },
-                    )
-                    vr.transcript = ""
-                    vr.save()
-        
-        role = interview.position_type
-        role_name = role.name if role else None
-        role_code = role.code if role else None
-        role_context = role.description_context or role.description if role else None
-        from interviews.scoring import get_role_prompt_context
-
-        prompt_context = get_role_prompt_context(role_code)
-        core_competencies = prompt_context.get("core_competencies") or None
-        role_profile = prompt_context.get("role_profile") or None
-        role_profile = prompt_context.get("role_profile") or None
-
-        # Prepare data for BATCH LLM ANALYSIS (transcripts already stored)
-        transcripts_data = [
-            {
-                'video_id': vr.id,
-                'transcript': vr.transcript,
-                'question_text': vr.question.question_text,
-                'question_type': vr.question.question_type.name if vr.question.question_type else 'general',
-                'question_competency': vr.question.competency,
-            }
-            for vr in video_responses
-        ]
+            _transcribe_missing_videos(videos_needing_transcription, interview_id)
+        stage_timings['transcribe_missing_ms'] = int((time.monotonic() - stage_start) * 1000)
         
         # Analyze all transcripts in ONE API call
-        logger.info(
-            "Running batch LLM analysis",
-            extra={"interview_id": interview_id, "stage": "llm_batch", "count": len(transcripts_data)},
-        )
-        ai_service = get_ai_service()
-        analyses = ai_service.batch_analyze_transcripts(
-            transcripts_data,
-            interview_id=interview.id,
-            role_name=role_name,
-            role_code=role_code,
-            role_context=role_context,
-            role_profile=role_profile,
-            core_competencies=core_competencies,
-        )
-        
-        # Save LLM analysis results to database
-        for video_response, analysis_result in zip(video_responses, analyses):
-            try:
-                # Check if transcript is empty (technical issue)
-                is_technical_issue = not video_response.transcript or len(video_response.transcript.strip()) == 0
-                
-                # Detect script reading
-                try:
-                    script_detection = detect_script_reading(video_response.video_file_path.path)
-                except Exception as e:
-                    logger.error(
-                        "Script detection failed",
-                        extra={"interview_id": interview_id, "video_response_id": video_response.id, "error": str(e)},
-                    )
-                    script_detection = {'status': 'clear', 'risk_score': 0, 'data': {'error': str(e)}}
-                
-                with transaction.atomic():
-                    if is_technical_issue:
-                        # For technical issues, don't create AI analysis, just flag the video
-                        video_response.ai_score = None
-                        video_response.sentiment = None
-                        video_response.script_reading_status = script_detection['status']
-                        video_response.script_reading_data = script_detection['data']
-                        video_response.processed = True
-                        video_response.status = 'analyzed'
-                        video_response.save()
-                        logger.warning(f"Video {video_response.id} has no transcript (technical issue)")
-                    else:
-                        # Save AI analysis
-                        AIAnalysis.objects.update_or_create(
-                            video_response=video_response,
-                            defaults={
-                                'transcript_text': video_response.transcript,  # Already stored from upload
-                                'sentiment_score': analysis_result.get('sentiment_score', 50.0),
-                                'confidence_score': analysis_result.get('confidence_score', 50.0),
-                                'speech_clarity_score': analysis_result.get('speech_clarity_score', 50.0),
-                                'content_relevance_score': analysis_result.get('content_relevance_score', 50.0),
-                                'overall_score': analysis_result.get('overall_score', 50.0),
-                                'recommendation': analysis_result.get('recommendation', 'review'),
-                                'body_language_analysis': {},
-                                'langchain_analysis_data': {
-                                    'analysis_summary': analysis_result.get('analysis_summary', ''),
-                                    'raw_scores': analysis_result
-                                }
-                            }
-                        )
-                        
-                        # Update video_response with scores
-                        video_response.ai_score = analysis_result.get('overall_score', 50.0)
-                        video_response.sentiment = analysis_result.get('sentiment_score', 50.0)
-                        video_response.script_reading_status = script_detection['status']
-                        video_response.script_reading_data = script_detection['data']
-                        video_response.processed = True
-                        video_response.status = 'analyzed'
-                        video_response.save()
-                        logger.info(
-                            "Saved LLM analysis",
-                            extra={"interview_id": interview_id, "video_response_id": video_response.id},
-                        )
-            except Exception as save_error:
-                logger.error(
-                    "Failed to save analysis",
-                    extra={
-                        "interview_id": interview_id,
-                        "video_response_id": video_response.id,
-                        "error": str(save_error),
-                    },
-                )
-                video_response.status = 'failed'
-                video_response.save()
-        
-        logger.info("All video analyses complete", extra={"interview_id": interview_id, "stage": "authenticity"})
-        
-        # Check for script reading and update interview-level authenticity flag
-        interview.check_authenticity()
-        interview.refresh_from_db()
+        stage_start = time.monotonic()
+        analyses = _run_batch_analysis(interview, video_responses)
+        stage_timings['llm_batch_ms'] = int((time.monotonic() - stage_start) * 1000)
         
-        logger.info("Calculating interview score", extra={"interview_id": interview_id, "stage": "score"})
+        # Join script detection before saving; only the remaining wait is on the critical path.
+        stage_start = time.monotonic()
+        script_detections = _collect_script_detection(detection_futures, interview_id)
+        detection_futures = {}
+        stage_timings['script_detection_wait_ms'] = int((time.monotonic() - stage_start) * 1000)
+        stage_timings['script_detection_ms'] = int((time.monotonic() - detection_start) * 1000)
         
-        # Calculate overall score
-        calculate_interview_score(interview_id)
-        
-        # Create final result
-        create_interview_result(interview_id)
-        
-        # Update interview status
-        interview.status = 'completed'
-        interview.completed_at = timezone.now()
-        interview.processing_status = "SUCCEEDED"
-        interview.processing_finished_at = timezone.now()
-        interview.save(update_fields=['status', 'completed_at', 'processing_status', 'processing_finished_at'])
-        
-        # Update queue
-        if queue_entry:
-            queue_entry.status = 'completed'
-            queue_entry.completed_at = timezone.now()
-            queue_entry.save(update_fields=['status', 'completed_at'])
+        # Save LLM analysis results to database
+        stage_start = time.monotonic()
+        _save_video_analyses(interview_id, video_responses, analyses, script_detections, interview=interview)
+        stage_timings['save_ms'] = int((time.monotonic() - stage_start) * 1000)
         
-        # Send notification (async)
-        try:
-            from notifications.tasks import send_result_notification
-            send_result_notification.delay(interview_id)
-        except Exception:
-            logger.exception("Failed to queue notification for interview %s", interview_id)
+        stage_start = time.monotonic()
+        _complete_interview_processing(interview, queue_entry, video_responses)
+        stage_timings['score_ms'] = int((time.monotonic() - stage_start) * 1000)
         
         elapsed_ms = int((time.monotonic() - monotonic_start) * 1000)
         logger.info(
             "AI analysis complete",
-            extra={"interview_id": interview_id, "elapsed_ms": elapsed_ms, "stage": "complete"},
+            extra={
+                "interview_id": interview_id,
+                "elapsed_ms": elapsed_ms,
+                "stage": "complete",
+                "stage_timings": stage_timings,
+            },
         )
         
         return {
             'status': 'success',
             'interview_id': interview_id,
-            'videos_processed': len(video_responses)
+            'videos_processed': len(video_responses),
+            'elapsed_ms': elapsed_ms,
+            'stage_timings': stage_timings,
         }
         
     except Exception as e:
@@ -453,6 +897,7 @@ def process_complete_interview(self, interview_id):
                 logger.exception("Failed to mark terminal failure for interview %s", interview_id)
             raise retry_error
     finally:
+        _cancel_script_detection(detection_futures)
         if lock_acquired:
             try:
                 cache.delete(lock_key)
@@ -474,6 +919,7 @@ analyze_interview = process_complete_interview
 def transcribe_video_response(self, video_response_id):
     from interviews.models import VideoResponse
     from interviews.deepgram_service import get_deepgram_service
+    from interviews.media_service import get_stt_audio_path
 
     try:
         video_response = VideoResponse.objects.get(id=video_response_id)
@@ -481,6 +927,12 @@ def transcribe_video_response(self, video_response_id):
         logger.warning("VideoResponse %s not found for transcription", video_response_id)
         return {'status': 'missing', 'video_response_id': video_response_id}
 
+    # Probe + extract the compact STT audio track once; later stages reuse it even
+    # when the transcript came from elsewhere (e.g. the live transcription relay)
+    audio_path = get_stt_audio_path(video_response)
+    if video_response.transcript:
+        return {'status': 'skipped', 'video_response_id': video_response_id}
+
     try:
         logger.info(
             "Deepgram transcription request",
@@ -490,6 +942,7 @@ def transcribe_video_response(self, video_response_id):
         transcript_data = deepgram_service.transcribe_video(
             video_response.video_file_path.path,
             video_response_id=video_response.id,
+            audio_path=audio_path,
         )
         video_response.transcript = transcript_data.get('transcript', '') or ''
         video_response.save(update_fields=["transcript"])
@@ -514,6 +967,228 @@ def transcribe_video_response(self, video_response_id):
             return {'status': 'failed', 'video_response_id': video_response_id}
 
 
+@shared_task(
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=120,
+    time_limit=180,
+)
+def prepare_video_response_media(video_response_id):
+    """
+    Probe an uploaded answer and store its STT audio track.
+
+    Queued for answers that skip batch transcription (live transcripts), so
+    script detection still gets the probed frame rate.
+    """
+    from interviews.models import VideoResponse
+    from interviews.media_service import get_stt_audio_path
+
+    try:
+        video_response = VideoResponse.objects.get(id=video_response_id)
+    except VideoResponse.DoesNotExist:
+        logger.warning("VideoResponse %s not found for media preparation", video_response_id)
+        return {'status': 'missing', 'video_response_id': video_response_id}
+
+    get_stt_audio_path(video_response)
+    return {'status': 'success', 'video_response_id': video_response_id}
+
+
+@shared_task(
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=240,
+    time_limit=300,
+)
+def detect_script_reading_for_video(video_response_id):
+    """
+    Chord header task: run script reading detection for one video and store it.
+
+    Never raises, so a single bad video cannot fail the interview chord.
+    """
+    from interviews.models import VideoResponse
+    from interviews.ai import detect_script_reading
+    from interviews.media_service import get_probed_fps, get_stt_audio_path
+
+    try:
+        video_response = VideoResponse.objects.get(id=video_response_id)
+    except VideoResponse.DoesNotExist:
+        logger.warning("VideoResponse %s not found for script detection", video_response_id)
+        return {'status': 'missing', 'video_response_id': video_response_id}
+
+    # No-op when the upload already prepared the media; fills in the probe otherwise
+    get_stt_audio_path(video_response)
+    try:
+        detection = detect_script_reading(video_response.video_file_path.path, fps=get_probed_fps(video_response))
+    except Exception as exc:
+        logger.error(
+            "Script detection failed",
+            extra={"video_response_id": video_response_id, "error": str(exc)},
+        )
+        detection = _script_detection_error_result(str(exc))
+
+    video_response.script_reading_status = detection['status']
+    video_response.script_reading_data = detection['data']
+    video_response.save(update_fields=['script_reading_status', 'script_reading_data'])
+    return {
+        'status': 'success',
+        'video_response_id': video_response_id,
+        'script_reading_status': detection['status'],
+    }
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=300,
+    time_limit=360,
+)
+def finalize_interview_analysis(self, header_results, interview_id):
+    """
+    Chord callback: batch LLM analysis over the stored transcripts, then
+    scoring, result creation and notification. A retry only repeats this step.
+    """
+    from interviews.models import Interview
+    from processing.models import ProcessingQueue
+
+    monotonic_start = time.monotonic()
+    interview = None
+    queue_entry = None
+    lock_key = f"interview_processing_lock:{interview_id}"
+    lock_acquired = False
+    stage_timings = {}
+    failed_header_tasks = [
+        result for result in (header_results or [])
+        if isinstance(result, dict) and result.get('status') not in ('success', 'skipped', None)
+    ]
+
+    logger.info("Interview %s finalize start (task_id=%s)", interview_id, self.request.id)
+
+    try:
+        lock_acquired = cache.add(lock_key, "1", timeout=1800)
+        if not lock_acquired:
+            _record_guard_hit(interview_id, "lock_active")
+            return {'status': 'skipped', 'reason': 'lock_active'}
+
+        interview = Interview.objects.select_related('position_type').get(id=interview_id)
+        if interview.processing_status == "SUCCEEDED" or interview.status in ['completed', 'failed']:
+            _record_guard_hit(interview_id, "finalize_already_done")
+            return {'status': 'skipped', 'reason': interview.status}
+        queue_entry = (
+            ProcessingQueue.objects.filter(interview=interview, processing_type='bulk_analysis')
+            .order_by('-created_at')
+            .first()
+        )
+
+        if failed_header_tasks:
+            logger.warning(
+                "Interview pipeline header tasks failed",
+                extra={"interview_id": interview_id, "failed": failed_header_tasks},
+            )
+
+        stage_start = time.monotonic()
+        video_responses = list(interview.video_responses.select_related('question__question_type'))
+        stage_timings['load_videos_ms'] = int((time.monotonic() - stage_start) * 1000)
+
+        stage_start = time.monotonic()
+        analyses = _run_batch_analysis(interview, video_responses)
+        stage_timings['llm_batch_ms'] = int((time.monotonic() - stage_start) * 1000)
+
+        stage_start = time.monotonic()
+        _save_video_analyses(interview_id, video_responses, analyses, interview=interview)
+        stage_timings['save_ms'] = int((time.monotonic() - stage_start) * 1000)
+
+        stage_start = time.monotonic()
+        _complete_interview_processing(interview, queue_entry, video_responses)
+        stage_timings['score_ms'] = int((time.monotonic() - stage_start) * 1000)
+
+        elapsed_ms = int((time.monotonic() - monotonic_start) * 1000)
+        logger.info(
+            "AI analysis complete",
+            extra={
+                "interview_id": interview_id,
+                "elapsed_ms": elapsed_ms,
+                "stage": "complete",
+                "pipeline_mode": "chord",
+                "stage_timings": stage_timings,
+            },
+        )
+        return {
+            'status': 'success',
+            'interview_id': interview_id,
+            'videos_processed': len(video_responses),
+            'failed_header_tasks': len(failed_header_tasks),
+            'elapsed_ms': elapsed_ms,
+            'stage_timings': stage_timings,
+        }
+
+    except Exception as e:
+        if _is_non_retryable_provider_error(e):
+            logger.error(
+                "Non-retryable provider error",
+                extra={"interview_id": interview_id, "error": str(e)},
+            )
+            try:
+                _mark_terminal_failure(interview, queue_entry, str(e))
+            except Exception:
+                logger.exception("Failed to mark terminal failure for interview %s", interview_id)
+            return {'status': 'failed', 'interview_id': interview_id}
+        logger.error(f"Error finalizing interview {interview_id}: {str(e)}", exc_info=True)
+        try:
+            _retry_with_backoff(self, e, interview_id, queue_entry=queue_entry)
+        except Retry:
+            raise
+        except Exception as retry_error:
+            try:
+                _mark_terminal_failure(interview, queue_entry, str(e))
+            except Exception:
+                logger.exception("Failed to mark terminal failure for interview %s", interview_id)
+            raise retry_error
+    finally:
+        if lock_acquired:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                logger.debug("Failed to release interview processing lock %s", lock_key)
+
+
+@shared_task(ignore_result=True)
+def fail_interview_pipeline(request, exc, traceback, interview_id):
+    """
+    Chord error callback: a header task raised (or finalize could not be
+    scheduled), so finalize_interview_analysis will never run. Mark the
+    interview and its queue entry failed so it can be reprocessed.
+    """
+    from interviews.models import Interview
+    from processing.models import ProcessingQueue
+
+    logger.error(
+        "Interview pipeline chord failed",
+        extra={
+            "interview_id": interview_id,
+            "task_id": getattr(request, "id", None),
+            "error": str(exc),
+        },
+    )
+    try:
+        interview = Interview.objects.get(id=interview_id)
+        if interview.processing_status != "SUCCEEDED" and interview.status != 'completed':
+            queue_entry = (
+                ProcessingQueue.objects.filter(interview=interview, processing_type='bulk_analysis')
+                .order_by('-created_at')
+                .first()
+            )
+            _mark_terminal_failure(interview, queue_entry, f"Interview pipeline failed: {exc}")
+    except Interview.DoesNotExist:
+        logger.warning("Interview %s not found for pipeline failure", interview_id)
+    finally:
+        try:
+            cache.delete(f"interview_processing_lock:{interview_id}")
+        except Exception:
+            logger.debug("Failed to release interview processing lock for %s", interview_id)
+
+
 @shared_task(
     bind=True,
     max_retries=3,
@@ -539,6 +1214,7 @@ def analyze_single_video(self, video_response_id):
     from interviews.models import VideoResponse, AIAnalysis
     from interviews.ai_service import get_ai_service
     from interviews.ai import detect_script_reading
+    from interviews.media_service import get_probed_fps, get_stt_audio_path
     import traceback
     
     try:
@@ -557,7 +1233,11 @@ def analyze_single_video(self, video_response_id):
         
         # Step 1 & 2: Transcribe video
         logger.info("Transcribing video...")
-        transcript = ai_service.transcribe_video(video_path)
+        transcript = ai_service.transcribe_video(
+            video_path,
+            video_response_id=video_response.id,
+            audio_path=get_stt_audio_path(video_response),
+        )
         logger.info(f"Transcription complete: {len(transcript)} characters")
         
         # Step 3, 4, 5, 6: Analyze transcript
@@ -588,7 +1268,7 @@ def analyze_single_video(self, video_response_id):
         
         # Step 7: Script reading detection
         logger.info("Detecting script reading...")
-        script_detection = detect_script_reading(video_path)
+        script_detection = detect_script_reading(video_path, fps=get_probed_fps(video_response))
         logger.info(f"Script detection complete. Status: {script_detection['status']} (risk: {script_detection['risk_score']})")
         
         # Step 8: Store analysis results
@@ -649,7 +1329,7 @@ def analyze_single_video(self, video_response_id):
             raise
 
 
-def calculate_interview_score(interview_id):
+def calculate_interview_score(interview_id, interview=None, video_responses=None):
     """
     Aggregate all video analysis results
     
@@ -659,105 +1339,76 @@ def calculate_interview_score(interview_id):
     3. Calculate overall score
     4. Generate final recommendation
     
+    Pass the already-loaded interview and its video_responses (with
+    select_related('question')) to score without further queries; otherwise
+    the per-competency sums come from one grouped query.
+    
     Note: Videos with technical issues (None scores) are excluded from calculation
     """
     from interviews.models import Interview
+    from interviews.scoring import build_interview_score, competency_buckets, competency_buckets_from_db
     
     logger.info(f"Calculating overall score for interview {interview_id}")
     
-    interview = Interview.objects.get(id=interview_id)
-    video_responses = interview.video_responses.all()
+    if interview is None:
+        interview = Interview.objects.select_related('position_type').get(id=interview_id)
+    if video_responses is not None:
+        scores_by_competency, total_responses, technical_issues_count = competency_buckets(video_responses)
+    else:
+        scores_by_competency, total_responses, technical_issues_count = competency_buckets_from_db(interview_id)
     
-    if not video_responses.exists():
+    if not total_responses:
         logger.warning(f"No video responses found for interview {interview_id}")
         return None
     
-    # Aggregate by competency (using final_score which includes HR overrides)
-    total_weight = 0
-    technical_issues_count = 0
-    scores_by_competency = {}
-    
-    for video_response in video_responses:
-        # Use final_score property which returns HR override if exists, else AI score
-        score = video_response.final_score
-        
-        # Skip videos with technical issues (None scores)
-        if score is None:
-            technical_issues_count += 1
-            logger.warning(f"Video {video_response.id} has technical issue (no audio), excluding from score")
-            continue
-        
-        total_weight += 1.0
-
-        competency = getattr(video_response.question, "competency", None) or "communication"
-        bucket_total, bucket_count = scores_by_competency.get(competency, (0.0, 0))
-        scores_by_competency[competency] = (bucket_total + score, bucket_count + 1)
-    
-    # If all videos have technical issues, return special status
-    if total_weight == 0:
-        logger.warning(f"All videos for interview {interview_id} have technical issues")
-        return {
-            'overall_score': 0,
-            'recommendation': 'technical_issue',
-            'total_responses': video_responses.count(),
-            'technical_issues_count': technical_issues_count,
-            'all_technical_issues': True,
-            'raw_scores_per_competency': {},
-            'weighted_scores_per_competency': {},
-            'final_weighted_score': 0,
-            'weights_used': {},
-            'role_profile': '',
-            'ai_recommendation_explanation': '',
-        }
-    
-    from interviews.scoring import compute_competency_scores
-
-    competency_score_data = compute_competency_scores(
-        scores_by_competency=scores_by_competency,
+    score_data = build_interview_score(
+        scores_by_competency,
+        total_responses,
+        technical_issues_count,
         role_code=getattr(interview.position_type, "code", None),
     )
-    overall_score = competency_score_data["final_weighted_score"] if total_weight > 0 else 0
-    
-    # Determine recommendation
-    if overall_score >= 70:
-        recommendation = 'pass'
-    elif overall_score >= 50:
-        recommendation = 'review'
-    else:
-        recommendation = 'fail'
+    if score_data['all_technical_issues']:
+        logger.warning(f"All videos for interview {interview_id} have technical issues")
+        return score_data
     
-    logger.info(f"Interview {interview_id} overall score: {overall_score:.2f}, recommendation: {recommendation}")
+    logger.info(
+        f"Interview {interview_id} overall score: {score_data['overall_score']:.2f}, "
+        f"recommendation: {score_data['recommendation']}"
+    )
     if technical_issues_count > 0:
         logger.info(f"  Note: {technical_issues_count} video(s) excluded due to technical issues")
     
-    return {
-        'overall_score': overall_score,
-        'recommendation': recommendation,
-        'total_responses': video_responses.count(),
-        'technical_issues_count': technical_issues_count,
-        'all_technical_issues': False,
-        'raw_scores_per_competency': competency_score_data["raw_scores_per_competency"],
-        'weighted_scores_per_competency': competency_score_data["weighted_scores_per_competency"],
-        'final_weighted_score': competency_score_data["final_weighted_score"],
-        'weights_used': competency_score_data["weights_used"],
-        'role_profile': competency_score_data["role_profile"],
-        'ai_recommendation_explanation': competency_score_data["ai_recommendation_explanation"],
-    }
+    return score_data
+
+
+def update_applicant_status(applicant, recommendation):
+    """Move the applicant to passed / failed / under_review from a score recommendation"""
+    if recommendation == 'pass':
+        applicant.status = 'passed'
+    elif recommendation == 'fail':
+        applicant.status = 'failed'
+    else:
+        applicant.status = 'under_review'
+    applicant.save()
 
 
-def create_interview_result(interview_id):
+def create_interview_result(interview_id, score_data=None, interview=None):
     """
     Create InterviewResult entry
+    
+    score_data is the calculate_interview_score() result when the caller has
+    already computed it; it is only computed here when omitted.
     """
     from interviews.models import Interview
     from results.models import InterviewResult
     
     logger.info(f"Creating result entry for interview {interview_id}")
     
-    interview = Interview.objects.get(id=interview_id)
+    if interview is None:
+        interview = Interview.objects.select_related('applicant', 'position_type').get(id=interview_id)
     
-    # Calculate scores
-    score_data = calculate_interview_score(interview_id)
+    if score_data is None:
+        score_data = calculate_interview_score(interview_id, interview=interview)
     
     if not score_data:
         logger.error(f"Cannot create result - no score data for interview {interview_id}")
@@ -774,14 +1425,7 @@ def create_interview_result(interview_id):
     )
     
     # Update applicant status based on recommendation
-    applicant = interview.applicant
-    if score_data['recommendation'] == 'pass':
-        applicant.status = 'passed'
-    elif score_data['recommendation'] == 'fail':
-        applicant.status = 'failed'
-    else:
-        applicant.status = 'under_review'
-    applicant.save()
+    update_applicant_status(interview.applicant, score_data['recommendation'])
     
     logger.info(f"Result created for interview {interview_id}: {score_data['recommendation']}")
     
@@ -0,0 +1,186 @@
+"""
+Tests for cross-interview micro-batching of LLM analysis.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from interviews import analysis_batcher
+from interviews.ai_service import AIAnalysisService
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "microbatch-tests"}}
+ROLE = {"role_name": "Customer Service", "role_code": "CSR", "role_context": None, "role_profile": None, "core_competencies": None}
+
+
+def _items(interview_id, count=2):
+    return [
+        {
+            "video_id": interview_id * 10 + index,
+            "transcript": f"Interview {interview_id} answer {index}",
+            "question_text": f"Question {index}",
+            "question_type": "general",
+        }
+        for index in range(count)
+    ]
+
+
+def _echo_analyses(transcripts_data, **kwargs):
+    return [{"overall_score": item["video_id"], "recommendation": "review"} for item in transcripts_data]
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class MicroBatchTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = MagicMock()
+        self.service.batch_analyze_transcripts.side_effect = _echo_analyses
+        service_patch = patch.object(analysis_batcher, "get_ai_service", return_value=self.service)
+        service_patch.start()
+        self.addCleanup(service_patch.stop)
+
+    def _run_concurrently(self, requests, **kwargs):
+        results = {}
+
+        def run(interview_id, group):
+            results[interview_id] = analysis_batcher.analyze_in_microbatch(
+                _items(interview_id), group, ROLE, interview_id=interview_id, **kwargs
+            )
+
+        threads = [threading.Thread(target=run, args=request) for request in requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        return results
+
+    def test_interviews_in_the_same_group_share_one_call(self):
+        group = analysis_batcher.microbatch_group_key(1, ROLE)
+        results = self._run_concurrently([(1, group), (2, group), (3, group)], window_seconds=0.5)
+
+        self.assertEqual(self.service.batch_analyze_transcripts.call_count, 1)
+        self.assertEqual(len(self.service.batch_analyze_transcripts.call_args.args[0]), 6)
+        self.assertIsNone(self.service.batch_analyze_transcripts.call_args.kwargs["interview_id"])
+        for interview_id in (1, 2, 3):
+            self.assertEqual(
+                [analysis["overall_score"] for analysis in results[interview_id]],
+                [interview_id * 10, interview_id * 10 + 1],
+            )
+
+    def test_different_roles_are_not_combined(self):
+        other_role = dict(ROLE, role_code="IT")
+        self.assertNotEqual(
+            analysis_batcher.microbatch_group_key(1, ROLE), analysis_batcher.microbatch_group_key(1, other_role)
+        )
+        results = self._run_concurrently(
+            [(1, analysis_batcher.microbatch_group_key(1, ROLE)), (2, analysis_batcher.microbatch_group_key(2, ROLE))],
+            window_seconds=0.3,
+        )
+
+        self.assertEqual(self.service.batch_analyze_transcripts.call_count, 2)
+        self.assertEqual(results[2][0]["overall_score"], 20)
+
+    def test_token_budget_splits_calls(self):
+        group = analysis_batcher.microbatch_group_key(1, ROLE)
+        budget = analysis_batcher.estimate_tokens(_items(1))
+        results = self._run_concurrently([(1, group), (2, group)], window_seconds=0.3, token_budget=budget)
+
+        self.assertEqual(self.service.batch_analyze_transcripts.call_count, 2)
+        self.assertEqual(results[1][1]["overall_score"], 11)
+        self.assertEqual(results[2][1]["overall_score"], 21)
+
+    def test_failed_shared_call_returns_none_for_fallback(self):
+        self.service.batch_analyze_transcripts.side_effect = RuntimeError("quota")
+        group = analysis_batcher.microbatch_group_key(1, ROLE)
+
+        result = analysis_batcher.analyze_in_microbatch(_items(1), group, ROLE, interview_id=1, window_seconds=0)
+
+        self.assertIsNone(result)
+
+    def _abandon_slot(self, group):
+        # A writer that died (or whose cache.set failed) between incr and set
+        cache.add(analysis_batcher._key(group, "seq"), 0, timeout=None)
+        cache.incr(analysis_batcher._key(group, "seq"))
+
+    def test_unwritten_slot_is_waited_on_during_grace_period(self):
+        group = analysis_batcher.microbatch_group_key(1, ROLE)
+        self._abandon_slot(group)
+        cache.add(analysis_batcher._key(group, "seq"), 0, timeout=None)
+        slot = cache.incr(analysis_batcher._key(group, "seq"))
+        cache.set(analysis_batcher._key(group, "slot", slot), {"request_id": "late", "tokens": 10})
+
+        batch, _ = analysis_batcher._claim_pending(group, token_budget=1000)
+
+        self.assertEqual(batch, [])
+        self.assertEqual(cache.get(analysis_batcher._key(group, "claimed")), 0)
+
+    @override_settings(ANALYSIS_MICROBATCH_SLOT_GRACE_SECONDS=0)
+    def test_never_written_slot_does_not_block_later_requests(self):
+        group = analysis_batcher.microbatch_group_key(1, ROLE)
+        self._abandon_slot(group)
+
+        result = analysis_batcher.analyze_in_microbatch(
+            _items(2), group, ROLE, interview_id=2, window_seconds=0, result_timeout_seconds=2
+        )
+
+        self.assertEqual([analysis["overall_score"] for analysis in result], [20, 21])
+        self.assertEqual(self.service.batch_analyze_transcripts.call_count, 1)
+        self.assertEqual(cache.get(analysis_batcher._key(group, "claimed")), 2)
+
+    def test_shared_call_splits_usage_by_estimated_tokens(self):
+        group = analysis_batcher.microbatch_group_key(1, ROLE)
+        self._run_concurrently([(1, group), (2, group)], window_seconds=0.5)
+
+        shares = self.service.batch_analyze_transcripts.call_args.kwargs["usage_shares"]
+        self.assertEqual(
+            sorted(shares),
+            [(1, analysis_batcher.estimate_tokens(_items(1))), (2, analysis_batcher.estimate_tokens(_items(2)))],
+        )
+
+    def test_usage_rows_are_written_per_interview(self):
+        service = AIAnalysisService.__new__(AIAnalysisService)
+        with patch("monitoring.usage_buffer.record_usage") as record_usage:
+            service._log_token_usage(
+                operation_type="batch_analysis",
+                prompt="p" * 100,
+                response_text="r" * 10,
+                response_time=1.5,
+                predicted_input_tokens=101,
+                usage_shares=[(1, 3), (2, 1)],
+            )
+
+        rows = [call.kwargs for call in record_usage.call_args_list]
+        self.assertEqual([row["interview_id"] for row in rows], [1, 2])
+        self.assertEqual([row["predicted_input_tokens"] for row in rows], [76, 25])
+        self.assertEqual(sum(row["prompt_length"] for row in rows), 100)
+        self.assertEqual(sum(row["response_length"] for row in rows), 10)
+
+    def test_waiter_keeps_waiting_for_a_claimed_request(self):
+        def slow_analyses(transcripts_data, **kwargs):
+            time.sleep(0.8)
+            return _echo_analyses(transcripts_data)
+
+        self.service.batch_analyze_transcripts.side_effect = slow_analyses
+        group = analysis_batcher.microbatch_group_key(1, ROLE)
+        results = self._run_concurrently([(1, group), (2, group)], window_seconds=0.2, result_timeout_seconds=0.6)
+
+        # The non-leader timed out mid-call but was served by it instead of paying again
+        self.assertEqual(self.service.batch_analyze_transcripts.call_count, 1)
+        self.assertEqual(results[1][0]["overall_score"], 10)
+        self.assertEqual(results[2][0]["overall_score"], 20)
+
+    def test_leader_skips_withdrawn_request(self):
+        group = analysis_batcher.microbatch_group_key(1, ROLE)
+        cache.set(analysis_batcher._key("request", "gone"), {"items": _items(1), "interview_id": 1})
+        cache.add(analysis_batcher._key(group, "seq"), 0, timeout=None)
+        slot = cache.incr(analysis_batcher._key(group, "seq"))
+        cache.set(analysis_batcher._key(group, "slot", slot), {"request_id": "gone", "tokens": 10})
+        self.assertTrue(analysis_batcher._take_ownership("gone", "requester", 60))
+
+        batch, _ = analysis_batcher._claim_pending(group, token_budget=1000)
+
+        self.assertEqual(batch, [])
@@ -0,0 +1,108 @@
+"""
+Tests for the LLM analysis result cache.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from interviews import analysis_cache
+from interviews.ai_service import AIAnalysisService
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "analysis-cache-tests"}}
+
+
+def _analysis(score):
+    return {
+        "sentiment_score": score,
+        "confidence_score": score,
+        "speech_clarity_score": score,
+        "content_relevance_score": score,
+        "overall_score": score,
+        "recommendation": "pass" if score >= 70 else "review",
+        "analysis_summary": f"Scored {score}",
+    }
+
+
+def _response(payload):
+    return SimpleNamespace(text=json.dumps(payload), usage_metadata=None)
+
+
+def _item(index):
+    return {
+        "video_id": index,
+        "transcript": f"I handled the escalation by listening first ({index}).",
+        "question_text": f"Question {index}",
+        "question_type": "behavioral",
+        "question_competency": "communication",
+    }
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ANALYSIS_CACHE_ENABLED=True)
+class AnalysisCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = AIAnalysisService.__new__(AIAnalysisService)
+        self.service.model = MagicMock()
+        log_patch = patch.object(self.service, "_log_token_usage")
+        log_patch.start()
+        self.addCleanup(log_patch.stop)
+
+    def _analyze(self, transcript="I resolved the customer's billing issue step by step.", role_code="CSR"):
+        return self.service.analyze_transcript(
+            transcript, "Tell us about a difficult customer.", "behavioral", role_code=role_code,
+        )
+
+    def test_repeated_analysis_is_served_from_cache(self):
+        self.service.model.generate_content.return_value = _response(_analysis(82))
+
+        first = self._analyze()
+        second = self._analyze()
+
+        self.assertEqual(self.service.model.generate_content.call_count, 1)
+        self.assertEqual(first, second)
+        self._analyze(role_code="IT")
+        self.assertEqual(self.service.model.generate_content.call_count, 2)
+
+    def test_failed_analysis_is_not_cached(self):
+        self.service.model.generate_content.side_effect = [RuntimeError("quota"), _response(_analysis(75))]
+
+        failed = self._analyze()
+        recovered = self._analyze()
+
+        self.assertIn("error", failed)
+        self.assertEqual(recovered["overall_score"], 75)
+
+    def test_invalidation_forces_a_fresh_call(self):
+        self.service.model.generate_content.return_value = _response(_analysis(60))
+        self._analyze()
+
+        analysis_cache.invalidate_analysis_cache()
+        self._analyze()
+
+        self.assertEqual(self.service.model.generate_content.call_count, 2)
+        self.assertEqual(analysis_cache.get_analysis_cache_stats()["generation"], 1)
+
+    def test_batch_only_sends_uncached_items(self):
+        items = [_item(1), _item(2), _item(3)]
+        self.service.model.generate_content.return_value = _response([_analysis(80), _analysis(55)])
+        self.service.batch_analyze_transcripts(items[:2], interview_id=1)
+
+        self.service.model.generate_content.return_value = _response([_analysis(90)])
+        results = self.service.batch_analyze_transcripts(items, interview_id=1)
+
+        self.assertEqual([r["overall_score"] for r in results], [80, 55, 90])
+        retry_prompt = self.service.model.generate_content.call_args.args[0]
+        self.assertIn("Question 3", retry_prompt)
+        self.assertNotIn("Question 1", retry_prompt)
+
+        # A retried task finds every item cached and makes no LLM call
+        calls = self.service.model.generate_content.call_count
+        self.assertEqual(self.service.batch_analyze_transcripts(items, interview_id=1), results)
+        self.assertEqual(self.service.model.generate_content.call_count, calls)
+        stats = analysis_cache.get_analysis_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (5, 3))
@@ -0,0 +1,214 @@
+"""
+Tests for the asyncio provider clients exposed through the service singletons.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import httpx
+from django.test import SimpleTestCase, override_settings
+
+from interviews import async_clients
+from interviews.ai_service import AIAnalysisService
+from interviews.async_clients import AsyncDeepgramClient, AsyncGeminiClient, LoopLocalClient
+from interviews.deepgram_service import DeepgramTranscriptionService
+
+
+DEEPGRAM_RESPONSE = {
+    "metadata": {"request_id": "fake", "duration": 12.5, "channels": 1},
+    "results": {
+        "channels": [
+            {"alternatives": [{"transcript": "async answer", "confidence": 0.91, "words": []}]}
+        ]
+    },
+}
+
+
+def _gemini_payload(text, prompt_tokens=120, output_tokens=40):
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}]}}],
+        "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": output_tokens},
+    }
+
+
+class AsyncClientTestBase(SimpleTestCase):
+    def setUp(self):
+        handle, self.audio_path = tempfile.mkstemp(suffix=".ogg")
+        with os.fdopen(handle, "wb") as audio_file:
+            audio_file.write(os.urandom(200 * 1024))
+        self.addCleanup(os.unlink, self.audio_path)
+        self.requests = []
+
+    def _gemini_service(self, handler):
+        service = AIAnalysisService.__new__(AIAnalysisService)
+        transport = httpx.MockTransport(handler)
+        service._async_clients = LoopLocalClient(lambda: AsyncGeminiClient("test-key", transport=transport))
+        return service
+
+
+@override_settings(DEEPGRAM_API_KEY="test-key", DEEPGRAM_API_URL="", TRANSCRIPT_CACHE_ENABLED=False)
+class AsyncDeepgramTests(AsyncClientTestBase):
+    def test_stored_audio_is_streamed_and_parsed(self):
+        def handler(request):
+            self.requests.append(request)
+            return httpx.Response(200, json=DEEPGRAM_RESPONSE)
+
+        service = DeepgramTranscriptionService()
+        transport = httpx.MockTransport(handler)
+        service._async_clients = LoopLocalClient(lambda: AsyncDeepgramClient("test-key", transport=transport))
+
+        with patch.object(service, "_log_usage") as log_usage:
+            result = asyncio.run(service.atranscribe_video("unused.webm", video_response_id=7, audio_path=self.audio_path))
+
+        self.assertEqual(result["transcript"], "async answer")
+        self.assertEqual(result["duration"], 12.5)
+        request = self.requests[0]
+        self.assertEqual(request.url.path, "/v1/listen")
+        self.assertEqual(request.url.params["model"], "nova-2")
+        self.assertEqual(request.url.params["smart_format"], "true")
+        self.assertEqual(request.headers["Authorization"], "Token test-key")
+        self.assertEqual(request.headers["Content-Type"], "audio/ogg")
+        self.assertEqual(request.headers.get("Transfer-Encoding"), "chunked")
+        self.assertEqual(len(request.content), 200 * 1024)
+        log_usage.assert_called_once()
+        self.assertEqual(log_usage.call_args.kwargs["video_response_id"], 7)
+
+    def test_provider_error_is_logged_and_raised(self):
+        service = DeepgramTranscriptionService()
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        service._async_clients = LoopLocalClient(lambda: AsyncDeepgramClient("test-key", transport=transport))
+
+        with patch.object(service, "_log_usage") as log_usage:
+            with self.assertRaises(Exception):
+                asyncio.run(service.atranscribe_video("unused.webm", audio_path=self.audio_path))
+
+        self.assertFalse(log_usage.call_args.kwargs["success"])
+
+
+@override_settings(ANALYSIS_CACHE_ENABLED=False, TRANSCRIPT_CACHE_ENABLED=False)
+class AsyncGeminiTests(AsyncClientTestBase):
+    def test_batch_analysis_uses_reported_token_usage(self):
+        analyses = [
+            {
+                "sentiment_score": score,
+                "confidence_score": score,
+                "speech_clarity_score": score,
+                "content_relevance_score": score,
+                "overall_score": score,
+                "recommendation": recommendation,
+                "analysis_summary": "ok",
+            }
+            for score, recommendation in ((80, "pass"), (40, "fail"))
+        ]
+
+        def handler(request):
+            self.requests.append(request)
+            return httpx.Response(200, json=_gemini_payload(json.dumps(analyses)))
+
+        service = self._gemini_service(handler)
+        transcripts = [
+            {"transcript": "first answer", "question_text": "Q1", "question_type": "general"},
+            {"transcript": "second answer", "question_text": "Q2", "question_type": "general"},
+        ]
+        with patch.object(service, "_log_token_usage") as log_usage:
+            result = asyncio.run(service.abatch_analyze_transcripts(transcripts, interview_id=3))
+
+        self.assertEqual(result, analyses)
+        body = json.loads(self.requests[0].content)
+        self.assertEqual(body["generationConfig"]["responseMimeType"], "application/json")
+        self.assertIn("=== RESPONSE 2 ===", body["contents"][0]["parts"][0]["text"])
+        usage = log_usage.call_args.kwargs["response_obj"].usage_metadata
+        self.assertEqual((usage.prompt_token_count, usage.candidates_token_count), (120, 40))
+
+    def test_audio_transcription_polls_and_deletes_remote_file(self):
+        states = iter(["PROCESSING", "ACTIVE"])
+
+        def handler(request):
+            self.requests.append((request.method, request.url.path))
+            if request.url.path == "/upload/v1beta/files":
+                if request.headers.get("X-Goog-Upload-Command") == "start":
+                    return httpx.Response(200, headers={"x-goog-upload-url": "https://upload.test/session/1"})
+            if request.url.path == "/session/1":
+                self.assertEqual(len(request.content), 200 * 1024)
+                return httpx.Response(200, json={"file": {"name": "files/abc", "uri": "gs://abc",
+                                                          "mimeType": "audio/ogg", "state": "PROCESSING"}})
+            if request.method == "GET":
+                return httpx.Response(200, json={"name": "files/abc", "uri": "gs://abc",
+                                                 "mimeType": "audio/ogg", "state": next(states)})
+            if request.method == "DELETE":
+                return httpx.Response(200, json={})
+            return httpx.Response(200, json=_gemini_payload("  hello world  "))
+
+        service = self._gemini_service(handler)
+        with override_settings(GEMINI_UPLOAD_POLL_INITIAL_SECONDS=0.001), \
+                patch.object(service, "_log_token_usage"):
+            transcript = asyncio.run(service.atranscribe_audio_file(self.audio_path, video_response_id=5))
+
+        self.assertEqual(transcript, "hello world")
+        self.assertIn(("DELETE", "/v1beta/files/abc"), self.requests)
+        self.assertEqual(self.requests.count(("GET", "/v1beta/files/abc")), 2)
+
+    @override_settings(GEMINI_UPLOAD_POLL_INITIAL_SECONDS=0.001, GEMINI_UPLOAD_POLL_MAX_SECONDS=0.001,
+                       GEMINI_UPLOAD_MAX_WAIT_SECONDS=0.05)
+    def test_file_wait_honours_upload_poll_settings(self):
+        def handler(request):
+            self.requests.append((request.method, request.url.path))
+            return httpx.Response(200, json={"name": "files/abc", "state": "PROCESSING"})
+
+        async def run():
+            client = AsyncGeminiClient("test-key", transport=httpx.MockTransport(handler))
+            try:
+                await client.wait_for_file({"name": "files/abc", "state": "PROCESSING"})
+            finally:
+                await client.aclose()
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(run())
+        self.assertGreater(len(self.requests), 2)
+
+    def test_cancellation_still_deletes_remote_file(self):
+        async def run():
+            started = asyncio.Event()
+
+            async def handler(request):
+                self.requests.append((request.method, request.url.path))
+                if request.url.path == "/upload/v1beta/files":
+                    return httpx.Response(200, headers={"x-goog-upload-url": "https://upload.test/session/1"})
+                if request.url.path == "/session/1":
+                    return httpx.Response(200, json={"file": {"name": "files/abc", "uri": "gs://abc",
+                                                              "mimeType": "audio/ogg", "state": "ACTIVE"}})
+                if request.method == "DELETE":
+                    return httpx.Response(200, json={})
+                started.set()
+                await asyncio.sleep(30)
+                return httpx.Response(200, json=_gemini_payload("late"))
+
+            service = self._gemini_service(handler)
+            with patch.object(service, "_log_token_usage"):
+                task = asyncio.create_task(service.atranscribe_audio_file(self.audio_path))
+                await asyncio.wait_for(started.wait(), timeout=5)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+        asyncio.run(run())
+        self.assertIn(("DELETE", "/v1beta/files/abc"), self.requests)
+
+
+class LoopLocalClientTests(SimpleTestCase):
+    def test_client_is_reused_within_a_loop_and_recreated_per_loop(self):
+        holder = LoopLocalClient(lambda: AsyncGeminiClient("test-key"))
+
+        async def grab_twice():
+            first, second = holder.get(), holder.get()
+            await holder.aclose()
+            return first, second
+
+        first, second = asyncio.run(grab_twice())
+        third, _ = asyncio.run(grab_twice())
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertTrue(first.is_closed)
@@ -0,0 +1,112 @@
+"""
+Tests for vectorized batch rescoring of stored interview results.
+"""
+
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from applicants.models import Applicant
+from interviews import batch_rescoring
+from interviews.models import Interview, InterviewQuestion, VideoResponse
+from interviews.tasks import calculate_interview_score
+from interviews.type_models import PositionType, QuestionType
+from results.models import InterviewResult
+
+
+ANSWERS = {
+    "network_engineer": [("troubleshooting", 90.0, None), ("communication", 40.0, None), ("technical_reasoning", None, None)],
+    "customer_service": [("communication", 65.0, 80), ("customer_handling", 72.0, None), ("communication", 58.0, None)],
+    "unprofiled_role": [("sales_upselling", 55.0, None), ("troubleshooting", 85.0, None)],
+    "virtual_assistant": [("communication", None, None)],
+}
+
+
+class BatchRescoringTests(TestCase):
+    def setUp(self):
+        self.question_type, _ = QuestionType.objects.get_or_create(code="general", defaults={"name": "General"})
+        self.interviews = {}
+        for number, (code, answers) in enumerate(ANSWERS.items()):
+            position, _ = PositionType.objects.get_or_create(code=code, defaults={"name": code.title()})
+            applicant = Applicant.objects.create(
+                first_name="Rescore",
+                last_name=str(number),
+                email=f"rescore{number}@example.com",
+                phone=f"555000{number:04d}",
+                application_source="online",
+            )
+            interview = Interview.objects.create(applicant=applicant, position_type=position, status="completed")
+            for order, (competency, ai_score, hr_override) in enumerate(answers):
+                question = InterviewQuestion.objects.create(
+                    question_text=f"{code} question {order}",
+                    question_type=self.question_type,
+                    position_type=position,
+                    competency=competency,
+                    is_active=True,
+                    order=order,
+                )
+                VideoResponse.objects.create(
+                    interview=interview,
+                    question=question,
+                    video_file_path=f"video_responses/{code}_{order}.webm",
+                    duration=timedelta(seconds=30),
+                    transcript="answer",
+                    ai_score=ai_score,
+                    hr_override_score=hr_override,
+                )
+            # Stale stored score, as if the weights changed since
+            InterviewResult.objects.create(interview=interview, applicant=applicant, final_score=1.0, passed=True)
+            self.interviews[code] = interview
+
+    def test_vectorized_scores_match_per_interview_scoring(self):
+        matrix = batch_rescoring.load_competency_matrix()
+        scores = dict(zip(matrix.interview_ids.tolist(), batch_rescoring.compute_scores(matrix).tolist()))
+
+        for code, interview in self.interviews.items():
+            expected = calculate_interview_score(interview.id)["overall_score"]
+            self.assertAlmostEqual(scores[interview.id], expected, places=9, msg=code)
+
+    def test_dry_run_reports_diff_without_writing(self):
+        with self.assertNumQueries(1):
+            report = batch_rescoring.rescore_results(passing_threshold=70.0, dry_run=True)
+
+        self.assertEqual(report.interviews, 4)
+        self.assertEqual(report.changed, 4)
+        self.assertGreater(report.pass_flips, 0)
+        self.assertEqual(report.written, 0)
+        self.assertEqual(set(InterviewResult.objects.values_list("final_score", flat=True)), {1.0})
+
+    def test_changes_are_written_and_rerun_is_a_no_op(self):
+        report = batch_rescoring.rescore_results(passing_threshold=70.0)
+
+        self.assertEqual(report.written, 4)
+        for interview in self.interviews.values():
+            result = InterviewResult.objects.get(interview=interview)
+            expected = calculate_interview_score(interview.id)["overall_score"]
+            self.assertAlmostEqual(result.final_score, expected)
+            self.assertEqual(result.passed, expected >= 70.0)
+        self.assertEqual(batch_rescoring.rescore_results(passing_threshold=70.0).changed, 0)
+
+    def test_command_previews_custom_weights(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as weights_file:
+            json.dump({"technical_core": {"communication": 1.0}}, weights_file)
+        out = StringIO()
+
+        call_command(
+            "rescore_interview_results",
+            "--dry-run",
+            "--role-code", "network_engineer",
+            "--weights-file", weights_file.name,
+            "--passing-threshold", "50",
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn("1.00 ->   40.00", output)
+        self.assertIn("interviews/s", output)
+        self.assertIn("Dry run", output)
+        self.assertEqual(InterviewResult.objects.get(interview=self.interviews["network_engineer"]).final_score, 1.0)
@@ -0,0 +1,104 @@
+"""
+Tests for partial salvage of batch LLM analysis responses.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from interviews.ai_service import AIAnalysisService
+
+
+def _analysis(score, **extra):
+    return {
+        "sentiment_score": score,
+        "confidence_score": score,
+        "speech_clarity_score": score,
+        "content_relevance_score": score,
+        "overall_score": score,
+        "recommendation": "pass" if score >= 70 else "review",
+        "analysis_summary": f"Scored {score}",
+        **extra,
+    }
+
+
+def _response(payload):
+    return SimpleNamespace(text=json.dumps(payload), usage_metadata=None)
+
+
+def _items(count):
+    return [
+        {
+            "video_id": 100 + index,
+            "transcript": f"Answer number {index} with enough detail to score.",
+            "question_text": f"Question {index}",
+            "question_type": "behavioral",
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+@override_settings(ANALYSIS_CACHE_ENABLED=False)
+class BatchSalvageTests(SimpleTestCase):
+    def setUp(self):
+        self.service = AIAnalysisService.__new__(AIAnalysisService)
+        self.service.model = MagicMock()
+        log_patch = patch.object(self.service, "_log_token_usage")
+        self.log_usage = log_patch.start()
+        self.addCleanup(log_patch.stop)
+
+    def _operations(self):
+        return [call.kwargs["operation_type"] for call in self.log_usage.call_args_list]
+
+    def test_items_are_matched_by_response_index_not_position(self):
+        self.service.model.generate_content.return_value = _response([
+            _analysis(30, response_index=3),
+            _analysis(10, response_index=1),
+            _analysis(20, video_id=102),
+        ])
+
+        results = self.service.batch_analyze_transcripts(_items(3))
+
+        self.assertEqual([r["overall_score"] for r in results], [10, 20, 30])
+        self.assertNotIn("response_index", results[0])
+        self.assertEqual(self.service.model.generate_content.call_count, 1)
+        self.assertEqual(self._operations(), ["batch_analysis"])
+
+    def test_only_invalid_items_are_re_requested_in_one_follow_up(self):
+        broken = _analysis(0, response_index=2)
+        del broken["overall_score"]
+        self.service.model.generate_content.side_effect = [
+            _response([_analysis(81, response_index=1), broken, _analysis(63, response_index=3)]),
+            _response([_analysis(72, response_index=1)]),
+        ]
+
+        results = self.service.batch_analyze_transcripts(_items(3), interview_id=9)
+
+        self.assertEqual([r["overall_score"] for r in results], [81, 72, 63])
+        follow_up_prompt = self.service.model.generate_content.call_args_list[1].args[0]
+        self.assertIn("Question 2", follow_up_prompt)
+        self.assertNotIn("Question 1", follow_up_prompt)
+        self.assertNotIn("Question 3", follow_up_prompt)
+        self.assertEqual(self._operations(), ["batch_analysis", "batch_analysis_retry"])
+
+    def test_items_still_missing_after_follow_up_fall_back_individually(self):
+        self.service.model.generate_content.side_effect = [
+            _response([_analysis(90, response_index=1), _analysis(70, response_index=2)]),
+            RuntimeError("follow-up failed"),
+            _response(_analysis(55)),
+        ]
+
+        results = self.service.batch_analyze_transcripts(_items(3))
+
+        self.assertEqual([r["overall_score"] for r in results], [90, 70, 55])
+        self.assertEqual(self.service.model.generate_content.call_count, 3)
+        self.assertEqual(self._operations(), ["batch_analysis", "batch_analysis_retry", "analysis"])
+
+    def test_scores_are_clamped_like_single_analysis(self):
+        self.service.model.generate_content.return_value = _response([_analysis(140, response_index=1)])
+
+        results = self.service.batch_analyze_transcripts(_items(1))
+
+        self.assertEqual(results[0]["overall_score"], 100)
@@ -0,0 +1,178 @@
+"""
+Tests for streaming audio uploads to Deepgram against a local fake endpoint.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from interviews.deepgram_service import DeepgramTranscriptionService
+
+
+FAKE_RESPONSE = {
+    "metadata": {
+        "request_id": "fake",
+        "created": "2026-01-01T00:00:00Z",
+        "duration": 42.0,
+        "channels": 1,
+        "models": ["nova-2"],
+        "model_info": {},
+    },
+    "results": {
+        "channels": [
+            {
+                "alternatives": [
+                    {
+                        "transcript": "streamed answer",
+                        "confidence": 0.93,
+                        "words": [],
+                    }
+                ]
+            }
+        ]
+    },
+}
+
+
+class FakeDeepgramHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        received = 0
+        chunks = 0
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().strip().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                while size:
+                    data = self.rfile.read(min(size, 64 * 1024))
+                    received += len(data)
+                    size -= len(data)
+                self.rfile.readline()
+                chunks += 1
+        else:
+            remaining = int(self.headers.get("Content-Length", 0))
+            # Drain in small reads: the server shares the test's traced heap.
+            while remaining:
+                data = self.rfile.read(min(remaining, 64 * 1024))
+                if not data:
+                    break
+                received += len(data)
+                remaining -= len(data)
+                chunks += 1
+        self.server.requests.append(
+            {
+                "bytes": received,
+                "chunks": chunks,
+                "content_type": self.headers.get("Content-Type"),
+                "chunked": self.headers.get("Transfer-Encoding", "").lower() == "chunked",
+            }
+        )
+        body = json.dumps(FAKE_RESPONSE).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DeepgramStreamingTests(SimpleTestCase):
+    audio_size = 24 * 1024 * 1024
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDeepgramHandler)
+        cls.server.requests = []
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        handle, cls.audio_path = tempfile.mkstemp(suffix=".ogg")
+        with os.fdopen(handle, "wb") as audio_file:
+            block = os.urandom(1024 * 1024)
+            for _ in range(cls.audio_size // len(block)):
+                audio_file.write(block)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        os.remove(cls.audio_path)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.requests.clear()
+        settings_override = override_settings(
+            DEEPGRAM_API_KEY="test-key",
+            DEEPGRAM_API_URL=f"http://127.0.0.1:{self.server.server_address[1]}",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        log_patcher = patch.object(DeepgramTranscriptionService, "_log_usage")
+        log_patcher.start()
+        self.addCleanup(log_patcher.stop)
+        self.service = DeepgramTranscriptionService()
+
+    def test_stored_audio_is_streamed_with_bounded_memory(self):
+        tracemalloc.start()
+        started = time.monotonic()
+        try:
+            result = self.service.transcribe_video("unused.webm", video_response_id=1, audio_path=self.audio_path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(result["transcript"], "streamed answer")
+        request = self.server.requests[0]
+        self.assertEqual(request["bytes"], self.audio_size)
+        self.assertEqual(request["content_type"], "audio/ogg")
+        # A full read would hold the whole 24MB file; streaming holds a few chunks.
+        self.assertLess(peak, 4 * 1024 * 1024)
+        self.assertGreater(self.audio_size / elapsed, 1024 * 1024)
+
+    def test_ffmpeg_stdout_is_piped_without_temp_files(self):
+        stream_bytes = 5 * 1024 * 1024
+
+        def fake_encoder(video_file_path):
+            return subprocess.Popen(
+                ["head", "-c", str(stream_bytes), "/dev/zero"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+
+        with patch.object(self.service, "_open_audio_stream", side_effect=fake_encoder), patch(
+            "tempfile.NamedTemporaryFile"
+        ) as named_temp:
+            result = self.service.transcribe_video("answer.webm", video_response_id=2)
+
+        named_temp.assert_not_called()
+        self.assertEqual(result["transcript"], "streamed answer")
+        request = self.server.requests[0]
+        self.assertEqual(request["bytes"], stream_bytes)
+        self.assertTrue(request["chunked"])
+        self.assertGreater(request["chunks"], 1)
+
+    def test_encoder_failure_raises(self):
+        def failing_encoder(video_file_path):
+            return subprocess.Popen(
+                ["sh", "-c", "echo 'Invalid data found' >&2; exit 1"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+
+        with patch.object(self.service, "_open_audio_stream", side_effect=failing_encoder):
+            with self.assertRaisesMessage(Exception, "Invalid data found"):
+                self.service.transcribe_video("broken.webm", video_response_id=3)
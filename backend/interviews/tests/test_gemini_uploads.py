@@ -0,0 +1,157 @@
+"""
+Tests for the Gemini upload manager (backoff polling, upload reuse, background cleanup).
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from interviews import gemini_uploads
+from interviews.ai_service import AIAnalysisService
+
+
+def _remote(name, state):
+    return SimpleNamespace(name=name, state=SimpleNamespace(name=state))
+
+
+class FakeFilesClient:
+    """Stands in for the google.generativeai file functions"""
+
+    def __init__(self, processing_polls=0, final_state="ACTIVE"):
+        self.processing_polls = processing_polls
+        self.final_state = final_state
+        self.uploaded = []
+        self.polled = 0
+        self.deleted = []
+
+    def upload_file(self, path, mime_type=None):
+        name = f"files/{len(self.uploaded) + 1}"
+        self.uploaded.append(path)
+        return _remote(name, "PROCESSING" if self.processing_polls else self.final_state)
+
+    def get_file(self, name):
+        self.polled += 1
+        return _remote(name, "PROCESSING" if self.polled < self.processing_polls else self.final_state)
+
+    def delete_file(self, name):
+        self.deleted.append(name)
+
+
+@override_settings(
+    GEMINI_UPLOAD_POLL_INITIAL_SECONDS=0.5,
+    GEMINI_UPLOAD_POLL_MAX_SECONDS=4,
+    GEMINI_UPLOAD_MAX_WAIT_SECONDS=30,
+    GEMINI_UPLOAD_CACHE_TTL_SECONDS=900,
+    GEMINI_UPLOAD_CACHE_MAX_ENTRIES=2,
+)
+class GeminiUploadManagerTests(SimpleTestCase):
+    def setUp(self):
+        self.path = self._write(os.urandom(2048))
+        sleep_patch = patch.object(gemini_uploads.time, "sleep")
+        self.sleep = sleep_patch.start()
+        self.addCleanup(sleep_patch.stop)
+
+    def _write(self, data):
+        handle, path = tempfile.mkstemp(suffix=".ogg")
+        with os.fdopen(handle, "wb") as audio_file:
+            audio_file.write(data)
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def _manager(self, client):
+        manager = gemini_uploads.GeminiUploadManager(client=client)
+        self.addCleanup(manager.shutdown)
+        return manager
+
+    def test_polling_backs_off_exponentially(self):
+        client = FakeFilesClient(processing_polls=5)
+
+        remote = self._manager(client).upload(self.path)
+
+        self.assertEqual(remote.state.name, "ACTIVE")
+        self.assertEqual(client.polled, 5)
+        self.assertEqual([c.args[0] for c in self.sleep.call_args_list], [0.5, 1.0, 2.0, 4.0, 4.0])
+
+    def test_same_file_is_uploaded_once_per_process(self):
+        client = FakeFilesClient()
+        manager = self._manager(client)
+        copy = self._write(open(self.path, "rb").read())
+
+        first = manager.upload(self.path)
+        second = manager.upload(copy)
+
+        self.assertEqual(first.name, second.name)
+        self.assertEqual(len(client.uploaded), 1)
+        self.assertEqual(manager.stats()["reused"], 1)
+
+    def test_released_and_failed_files_are_deleted_in_background(self):
+        client = FakeFilesClient()
+        manager = self._manager(client)
+        remote = manager.upload(self.path)
+        manager.release(remote)
+
+        failing = FakeFilesClient(final_state="FAILED")
+        failing_manager = self._manager(failing)
+        with self.assertRaises(ValueError):
+            failing_manager.upload(self.path)
+
+        manager.shutdown()
+        failing_manager.shutdown()
+        self.assertEqual(client.deleted, [remote.name])
+        self.assertEqual(failing.deleted, ["files/1"])
+        self.assertEqual(manager.stats()["cached_files"], 0)
+
+    def test_evicted_uploads_are_deleted(self):
+        client = FakeFilesClient()
+        manager = self._manager(client)
+        paths = [self.path, self._write(b"second"), self._write(b"third")]
+
+        for path in paths:
+            manager.upload(path)
+        manager.shutdown()
+
+        self.assertEqual(client.deleted[0], "files/1")
+        self.assertCountEqual(client.deleted, ["files/1", "files/2", "files/3"])
+
+    @override_settings(GEMINI_UPLOAD_MAX_WAIT_SECONDS=0)
+    def test_processing_timeout_deletes_remote_file(self):
+        client = FakeFilesClient(processing_polls=100)
+        manager = self._manager(client)
+
+        with self.assertRaises(TimeoutError):
+            manager.upload(self.path)
+        manager.shutdown()
+
+        self.assertEqual(client.deleted, ["files/1"])
+
+
+class TranscriptionUploadReuseTests(SimpleTestCase):
+    def test_failed_generate_keeps_upload_for_retry(self):
+        handle, path = tempfile.mkstemp(suffix=".ogg")
+        with os.fdopen(handle, "wb") as audio_file:
+            audio_file.write(os.urandom(1024))
+        self.addCleanup(os.unlink, path)
+
+        client = FakeFilesClient()
+        manager = gemini_uploads.GeminiUploadManager(client=client)
+        self.addCleanup(manager.shutdown)
+        service = AIAnalysisService.__new__(AIAnalysisService)
+        service.model = MagicMock()
+        service.model.generate_content.side_effect = [
+            RuntimeError("503"),
+            SimpleNamespace(text=" Hello there ", usage_metadata=None),
+        ]
+
+        with patch.object(gemini_uploads, "get_upload_manager", return_value=manager), \
+                patch.object(service, "_log_token_usage"):
+            with self.assertRaises(RuntimeError):
+                service._transcribe_audio_file(path, 1, 0.0)
+            transcript = service._transcribe_audio_file(path, 1, 0.0)
+
+        manager.shutdown()
+        self.assertEqual(transcript, "Hello there")
+        self.assertEqual(len(client.uploaded), 1)
+        self.assertEqual(client.deleted, ["files/1"])
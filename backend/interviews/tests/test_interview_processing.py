@@ -0,0 +1,468 @@
+"""
+Tests for the bulk interview processing task (process_complete_interview).
+"""
+
+import os
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.db import connections
+from django.test import TestCase, override_settings
+
+from applicants.models import Applicant
+from interviews.models import AIAnalysis, Interview, InterviewQuestion, VideoResponse
+from interviews import scoring
+from interviews import tasks as interview_tasks
+from interviews.tasks import (
+    _collect_script_detection,
+    _complete_interview_processing,
+    _save_video_analyses,
+    _start_script_detection,
+    calculate_interview_score,
+    detect_script_reading_for_video,
+    fail_interview_pipeline,
+    finalize_interview_analysis,
+    process_complete_interview,
+)
+from interviews.provider_guard import ProviderUnavailable
+from interviews.type_models import PositionType, QuestionType
+from processing.models import ProcessingQueue
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _analysis(score=80.0):
+    return {
+        "sentiment_score": score,
+        "confidence_score": score,
+        "speech_clarity_score": score,
+        "content_relevance_score": score,
+        "overall_score": score,
+        "recommendation": "pass",
+        "analysis_summary": "Clear answer.",
+    }
+
+
+def _detection(status="clear", risk_score=0):
+    return {"status": status, "risk_score": risk_score, "data": {"gaze_at_camera_percent": 90.0}}
+
+
+def _pid_detection(video_path, **kwargs):
+    # Module level so the process pool can pickle it
+    return {"status": "clear", "risk_score": 0, "data": {"pid": os.getpid()}}
+
+
+def _hung_detection(video_path, **kwargs):
+    time.sleep(60)
+    return _detection()
+
+
+@override_settings(CACHES=LOCMEM_CACHES, SCRIPT_DETECTION_EXECUTOR="thread")
+class ProcessCompleteInterviewTestBase(TestCase):
+    """Shared fixtures: one interview with three transcribed answers."""
+
+    answer_count = 3
+
+    def setUp(self):
+        self.applicant = Applicant.objects.create(
+            first_name="Pipeline",
+            last_name="Test",
+            email="pipeline@example.com",
+            phone="5550001111",
+            application_source="online",
+        )
+        self.question_type, _ = QuestionType.objects.get_or_create(code="general", defaults={"name": "General"})
+        self.position_type, _ = PositionType.objects.get_or_create(
+            code="customer_service", defaults={"name": "Customer Service"}
+        )
+        self.interview = Interview.objects.create(
+            applicant=self.applicant,
+            position_type=self.position_type,
+            status="processing",
+        )
+        ProcessingQueue.objects.create(interview=self.interview, processing_type="bulk_analysis", status="queued")
+        self.video_responses = []
+        for i in range(self.answer_count):
+            question = InterviewQuestion.objects.create(
+                question_text=f"Question {i + 1}",
+                question_type=self.question_type,
+                position_type=self.position_type,
+                is_active=True,
+                order=i,
+            )
+            self.video_responses.append(
+                VideoResponse.objects.create(
+                    interview=self.interview,
+                    question=question,
+                    video_file_path=f"video_responses/test_{i}.webm",
+                    duration=timedelta(seconds=45),
+                    transcript=f"This is my detailed answer number {i + 1}.",
+                )
+            )
+        notification_patcher = patch("notifications.tasks.send_result_notification.delay")
+        notification_patcher.start()
+        self.addCleanup(notification_patcher.stop)
+
+    def run_task(self):
+        return process_complete_interview.apply(args=[self.interview.id]).result
+
+
+class ScriptDetectionOverlapTests(ProcessCompleteInterviewTestBase):
+    def test_detection_runs_while_llm_batch_is_in_flight(self):
+        detection_started = threading.Event()
+
+        def fake_detect(video_path, **kwargs):
+            detection_started.set()
+            return _detection()
+
+        def fake_batch(transcripts_data, **kwargs):
+            # The LLM call only returns once detection has started on the pool.
+            self.assertTrue(detection_started.wait(timeout=5))
+            return [_analysis() for _ in transcripts_data]
+
+        ai_service = MagicMock()
+        ai_service.batch_analyze_transcripts.side_effect = fake_batch
+        with patch("interviews.ai.detect_script_reading", side_effect=fake_detect), patch(
+            "interviews.ai_service.get_ai_service", return_value=ai_service
+        ):
+            result = self.run_task()
+
+        self.assertEqual(result["status"], "success")
+        for key in ("llm_batch_ms", "script_detection_ms", "script_detection_wait_ms", "save_ms", "score_ms"):
+            self.assertIn(key, result["stage_timings"])
+        for vr in VideoResponse.objects.filter(interview=self.interview):
+            self.assertEqual(vr.status, "analyzed")
+            self.assertEqual(vr.script_reading_status, "clear")
+
+    def test_detection_failure_is_isolated_per_video(self):
+        failing_path_suffix = "test_1.webm"
+
+        def fake_detect(video_path, **kwargs):
+            if video_path.endswith(failing_path_suffix):
+                raise RuntimeError("decoder crashed")
+            return _detection("suspicious", 40)
+
+        ai_service = MagicMock()
+        ai_service.batch_analyze_transcripts.side_effect = lambda data, **kwargs: [_analysis() for _ in data]
+        with patch("interviews.ai.detect_script_reading", side_effect=fake_detect), patch(
+            "interviews.ai_service.get_ai_service", return_value=ai_service
+        ):
+            result = self.run_task()
+
+        self.assertEqual(result["status"], "success")
+        failed = VideoResponse.objects.get(id=self.video_responses[1].id)
+        self.assertEqual(failed.script_reading_status, "clear")
+        self.assertEqual(failed.script_reading_data, {"error": "decoder crashed"})
+        flagged = VideoResponse.objects.get(id=self.video_responses[0].id)
+        self.assertEqual(flagged.script_reading_status, "suspicious")
+        self.interview.refresh_from_db()
+        self.assertTrue(self.interview.authenticity_flag)
+
+
+@override_settings(SCRIPT_DETECTION_EXECUTOR="process", SCRIPT_DETECTION_MAX_WORKERS=2)
+class ProcessPoolScriptDetectionTests(ProcessCompleteInterviewTestBase):
+    def setUp(self):
+        super().setUp()
+        self._reset_pool()
+        self.addCleanup(self._reset_pool)
+
+    def _reset_pool(self):
+        if interview_tasks._detection_executor is not None:
+            interview_tasks._recycle_detection_executor(interview_tasks._detection_executor)
+
+    def test_pool_is_shared_across_interviews(self):
+        with patch("interviews.ai.detect_script_reading", _pid_detection):
+            first = _collect_script_detection(_start_script_detection(self.video_responses, 1), 1, timeout_seconds=30)
+            executor = interview_tasks._detection_executor
+            second = _collect_script_detection(_start_script_detection(self.video_responses, 2), 2, timeout_seconds=30)
+
+        self.assertIsInstance(executor, interview_tasks.ProcessPoolExecutor)
+        self.assertIs(interview_tasks._detection_executor, executor)
+        pids = {result["data"]["pid"] for result in list(first.values()) + list(second.values())}
+        self.assertNotIn(os.getpid(), pids)
+        self.assertLessEqual(len(pids), 2)
+
+    def test_timed_out_workers_are_terminated(self):
+        with patch("interviews.ai.detect_script_reading", _hung_detection):
+            futures = _start_script_detection(self.video_responses, 1)
+            workers = list(interview_tasks._detection_executor._processes.values())
+            started = time.monotonic()
+            results = _collect_script_detection(futures, 1, timeout_seconds=1)
+
+        self.assertLess(time.monotonic() - started, 15)
+        self.assertEqual({r["data"]["error"] for r in results.values()}, {"Script detection timed out"})
+        self.assertIsNone(interview_tasks._detection_executor)
+        self.assertTrue(workers)
+        self.assertFalse(any(process.is_alive() for process in workers))
+
+        with patch("interviews.ai.detect_script_reading", _pid_detection):
+            results = _collect_script_detection(_start_script_detection(self.video_responses, 2), 2, timeout_seconds=30)
+        self.assertTrue(all("pid" in result["data"] for result in results.values()))
+
+
+class ChordPipelineTests(ProcessCompleteInterviewTestBase):
+    @override_settings(INTERVIEW_PIPELINE_MODE="chord")
+    def test_chord_mode_fans_out_per_video_tasks(self):
+        VideoResponse.objects.filter(id=self.video_responses[0].id).update(transcript="")
+        with patch("interviews.tasks.chord") as chord_mock:
+            result = self.run_task()
+
+        self.assertEqual(result["status"], "dispatched")
+        header = chord_mock.call_args.args[0]
+        task_names = sorted(sig.task.rsplit(".", 1)[-1] for sig in header)
+        self.assertEqual(task_names.count("transcribe_video_response"), 1)
+        self.assertEqual(task_names.count("detect_script_reading_for_video"), self.answer_count)
+        chord_mock.return_value.assert_called_once()
+        queue_entry = ProcessingQueue.objects.get(interview=self.interview)
+        self.assertEqual(queue_entry.status, "processing")
+
+    @override_settings(INTERVIEW_PIPELINE_MODE="chord")
+    def test_failed_header_task_marks_interview_failed(self):
+        with patch("interviews.tasks.chord") as chord_mock:
+            self.run_task()
+        callback = chord_mock.return_value.call_args.args[0]
+        errbacks = callback.options["link_error"]
+        self.assertEqual([errback.task.rsplit(".", 1)[-1] for errback in errbacks], ["fail_interview_pipeline"])
+
+        # Celery calls the errback with (request, exc, traceback) ahead of its own args
+        errback = errbacks[0]
+        errback.type.apply(args=[None, RuntimeError("worker lost"), None, *errback.args])
+
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.status, "failed")
+        self.assertEqual(self.interview.processing_status, "FAILED")
+        self.assertIn("worker lost", self.interview.processing_error)
+        self.assertEqual(ProcessingQueue.objects.get(interview=self.interview).status, "failed")
+        self.assertIsNone(interview_tasks.cache.get(f"interview_processing_lock:{self.interview.id}"))
+
+    def test_finalize_scores_interview_from_stored_results(self):
+        for vr in self.video_responses:
+            with patch("interviews.ai.detect_script_reading", return_value=_detection("suspicious", 40)):
+                detect_script_reading_for_video.apply(args=[vr.id])
+        ProcessingQueue.objects.filter(interview=self.interview).update(status="processing")
+
+        ai_service = MagicMock()
+        ai_service.batch_analyze_transcripts.side_effect = lambda data, **kwargs: [_analysis() for _ in data]
+        with patch("interviews.ai_service.get_ai_service", return_value=ai_service):
+            result = finalize_interview_analysis.apply(args=[[], self.interview.id]).result
+
+        self.assertEqual(result["status"], "success")
+        ai_service.batch_analyze_transcripts.assert_called_once()
+        for vr in VideoResponse.objects.filter(interview=self.interview):
+            self.assertEqual(vr.status, "analyzed")
+            self.assertEqual(vr.script_reading_status, "suspicious")
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.processing_status, "SUCCEEDED")
+        self.assertTrue(self.interview.authenticity_flag)
+        self.assertEqual(ProcessingQueue.objects.get(interview=self.interview).status, "completed")
+
+
+class FallbackTranscriptionTests(ProcessCompleteInterviewTestBase):
+    def setUp(self):
+        super().setUp()
+        VideoResponse.objects.filter(id__in=[vr.id for vr in self.video_responses[:2]]).update(transcript="")
+        self.ai_service = MagicMock()
+        self.ai_service.batch_analyze_transcripts.side_effect = lambda data, **kwargs: [_analysis() for _ in data]
+
+    def run_with_deepgram(self, deepgram):
+        with patch("interviews.ai.detect_script_reading", return_value=_detection()), patch(
+            "interviews.ai_service.get_ai_service", return_value=self.ai_service
+        ), patch("interviews.deepgram_service.get_deepgram_service", return_value=deepgram), patch(
+            "interviews.media_service.get_stt_audio_path", return_value=None
+        ):
+            return self.run_task()
+
+    def test_missing_transcripts_are_fetched_concurrently(self):
+        both_in_flight = threading.Barrier(2, timeout=5)
+
+        def fake_transcribe(video_path, video_response_id=None, audio_path=None):
+            both_in_flight.wait()
+            return {"transcript": f"fallback transcript {video_response_id}"}
+
+        deepgram = MagicMock()
+        deepgram.transcribe_video.side_effect = fake_transcribe
+        result = self.run_with_deepgram(deepgram)
+
+        self.assertEqual(result["status"], "success")
+        for vr in self.video_responses[:2]:
+            vr.refresh_from_db()
+            self.assertEqual(vr.transcript, f"fallback transcript {vr.id}")
+        self.assertEqual(deepgram.transcribe_video.call_count, 2)
+
+    @override_settings(FALLBACK_TRANSCRIPTION_TIMEOUT_SECONDS=1)
+    def test_slow_transcription_times_out_without_blocking_others(self):
+        release = threading.Event()
+        slow_id = self.video_responses[0].id
+
+        def fake_transcribe(video_path, video_response_id=None, audio_path=None):
+            if video_response_id == slow_id:
+                release.wait(timeout=10)
+            return {"transcript": "on time"}
+
+        deepgram = MagicMock()
+        deepgram.transcribe_video.side_effect = fake_transcribe
+        try:
+            result = self.run_with_deepgram(deepgram)
+        finally:
+            release.set()
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(VideoResponse.objects.get(id=slow_id).transcript, "")
+        self.assertEqual(VideoResponse.objects.get(id=self.video_responses[1].id).transcript, "on time")
+
+    def test_worker_threads_close_persistent_db_connections(self):
+        closed_by = []
+
+        def record_close(wrapper):
+            closed_by.append(threading.current_thread().name)
+
+        deepgram = MagicMock()
+        deepgram.transcribe_video.return_value = {"transcript": "fallback"}
+        # Worker threads open fresh connections from these settings
+        with patch.dict(connections.settings["default"], {"CONN_MAX_AGE": 600}), patch.object(
+            type(connections["default"]), "close", autospec=True, side_effect=record_close
+        ):
+            result = self.run_with_deepgram(deepgram)
+
+        self.assertEqual(result["status"], "success")
+        worker_closes = [name for name in closed_by if name.startswith("fallback-transcription")]
+        self.assertEqual(len(worker_closes), 2)
+
+
+class ProviderDeferralTests(ProcessCompleteInterviewTestBase):
+    def run_with_ai_service(self, ai_service, task_id=None):
+        with patch("interviews.ai.detect_script_reading", return_value=_detection()), patch(
+            "interviews.ai_service.get_ai_service", return_value=ai_service
+        ):
+            return process_complete_interview.apply(args=[self.interview.id], task_id=task_id).result
+
+    def test_deferred_run_completes_on_retry(self):
+        ai_service = MagicMock()
+        ai_service.batch_analyze_transcripts.side_effect = [
+            ProviderUnavailable("gemini", retry_after=30),
+            [_analysis() for _ in self.video_responses],
+        ]
+
+        result = self.run_with_ai_service(ai_service)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(ai_service.batch_analyze_transcripts.call_count, 2)
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.status, "completed")
+        self.assertEqual(ProcessingQueue.objects.get(interview=self.interview).status, "completed")
+
+    @override_settings(PROVIDER_DEFER_MAX_RETRIES=5)
+    def test_deferrals_do_not_use_up_failure_retries(self):
+        task_id = "deferred-task"
+        ai_service = MagicMock()
+        ai_service.batch_analyze_transcripts.side_effect = (
+            [ProviderUnavailable("gemini", retry_after=30)] * 4
+            + [ConnectionError("reset")]
+            + [[_analysis() for _ in self.video_responses]]
+        )
+
+        result = self.run_with_ai_service(ai_service, task_id=task_id)
+
+        # Celery's retry counter is 5 by the last attempt, past max_retries=3
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(ai_service.batch_analyze_transcripts.call_count, 6)
+        self.assertEqual(
+            interview_tasks.cache.get(interview_tasks.PROVIDER_DEFER_COUNT_CACHE_KEY.format(task_id=task_id)), 4
+        )
+
+    def test_other_task_is_still_skipped_while_processing(self):
+        ProcessingQueue.objects.filter(interview=self.interview).update(
+            status="processing", celery_task_id="someone-else"
+        )
+
+        result = self.run_with_ai_service(MagicMock(), task_id="new-task")
+
+        self.assertEqual(result, {"status": "skipped", "reason": "queue_processing"})
+
+
+class BulkPersistenceTests(ProcessCompleteInterviewTestBase):
+    answer_count = 6
+
+    def save(self, video_responses, score, detections):
+        _save_video_analyses(
+            self.interview.id,
+            video_responses,
+            [_analysis(score) for _ in video_responses],
+            detections,
+            interview=self.interview,
+        )
+
+    def test_query_count_does_not_grow_with_answers(self):
+        detections = {vr.id: _detection() for vr in self.video_responses}
+        detections[self.video_responses[2].id] = _detection("high_risk", 90)
+
+        # SAVEPOINT, AIAnalysis upsert, VideoResponse bulk_update, Interview update, RELEASE
+        with self.assertNumQueries(5):
+            self.save(self.video_responses[:3], 70.0, detections)
+        with self.assertNumQueries(5):
+            self.save(self.video_responses, 85.0, detections)
+
+        self.assertEqual(AIAnalysis.objects.filter(video_response__interview=self.interview).count(), 6)
+        self.assertEqual(AIAnalysis.objects.get(video_response=self.video_responses[0]).overall_score, 85.0)
+        flagged = VideoResponse.objects.get(id=self.video_responses[2].id)
+        self.assertEqual((flagged.status, flagged.ai_score, flagged.script_reading_status), ("analyzed", 85.0, "high_risk"))
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.authenticity_status, "under_investigation")
+
+    def test_empty_transcript_is_flagged_without_analysis(self):
+        VideoResponse.objects.filter(id=self.video_responses[0].id).update(transcript="  ")
+        video_responses = list(VideoResponse.objects.filter(interview=self.interview))
+
+        self.save(video_responses, 60.0, {vr.id: _detection() for vr in video_responses})
+
+        silent = VideoResponse.objects.get(id=self.video_responses[0].id)
+        self.assertEqual((silent.status, silent.ai_score), ("analyzed", None))
+        self.assertFalse(AIAnalysis.objects.filter(video_response=silent).exists())
+        self.interview.refresh_from_db()
+        self.assertFalse(self.interview.authenticity_flag)
+        self.assertEqual(self.interview.authenticity_status, "verified")
+
+
+class SingleScoringTests(ProcessCompleteInterviewTestBase):
+    answer_count = 4
+
+    def setUp(self):
+        super().setUp()
+        competencies = ["communication", "troubleshooting", "", "troubleshooting"]
+        for vr, competency, score in zip(self.video_responses, competencies, [80.0, 60.0, 90.0, None]):
+            InterviewQuestion.objects.filter(id=vr.question_id).update(competency=competency)
+            VideoResponse.objects.filter(id=vr.id).update(ai_score=score)
+        VideoResponse.objects.filter(id=self.video_responses[1].id).update(hr_override_score=70)
+
+    def loaded_responses(self):
+        return list(self.interview.video_responses.select_related("question"))
+
+    def test_in_memory_and_grouped_query_scores_match(self):
+        video_responses = self.loaded_responses()
+
+        with self.assertNumQueries(0):
+            in_memory = calculate_interview_score(self.interview.id, self.interview, video_responses)
+        with self.assertNumQueries(1):
+            grouped = calculate_interview_score(self.interview.id, self.interview)
+
+        self.assertEqual(in_memory, grouped)
+        self.assertEqual(in_memory["technical_issues_count"], 1)
+        self.assertEqual(in_memory["raw_scores_per_competency"], {"communication": 85.0, "troubleshooting": 70.0})
+
+    def test_score_is_computed_once_per_run(self):
+        video_responses = self.loaded_responses()
+        expected = calculate_interview_score(self.interview.id, self.interview, video_responses)
+
+        with patch.object(scoring, "build_interview_score", wraps=scoring.build_interview_score) as build:
+            _complete_interview_processing(self.interview, None, video_responses)
+
+        build.assert_called_once()
+        self.assertAlmostEqual(self.interview.result.final_score, expected["overall_score"])
+        self.applicant.refresh_from_db()
+        expected_status = {"pass": "passed", "fail": "failed"}.get(expected["recommendation"], "under_review")
+        self.assertEqual(self.applicant.status, expected_status)
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.status, "completed")
@@ -0,0 +1,160 @@
+"""
+Tests for the live transcription WebSocket relay (mock STT backend).
+"""
+
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+from asgiref.testing import ApplicationCommunicator
+from django.test import TestCase, override_settings
+
+from applicants.models import Applicant
+from core.asgi import application
+from interviews.live_transcription import DeepgramLiveBackend, pop_live_transcript
+from interviews.models import Interview, InterviewQuestion, VideoResponse
+from interviews.type_models import PositionType, QuestionType
+from security.interview_tokens import generate_interview_token
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    LIVE_TRANSCRIPTION_ENABLED=True,
+    LIVE_STT_BACKEND="interviews.live_transcription.MockLiveSTTBackend",
+)
+class LiveTranscriptionRelayTests(TestCase):
+    def setUp(self):
+        applicant = Applicant.objects.create(
+            first_name="Live",
+            last_name="Test",
+            email="live@example.com",
+            phone="5550003333",
+            application_source="online",
+        )
+        question_type, _ = QuestionType.objects.get_or_create(code="general", defaults={"name": "General"})
+        self.position_type, _ = PositionType.objects.get_or_create(
+            code="customer_service", defaults={"name": "Customer Service"}
+        )
+        self.interview = Interview.objects.create(
+            applicant=applicant,
+            position_type=self.position_type,
+            status="in_progress",
+        )
+        self.question = InterviewQuestion.objects.create(
+            question_text="Why do you want this job?",
+            question_type=question_type,
+            position_type=self.position_type,
+            is_active=True,
+            order=0,
+        )
+        self.token = generate_interview_token(self.interview.public_id)
+
+    def _communicator(self, token=None):
+        token = self.token if token is None else token
+        scope = {
+            "type": "websocket",
+            "path": f"/ws/public/interviews/{self.interview.public_id}/live-transcript/",
+            "query_string": f"token={token}&question_id={self.question.id}".encode(),
+        }
+        return ApplicationCommunicator(application, scope)
+
+    async def _stream_answer(self, chunks):
+        communicator = self._communicator()
+        await communicator.send_input({"type": "websocket.connect"})
+        self.assertEqual((await communicator.receive_output(timeout=5))["type"], "websocket.accept")
+        messages = []
+        for chunk in chunks:
+            await communicator.send_input({"type": "websocket.receive", "bytes": chunk})
+            messages.append(json.loads((await communicator.receive_output(timeout=5))["text"]))
+        await communicator.send_input({"type": "websocket.receive", "text": json.dumps({"type": "stop"})})
+        complete = json.loads((await communicator.receive_output(timeout=5))["text"])
+        closed = await communicator.receive_output(timeout=5)
+        await communicator.wait(timeout=5)
+        return messages, complete, closed
+
+    async def test_rejects_invalid_token(self):
+        communicator = self._communicator(token="bogus")
+        await communicator.send_input({"type": "websocket.connect"})
+        message = await communicator.receive_output(timeout=5)
+        self.assertEqual(message, {"type": "websocket.close", "code": 4401})
+
+    async def _assert_question_rejected(self, question):
+        communicator = self._communicator()
+        communicator.scope["query_string"] = f"token={self.token}&question_id={question.id}".encode()
+        await communicator.send_input({"type": "websocket.connect"})
+        message = await communicator.receive_output(timeout=5)
+        self.assertEqual(message, {"type": "websocket.close", "code": 4404})
+
+    async def test_rejects_question_from_another_position(self):
+        other_position, _ = await PositionType.objects.aget_or_create(
+            code="network_engineer", defaults={"name": "Network Engineer"}
+        )
+        other_question = await InterviewQuestion.objects.acreate(
+            question_text="Explain subnetting",
+            question_type_id=self.question.question_type_id,
+            position_type=other_position,
+            is_active=True,
+            order=0,
+        )
+
+        await self._assert_question_rejected(other_question)
+
+    async def test_rejects_question_outside_selected_set(self):
+        unselected = await InterviewQuestion.objects.acreate(
+            question_text="Describe a difficult customer",
+            question_type_id=self.question.question_type_id,
+            position_type=self.position_type,
+            is_active=True,
+            order=1,
+        )
+        self.interview.selected_question_ids = [self.question.id]
+        await self.interview.asave(update_fields=["selected_question_ids"])
+
+        await self._assert_question_rejected(unselected)
+
+    async def test_relays_audio_and_keeps_transcript_for_upload(self):
+        messages, complete, closed = await self._stream_answer([b"a" * 1024, b"b" * 2048])
+
+        self.assertEqual([m["type"] for m in messages], ["interim", "interim"])
+        self.assertEqual(complete["type"], "complete")
+        self.assertEqual(complete["transcript"], "mock live transcript")
+        self.assertFalse(complete["applied_to_upload"])
+        self.assertEqual(closed["type"], "websocket.close")
+        cached = pop_live_transcript(self.interview.id, self.question.id)
+        self.assertEqual(cached["bytes_received"], 3072)
+        self.assertIsNone(pop_live_transcript(self.interview.id, self.question.id))
+
+    async def test_writes_transcript_when_upload_landed_first(self):
+        video_response = await VideoResponse.objects.acreate(
+            interview=self.interview,
+            question=self.question,
+            video_file_path="video_responses/live.webm",
+            duration=timedelta(seconds=30),
+        )
+
+        _, complete, _ = await self._stream_answer([b"a" * 512])
+
+        self.assertTrue(complete["applied_to_upload"])
+        await video_response.arefresh_from_db()
+        self.assertEqual(video_response.transcript, "mock live transcript")
+
+
+class DeepgramLiveUsageTests(TestCase):
+    @override_settings(DEEPGRAM_API_KEY="test-key")
+    async def test_finish_records_transcription_usage(self):
+        backend = DeepgramLiveBackend()
+        backend.interview_id = 42
+        backend.final_segments = ["I enjoy", "helping customers"]
+        backend.confidences = [0.9, 0.8]
+        backend.duration = 12.5
+
+        with patch("monitoring.usage_buffer.record_usage") as record_usage:
+            transcript_data = await backend.finish()
+
+        self.assertEqual(transcript_data["transcript"], "I enjoy helping customers")
+        usage = record_usage.call_args.kwargs
+        self.assertEqual(usage["operation_type"], "transcription")
+        self.assertEqual(usage["interview_id"], 42)
+        self.assertEqual(usage["model_name"], "deepgram-nova-2")
+        self.assertEqual(usage["output_tokens"], 4)
+        self.assertEqual(usage["prompt_length"], len("Audio duration: 12.50s"))
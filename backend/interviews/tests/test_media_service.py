@@ -0,0 +1,141 @@
+"""
+Tests for upload-time media preprocessing (probe + STT audio extraction).
+"""
+
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+from applicants.models import Applicant
+from interviews import media_service
+from interviews.models import Interview, InterviewQuestion, VideoResponse
+from interviews.tasks import detect_script_reading_for_video, prepare_video_response_media, transcribe_video_response
+from interviews.type_models import PositionType, QuestionType
+
+
+FFPROBE_OUTPUT = {
+    "format": {"format_name": "matroska,webm", "duration": "42.5", "size": "1048576"},
+    "streams": [
+        {"codec_type": "video", "codec_name": "vp8", "width": 1280, "height": 720, "avg_frame_rate": "30000/1001"},
+        {"codec_type": "audio", "codec_name": "opus", "sample_rate": "48000", "channels": 2},
+    ],
+}
+
+
+def _fake_extract(video_path, output_path, audio_format="opus"):
+    with open(output_path, "wb") as audio_file:
+        audio_file.write(b"OggS-fake-audio")
+    return output_path
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class MediaPreprocessingTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        applicant = Applicant.objects.create(
+            first_name="Media",
+            last_name="Test",
+            email="media@example.com",
+            phone="5550002222",
+            application_source="online",
+        )
+        question_type, _ = QuestionType.objects.get_or_create(code="general", defaults={"name": "General"})
+        position_type, _ = PositionType.objects.get_or_create(
+            code="customer_service", defaults={"name": "Customer Service"}
+        )
+        interview = Interview.objects.create(applicant=applicant, position_type=position_type)
+        question = InterviewQuestion.objects.create(
+            question_text="Tell us about yourself",
+            question_type=question_type,
+            position_type=position_type,
+            is_active=True,
+            order=0,
+        )
+        self.video_response = VideoResponse.objects.create(
+            interview=interview,
+            question=question,
+            video_file_path="video_responses/test_0.webm",
+            duration=timedelta(seconds=42),
+        )
+
+    def test_probe_media_summarises_streams(self):
+        with patch("ffmpeg.probe", return_value=FFPROBE_OUTPUT):
+            metadata = media_service.probe_media("/videos/answer.webm")
+
+        self.assertEqual(metadata["duration"], 42.5)
+        self.assertEqual(metadata["video_codec"], "vp8")
+        self.assertEqual(metadata["fps"], 29.97)
+        self.assertTrue(metadata["has_audio"])
+        self.assertEqual(metadata["audio_sample_rate"], 48000)
+
+    def test_prepare_stores_artifacts_once(self):
+        with patch("ffmpeg.probe", return_value=FFPROBE_OUTPUT) as probe, patch.object(
+            media_service, "extract_stt_audio", side_effect=_fake_extract
+        ) as extract:
+            media_service.prepare_video_media(self.video_response)
+            media_service.prepare_video_media(self.video_response)
+
+        self.assertEqual(probe.call_count, 1)
+        self.assertEqual(extract.call_count, 1)
+        stored = VideoResponse.objects.get(id=self.video_response.id)
+        self.assertTrue(stored.audio_file_path.name.endswith("test_0.ogg"))
+        self.assertEqual(stored.media_metadata["stt_audio"]["sample_rate"], 16000)
+        self.assertEqual(media_service.get_probed_fps(stored), 29.97)
+
+    def test_transcription_task_reuses_stored_audio(self):
+        deepgram = MagicMock()
+        deepgram.transcribe_video.return_value = {"transcript": "hello there"}
+        with patch("ffmpeg.probe", return_value=FFPROBE_OUTPUT), patch.object(
+            media_service, "extract_stt_audio", side_effect=_fake_extract
+        ), patch("interviews.deepgram_service.get_deepgram_service", return_value=deepgram):
+            result = transcribe_video_response.apply(args=[self.video_response.id]).result
+
+        self.assertEqual(result["status"], "success")
+        audio_path = deepgram.transcribe_video.call_args.kwargs["audio_path"]
+        self.assertTrue(audio_path.endswith(".ogg"))
+        self.assertEqual(VideoResponse.objects.get(id=self.video_response.id).transcript, "hello there")
+
+    def test_live_transcript_still_gets_media_prepared(self):
+        self.video_response.transcript = "streamed while recording"
+        self.video_response.save(update_fields=["transcript"])
+        deepgram = MagicMock()
+        with patch("ffmpeg.probe", return_value=FFPROBE_OUTPUT), patch.object(
+            media_service, "extract_stt_audio", side_effect=_fake_extract
+        ), patch("interviews.deepgram_service.get_deepgram_service", return_value=deepgram):
+            result = transcribe_video_response.apply(args=[self.video_response.id]).result
+
+        self.assertEqual(result["status"], "skipped")
+        deepgram.transcribe_video.assert_not_called()
+        stored = VideoResponse.objects.get(id=self.video_response.id)
+        self.assertEqual(stored.transcript, "streamed while recording")
+        self.assertTrue(stored.audio_file_path.name.endswith("test_0.ogg"))
+        self.assertEqual(media_service.get_probed_fps(stored), 29.97)
+
+    def test_prepare_task_and_script_detection_use_probed_media(self):
+        with patch("ffmpeg.probe", return_value=FFPROBE_OUTPUT), patch.object(
+            media_service, "extract_stt_audio", side_effect=_fake_extract
+        ):
+            result = prepare_video_response_media.apply(args=[self.video_response.id]).result
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(media_service.get_probed_fps(VideoResponse.objects.get(id=self.video_response.id)), 29.97)
+
+        # Detection on an unprepared answer probes it first instead of decoding blind
+        VideoResponse.objects.filter(id=self.video_response.id).update(media_metadata={}, audio_file_path="")
+        detection = {"status": "clear", "data": {}}
+        with patch("ffmpeg.probe", return_value=FFPROBE_OUTPUT), patch.object(
+            media_service, "extract_stt_audio", side_effect=_fake_extract
+        ), patch("interviews.ai.detect_script_reading", return_value=detection) as detect:
+            detect_script_reading_for_video.apply(args=[self.video_response.id])
+        self.assertEqual(detect.call_args.kwargs["fps"], 29.97)
+
+    def test_probe_failure_falls_back_to_video_extraction(self):
+        with patch("ffmpeg.probe", side_effect=RuntimeError("ffprobe missing")):
+            self.assertIsNone(media_service.get_stt_audio_path(self.video_response))
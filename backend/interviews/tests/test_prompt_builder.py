@@ -0,0 +1,114 @@
+"""
+Tests for token-budget-aware analysis prompt building.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from interviews import prompt_builder
+from interviews.ai_service import AIAnalysisService
+
+
+ROLE = {"role_name": "Customer Service", "role_code": "CSR", "role_context": None, "role_profile": None, "core_competencies": None}
+
+
+def _analysis(score, **extra):
+    return {
+        "sentiment_score": score,
+        "confidence_score": score,
+        "speech_clarity_score": score,
+        "content_relevance_score": score,
+        "overall_score": score,
+        "recommendation": "pass" if score >= 70 else "review",
+        "analysis_summary": f"Scored {score}",
+        **extra,
+    }
+
+
+def _items(count, words=40):
+    return [
+        {
+            "video_id": index,
+            "transcript": " ".join(f"detail{index}-{word}" for word in range(words)),
+            "question_text": f"Question {index}",
+            "question_type": "behavioral",
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+class TrimTests(SimpleTestCase):
+    def test_short_text_is_unchanged(self):
+        self.assertEqual(prompt_builder.trim_to_tokens("A short answer.", 100), "A short answer.")
+
+    def test_long_text_keeps_opening_and_conclusion_within_limit(self):
+        text = "OPENING " + " ".join(f"middle{n}" for n in range(2000)) + " CONCLUSION"
+
+        trimmed = prompt_builder.trim_to_tokens(text, 200)
+
+        self.assertTrue(trimmed.startswith("OPENING"))
+        self.assertTrue(trimmed.endswith("CONCLUSION"))
+        self.assertIn(prompt_builder.TRIM_MARKER.strip(), trimmed)
+        marker_tokens = prompt_builder.count_tokens(prompt_builder.TRIM_MARKER)
+        self.assertLessEqual(prompt_builder.count_tokens(trimmed), 200 + marker_tokens + 2)
+
+    @override_settings(ANALYSIS_TRANSCRIPT_TOKEN_LIMIT=50)
+    def test_batch_prompt_reports_trimmed_items(self):
+        items = _items(2, words=5) + _items(1, words=400)
+
+        built = prompt_builder.build_batch_prompt(items, ROLE)
+
+        self.assertEqual(built.trimmed_items, [2])
+        self.assertEqual(built.predicted_tokens, prompt_builder.count_tokens(built.text))
+
+
+class SplitBatchTests(SimpleTestCase):
+    def test_everything_fits_in_one_batch_under_the_default_budget(self):
+        self.assertEqual(prompt_builder.split_batch(_items(4), ROLE), [[0, 1, 2, 3]])
+
+    def test_groups_respect_the_budget_and_keep_order(self):
+        items = _items(6)
+        single = prompt_builder.build_batch_prompt(items[:1], ROLE).predicted_tokens
+        budget = single * 2
+
+        groups = prompt_builder.split_batch(items, ROLE, budget=budget)
+
+        self.assertGreater(len(groups), 1)
+        self.assertEqual([index for group in groups for index in group], list(range(6)))
+        for group in groups:
+            prompt = prompt_builder.build_batch_prompt([items[index] for index in group], ROLE)
+            self.assertLessEqual(prompt.predicted_tokens, budget)
+
+
+@override_settings(ANALYSIS_CACHE_ENABLED=False)
+class BudgetedBatchAnalysisTests(SimpleTestCase):
+    def setUp(self):
+        self.service = AIAnalysisService.__new__(AIAnalysisService)
+        self.service.model = MagicMock()
+        log_patch = patch.object(self.service, "_log_token_usage")
+        self.log_usage = log_patch.start()
+        self.addCleanup(log_patch.stop)
+
+    def test_batch_over_budget_is_split_into_several_calls(self):
+        items = _items(4)
+        budget = prompt_builder.build_batch_prompt(items[:2], ROLE).predicted_tokens + 10
+
+        def respond(prompt, **kwargs):
+            count = prompt.count("=== RESPONSE")
+            return SimpleNamespace(
+                text=json.dumps([_analysis(60 + n, response_index=n) for n in range(1, count + 1)]),
+                usage_metadata=None,
+            )
+
+        self.service.model.generate_content.side_effect = respond
+        with override_settings(ANALYSIS_PROMPT_TOKEN_BUDGET=budget):
+            results = self.service.batch_analyze_transcripts(items, interview_id=3, **ROLE)
+
+        self.assertEqual(self.service.model.generate_content.call_count, 2)
+        self.assertEqual([r["overall_score"] for r in results], [61, 62, 61, 62])
+        for call in self.log_usage.call_args_list:
+            self.assertEqual(call.kwargs["predicted_input_tokens"], prompt_builder.count_tokens(call.kwargs["prompt"]))
+            self.assertLessEqual(call.kwargs["predicted_input_tokens"], budget)
@@ -0,0 +1,168 @@
+"""
+Tests for the shared provider circuit breaker and concurrency slots.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from interviews import provider_guard, tasks
+from interviews.ai_service import AIAnalysisService
+from interviews.provider_guard import ProviderUnavailable
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "provider-guard-tests"}}
+
+
+class ServerError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    PROVIDER_BREAKER_FAILURE_THRESHOLD=3,
+    PROVIDER_BREAKER_WINDOW_SECONDS=60,
+    PROVIDER_BREAKER_OPEN_SECONDS=30,
+    PROVIDER_MAX_CONCURRENCY_GEMINI=2,
+    PROVIDER_ACQUIRE_TIMEOUT_SECONDS=0,
+)
+class ProviderGuardTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        time_patch = patch.object(provider_guard.time, "time", side_effect=lambda: self.now)
+        time_patch.start()
+        self.addCleanup(time_patch.stop)
+
+    def _fail(self, exc, provider="gemini"):
+        with self.assertRaises(type(exc)):
+            with provider_guard.provider_call(provider):
+                raise exc
+
+    def _succeed(self, provider="gemini"):
+        calls = []
+        with provider_guard.provider_call(provider):
+            calls.append(provider)
+        return calls
+
+    def test_transient_failures_open_the_circuit(self):
+        for _ in range(3):
+            self._fail(ServerError(503))
+
+        body = MagicMock()
+        with self.assertRaises(ProviderUnavailable) as ctx:
+            with provider_guard.provider_call("gemini"):
+                body()
+
+        body.assert_not_called()
+        self.assertEqual(ctx.exception.retry_after, 30)
+        self.assertEqual(provider_guard.breaker_state("gemini")["state"], "open")
+        # Providers have independent breakers
+        self.assertEqual(self._succeed("deepgram"), ["deepgram"])
+
+    def test_client_errors_do_not_count(self):
+        for _ in range(5):
+            self._fail(ServerError(400))
+            self._fail(ValueError("bad JSON"))
+
+        self.assertEqual(self._succeed(), ["gemini"])
+        self.assertEqual(provider_guard.breaker_state("gemini")["recent_failures"], 0)
+
+    def test_half_open_probe_closes_or_reopens(self):
+        for _ in range(3):
+            self._fail(ServerError(429))
+        self.now += 31
+
+        self._fail(TimeoutError("probe timed out"))
+        self.assertEqual(provider_guard.breaker_state("gemini")["state"], "open")
+
+        self.now += 31
+        with provider_guard.provider_call("gemini"):
+            # Only the probe goes through while half-open
+            self.assertEqual(provider_guard.breaker_state("gemini")["state"], "half_open")
+            with self.assertRaises(ProviderUnavailable):
+                self._succeed()
+        self.assertEqual(provider_guard.breaker_state("gemini")["state"], "closed")
+        self.assertEqual(self._succeed(), ["gemini"])
+
+    def test_concurrency_slots_are_shared_and_released(self):
+        with provider_guard.provider_call("gemini"), provider_guard.provider_call("gemini"):
+            self.assertEqual(provider_guard.breaker_state("gemini")["in_flight"], 2)
+            with self.assertRaises(ProviderUnavailable) as ctx:
+                self._succeed()
+            self.assertEqual(ctx.exception.reason, "concurrency_limit")
+
+        self.assertEqual(provider_guard.breaker_state("gemini")["in_flight"], 0)
+        self.assertEqual(provider_guard.breaker_state("gemini")["rejected_calls_last_15m"], 1)
+
+    def test_async_guard_counts_failures(self):
+        async def failing_call():
+            async with provider_guard.aprovider_call("gemini"):
+                raise ConnectionError("reset")
+
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                asyncio.run(failing_call())
+
+        self.assertEqual(provider_guard.breaker_state("gemini")["state"], "open")
+        self.assertEqual(provider_guard.breaker_state("gemini")["in_flight"], 0)
+
+    def test_analysis_rejection_propagates_instead_of_default_scores(self):
+        for _ in range(3):
+            self._fail(ServerError(500))
+        service = AIAnalysisService.__new__(AIAnalysisService)
+        service.model = MagicMock()
+
+        with patch.object(service, "_log_token_usage") as log_usage:
+            with self.assertRaises(ProviderUnavailable):
+                service.analyze_transcript("I like helping customers.", "Why this job?", "general")
+
+        service.model.generate_content.assert_not_called()
+        log_usage.assert_not_called()
+
+
+@override_settings(CACHES=LOCMEM_CACHES, PROVIDER_DEFER_MAX_RETRIES=10)
+class ProviderDeferralTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _task(self, retries):
+        task = SimpleNamespace(request=SimpleNamespace(id="task-1", retries=retries), max_retries=3)
+        task.retry = MagicMock(return_value=RuntimeError("retry scheduled"))
+        return task
+
+    def test_open_circuit_defers_past_the_retry_budget(self):
+        task = self._task(retries=3)
+        exc = ProviderUnavailable("deepgram", 45)
+
+        with self.assertRaisesMessage(RuntimeError, "retry scheduled"):
+            tasks._retry_with_backoff(task, exc, 7)
+
+        kwargs = task.retry.call_args.kwargs
+        self.assertGreaterEqual(kwargs["countdown"], 45)
+        self.assertLessEqual(kwargs["countdown"], 45 + tasks.PROVIDER_DEFER_JITTER_SECONDS)
+        self.assertEqual(kwargs["max_retries"], 4)
+        self.assertEqual(provider_guard.breaker_state("deepgram")["deferred_tasks_last_15m"], 1)
+        self.assertEqual(cache.get(tasks.PROVIDER_DEFER_COUNT_CACHE_KEY.format(task_id="task-1")), 1)
+
+    def test_deferrals_are_not_counted_as_failures(self):
+        cache.set(tasks.PROVIDER_DEFER_COUNT_CACHE_KEY.format(task_id="task-1"), 3)
+        task = self._task(retries=5)
+
+        with self.assertRaisesMessage(RuntimeError, "retry scheduled"):
+            tasks._retry_with_backoff(task, ConnectionError("reset"), 7)
+
+        self.assertEqual(task.retry.call_args.kwargs["max_retries"], 6)
+
+    def test_gives_up_after_max_deferrals(self):
+        cache.set(tasks.PROVIDER_DEFER_COUNT_CACHE_KEY.format(task_id="task-1"), 10)
+        task = self._task(retries=10)
+
+        with self.assertRaises(ProviderUnavailable):
+            tasks._retry_with_backoff(task, ProviderUnavailable("gemini", 5), 7)
+        task.retry.assert_not_called()
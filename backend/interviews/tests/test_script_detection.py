@@ -0,0 +1,94 @@
+"""
+Tests for script reading detection frame sampling.
+"""
+
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+from django.test import SimpleTestCase
+
+from interviews.ai import script_detection
+from interviews.ai.script_detection import (
+    _iter_sampled_frames,
+    _prepare_gray,
+    detect_script_reading,
+    get_face_detector,
+)
+
+
+class FrameSamplingTests(SimpleTestCase):
+    fps = 30
+    frame_count = 90
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        handle, cls.video_path = tempfile.mkstemp(suffix=".avi")
+        os.close(handle)
+        writer = cv2.VideoWriter(cls.video_path, cv2.VideoWriter_fourcc(*"MJPG"), cls.fps, (640, 480))
+        for i in range(cls.frame_count):
+            writer.write(np.full((480, 640, 3), i % 255, np.uint8))
+        writer.release()
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.video_path)
+        super().tearDownClass()
+
+    def _sample(self, **kwargs):
+        video = cv2.VideoCapture(self.video_path)
+        stats = {}
+        try:
+            frames = list(_iter_sampled_frames(video, self.fps, stats=stats, **kwargs))
+        finally:
+            video.release()
+        return frames, stats
+
+    def test_target_fps_limits_retrieved_frames(self):
+        frames, stats = self._sample(target_fps=5)
+        self.assertEqual(stats["frames_read"], self.frame_count)
+        self.assertEqual(len(frames), 15)
+
+    def test_zero_target_fps_keeps_every_third_frame(self):
+        frames, stats = self._sample(target_fps=0)
+        self.assertEqual(len(frames), self.frame_count // 3)
+
+    def test_frames_downscaled_before_detection(self):
+        gray, scale = _prepare_gray(np.zeros((480, 640, 3), np.uint8), 320)
+        self.assertEqual(gray.shape, (240, 320))
+        self.assertEqual(scale, 0.5)
+        gray, scale = _prepare_gray(np.zeros((240, 320, 3), np.uint8), 480)
+        self.assertEqual(gray.shape, (240, 320))
+        self.assertEqual(scale, 1.0)
+
+    def test_detection_reports_sampling_stats(self):
+        stats = {}
+        result = detect_script_reading(self.video_path, target_fps=2, max_frame_width=320, stats=stats)
+        # Synthetic frames contain no face.
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(stats["frames_read"], self.frame_count)
+        self.assertEqual(stats["frames_analyzed"], 6)
+
+
+class FaceDetectorCacheTests(SimpleTestCase):
+    def test_detector_is_reused_within_a_thread(self):
+        self.assertIs(get_face_detector(), get_face_detector())
+        self.assertFalse(get_face_detector().face_cascade.empty())
+
+    def test_each_thread_gets_its_own_detector(self):
+        detectors = []
+        thread = threading.Thread(target=lambda: detectors.append(get_face_detector()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(detectors[0], get_face_detector())
+
+    def test_cascade_is_not_reloaded_per_video(self):
+        get_face_detector()
+        with patch.object(script_detection.cv2, "CascadeClassifier") as cascade_cls:
+            detect_script_reading("/nonexistent/a.webm")
+            detect_script_reading("/nonexistent/b.webm")
+        cascade_cls.assert_not_called()
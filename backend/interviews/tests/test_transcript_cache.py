@@ -0,0 +1,89 @@
+"""
+Tests for the content-addressed transcript cache.
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from interviews import transcript_cache
+from interviews.deepgram_service import DeepgramTranscriptionService
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "transcript-cache-tests"}}
+
+
+def _deepgram_response(text):
+    alternative = SimpleNamespace(transcript=text, confidence=0.9, words=[])
+    return SimpleNamespace(
+        results=SimpleNamespace(channels=[SimpleNamespace(alternatives=[alternative])]),
+        metadata=SimpleNamespace(duration=30.0),
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHES, DEEPGRAM_API_KEY="test-key", DEEPGRAM_API_URL="", TRANSCRIPT_CACHE_ENABLED=True)
+class TranscriptCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.audio_path = self._write_audio(os.urandom(4096))
+        self.service = DeepgramTranscriptionService()
+        log_patch = patch.object(self.service, "_log_usage")
+        log_patch.start()
+        self.addCleanup(log_patch.stop)
+
+    def _write_audio(self, data):
+        handle, path = tempfile.mkstemp(suffix=".ogg")
+        with os.fdopen(handle, "wb") as audio_file:
+            audio_file.write(data)
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def test_key_depends_on_content_provider_model_and_options(self):
+        fingerprint = transcript_cache.audio_fingerprint(self.audio_path)
+        copy_path = self._write_audio(open(self.audio_path, "rb").read())
+        base = transcript_cache.transcript_cache_key(fingerprint, "deepgram", "nova-2", {"punctuate": True})
+
+        self.assertEqual(transcript_cache.audio_fingerprint(copy_path), fingerprint)
+        self.assertEqual(base, transcript_cache.transcript_cache_key(fingerprint, "deepgram", "nova-2", {"punctuate": True}))
+        self.assertNotEqual(base, transcript_cache.transcript_cache_key(fingerprint, "deepgram", "nova-3", {"punctuate": True}))
+        self.assertNotEqual(base, transcript_cache.transcript_cache_key(fingerprint, "gemini", "nova-2", {"punctuate": True}))
+        self.assertNotEqual(base, transcript_cache.transcript_cache_key(fingerprint, "deepgram", "nova-2", {"punctuate": False}))
+
+    def test_reprocessing_identical_audio_skips_provider_call(self):
+        copy_path = self._write_audio(open(self.audio_path, "rb").read())
+        with patch.object(self.service, "_transcribe_audio", return_value=_deepgram_response("cached answer")) as call:
+            first = self.service.transcribe_video("unused.webm", video_response_id=1, audio_path=self.audio_path)
+            second = self.service.transcribe_video("unused.webm", video_response_id=2, audio_path=copy_path)
+
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(second["transcript"], "cached answer")
+        self.assertTrue(second["cached"])
+        self.assertNotIn("cached", first)
+        stats = transcript_cache.get_transcript_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["stores"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_failures_and_empty_transcripts_are_not_cached(self):
+        with patch.object(self.service, "_transcribe_audio", side_effect=RuntimeError("boom")):
+            with self.assertRaises(Exception):
+                self.service.transcribe_video("unused.webm", audio_path=self.audio_path)
+        with patch.object(self.service, "_transcribe_audio", return_value=_deepgram_response("")):
+            self.service.transcribe_video("unused.webm", audio_path=self.audio_path)
+        with patch.object(self.service, "_transcribe_audio", return_value=_deepgram_response("real answer")) as call:
+            result = self.service.transcribe_video("unused.webm", audio_path=self.audio_path)
+
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(result["transcript"], "real answer")
+
+    @override_settings(TRANSCRIPT_CACHE_ENABLED=False)
+    def test_disabled_cache_always_calls_provider(self):
+        with patch.object(self.service, "_transcribe_audio", return_value=_deepgram_response("answer")) as call:
+            self.service.transcribe_video("unused.webm", audio_path=self.audio_path)
+            self.service.transcribe_video("unused.webm", audio_path=self.audio_path)
+
+        self.assertEqual(call.call_count, 2)
+        self.assertEqual(transcript_cache.get_transcript_cache_stats()["hits"], 0)
@@ -0,0 +1,126 @@
+"""
+Content-addressed transcript cache
+
+Transcripts are keyed by a SHA-256 of the audio that is actually sent to the
+provider (the stored STT track, or the video when no track exists) plus the
+provider, model and request options. Reprocessing the same answer (management
+commands, forced resubmits, retries) reuses the stored transcript instead of
+paying for the same audio again.
+
+Entries live in the default cache (Redis in production) with a sliding TTL:
+every hit refreshes the expiry, so unused transcripts age out after
+TRANSCRIPT_CACHE_TTL_SECONDS and Redis' maxmemory policy handles pressure.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "transcript_cache:v1"
+HITS_CACHE_KEY = "transcript_cache:hits"
+MISSES_CACHE_KEY = "transcript_cache:misses"
+STORES_CACHE_KEY = "transcript_cache:stores"
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def is_enabled() -> bool:
+    return bool(getattr(settings, "TRANSCRIPT_CACHE_ENABLED", True))
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "TRANSCRIPT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+
+def audio_fingerprint(path: str) -> str:
+    """SHA-256 of the file contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as audio_file:
+        for chunk in iter(lambda: audio_file.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def transcript_cache_key(fingerprint: str, provider: str, model: str, options: Optional[Dict[str, Any]] = None) -> str:
+    variant = json.dumps(options or {}, sort_keys=True, default=str)
+    variant_hash = hashlib.sha256(variant.encode()).hexdigest()[:16]
+    return f"{KEY_PREFIX}:{provider}:{model}:{variant_hash}:{fingerprint}"
+
+
+def _increment(key: str) -> None:
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except Exception:
+        logger.debug("Unable to increment cache counter %s", key)
+
+
+def cache_key_for_file(path: str, provider: str, model: str, options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Cache key for a source file, or None when caching is off or the file is unreadable"""
+    if not is_enabled() or not path:
+        return None
+    try:
+        return transcript_cache_key(audio_fingerprint(path), provider, model, options)
+    except OSError as exc:
+        logger.debug("Transcript cache fingerprint failed for %s: %s", path, exc)
+        return None
+
+
+def get_cached_transcript(key: Optional[str]) -> Optional[Any]:
+    """Return the cached entry (refreshing its TTL) and count the hit or miss"""
+    if not key:
+        return None
+    try:
+        entry = cache.get(key)
+    except Exception:
+        logger.warning("Transcript cache read failed", extra={"cache_key": key})
+        return None
+    if entry is None:
+        _increment(MISSES_CACHE_KEY)
+        return None
+    _increment(HITS_CACHE_KEY)
+    try:
+        cache.touch(key, _ttl_seconds())
+    except Exception:
+        pass
+    logger.info("Transcript cache hit", extra={"cache_key": key})
+    return entry
+
+
+def store_transcript(key: Optional[str], entry: Any) -> None:
+    """Store a successful transcription; empty transcripts are not cached"""
+    if not key:
+        return
+    text = entry.get('transcript') if isinstance(entry, dict) else entry
+    if not text:
+        return
+    try:
+        cache.set(key, entry, timeout=_ttl_seconds())
+        _increment(STORES_CACHE_KEY)
+    except Exception:
+        logger.warning("Transcript cache write failed", extra={"cache_key": key})
+
+
+def get_transcript_cache_stats() -> Dict[str, Any]:
+    """Counters for the monitoring endpoints (cumulative since the counters were created)"""
+    try:
+        counters = cache.get_many([HITS_CACHE_KEY, MISSES_CACHE_KEY, STORES_CACHE_KEY])
+    except Exception:
+        counters = {}
+    hits = int(counters.get(HITS_CACHE_KEY) or 0)
+    misses = int(counters.get(MISSES_CACHE_KEY) or 0)
+    lookups = hits + misses
+    return {
+        "enabled": is_enabled(),
+        "hits": hits,
+        "misses": misses,
+        "stores": int(counters.get(STORES_CACHE_KEY) or 0),
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "ttl_seconds": _ttl_seconds(),
+    }
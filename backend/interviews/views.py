@@ -629,6 +629,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
             if getattr(settings, "INTERVIEW_PROCESSING_SYNC", False):
                 try:
                     from .deepgram_service import get_deepgram_service
+                    from .media_service import get_stt_audio_path
 
                     _debug_print(
                         f"Starting Deepgram transcription for video {video_response.id}..."
@@ -637,6 +638,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
                     transcript_data = deepgram_service.transcribe_video(
                         video_response.video_file_path.path,
                         video_response_id=video_response.id,
+                        audio_path=get_stt_audio_path(video_response),
                     )
                     video_response.transcript = transcript_data.get('transcript', '') or ''
                     video_response.status = 'uploaded'
@@ -3,7 +3,7 @@ Admin interface for Token Usage Monitoring
 """
 
 from django.contrib import admin
-from .models import TokenUsage, DailyTokenSummary
+from .models import TokenUsage, DailyTokenSummary, DailyOperationSummary
 
 
 @admin.register(TokenUsage)
@@ -31,8 +31,17 @@ class TokenUsageAdmin(admin.ModelAdmin):
     )
 
 
+class DailyOperationSummaryInline(admin.TabularInline):
+    model = DailyOperationSummary
+    extra = 0
+    can_delete = False
+    readonly_fields = ['operation_type', 'requests', 'successful_requests', 'total_tokens', 'total_cost']
+    fields = readonly_fields
+
+
 @admin.register(DailyTokenSummary)
 class DailyTokenSummaryAdmin(admin.ModelAdmin):
+    inlines = [DailyOperationSummaryInline]
     list_display = ['date', 'total_requests', 'total_tokens', 'total_cost', 'success_rate', 'avg_response_time']
     list_filter = ['date']
     readonly_fields = ['created_at', 'updated_at']
@@ -0,0 +1,70 @@
+"""
+Management command to archive and drop old TokenUsage months.
+
+Each month older than the retention window is exported to
+<output-dir>/token_usage_YYYY_MM.csv.gz and then removed. On PostgreSQL its
+monthly partition is detached and dropped; elsewhere the rows are deleted.
+Daily rollups are brought up to date first and are kept, so the statistics
+endpoints still cover archived months.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.utils import timezone
+
+from monitoring import partitions, rollups
+from monitoring.models import DailyTokenSummary
+
+
+class Command(BaseCommand):
+    help = 'Export TokenUsage months older than the retention window to gzip CSV and drop them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-months',
+            type=int,
+            default=getattr(settings, 'TOKEN_USAGE_RETENTION_MONTHS', 12),
+            help='Months of raw rows to keep, including the current month',
+        )
+        parser.add_argument(
+            '--output-dir',
+            default=str(getattr(settings, 'TOKEN_USAGE_ARCHIVE_DIR', settings.BASE_DIR / 'archives' / 'token_usage')),
+            help='Directory for the compressed exports',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='List the months that would be archived')
+
+    def handle(self, *args, **options):
+        keep_months = options['keep_months']
+        if keep_months < 1:
+            raise CommandError('--keep-months must be at least 1')
+
+        created = partitions.ensure_partitions()
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+
+        cutoff = partitions.add_months(partitions.month_start(timezone.now()), -(keep_months - 1))
+        months = partitions.months_with_rows_before(cutoff)
+        if not months:
+            self.stdout.write(self.style.SUCCESS(f"Nothing to archive before {cutoff:%Y-%m}"))
+            return
+
+        if options['dry_run']:
+            for month in months:
+                self.stdout.write(f"Would archive {month:%Y-%m}")
+            return
+
+        # Archived days must stay visible through the rollups
+        rollups.rollup_token_usage()
+        rolled_until = DailyTokenSummary.objects.aggregate(latest=Max('date'))['latest']
+
+        for month in months:
+            # Months are UTC, rollup days are local: require the following day too
+            if rolled_until is None or rolled_until < partitions.add_months(month, 1):
+                self.stdout.write(self.style.WARNING(f"Skipping {month:%Y-%m}: daily rollups not complete"))
+                continue
+            try:
+                path, rows = partitions.archive_month(month, options['output_dir'])
+            except FileExistsError as exc:
+                self.stdout.write(self.style.WARNING(f"Skipping {month:%Y-%m}: {exc}"))
+                continue
+            self.stdout.write(self.style.SUCCESS(f"Archived {month:%Y-%m}: {rows} rows -> {path}"))
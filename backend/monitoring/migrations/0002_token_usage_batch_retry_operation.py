@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tokenusage',
+            name='operation_type',
+            field=models.CharField(choices=[('transcription', 'Video Transcription'), ('analysis', 'Transcript Analysis'), ('batch_analysis', 'Batch Analysis'), ('batch_analysis_retry', 'Batch Analysis Follow-up'), ('other', 'Other')], max_length=50),
+        ),
+    ]
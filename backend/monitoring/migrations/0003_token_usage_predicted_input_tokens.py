@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0002_token_usage_batch_retry_operation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tokenusage',
+            name='predicted_input_tokens',
+            field=models.IntegerField(blank=True, help_text='Prompt tokens counted locally before the call (text-only prompts)', null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0003_token_usage_predicted_input_tokens'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tokenusage',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
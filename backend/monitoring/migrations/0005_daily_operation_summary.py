@@ -0,0 +1,50 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0004_token_usage_created_at_default'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailytokensummary',
+            name='analysis_cost',
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=14),
+        ),
+        migrations.AlterField(
+            model_name='dailytokensummary',
+            name='total_cost',
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=14),
+        ),
+        migrations.AlterField(
+            model_name='dailytokensummary',
+            name='transcription_cost',
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=14),
+        ),
+        migrations.CreateModel(
+            name='DailyOperationSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('operation_type', models.CharField(choices=[('transcription', 'Video Transcription'), ('analysis', 'Transcript Analysis'), ('batch_analysis', 'Batch Analysis'), ('batch_analysis_retry', 'Batch Analysis Follow-up'), ('other', 'Other')], max_length=50)),
+                ('requests', models.IntegerField(default=0)),
+                ('successful_requests', models.IntegerField(default=0)),
+                ('input_tokens', models.BigIntegerField(default=0)),
+                ('output_tokens', models.BigIntegerField(default=0)),
+                ('total_tokens', models.BigIntegerField(default=0)),
+                ('total_cost', models.DecimalField(decimal_places=6, default=0, max_digits=14)),
+                ('response_time_total', models.FloatField(default=0)),
+                ('timed_requests', models.IntegerField(default=0)),
+                ('summary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='operations', to='monitoring.dailytokensummary')),
+            ],
+            options={
+                'db_table': 'monitoring_daily_operation_summary',
+                'ordering': ['operation_type'],
+                'constraints': [models.UniqueConstraint(fields=('summary', 'operation_type'), name='uniq_daily_operation_summary')],
+            },
+        ),
+    ]
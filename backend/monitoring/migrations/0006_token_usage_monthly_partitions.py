@@ -0,0 +1,120 @@
+"""
+Convert monitoring_token_usage into a monthly RANGE (created_at) partitioned
+table on PostgreSQL. Other databases keep the plain table (see
+monitoring/partitions.py for the fallback).
+"""
+
+from datetime import date, datetime, timezone
+
+from django.db import migrations
+
+TABLE = 'monitoring_token_usage'
+LEGACY = 'monitoring_token_usage_legacy'
+MONTHS_AHEAD = 2
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month):
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat()
+
+
+def _is_partitioned(cursor):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+        [TABLE],
+    )
+    return cursor.fetchone() is not None
+
+
+def _rebuild(cursor, partitioned):
+    """Copy monitoring_token_usage into a fresh (partitioned or plain) table of the same shape"""
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND indexname NOT LIKE %s",
+        [TABLE, '%_pkey'],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [TABLE],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(f'SELECT min(created_at) FROM "{TABLE}"')
+    oldest = cursor.fetchone()[0]
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+    legacy_sequence = cursor.fetchone()[0]
+
+    cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY}"')
+    if legacy_sequence:
+        # Free the name for the new table's sequence (dropped with the legacy table)
+        cursor.execute(f'ALTER SEQUENCE {legacy_sequence} RENAME TO "{TABLE}_id_legacy_seq"')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+    for name, _ in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{LEGACY}" DROP CONSTRAINT "{name}"')
+
+    # Identity columns on partitioned tables need PostgreSQL 17, so use an owned sequence
+    partition_clause = ' PARTITION BY RANGE (created_at)' if partitioned else ''
+    cursor.execute(
+        f'CREATE TABLE "{TABLE}" (LIKE "{LEGACY}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS){partition_clause}'
+    )
+    cursor.execute(f'CREATE SEQUENCE "{TABLE}_id_seq" OWNED BY "{TABLE}".id')
+    cursor.execute(f'ALTER TABLE "{TABLE}" ALTER COLUMN id SET DEFAULT nextval(\'"{TABLE}_id_seq"\')')
+    primary_key = 'id, created_at' if partitioned else 'id'
+    cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY ({primary_key})')
+    for _, definition in indexes:
+        # Indexes read off a partitioned parent are reported as "ON ONLY"
+        cursor.execute(definition.replace(' ON ONLY ', ' ON '))
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{name}" {definition}')
+
+    if partitioned:
+        cursor.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+        current = date.today().replace(day=1)
+        month = date(oldest.year, oldest.month, 1) if oldest else current
+        while month <= _add_months(current, MONTHS_AHEAD):
+            following = _add_months(month, 1)
+            cursor.execute(
+                f'CREATE TABLE "{TABLE}_p{month.year:04d}_{month.month:02d}" PARTITION OF "{TABLE}" '
+                f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(following)}')"
+            )
+            month = following
+
+    cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{LEGACY}"')
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE((SELECT max(id) FROM \"{TABLE}\"), 0) + 1, false)",
+        [TABLE],
+    )
+    # Dropping a partitioned table drops its partitions too
+    cursor.execute(f'DROP TABLE "{LEGACY}"')
+
+
+def partition_token_usage(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if not _is_partitioned(cursor):
+            _rebuild(cursor, partitioned=True)
+
+
+def unpartition_token_usage(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if _is_partitioned(cursor):
+            _rebuild(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0005_daily_operation_summary'),
+    ]
+
+    operations = [
+        # Reverse copies the rows back into a plain table with a single-column primary key
+        migrations.RunPython(partition_token_usage, unpartition_token_usage),
+    ]
@@ -5,6 +5,7 @@ Tracks all API calls to Gemini for cost analysis and optimization
 
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class TokenUsage(models.Model):
@@ -14,6 +15,7 @@ class TokenUsage(models.Model):
         ('transcription', 'Video Transcription'),
         ('analysis', 'Transcript Analysis'),
         ('batch_analysis', 'Batch Analysis'),
+        ('batch_analysis_retry', 'Batch Analysis Follow-up'),
         ('other', 'Other'),
     ]
     
@@ -26,6 +28,9 @@ class TokenUsage(models.Model):
     input_tokens = models.IntegerField(default=0, help_text="Tokens sent to API (prompt)")
     output_tokens = models.IntegerField(default=0, help_text="Tokens received from API (response)")
     total_tokens = models.IntegerField(default=0, help_text="Total tokens used")
+    predicted_input_tokens = models.IntegerField(
+        null=True, blank=True, help_text="Prompt tokens counted locally before the call (text-only prompts)"
+    )
     
     # API Details
     model_name = models.CharField(max_length=100, default='gemini-2.5-flash')
@@ -40,8 +45,8 @@ class TokenUsage(models.Model):
     success = models.BooleanField(default=True)
     error_message = models.TextField(blank=True)
     
-    # Timestamps
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Timestamps (set when the call happened; rows may be written later by the usage buffer flush)
+    created_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         db_table = 'monitoring_token_usage'
@@ -52,8 +57,8 @@ class TokenUsage(models.Model):
             models.Index(fields=['interview']),
         ]
     
-    def save(self, *args, **kwargs):
-        """Auto-calculate total tokens and estimated cost"""
+    def apply_pricing(self):
+        """Calculate total tokens and estimated cost (also used by bulk_create flushes)"""
         self.total_tokens = self.input_tokens + self.output_tokens
         
         # Gemini 2.5 Flash pricing (as of Nov 2024)
@@ -61,8 +66,11 @@ class TokenUsage(models.Model):
         # Output: $0.30 per 1M tokens
         input_cost = (self.input_tokens / 1_000_000) * 0.075
         output_cost = (self.output_tokens / 1_000_000) * 0.30
-        self.estimated_cost = input_cost + output_cost
-        
+        self.estimated_cost = round(input_cost + output_cost, 6)
+    
+    def save(self, *args, **kwargs):
+        """Auto-calculate total tokens and estimated cost"""
+        self.apply_pricing()
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -70,7 +78,7 @@ class TokenUsage(models.Model):
 
 
 class DailyTokenSummary(models.Model):
-    """Aggregate daily token usage statistics"""
+    """Aggregate daily token usage statistics (filled by monitoring.rollups)"""
     
     date = models.DateField(unique=True)
     
@@ -79,16 +87,16 @@ class DailyTokenSummary(models.Model):
     total_input_tokens = models.BigIntegerField(default=0)
     total_output_tokens = models.BigIntegerField(default=0)
     total_tokens = models.BigIntegerField(default=0)
-    total_cost = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    total_cost = models.DecimalField(max_digits=14, decimal_places=6, default=0)
     
     # Breakdown by operation
     transcription_requests = models.IntegerField(default=0)
     transcription_tokens = models.BigIntegerField(default=0)
-    transcription_cost = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    transcription_cost = models.DecimalField(max_digits=14, decimal_places=6, default=0)
     
     analysis_requests = models.IntegerField(default=0)
     analysis_tokens = models.BigIntegerField(default=0)
-    analysis_cost = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    analysis_cost = models.DecimalField(max_digits=14, decimal_places=6, default=0)
     
     # Performance
     avg_response_time = models.FloatField(default=0, help_text="Average API response time in seconds")
@@ -105,3 +113,31 @@ class DailyTokenSummary(models.Model):
     
     def __str__(self):
         return f"{self.date} - {self.total_tokens:,} tokens - ${self.total_cost}"
+
+
+class DailyOperationSummary(models.Model):
+    """Per-operation split of a DailyTokenSummary (sums, so days can be combined)"""
+    
+    summary = models.ForeignKey(DailyTokenSummary, on_delete=models.CASCADE, related_name='operations')
+    operation_type = models.CharField(max_length=50, choices=TokenUsage.OPERATION_TYPES)
+    
+    requests = models.IntegerField(default=0)
+    successful_requests = models.IntegerField(default=0)
+    input_tokens = models.BigIntegerField(default=0)
+    output_tokens = models.BigIntegerField(default=0)
+    total_tokens = models.BigIntegerField(default=0)
+    total_cost = models.DecimalField(max_digits=14, decimal_places=6, default=0)
+    
+    # Sum and count of non-null api_response_time values (for weighted averages)
+    response_time_total = models.FloatField(default=0)
+    timed_requests = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'monitoring_daily_operation_summary'
+        ordering = ['operation_type']
+        constraints = [
+            models.UniqueConstraint(fields=['summary', 'operation_type'], name='uniq_daily_operation_summary'),
+        ]
+    
+    def __str__(self):
+        return f"{self.summary.date} {self.operation_type} - {self.total_tokens:,} tokens"
@@ -0,0 +1,191 @@
+"""
+Monthly partitions for monitoring_token_usage
+
+On PostgreSQL, migration 0006 turns the table into a RANGE (created_at)
+partitioned table. The table has one partition per UTC month, named
+monitoring_token_usage_pYYYY_MM, plus a DEFAULT partition for stragglers. The
+primary key becomes (id, created_at), since PostgreSQL requires the partition
+key in it; Django keeps using id, which stays unique through its sequence.
+
+Queries with a created_at lower bound (the traffic_monitor windows, the
+statistics raw rows, the default token-usage list window) only scan the
+matching partitions. ensure_partitions() is run daily by beat so upcoming
+months exist before rows arrive. archive_month() exports a month to a
+compressed CSV and then drops its partition.
+
+On other databases (SQLite in tests and local dev) the table stays plain.
+The same functions fall back to range queries and deletes.
+"""
+
+import csv
+import gzip
+import logging
+import os
+from datetime import date, datetime, timezone as dt_timezone
+from typing import List, Optional
+
+from django.db import connection, transaction
+
+from .models import TokenUsage
+
+logger = logging.getLogger(__name__)
+
+TABLE = TokenUsage._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+DEFAULT_MONTHS_AHEAD = 2
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month: date):
+    """[start, end) of a month as aware UTC datetimes"""
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    nxt = add_months(month, 1)
+    return start, datetime(nxt.year, nxt.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def existing_partitions() -> List[str]:
+    if not is_partitioned():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+            """,
+            [TABLE],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def partition_month(name: str) -> Optional[date]:
+    prefix = f"{TABLE}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        year, month = name[len(prefix):].split('_')
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def create_partition_sql(month: date) -> List[str]:
+    """Statements creating one month's partition (rows already in DEFAULT are moved into it)"""
+    start, end = month_bounds(month)
+    name = partition_name(month)
+    bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    return [
+        f'CREATE TABLE "{name}" (LIKE "{TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        (
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+            f"WHERE created_at >= '{start.isoformat()}' AND created_at < '{end.isoformat()}' RETURNING *) "
+            f'INSERT INTO "{name}" SELECT * FROM moved'
+        ),
+        f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{name}" FOR VALUES {bounds}',
+    ]
+
+
+def ensure_partitions(months_ahead: int = DEFAULT_MONTHS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """Create partitions for the current month and the next months_ahead; returns created names"""
+    if not is_partitioned():
+        return []
+    current = month_start(today or datetime.now(dt_timezone.utc).date())
+    existing = set(existing_partitions())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            for statement in create_partition_sql(month):
+                cursor.execute(statement)
+        created.append(name)
+        logger.info("Created token usage partition", extra={"partition": name})
+    return created
+
+
+def months_with_rows_before(cutoff: date) -> List[date]:
+    """Months before cutoff that still hold TokenUsage rows"""
+    if is_partitioned():
+        months = {partition_month(name) for name in existing_partitions()}
+        months.discard(None)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date "
+                f'FROM "{DEFAULT_PARTITION}" WHERE created_at < %s',
+                [month_bounds(cutoff)[0]],
+            )
+            months.update(row[0] for row in cursor.fetchall())
+        return sorted(month for month in months if month < cutoff)
+
+    months = set()
+    start = month_bounds(cutoff)[0]
+    for created_at in TokenUsage.objects.filter(created_at__lt=start).values_list('created_at', flat=True).iterator():
+        months.add(month_start(created_at.astimezone(dt_timezone.utc)))
+    return sorted(months)
+
+
+def export_month(month: date, output_dir: str) -> tuple:
+    """Write a month's rows to <output_dir>/token_usage_YYYY_MM.csv.gz; returns (path, rows)"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"token_usage_{month.year:04d}_{month.month:02d}.csv.gz")
+    if os.path.exists(path):
+        raise FileExistsError(f"Archive already exists: {path}")
+    start, end = month_bounds(month)
+    columns = [field.attname for field in TokenUsage._meta.concrete_fields]
+    rows = 0
+    partial = f"{path}.partial"
+    with gzip.open(partial, 'wt', newline='') as archive:
+        writer = csv.writer(archive)
+        writer.writerow(columns)
+        queryset = TokenUsage.objects.filter(created_at__gte=start, created_at__lt=end).order_by('created_at', 'id')
+        for values in queryset.values_list(*columns).iterator(chunk_size=2000):
+            writer.writerow(values)
+            rows += 1
+    os.replace(partial, path)
+    return path, rows
+
+
+def drop_month(month: date) -> None:
+    """Remove a month's rows: detach + drop its partition, or a range delete on plain tables"""
+    start, end = month_bounds(month)
+    name = partition_name(month)
+    with transaction.atomic():
+        if name in existing_partitions():
+            with connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"')
+                cursor.execute(f'DROP TABLE "{name}"')
+        # Stragglers in DEFAULT, or every row on non-partitioned databases
+        TokenUsage.objects.filter(created_at__gte=start, created_at__lt=end).delete()
+
+
+def archive_month(month: date, output_dir: str) -> tuple:
+    path, rows = export_month(month, output_dir)
+    drop_month(month)
+    return path, rows
@@ -0,0 +1,214 @@
+"""
+Daily TokenUsage rollups
+
+rollup_token_usage() aggregates complete days (before today, local time) into
+DailyTokenSummary plus one DailyOperationSummary per operation type. Every
+run recomputes the days since the latest summary and also the last
+TOKEN_USAGE_ROLLUP_LOOKBACK_DAYS days, to pick up rows flushed late. Rolling
+a day again replaces its rows, so runs are idempotent.
+
+The statistics endpoints read per-operation sums from the rollups and add
+only the raw rows after the last rolled-up day (just today's, once the
+rollup task runs).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyOperationSummary, DailyTokenSummary, TokenUsage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOOKBACK_DAYS = 2
+ANALYSIS_OPERATIONS = ('analysis', 'batch_analysis', 'batch_analysis_retry')
+SUM_FIELDS = (
+    'requests', 'successful_requests', 'input_tokens', 'output_tokens', 'total_tokens',
+    'total_cost', 'response_time_total', 'timed_requests',
+)
+
+
+def day_start(day: date) -> datetime:
+    """Start of a local calendar day as an aware datetime"""
+    start = datetime.combine(day, time.min)
+    return timezone.make_aware(start) if settings.USE_TZ else start
+
+
+def _empty_totals() -> Dict[str, object]:
+    return {
+        'requests': 0, 'successful_requests': 0, 'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0,
+        'total_cost': Decimal('0'), 'response_time_total': 0.0, 'timed_requests': 0,
+    }
+
+
+def _raw_aggregates() -> Dict[str, object]:
+    return dict(
+        requests=Count('id'),
+        successful_requests=Count('id', filter=Q(success=True)),
+        input_tokens=Sum('input_tokens'),
+        output_tokens=Sum('output_tokens'),
+        total_tokens=Sum('total_tokens'),
+        total_cost=Sum('estimated_cost'),
+        response_time_total=Sum('api_response_time'),
+        timed_requests=Count('api_response_time'),
+    )
+
+
+def _add(target: Dict[str, object], row: Dict[str, object]) -> None:
+    for name in SUM_FIELDS:
+        target[name] += row.get(name) or 0
+
+
+def raw_daily_operation_totals(start: date, end: date) -> Dict[date, Dict[str, Dict[str, object]]]:
+    """{day: {operation_type: sums}} for raw TokenUsage rows in [start, end)"""
+    rows = (
+        TokenUsage.objects.filter(created_at__gte=day_start(start), created_at__lt=day_start(end))
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'operation_type')
+        .annotate(**_raw_aggregates())
+        .order_by()
+    )
+    days: Dict[date, Dict[str, Dict[str, object]]] = defaultdict(dict)
+    for row in rows:
+        totals = _empty_totals()
+        _add(totals, row)
+        days[row['day']][row['operation_type']] = totals
+    return days
+
+
+def build_daily_summary(day: date, operations: Dict[str, Dict[str, object]]):
+    """Unsaved DailyTokenSummary + DailyOperationSummary rows for one day's per-operation sums"""
+    overall = _empty_totals()
+    for totals in operations.values():
+        _add(overall, totals)
+
+    def split(names: Iterable[str]):
+        picked = _empty_totals()
+        for name in names:
+            if name in operations:
+                _add(picked, operations[name])
+        return picked
+
+    transcription = split(['transcription'])
+    analysis = split(ANALYSIS_OPERATIONS)
+    requests = overall['requests']
+    summary = DailyTokenSummary(
+        date=day,
+        total_requests=requests,
+        total_input_tokens=overall['input_tokens'],
+        total_output_tokens=overall['output_tokens'],
+        total_tokens=overall['total_tokens'],
+        total_cost=overall['total_cost'],
+        transcription_requests=transcription['requests'],
+        transcription_tokens=transcription['total_tokens'],
+        transcription_cost=transcription['total_cost'],
+        analysis_requests=analysis['requests'],
+        analysis_tokens=analysis['total_tokens'],
+        analysis_cost=analysis['total_cost'],
+        avg_response_time=(
+            overall['response_time_total'] / overall['timed_requests'] if overall['timed_requests'] else 0
+        ),
+        success_rate=(overall['successful_requests'] / requests * 100) if requests else 100,
+    )
+    operation_rows = [
+        DailyOperationSummary(operation_type=operation_type, **totals)
+        for operation_type, totals in sorted(operations.items())
+    ]
+    return summary, operation_rows
+
+
+def _lookback_days() -> int:
+    return int(getattr(settings, "TOKEN_USAGE_ROLLUP_LOOKBACK_DAYS", DEFAULT_LOOKBACK_DAYS))
+
+
+def rollup_token_usage(start: Optional[date] = None, end: Optional[date] = None) -> List[date]:
+    """
+    Recompute summaries for days in [start, end) (end defaults to today)
+
+    Without start, resumes after the latest summary (minus the lookback) or
+    from the first TokenUsage row. Returns the days written.
+    """
+    today = timezone.localdate()
+    end = min(end or today, today)
+    if start is None:
+        latest = DailyTokenSummary.objects.aggregate(latest=Max('date'))['latest']
+        if latest is not None:
+            start = min(latest + timedelta(days=1), today - timedelta(days=_lookback_days()))
+        else:
+            first = TokenUsage.objects.aggregate(first=Min('created_at'))['first']
+            if first is None:
+                return []
+            start = timezone.localtime(first).date()
+    if start >= end:
+        return []
+
+    raw = raw_daily_operation_totals(start, end)
+    written = []
+    day = start
+    while day < end:
+        summary, operation_rows = build_daily_summary(day, raw.get(day, {}))
+        with transaction.atomic():
+            stored, _ = DailyTokenSummary.objects.update_or_create(
+                date=day,
+                defaults={
+                    field.name: getattr(summary, field.name)
+                    for field in DailyTokenSummary._meta.concrete_fields
+                    if field.name not in ('id', 'date', 'created_at', 'updated_at')
+                },
+            )
+            stored.operations.all().delete()
+            for row in operation_rows:
+                row.summary = stored
+            DailyOperationSummary.objects.bulk_create(operation_rows)
+        written.append(day)
+        day += timedelta(days=1)
+    return written
+
+
+def raw_cutoff() -> date:
+    """First day not covered by rollups (today once the rollup job is current)"""
+    latest = DailyTokenSummary.objects.aggregate(latest=Max('date'))['latest']
+    today = timezone.localdate()
+    if latest is None:
+        first = TokenUsage.objects.aggregate(first=Min('created_at'))['first']
+        return min(timezone.localtime(first).date(), today) if first else today
+    return min(latest + timedelta(days=1), today)
+
+
+def operation_totals(since: Optional[date] = None, cutoff: Optional[date] = None) -> Dict[str, Dict[str, object]]:
+    """
+    Per-operation sums for days >= since (all time when None)
+
+    Days before cutoff come from DailyOperationSummary, later rows from TokenUsage.
+    """
+    if cutoff is None:
+        cutoff = raw_cutoff()
+    totals: Dict[str, Dict[str, object]] = defaultdict(_empty_totals)
+
+    if since is None or since < cutoff:
+        rollups = DailyOperationSummary.objects.filter(summary__date__lt=cutoff)
+        if since is not None:
+            rollups = rollups.filter(summary__date__gte=since)
+        for row in rollups.values('operation_type').annotate(**{name: Sum(name) for name in SUM_FIELDS}).order_by():
+            _add(totals[row['operation_type']], row)
+
+    raw = TokenUsage.objects.filter(created_at__gte=day_start(max(since, cutoff) if since else cutoff))
+    for row in raw.values('operation_type').annotate(**_raw_aggregates()).order_by():
+        _add(totals[row['operation_type']], row)
+    return dict(totals)
+
+
+def combine(totals: Dict[str, Dict[str, object]], operations: Optional[Iterable[str]] = None) -> Dict[str, object]:
+    combined = _empty_totals()
+    for operation_type, row in totals.items():
+        if operations is None or operation_type in operations:
+            _add(combined, row)
+    return combined
@@ -3,7 +3,7 @@ Serializers for Token Usage Monitoring API
 """
 
 from rest_framework import serializers
-from .models import TokenUsage, DailyTokenSummary
+from .models import TokenUsage, DailyTokenSummary, DailyOperationSummary
 
 
 class TokenUsageSerializer(serializers.ModelSerializer):
@@ -24,6 +24,7 @@ class TokenUsageSerializer(serializers.ModelSerializer):
             'input_tokens',
             'output_tokens',
             'total_tokens',
+            'predicted_input_tokens',
             'model_name',
             'api_response_time',
             'estimated_cost',
@@ -35,9 +36,34 @@ class TokenUsageSerializer(serializers.ModelSerializer):
         ]
 
 
+class DailyOperationSummarySerializer(serializers.ModelSerializer):
+    """Per-operation split of a daily summary"""
+    
+    class Meta:
+        model = DailyOperationSummary
+        fields = [
+            'operation_type',
+            'requests',
+            'successful_requests',
+            'input_tokens',
+            'output_tokens',
+            'total_tokens',
+            'total_cost',
+            'response_time_total',
+            'timed_requests',
+        ]
+
+
 class DailyTokenSummarySerializer(serializers.ModelSerializer):
     """Daily aggregated token usage"""
     
+    operations = serializers.SerializerMethodField()
+    
+    def get_operations(self, obj):
+        # Live (not yet rolled up) days carry unsaved rows
+        rows = obj.operations.all() if obj.pk else getattr(obj, 'pending_operations', [])
+        return DailyOperationSummarySerializer(rows, many=True).data
+    
     class Meta:
         model = DailyTokenSummary
         fields = [
@@ -56,6 +82,7 @@ class DailyTokenSummarySerializer(serializers.ModelSerializer):
             'analysis_cost',
             'avg_response_time',
             'success_rate',
+            'operations',
             'created_at',
             'updated_at'
         ]
@@ -0,0 +1,40 @@
+"""
+Celery tasks for the monitoring app
+"""
+
+import logging
+
+from celery import shared_task
+from django.core.cache import cache
+
+from monitoring import partitions, rollups, usage_buffer
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="monitoring.flush_token_usage_buffer", ignore_result=True)
+def flush_token_usage_buffer():
+    """Drain buffered TokenUsage events into the database with bulk_create"""
+    cache.delete(usage_buffer.FLUSH_SCHEDULED_KEY)
+    written = usage_buffer.flush()
+    if written:
+        logger.info("Flushed token usage buffer", extra={"rows": written})
+    return written
+
+
+@shared_task(name="monitoring.rollup_daily_token_usage", ignore_result=True)
+def rollup_daily_token_usage():
+    """Fill DailyTokenSummary / DailyOperationSummary for complete days (idempotent per date)"""
+    days = rollups.rollup_token_usage()
+    if days:
+        logger.info("Rolled up token usage", extra={"first_day": str(days[0]), "last_day": str(days[-1])})
+    return len(days)
+
+
+@shared_task(name="monitoring.ensure_token_usage_partitions", ignore_result=True)
+def ensure_token_usage_partitions():
+    """Create upcoming monthly TokenUsage partitions (PostgreSQL only)"""
+    created = partitions.ensure_partitions()
+    if created:
+        logger.info("Created token usage partitions", extra={"partitions": created})
+    return created
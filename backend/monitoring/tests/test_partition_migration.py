@@ -0,0 +1,87 @@
+"""
+Round trip of migration 0006 (monthly TokenUsage partitions) on PostgreSQL.
+
+The migration is a no-op elsewhere, so this module is skipped on SQLite. Run it
+against a scratch PostgreSQL database (the test runner creates test_<DB_NAME>):
+
+    DB_ENGINE=django.db.backends.postgresql DB_NAME=hirenowpro_db DB_USER=postgres \
+        python -m pytest -q --ds=core.settings monitoring/tests/test_partition_migration.py
+"""
+
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from monitoring import partitions
+from monitoring.models import TokenUsage
+
+BEFORE = [("monitoring", "0005_daily_operation_summary")]
+PARTITIONED = [("monitoring", "0006_token_usage_monthly_partitions")]
+
+
+def _migrate(targets):
+    executor = MigrationExecutor(connection)
+    executor.migrate(targets)
+
+
+def _table_shape():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s AND indexname NOT LIKE %s ORDER BY indexname",
+            [partitions.TABLE, "%_pkey"],
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f' ORDER BY conname",
+            [partitions.TABLE],
+        )
+        foreign_keys = [row[0] for row in cursor.fetchall()]
+    return indexes, foreign_keys
+
+
+@skipUnless(connection.vendor == "postgresql", "TokenUsage partitions only exist on PostgreSQL")
+class TokenUsagePartitionMigrationTests(TransactionTestCase):
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def _usage(self, days_ago):
+        return TokenUsage.objects.create(
+            operation_type="analysis",
+            input_tokens=100,
+            output_tokens=20,
+            created_at=timezone.now() - timedelta(days=days_ago),
+        )
+
+    def test_forward_and_reverse_keep_rows_indexes_and_foreign_keys(self):
+        _migrate(BEFORE)
+        self.assertFalse(partitions.is_partitioned())
+        old, recent = self._usage(70), self._usage(1)
+        shape = _table_shape()
+
+        _migrate(PARTITIONED)
+
+        self.assertTrue(partitions.is_partitioned())
+        existing = partitions.existing_partitions()
+        self.assertIn(partitions.DEFAULT_PARTITION, existing)
+        self.assertIn(partitions.partition_name(partitions.month_start(old.created_at)), existing)
+        self.assertIn(partitions.partition_name(partitions.add_months(partitions.month_start(timezone.now()), 2)),
+                      existing)
+        self.assertEqual(_table_shape(), shape)
+        self.assertEqual(sorted(TokenUsage.objects.values_list("id", flat=True)), [old.id, recent.id])
+        self.assertGreater(self._usage(0).id, recent.id)
+
+        _migrate(BEFORE)
+
+        self.assertFalse(partitions.is_partitioned())
+        self.assertEqual(_table_shape(), shape)
+        self.assertEqual(TokenUsage.objects.count(), 3)
+        latest = self._usage(0)
+        self.assertGreater(latest.id, recent.id + 1)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_class WHERE relname LIKE %s", [f"{partitions.TABLE}_p%"])
+            self.assertEqual(cursor.fetchone()[0], 0)
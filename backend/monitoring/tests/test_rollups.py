@@ -0,0 +1,140 @@
+"""
+Tests for the daily TokenUsage rollups and the statistics endpoints built on them.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from monitoring import rollups
+from monitoring.models import DailyOperationSummary, DailyTokenSummary, TokenUsage
+from monitoring.views import TokenUsageViewSet
+
+
+def _usage(days_ago, operation_type="analysis", tokens=(1000, 200), success=True, response_time=1.0):
+    row = TokenUsage.objects.create(
+        operation_type=operation_type,
+        input_tokens=tokens[0],
+        output_tokens=tokens[1],
+        api_response_time=response_time,
+        success=success,
+        created_at=timezone.now() - timedelta(days=days_ago),
+    )
+    return row
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        _usage(3, "transcription", tokens=(0, 50))
+        _usage(3, "analysis")
+        _usage(2, "batch_analysis", tokens=(4000, 800), success=False, response_time=None)
+        _usage(0, "analysis")
+
+    def test_complete_days_are_rolled_up_with_operation_splits(self):
+        days = rollups.rollup_token_usage()
+
+        today = timezone.localdate()
+        self.assertEqual(days[-1], today - timedelta(days=1))
+        self.assertFalse(DailyTokenSummary.objects.filter(date=today).exists())
+        three_days_ago = DailyTokenSummary.objects.get(date=timezone.localtime(timezone.now() - timedelta(days=3)).date())
+        self.assertEqual(three_days_ago.total_requests, 2)
+        self.assertEqual(three_days_ago.transcription_tokens, 50)
+        self.assertEqual(three_days_ago.analysis_tokens, 1200)
+        self.assertEqual(
+            sorted(three_days_ago.operations.values_list("operation_type", flat=True)), ["analysis", "transcription"]
+        )
+
+    def test_rerunning_is_idempotent_and_picks_up_late_rows(self):
+        rollups.rollup_token_usage()
+        _usage(1, "analysis")
+        rollups.rollup_token_usage()
+        rollups.rollup_token_usage()
+
+        yesterday = DailyTokenSummary.objects.get(date=timezone.localdate() - timedelta(days=1))
+        self.assertEqual(yesterday.analysis_requests, 1)
+        self.assertEqual(DailyOperationSummary.objects.filter(summary=yesterday).count(), 1)
+        self.assertEqual(DailyTokenSummary.objects.values("date").distinct().count(), DailyTokenSummary.objects.count())
+
+
+class StatisticsFromRollupsTests(TestCase):
+    def setUp(self):
+        for days_ago in (5, 4, 1):
+            _usage(days_ago, "transcription", tokens=(0, 40))
+            _usage(days_ago, "batch_analysis", tokens=(3000, 600))
+        _usage(0, "analysis", tokens=(900, 100), success=False)
+        self.user = get_user_model().objects.create_user(username="it", password="pass", is_staff=True)
+        self.factory = APIRequestFactory()
+
+    def _get(self, action):
+        request = self.factory.get(f"/api/token-usage/{action}/")
+        force_authenticate(request, user=self.user)
+        return TokenUsageViewSet.as_view({"get": action})(request).data
+
+    def test_statistics_match_before_and_after_rollup(self):
+        before = self._get("statistics")
+        rollups.rollup_token_usage()
+        with self.assertNumQueries(7):
+            after = self._get("statistics")
+
+        self.assertEqual(before, after)
+        self.assertEqual(after["total_requests"], 7)
+        self.assertEqual(after["total_tokens"], 3 * 40 + 3 * 3600 + 1000)
+        self.assertEqual(after["today_requests"], 1)
+        self.assertEqual(after["avg_tokens_per_transcription"], 40)
+        self.assertAlmostEqual(after["success_rate"], 6 / 7 * 100, places=1)
+
+    def test_analysis_average_includes_retry_calls(self):
+        _usage(1, "batch_analysis_retry", tokens=(500, 100))
+        rollups.rollup_token_usage()
+
+        stats = self._get("statistics")
+
+        # 3 batch_analysis + 1 analysis + 1 batch_analysis_retry
+        self.assertEqual(stats["avg_tokens_per_analysis"], (3 * 3600 + 1000 + 600) / 5)
+
+    def test_by_operation_and_daily_summary_combine_rollups_with_today(self):
+        rollups.rollup_token_usage()
+
+        by_operation = {row["operation_type"]: row for row in self._get("by_operation")}
+        self.assertEqual(by_operation["batch_analysis"]["count"], 3)
+        self.assertEqual(by_operation["analysis"]["total_tokens"], 1000)
+        self.assertEqual(by_operation["transcription"]["total_cost"], Decimal("0.000036"))
+
+        daily = self._get("daily_summary")
+        self.assertEqual(daily[0]["date"], str(timezone.localdate()))
+        self.assertEqual(daily[0]["total_requests"], 1)
+        self.assertEqual(daily[0]["operations"][0]["operation_type"], "analysis")
+        self.assertEqual(daily[1]["total_requests"], 2)
+        self.assertEqual(len(daily[1]["operations"]), 2)
+
+
+class TokenUsageListWindowTests(TestCase):
+    def setUp(self):
+        self.recent = _usage(2)
+        self.old = _usage(40)
+        self.user = get_user_model().objects.create_user(username="it", password="pass", is_staff=True)
+        self.factory = APIRequestFactory()
+
+    def _list(self, **params):
+        request = self.factory.get("/api/token-usage/", params)
+        force_authenticate(request, user=self.user)
+        return TokenUsageViewSet.as_view({"get": "list"})(request).data
+
+    @override_settings(TOKEN_USAGE_LIST_DEFAULT_DAYS=31)
+    def test_unfiltered_list_reports_default_window(self):
+        data = self._list()
+
+        self.assertEqual([row["id"] for row in data["results"]], [self.recent.id])
+        self.assertEqual(data["window_days"], 31)
+        self.assertIn("date_from", data)
+
+    def test_explicit_date_from_reaches_past_window(self):
+        since = (timezone.now() - timedelta(days=60)).isoformat()
+        data = self._list(date_from=since)
+
+        self.assertEqual(data["count"], 2)
+        self.assertNotIn("window_days", data)
@@ -0,0 +1,88 @@
+"""
+Tests for TokenUsage retention (archive_token_usage) on the non-partitioned fallback.
+"""
+
+import csv
+import gzip
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from monitoring import partitions, rollups
+from monitoring.models import DailyTokenSummary, TokenUsage
+
+
+class PartitionHelperTests(TestCase):
+    def test_month_arithmetic_and_names(self):
+        self.assertEqual(partitions.add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(partitions.add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+        start, end = partitions.month_bounds(date(2026, 12, 1))
+        self.assertEqual((start.month, end.year, end.month), (12, 2027, 1))
+        self.assertEqual(partitions.partition_name(date(2026, 3, 1)), "monitoring_token_usage_p2026_03")
+        self.assertEqual(partitions.partition_month("monitoring_token_usage_p2026_03"), date(2026, 3, 1))
+        self.assertIsNone(partitions.partition_month("monitoring_token_usage_default"))
+
+    def test_partition_sql_moves_default_rows_before_attaching(self):
+        statements = partitions.create_partition_sql(date(2026, 5, 1))
+
+        self.assertIn("DELETE FROM \"monitoring_token_usage_default\"", statements[1])
+        self.assertTrue(statements[2].endswith("FROM ('2026-05-01T00:00:00+00:00') TO ('2026-06-01T00:00:00+00:00')"))
+
+    def test_plain_tables_skip_partition_maintenance(self):
+        self.assertFalse(partitions.is_partitioned())
+        self.assertEqual(partitions.ensure_partitions(), [])
+
+
+class ArchiveTokenUsageCommandTests(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+        this_month = partitions.month_start(timezone.now())
+        self.old_month = partitions.add_months(this_month, -3)
+        old_time = datetime(self.old_month.year, self.old_month.month, 10, 12, tzinfo=dt_timezone.utc)
+        for tokens in (100, 200):
+            TokenUsage.objects.create(operation_type="analysis", input_tokens=tokens, created_at=old_time)
+        self.recent = TokenUsage.objects.create(
+            operation_type="transcription", output_tokens=50, created_at=timezone.now() - timedelta(days=1)
+        )
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command("archive_token_usage", "--keep-months=2", f"--output-dir={self.output_dir}", *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_changes_nothing(self):
+        output = self._run("--dry-run")
+
+        self.assertIn(f"Would archive {self.old_month:%Y-%m}", output)
+        self.assertEqual(TokenUsage.objects.count(), 3)
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_old_months_are_exported_and_dropped_but_stay_in_statistics(self):
+        total_before = rollups.combine(rollups.operation_totals())["total_tokens"]
+
+        self._run()
+
+        self.assertEqual(list(TokenUsage.objects.values_list("id", flat=True)), [self.recent.id])
+        path = os.path.join(self.output_dir, f"token_usage_{self.old_month:%Y_%m}.csv.gz")
+        with gzip.open(path, "rt", newline="") as archive:
+            rows = list(csv.DictReader(archive))
+        self.assertEqual(sorted(int(row["input_tokens"]) for row in rows), [100, 200])
+        self.assertTrue(DailyTokenSummary.objects.filter(total_tokens=300).exists())
+        self.assertEqual(rollups.combine(rollups.operation_totals())["total_tokens"], total_before)
+
+    def test_existing_archive_is_never_overwritten(self):
+        path = os.path.join(self.output_dir, f"token_usage_{self.old_month:%Y_%m}.csv.gz")
+        with open(path, "wb") as existing:
+            existing.write(b"keep")
+
+        output = self._run()
+
+        self.assertIn("Skipping", output)
+        self.assertEqual(TokenUsage.objects.count(), 3)
@@ -0,0 +1,138 @@
+"""
+Tests for buffered TokenUsage writes.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from monitoring import usage_buffer
+from monitoring.models import TokenUsage
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "usage-buffer-tests"}}
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def lrange(self, key, start, end):
+        self.ops.append(lambda: list(self.client.items[start:end + 1]))
+
+    def ltrim(self, key, start, end):
+        def trim():
+            self.client.items = self.client.items[start:]
+            return True
+        self.ops.append(trim)
+
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.items = []
+
+    def rpush(self, key, value):
+        self.items.append(value.encode())
+        return len(self.items)
+
+    def lpush(self, key, *values):
+        self.items[:0] = [value for value in reversed(values)]
+        return len(self.items)
+
+    def llen(self, key):
+        return len(self.items)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def _usage(**extra):
+    return {
+        "operation_type": "analysis",
+        "input_tokens": 1_000_000,
+        "output_tokens": 100_000,
+        "model_name": "gemini-2.5-flash",
+        "prompt_length": 10,
+        "response_length": 5,
+        **extra,
+    }
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    TOKEN_USAGE_BUFFER_ENABLED=True,
+    TOKEN_USAGE_FLUSH_BATCH_SIZE=3,
+    TOKEN_USAGE_FLUSH_INTERVAL_SECONDS=3600,
+)
+class InProcessUsageBufferTests(TestCase):
+    def setUp(self):
+        usage_buffer.flush()
+
+    def test_events_are_bulk_written_at_the_size_threshold_with_cost(self):
+        usage_buffer.record_usage(**_usage())
+        usage_buffer.record_usage(**_usage(operation_type="transcription"))
+        self.assertEqual(TokenUsage.objects.count(), 0)
+        self.assertEqual(usage_buffer.pending_count(), 2)
+
+        usage_buffer.record_usage(**_usage(success=False, error_message="quota"))
+
+        self.assertEqual(TokenUsage.objects.count(), 3)
+        row = TokenUsage.objects.filter(operation_type="transcription").get()
+        self.assertEqual(row.total_tokens, 1_100_000)
+        self.assertEqual(row.estimated_cost, Decimal("0.105000"))
+
+    def test_call_time_is_kept_as_created_at(self):
+        called_at = timezone.now() - timedelta(minutes=5)
+        usage_buffer.record_usage(**_usage(created_at=called_at))
+
+        self.assertEqual(usage_buffer.flush(), 1)
+        self.assertEqual(TokenUsage.objects.get().created_at, called_at)
+
+    @override_settings(TOKEN_USAGE_BUFFER_ENABLED=False)
+    def test_disabled_buffer_writes_immediately(self):
+        usage_buffer.record_usage(**_usage())
+
+        self.assertEqual(TokenUsage.objects.count(), 1)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    TOKEN_USAGE_BUFFER_ENABLED=True,
+    TOKEN_USAGE_FLUSH_BATCH_SIZE=2,
+    TOKEN_USAGE_FLUSH_INTERVAL_SECONDS=10,
+)
+class RedisUsageBufferTests(TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        redis_patch = patch.object(usage_buffer, "_redis", return_value=self.redis)
+        redis_patch.start()
+        self.addCleanup(redis_patch.stop)
+        schedule_patch = patch.object(usage_buffer, "_schedule_flush")
+        self.schedule = schedule_patch.start()
+        self.addCleanup(schedule_patch.stop)
+
+    def test_first_event_schedules_delayed_flush_and_batch_size_flushes_now(self):
+        usage_buffer.record_usage(**_usage())
+        self.schedule.assert_called_once_with(countdown=10)
+
+        usage_buffer.record_usage(**_usage())
+        self.schedule.assert_called_with()
+        self.assertEqual(TokenUsage.objects.count(), 0)
+
+    def test_flush_drains_the_list_in_batches(self):
+        for _ in range(5):
+            usage_buffer.record_usage(**_usage())
+
+        with self.assertNumQueries(3):
+            written = usage_buffer.flush()
+
+        self.assertEqual(written, 5)
+        self.assertEqual(TokenUsage.objects.count(), 5)
+        self.assertEqual(self.redis.items, [])
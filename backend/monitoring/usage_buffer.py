@@ -0,0 +1,226 @@
+"""
+Buffered TokenUsage writes
+
+Provider calls record usage with record_usage() instead of
+TokenUsage.objects.create(). The event is serialized onto a Redis list, which
+is one RPUSH on the connection django-redis already holds. The
+flush_token_usage_buffer Celery task drains it with bulk_create and computes
+total tokens and estimated cost during the flush.
+
+Flushes are triggered:
+- by a delayed task when the first event lands in an empty buffer
+  (TOKEN_USAGE_FLUSH_INTERVAL_SECONDS, so rows appear even without beat);
+- immediately once TOKEN_USAGE_FLUSH_BATCH_SIZE events are pending;
+- by the beat schedule as a safety net.
+
+Without a Redis cache (tests, local dev) events are buffered in process and
+flushed inline on the same size/time thresholds and at exit. With
+TOKEN_USAGE_BUFFER_ENABLED=false every event is written immediately, as before.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.db import OperationalError
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "monitoring:token_usage_buffer"
+FLUSH_SCHEDULED_KEY = "monitoring:token_usage_buffer:flush_scheduled"
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL_SECONDS = 10
+
+EVENT_FIELDS = (
+    'operation_type', 'interview_id', 'video_response_id', 'input_tokens', 'output_tokens',
+    'predicted_input_tokens', 'model_name', 'api_response_time', 'prompt_length', 'response_length',
+    'success', 'error_message',
+)
+
+_local_events: List[str] = []
+_local_lock = threading.Lock()
+_local_oldest = None
+
+
+def is_enabled() -> bool:
+    return bool(getattr(settings, "TOKEN_USAGE_BUFFER_ENABLED", True))
+
+
+def _batch_size() -> int:
+    return int(getattr(settings, "TOKEN_USAGE_FLUSH_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+
+
+def _flush_interval() -> int:
+    return int(getattr(settings, "TOKEN_USAGE_FLUSH_INTERVAL_SECONDS", DEFAULT_FLUSH_INTERVAL_SECONDS))
+
+
+def _redis():
+    """Raw Redis client behind the default cache, or None when it is not django-redis"""
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except Exception:
+        return None
+
+
+def _serialize(fields: Dict[str, Any]) -> str:
+    event = {name: fields.get(name) for name in EVENT_FIELDS if name in fields}
+    event['created_at'] = (fields.get('created_at') or timezone.now()).isoformat()
+    return json.dumps(event, default=str)
+
+
+def _build_rows(raw_events: List) -> list:
+    from monitoring.models import TokenUsage
+
+    rows = []
+    for raw in raw_events:
+        try:
+            event = json.loads(raw)
+            event['created_at'] = datetime.fromisoformat(event['created_at'])
+            row = TokenUsage(**event)
+            row.apply_pricing()
+            rows.append(row)
+        except Exception as exc:
+            logger.warning("Dropping malformed token usage event", extra={"error": str(exc)})
+    return rows
+
+
+def _write_rows(rows: list) -> int:
+    """bulk_create; on failure (e.g. interview deleted meanwhile) save row by row and drop the bad ones"""
+    from monitoring.models import TokenUsage
+
+    if not rows:
+        return 0
+    try:
+        TokenUsage.objects.bulk_create(rows, batch_size=_batch_size())
+        return len(rows)
+    except OperationalError:
+        # Database unavailable: the caller keeps the events for the next flush
+        raise
+    except Exception as exc:
+        logger.warning("Bulk token usage flush failed, saving rows individually", extra={"error": str(exc)})
+    written = 0
+    for row in rows:
+        row.pk = None
+        try:
+            row.save()
+            written += 1
+        except Exception as exc:
+            logger.warning("Dropping token usage row", extra={"operation_type": row.operation_type, "error": str(exc)})
+    return written
+
+
+def _schedule_flush(countdown: int = 0) -> None:
+    from django.core.cache import cache
+    from monitoring.tasks import flush_token_usage_buffer
+
+    try:
+        # One pending flush task at a time
+        if countdown and not cache.add(FLUSH_SCHEDULED_KEY, 1, timeout=countdown + 60):
+            return
+        flush_token_usage_buffer.apply_async(countdown=countdown)
+    except Exception as exc:
+        logger.warning("Unable to schedule token usage flush", extra={"error": str(exc)})
+
+
+def record_usage(**fields) -> None:
+    """Queue one TokenUsage row (fields as for TokenUsage.objects.create)"""
+    if not is_enabled():
+        from monitoring.models import TokenUsage
+
+        TokenUsage.objects.create(**fields)
+        return
+
+    event = _serialize(fields)
+    client = _redis()
+    if client is not None:
+        try:
+            pending = client.rpush(BUFFER_KEY, event)
+        except Exception as exc:
+            logger.warning("Token usage buffer unavailable, writing directly", extra={"error": str(exc)})
+            from monitoring.models import TokenUsage
+
+            TokenUsage.objects.create(**fields)
+            return
+        if pending == 1:
+            _schedule_flush(countdown=_flush_interval())
+        elif pending == _batch_size():
+            _schedule_flush()
+        return
+
+    global _local_oldest
+    with _local_lock:
+        _local_events.append(event)
+        if _local_oldest is None:
+            _local_oldest = time.monotonic()
+        due = len(_local_events) >= _batch_size() or time.monotonic() - _local_oldest >= _flush_interval()
+    if due:
+        flush()
+
+
+def pending_count() -> int:
+    client = _redis()
+    if client is not None:
+        try:
+            return int(client.llen(BUFFER_KEY))
+        except Exception:
+            return 0
+    with _local_lock:
+        return len(_local_events)
+
+
+def flush(max_items: int = None) -> int:
+    """Write up to max_items buffered events (all when None); returns rows written"""
+    global _local_oldest
+    client = _redis()
+    if client is None:
+        with _local_lock:
+            count = len(_local_events) if max_items is None else min(max_items, len(_local_events))
+            raw_events = _local_events[:count]
+            del _local_events[:count]
+            _local_oldest = time.monotonic() if _local_events else None
+        try:
+            return _write_rows(_build_rows(raw_events))
+        except OperationalError:
+            with _local_lock:
+                _local_events[:0] = raw_events
+            raise
+
+    written = drained = 0
+    batch_size = _batch_size()
+    while max_items is None or drained < max_items:
+        take = batch_size if max_items is None else min(batch_size, max_items - drained)
+        # LRANGE + LTRIM in one MULTI so concurrent flushers never double-write
+        pipe = client.pipeline(transaction=True)
+        pipe.lrange(BUFFER_KEY, 0, take - 1)
+        pipe.ltrim(BUFFER_KEY, take, -1)
+        raw_events, _ = pipe.execute()
+        if not raw_events:
+            break
+        drained += len(raw_events)
+        try:
+            written += _write_rows(_build_rows(raw_events))
+        except OperationalError:
+            client.lpush(BUFFER_KEY, *reversed(raw_events))
+            raise
+        if len(raw_events) < take:
+            break
+    return written
+
+
+def _flush_on_exit() -> None:
+    if _local_events:
+        try:
+            flush()
+        except Exception:
+            pass
+
+
+atexit.register(_flush_on_exit)
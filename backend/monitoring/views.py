@@ -6,13 +6,15 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Sum, Avg, Count, Q
+from django.db.models import Sum, Count, Q
 from django.db import connections
+from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
 
+from . import rollups
 from .models import TokenUsage, DailyTokenSummary
 from .serializers import (
     TokenUsageSerializer,
@@ -20,6 +22,9 @@ from .serializers import (
     TokenUsageStatsSerializer
 )
 from accounts.permissions import RolePermission
+from interviews.analysis_cache import get_analysis_cache_stats
+from interviews.provider_guard import get_breaker_states
+from interviews.transcript_cache import get_transcript_cache_stats
 
 GUARD_HIT_CACHE_KEY = "traffic_monitor:idempotency_guard_hits:last_1h"
 RETRY_COUNT_CACHE_KEY = "traffic_monitor:retry_attempts:last_15m"
@@ -237,6 +242,13 @@ def traffic_monitor(request):
     except Exception:
         data_quality_notes.append("outbound_spike_detection_unavailable")
 
+    transcript_cache_stats = get_transcript_cache_stats()
+    analysis_cache_stats = get_analysis_cache_stats()
+    provider_breakers = get_breaker_states()
+    provider_circuit_open = any(
+        state.get("state") in ("open", "half_open") for state in provider_breakers.values()
+    )
+
     flags = [
         worker_online_but_not_executing,
         repeated_worker_restart_detected,
@@ -264,6 +276,9 @@ def traffic_monitor(request):
             "idempotency_guard_hits_last_1h": idempotency_guard_hits,
         },
         "recent_async_activity": recent_activity,
+        "transcript_cache": transcript_cache_stats,
+        "analysis_cache": analysis_cache_stats,
+        "provider_breakers": provider_breakers,
         "outbound_api_summary": outbound_api_summary,
         "provider_risk_signals": {
             "worker_online_but_not_executing": worker_online_but_not_executing,
@@ -271,6 +286,7 @@ def traffic_monitor(request):
             "log_write_failures_detected": log_write_failures_detected,
             "task_retries_spiking": task_retries_spiking,
             "outbound_calls_spiking": outbound_calls_spiking,
+            "provider_circuit_open": provider_circuit_open,
             "infrastructure_risk_level": infrastructure_risk_level,
         },
     }
@@ -313,6 +329,11 @@ class TokenUsageViewSet(viewsets.ReadOnlyModelViewSet):
     API endpoints for token usage monitoring
     
     Only HR Managers and IT Support can access this data
+
+    The list defaults to the last TOKEN_USAGE_LIST_DEFAULT_DAYS days (31) when
+    neither date_from nor interview_id is given, so it only scans recent monthly
+    partitions. Pass date_from to look further back; the applied window is
+    returned as date_from/window_days alongside the results.
     """
     
     queryset = TokenUsage.objects.all()
@@ -320,6 +341,8 @@ class TokenUsageViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated, RolePermission]
     required_user_types = ["HR_MANAGER", "IT_SUPPORT"]
     
+    list_window_start = None
+
     def get_queryset(self):
         """Filter based on query parameters"""
         queryset = super().get_queryset()
@@ -343,8 +366,22 @@ class TokenUsageViewSet(viewsets.ReadOnlyModelViewSet):
         if interview_id:
             queryset = queryset.filter(interview_id=interview_id)
         
+        # Unbounded listings only scan recent monthly partitions
+        if self.action == 'list' and not date_from and not interview_id:
+            window_days = getattr(settings, 'TOKEN_USAGE_LIST_DEFAULT_DAYS', 31)
+            self.list_window_start = timezone.now() - timedelta(days=window_days)
+            queryset = queryset.filter(created_at__gte=self.list_window_start)
+        
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """Paginated list; reports the default window when one was applied"""
+        response = super().list(request, *args, **kwargs)
+        if self.list_window_start is not None and isinstance(response.data, dict):
+            response.data['date_from'] = self.list_window_start.isoformat()
+            response.data['window_days'] = getattr(settings, 'TOKEN_USAGE_LIST_DEFAULT_DAYS', 31)
+        return response
+    
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """
@@ -353,86 +390,64 @@ class TokenUsageViewSet(viewsets.ReadOnlyModelViewSet):
         GET /api/token-usage/statistics/
         """
         now = timezone.now()
-        today = now.date()
+        today = timezone.localdate()
         month_start = today.replace(day=1)
         
-        # Overall totals
-        total_stats = TokenUsage.objects.aggregate(
-            total_requests=Count('id'),
-            total_tokens=Sum('total_tokens'),
-            total_cost=Sum('estimated_cost'),
-            avg_response_time=Avg('api_response_time'),
-            successful=Count('id', filter=Q(success=True))
-        )
-        
-        # Today's stats
-        today_stats = TokenUsage.objects.filter(
-            created_at__date=today
-        ).aggregate(
-            today_requests=Count('id'),
-            today_tokens=Sum('total_tokens'),
-            today_cost=Sum('estimated_cost')
-        )
-        
-        # This month's stats
-        month_stats = TokenUsage.objects.filter(
-            created_at__date__gte=month_start
-        ).aggregate(
-            month_requests=Count('id'),
-            month_tokens=Sum('total_tokens'),
-            month_cost=Sum('estimated_cost')
-        )
+        # Per-operation sums: DailyOperationSummary rollups + raw rows after the last rolled-up day
+        cutoff = rollups.raw_cutoff()
+        all_time = rollups.operation_totals(cutoff=cutoff)
+        total_stats = rollups.combine(all_time)
+        today_stats = rollups.combine(rollups.operation_totals(since=today, cutoff=cutoff))
+        month_stats = rollups.combine(rollups.operation_totals(since=month_start, cutoff=cutoff))
         
         # Averages by operation type
-        transcription_avg = TokenUsage.objects.filter(
-            operation_type='transcription'
-        ).aggregate(avg=Avg('total_tokens'))['avg'] or 0
+        transcription = rollups.combine(all_time, ['transcription'])
+        transcription_avg = transcription['total_tokens'] / transcription['requests'] if transcription['requests'] else 0
+        analysis = rollups.combine(all_time, rollups.ANALYSIS_OPERATIONS)
+        analysis_avg = analysis['total_tokens'] / analysis['requests'] if analysis['requests'] else 0
         
-        analysis_avg = TokenUsage.objects.filter(
-            operation_type__in=['analysis', 'batch_analysis']
-        ).aggregate(avg=Avg('total_tokens'))['avg'] or 0
-        
-        # Average cost per interview (sum of all operations for one interview)
+        # Average cost per interview (sum of all operations for one interview), one grouped query
         from interviews.models import Interview
-        interview_costs = []
-        recent_interviews = Interview.objects.filter(
+        recent_interview_ids = list(Interview.objects.filter(
             status='completed',
             completed_at__gte=now - timedelta(days=30)
-        )[:100]
-        
-        for interview in recent_interviews:
-            cost = TokenUsage.objects.filter(
-                interview=interview
-            ).aggregate(total=Sum('estimated_cost'))['total'] or 0
-            if cost > 0:
-                interview_costs.append(float(cost))
+        ).values_list('id', flat=True)[:100])
+        interview_costs = [
+            float(row['total']) for row in TokenUsage.objects.filter(
+                interview_id__in=recent_interview_ids
+            ).values('interview_id').annotate(total=Sum('estimated_cost')).order_by()
+            if row['total'] and row['total'] > 0
+        ]
         
         avg_cost_per_interview = sum(interview_costs) / len(interview_costs) if interview_costs else 0
         
         # Success rate
-        total_requests = total_stats['total_requests'] or 1
-        successful_requests = total_stats['successful'] or 0
+        total_requests = total_stats['requests']
+        successful_requests = total_stats['successful_requests']
         success_rate = (successful_requests / total_requests) * 100 if total_requests > 0 else 100
+        avg_response_time = (
+            total_stats['response_time_total'] / total_stats['timed_requests'] if total_stats['timed_requests'] else 0
+        )
         
         stats = {
-            'total_requests': total_stats['total_requests'] or 0,
-            'total_tokens': total_stats['total_tokens'] or 0,
+            'total_requests': total_stats['requests'],
+            'total_tokens': total_stats['total_tokens'],
             'total_cost': total_stats['total_cost'] or Decimal('0.00'),
             
-            'today_requests': today_stats['today_requests'] or 0,
-            'today_tokens': today_stats['today_tokens'] or 0,
-            'today_cost': today_stats['today_cost'] or Decimal('0.00'),
+            'today_requests': today_stats['requests'],
+            'today_tokens': today_stats['total_tokens'],
+            'today_cost': today_stats['total_cost'] or Decimal('0.00'),
             
-            'this_month_requests': month_stats['month_requests'] or 0,
-            'this_month_tokens': month_stats['month_tokens'] or 0,
-            'this_month_cost': month_stats['month_cost'] or Decimal('0.00'),
+            'this_month_requests': month_stats['requests'],
+            'this_month_tokens': month_stats['total_tokens'],
+            'this_month_cost': month_stats['total_cost'] or Decimal('0.00'),
             
             'avg_tokens_per_transcription': round(transcription_avg, 2),
             'avg_tokens_per_analysis': round(analysis_avg, 2),
             'avg_cost_per_interview': round(Decimal(str(avg_cost_per_interview)), 2),
             
             'success_rate': round(success_rate, 2),
-            'avg_response_time': round(total_stats['avg_response_time'] or 0, 2)
+            'avg_response_time': round(avg_response_time, 2)
         }
         
         serializer = TokenUsageStatsSerializer(stats)
@@ -447,11 +462,42 @@ class TokenUsageViewSet(viewsets.ReadOnlyModelViewSet):
         """
         days = int(request.query_params.get('days', 30))
         
-        summaries = DailyTokenSummary.objects.all()[:days]
+        # Days not rolled up yet (normally only today) are summarized from raw rows
+        today = timezone.localdate()
+        cutoff = rollups.raw_cutoff()
+        live = rollups.raw_daily_operation_totals(cutoff, today + timedelta(days=1))
+        pending = []
+        day = today
+        while day >= cutoff and len(pending) < days:
+            summary, operation_rows = rollups.build_daily_summary(day, live.get(day, {}))
+            summary.pending_operations = operation_rows
+            pending.append(summary)
+            day -= timedelta(days=1)
+        
+        stored = DailyTokenSummary.objects.filter(date__lt=cutoff).prefetch_related('operations')
+        summaries = pending + list(stored[:max(days - len(pending), 0)])
         serializer = DailyTokenSummarySerializer(summaries, many=True)
         
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'], url_path='transcript-cache')
+    def transcript_cache(self, request):
+        """
+        Transcript cache hit/miss counters
+        
+        GET /api/token-usage/transcript-cache/
+        """
+        return Response(get_transcript_cache_stats())
+    
+    @action(detail=False, methods=['get'], url_path='analysis-cache')
+    def analysis_cache(self, request):
+        """
+        LLM analysis cache hit/miss counters
+        
+        GET /api/token-usage/analysis-cache/
+        """
+        return Response(get_analysis_cache_stats())
+    
     @action(detail=False, methods=['get'], url_path='by-operation')
     def by_operation(self, request):
         """
@@ -459,13 +505,20 @@ class TokenUsageViewSet(viewsets.ReadOnlyModelViewSet):
         
         GET /api/token-usage/by-operation/
         """
-        operation_stats = TokenUsage.objects.values('operation_type').annotate(
-            count=Count('id'),
-            total_tokens=Sum('total_tokens'),
-            total_cost=Sum('estimated_cost'),
-            avg_tokens=Avg('total_tokens'),
-            avg_response_time=Avg('api_response_time')
-        ).order_by('-total_tokens')
+        operation_stats = [
+            {
+                'operation_type': operation_type,
+                'count': totals['requests'],
+                'total_tokens': totals['total_tokens'],
+                'total_cost': totals['total_cost'],
+                'avg_tokens': totals['total_tokens'] / totals['requests'] if totals['requests'] else None,
+                'avg_response_time': (
+                    totals['response_time_total'] / totals['timed_requests'] if totals['timed_requests'] else None
+                ),
+            }
+            for operation_type, totals in rollups.operation_totals().items()
+        ]
+        operation_stats.sort(key=lambda row: row['total_tokens'], reverse=True)
         
         return Response(operation_stats)
 
@@ -477,7 +530,7 @@ class DailyTokenSummaryViewSet(viewsets.ReadOnlyModelViewSet):
     Only HR Managers and IT Support can access
     """
     
-    queryset = DailyTokenSummary.objects.all()
+    queryset = DailyTokenSummary.objects.prefetch_related('operations')
     serializer_class = DailyTokenSummarySerializer
     permission_classes = [IsAuthenticated, RolePermission]
     required_user_types = ["HR_MANAGER", "IT_SUPPORT"]
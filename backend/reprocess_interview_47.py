@@ -15,6 +15,7 @@ django.setup()
 
 from interviews.models import Interview, VideoResponse, AIAnalysis
 from interviews.ai_service import get_ai_service
+from interviews.media_service import get_stt_audio_path
 
 def reprocess_interview_with_rate_limiting(interview_id):
     """Reprocess interview with rate limiting"""
@@ -74,7 +75,11 @@ def reprocess_interview_with_rate_limiting(interview_id):
             
             # Step 1: Transcribe (with built-in rate limiting)
             print(f"\n🎤 Transcribing...")
-            transcript = ai_service.transcribe_video(video_path, video_response_id=video.id)
+            transcript = ai_service.transcribe_video(
+                video_path,
+                video_response_id=video.id,
+                audio_path=get_stt_audio_path(video),
+            )
             print(f"✅ Transcript ({len(transcript)} chars): {transcript[:100]}...")
             
             # Wait before analysis call to avoid quota
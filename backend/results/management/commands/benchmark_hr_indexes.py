@@ -0,0 +1,254 @@
+"""
+Management command to benchmark the HR hot-query indexes (results 0003,
+interviews 0004) against the index set they replaced.
+
+Seeds --rows interview results (plus answers) inside a transaction, then for
+each index set runs ANALYZE, EXPLAINs every hot query and times it. Everything,
+including the seeded rows and the index swaps, is rolled back at the end.
+"""
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.db.models import Avg, DurationField, ExpressionWrapper, F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from applicants.models import Applicant
+from interviews.models import Interview, InterviewQuestion, VideoResponse
+from interviews.type_models import PositionType, QuestionType
+from results.models import PENDING_DECISION_Q, REVIEW_SCORE_CUTOFF, InterviewResult
+
+
+# Index set before results 0003 / interviews 0004
+PREVIOUS_INDEXES = {
+    InterviewResult: [
+        models.Index(fields=['result_date'], name='idx_result_date'),
+        models.Index(fields=['applicant'], name='idx_result_applicant'),
+        models.Index(fields=['interview'], name='idx_result_interview'),
+    ],
+    VideoResponse: [models.Index(fields=['interview'], name='idx_vr_interview')],
+}
+CURRENT_INDEX_NAMES = {
+    InterviewResult: ['idx_result_date_score', 'idx_result_pending_recent', 'idx_result_decided'],
+    VideoResponse: ['idx_vr_interview_status'],
+}
+
+INTERVIEW_STATUSES = [('completed', 85), ('failed', 10), ('processing', 5)]
+HR_DECISIONS = [(None, 40), ('pending_hr_review', 10), ('hold', 5), ('hire', 25), ('reject', 20)]
+ANSWER_STATUSES = [('analyzed', 70), ('uploaded', 10), ('processing', 10), ('failed', 10)]
+EXPLAIN_PREFIX = {'postgresql': 'EXPLAIN', 'sqlite': 'EXPLAIN QUERY PLAN', 'mysql': 'EXPLAIN'}
+
+
+def _pick(rng, weighted):
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights=weights)[0]
+
+
+def hot_queries(sample):
+    """name -> callable running the query the way the HR views do"""
+    now = timezone.now()
+    pending = InterviewResult.objects.filter(PENDING_DECISION_Q, interview__status='completed')
+    today_start = timezone.make_aware(datetime.combine(now.date(), datetime.min.time()))
+    return {
+        'pending_reviews': lambda: pending.count(),
+        'overdue_reviews': lambda: pending.filter(result_date__lt=now - timedelta(hours=48)).count(),
+        'waiting_week': lambda: pending.filter(result_date__gte=now - timedelta(days=7)).count(),
+        'review_window_page': lambda: list(
+            pending.filter(final_score__gte=REVIEW_SCORE_CUTOFF, result_date__gte=now - timedelta(days=30))
+            .order_by('-result_date')
+            .values('id', 'final_score', 'result_date')[:20]
+        ),
+        'avg_decision_time': lambda: InterviewResult.objects.filter(hr_decision_at__isnull=False).aggregate(
+            avg=Avg(ExpressionWrapper(F('hr_decision_at') - F('result_date'), output_field=DurationField()))
+        ),
+        'reviewed_today': lambda: InterviewResult.objects.filter(
+            hr_decision__in=['hire', 'reject'], hr_decision_at__gte=today_start
+        ).count(),
+        'answers_by_status': lambda: VideoResponse.objects.filter(
+            interview_id=sample['interview_id'], status='analyzed'
+        ).count(),
+        'answer_by_question': lambda: VideoResponse.objects.get(
+            interview_id=sample['interview_id'], question_id=sample['question_id']
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN and time the HR hot queries on seeded data with the previous and current index sets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Interview results to seed')
+        parser.add_argument('--answers', type=int, default=3, help='Video responses per interview')
+        parser.add_argument('--days', type=int, default=180, help='Spread result dates over this many days')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible data')
+        parser.add_argument('--analyze', action='store_true', help='Use EXPLAIN ANALYZE (PostgreSQL only)')
+        parser.add_argument('--no-plans', action='store_true', help='Only print timings')
+
+    # Seeding
+
+    def _seed(self, rows, answers, days, rng):
+        run = uuid.uuid4().hex[:8]
+        position, _ = PositionType.objects.get_or_create(code='benchmark_role', defaults={'name': 'Benchmark Role'})
+        question_type, _ = QuestionType.objects.get_or_create(code='general', defaults={'name': 'General'})
+        questions = InterviewQuestion.objects.bulk_create([
+            InterviewQuestion(
+                question_text=f'Benchmark question {order} ({run})',
+                question_type=question_type,
+                position_type=position,
+                is_active=False,
+                order=order,
+            )
+            for order in range(answers)
+        ])
+        applicants = Applicant.objects.bulk_create([
+            Applicant(
+                first_name='Bench',
+                last_name=str(i),
+                email=f'hr-index-bench-{run}-{i}@example.invalid',
+                phone=f'555{i:07d}',
+                application_source='online',
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        interviews = Interview.objects.bulk_create([
+            Interview(applicant=applicant, position_type=position, status=_pick(rng, INTERVIEW_STATUSES))
+            for applicant in applicants
+        ], batch_size=1000)
+        results = InterviewResult.objects.bulk_create([
+            InterviewResult(
+                interview=interview,
+                applicant=interview.applicant,
+                applicant_display_name=f'Bench {i}',
+                final_score=round(rng.uniform(0, 100), 2),
+                passed=False,
+                hr_decision=_pick(rng, HR_DECISIONS),
+            )
+            for i, interview in enumerate(interviews)
+        ], batch_size=1000)
+
+        # result_date is auto_now_add, so spread it (and the decision times) afterwards
+        now = timezone.now()
+        for result in results:
+            result.passed = result.final_score >= 70
+            result.result_date = now - timedelta(days=rng.uniform(0, days))
+            if result.hr_decision in {'hire', 'reject', 'hold'}:
+                result.hr_decision_at = min(now, result.result_date + timedelta(hours=rng.uniform(1, 96)))
+        InterviewResult.objects.bulk_update(results, ['passed', 'result_date', 'hr_decision_at'], batch_size=500)
+
+        VideoResponse.objects.bulk_create([
+            VideoResponse(
+                interview=interview,
+                question=question,
+                video_file_path=f'video_responses/benchmark/{interview.pk}_{question.order}.webm',
+                duration=timedelta(seconds=45),
+                status=_pick(rng, ANSWER_STATUSES),
+            )
+            for interview in interviews
+            for question in questions
+        ], batch_size=1000)
+        sample = rng.choice(interviews)
+        return {'interview_id': sample.pk, 'question_id': questions[-1].pk}
+
+    # Index sets
+
+    def _existing_indexes(self, model):
+        with connection.cursor() as cursor:
+            return set(connection.introspection.get_constraints(cursor, model._meta.db_table))
+
+    def _use_index_set(self, previous):
+        editor = connection.schema_editor(collect_sql=True)
+        statements = []
+        for model in (InterviewResult, VideoResponse):
+            current = [index for index in model._meta.indexes if index.name in CURRENT_INDEX_NAMES[model]]
+            drop, create = (current, PREVIOUS_INDEXES[model]) if previous else (PREVIOUS_INDEXES[model], current)
+            existing = self._existing_indexes(model)
+            table = editor.quote_name(model._meta.db_table)
+            statements += [
+                editor.sql_delete_index % {'table': table, 'name': editor.quote_name(index.name)}
+                for index in drop
+                if index.name in existing
+            ]
+            statements += [str(index.create_sql(model, editor)) for index in create if index.name not in existing]
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'ANALYZE {InterviewResult._meta.db_table}, {VideoResponse._meta.db_table}')
+            else:
+                cursor.execute('ANALYZE')
+
+    # Measuring
+
+    def _explain(self, sql, analyze):
+        prefix = EXPLAIN_PREFIX.get(connection.vendor, 'EXPLAIN')
+        if analyze and connection.vendor == 'postgresql':
+            prefix = 'EXPLAIN (ANALYZE, BUFFERS)'
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}')
+            rows = cursor.fetchall()
+        if connection.vendor == 'sqlite':
+            return [row[-1] for row in rows]
+        return [row[0] if len(row) == 1 else ' '.join(str(value) for value in row) for row in rows]
+
+    def _measure(self, queries, repeat, analyze):
+        measured = {}
+        for name, run in queries.items():
+            with CaptureQueriesContext(connection) as captured:
+                run()  # warm-up, and the SQL to EXPLAIN
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            measured[name] = {
+                'median_ms': statistics.median(timings),
+                'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+                'plan': self._explain(captured.captured_queries[-1]['sql'], analyze),
+            }
+        return measured
+
+    def _report(self, before, after, show_plans):
+        for name in before:
+            old, new = before[name], after[name]
+            speedup = old['median_ms'] / new['median_ms'] if new['median_ms'] else 0.0
+            line = (
+                f"  {name:<20} before={old['median_ms']:8.2f}ms (p95 {old['p95_ms']:8.2f})  "
+                f"after={new['median_ms']:8.2f}ms (p95 {new['p95_ms']:8.2f})  speedup={speedup:.1f}x"
+            )
+            self.stdout.write(self.style.SUCCESS(line) if speedup >= 1 else self.style.WARNING(line))
+            if show_plans:
+                for label, plan in (('before', old['plan']), ('after', new['plan'])):
+                    self.stdout.write(f"    {label} plan:")
+                    for plan_line in plan:
+                        self.stdout.write(f"      {plan_line}")
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['answers'] < 1 or options['repeat'] < 1:
+            raise CommandError('--rows, --answers and --repeat must be positive')
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError(f'{connection.vendor} does not return ids from bulk inserts; seeding needs them')
+
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            started = time.perf_counter()
+            sample = self._seed(options['rows'], options['answers'], options['days'], rng)
+            self.stdout.write(
+                f"Seeded {options['rows']} results / {options['rows'] * options['answers']} answers "
+                f"on {connection.vendor} in {time.perf_counter() - started:.1f}s (rolled back at the end)"
+            )
+            queries = hot_queries(sample)
+
+            self._use_index_set(previous=True)
+            before = self._measure(queries, options['repeat'], options['analyze'])
+            self._use_index_set(previous=False)
+            after = self._measure(queries, options['repeat'], options['analyze'])
+
+            self._report(before, after, show_plans=not options['no_plans'])
+            transaction.set_rollback(True)
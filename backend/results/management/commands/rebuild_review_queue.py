@@ -0,0 +1,19 @@
+"""
+Management command to rebuild the HR review-queue projection
+(ReviewQueueEntry, see results/review_queue.py) from InterviewResults.
+"""
+from django.core.management.base import BaseCommand
+
+from results.review_queue import sync_review_queue
+
+
+class Command(BaseCommand):
+    help = 'Rebuild review queue entries from interview results (after raw SQL or queryset.update() writes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--result-id', type=int, action='append', dest='result_ids', help='Only rebuild these results')
+        parser.add_argument('--batch-size', type=int, default=500, help='Upsert batch size')
+
+    def handle(self, *args, **options):
+        written = sync_review_queue(options['result_ids'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Synced {written} review queue entr{'y' if written == 1 else 'ies'}"))
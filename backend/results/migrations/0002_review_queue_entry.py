@@ -0,0 +1,76 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_review_queue(apps, schema_editor):
+    from results.review_queue import queue_state_for, urgency_bucket_for, urgent_cutoff
+
+    InterviewResult = apps.get_model('results', 'InterviewResult')
+    ReviewQueueEntry = apps.get_model('results', 'ReviewQueueEntry')
+    db_alias = schema_editor.connection.alias
+    cutoff = urgent_cutoff()
+    entries = []
+    results = InterviewResult.objects.using(db_alias).select_related('interview__position_type')
+    for result in results.iterator(chunk_size=500):
+        interview = result.interview
+        queue_state = queue_state_for(result.hr_decision, interview.status)
+        entries.append(ReviewQueueEntry(
+            result_id=result.pk,
+            queue_state=queue_state,
+            urgency_bucket=urgency_bucket_for(queue_state, result.result_date, cutoff),
+            position_code=interview.position_type.code if interview.position_type_id else None,
+            applicant_display_name=result.applicant_display_name or '',
+            result_date=result.result_date,
+            final_score=result.final_score,
+            passed=result.passed,
+            hr_decision=result.hr_decision,
+            hr_decision_at=result.hr_decision_at,
+            hold_until=result.hold_until,
+            final_decision=result.final_decision,
+            interview_status=interview.status or '',
+            interview_created_at=interview.created_at,
+            synced_at=timezone.now(),
+        ))
+    ReviewQueueEntry.objects.using(db_alias).bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_video_response_media_artifacts'),
+        ('results', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewQueueEntry',
+            fields=[
+                ('result', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review_queue_entry', serialize=False, to='results.interviewresult')),
+                ('queue_state', models.CharField(choices=[('pending', 'Pending HR Review'), ('reviewed', 'Reviewed'), ('waiting', 'Waiting For Interview')], max_length=20)),
+                ('urgency_bucket', models.CharField(choices=[('urgent', 'Urgent'), ('normal', 'Normal'), ('none', 'None')], default='none', max_length=10)),
+                ('position_code', models.CharField(blank=True, max_length=50, null=True)),
+                ('applicant_display_name', models.CharField(blank=True, max_length=255)),
+                ('result_date', models.DateTimeField()),
+                ('final_score', models.FloatField()),
+                ('passed', models.BooleanField(default=False)),
+                ('hr_decision', models.CharField(blank=True, max_length=20, null=True)),
+                ('hr_decision_at', models.DateTimeField(blank=True, null=True)),
+                ('hold_until', models.DateTimeField(blank=True, null=True)),
+                ('final_decision', models.CharField(blank=True, max_length=20, null=True)),
+                ('interview_status', models.CharField(blank=True, max_length=20)),
+                ('interview_created_at', models.DateTimeField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Review Queue Entry',
+                'verbose_name_plural': 'Review Queue Entries',
+                'db_table': 'review_queue_entries',
+                'ordering': ['-result_date'],
+                'indexes': [models.Index(condition=models.Q(('final_score__gte', 50)), fields=['-result_date'], name='idx_rq_recent'), models.Index(condition=models.Q(('final_score__gte', 50)), fields=['queue_state', '-result_date'], name='idx_rq_state_recent'), models.Index(condition=models.Q(('final_score__gte', 50)), fields=['hr_decision', '-result_date'], name='idx_rq_decision_recent'), models.Index(condition=models.Q(('final_score__gte', 50)), fields=['queue_state', 'hr_decision_at'], name='idx_rq_state_decided')],
+            },
+        ),
+        migrations.RunPython(backfill_review_queue, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.3 on 2026-10-17 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0001_initial'),
+        ('interviews', '0004_hr_hot_query_indexes'),
+        ('results', '0002_review_queue_entry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='interviewresult',
+            name='idx_result_date',
+        ),
+        migrations.RemoveIndex(
+            model_name='interviewresult',
+            name='idx_result_applicant',
+        ),
+        migrations.RemoveIndex(
+            model_name='interviewresult',
+            name='idx_result_interview',
+        ),
+        migrations.AddIndex(
+            model_name='interviewresult',
+            index=models.Index(fields=['-result_date', 'final_score'], name='idx_result_date_score'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewresult',
+            index=models.Index(condition=models.Q(('hr_decision__isnull', True), ('hr_decision__in', ['pending_hr_review', 'pending', 'on_hold', 'hold']), _connector='OR'), fields=['-result_date', 'interview'], name='idx_result_pending_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewresult',
+            index=models.Index(condition=models.Q(('hr_decision_at__isnull', False)), fields=['hr_decision', 'hr_decision_at'], name='idx_result_decided'),
+        ),
+    ]
@@ -6,6 +6,13 @@ from applicants.models import Applicant
 from interviews.models import Interview
 
 
+# HR has not decided yet (or parked it). The only definition: results/review_queue.py
+# derives queue_state from it, and filters must use PENDING_DECISION_Q as-is so
+# PostgreSQL/SQLite can match them to the idx_result_pending_recent partial index.
+PENDING_HR_DECISIONS = ['pending_hr_review', 'pending', 'on_hold', 'hold']
+PENDING_DECISION_Q = models.Q(hr_decision__isnull=True) | models.Q(hr_decision__in=PENDING_HR_DECISIONS)
+
+
 class InterviewResult(models.Model):
     """Model for final interview results"""
     
@@ -87,13 +94,25 @@ class InterviewResult(models.Model):
         verbose_name = 'Interview Result'
         verbose_name_plural = 'Interview Results'
         ordering = ['-result_date']
+        # applicant/interview lookups use the FK and one-to-one indexes.
+        # `manage.py benchmark_hr_indexes` compares plans with and without these.
         indexes = [
-            models.Index(fields=['result_date'], name='idx_result_date'),
+            models.Index(fields=['-result_date', 'final_score'], name='idx_result_date_score'),
             models.Index(fields=['final_score'], name='idx_result_final_score'),
             models.Index(fields=['passed'], name='idx_result_passed'),
             models.Index(fields=['final_decision'], name='idx_result_final_decision'),
-            models.Index(fields=['applicant'], name='idx_result_applicant'),
-            models.Index(fields=['interview'], name='idx_result_interview'),
+            # Pending HR decisions (dashboard, recruiter insights): small and only
+            # touched while a result waits for HR
+            models.Index(
+                fields=['-result_date', 'interview'],
+                name='idx_result_pending_recent',
+                condition=PENDING_DECISION_Q,
+            ),
+            models.Index(
+                fields=['hr_decision', 'hr_decision_at'],
+                name='idx_result_decided',
+                condition=models.Q(hr_decision_at__isnull=False),
+            ),
         ]
     
     def __str__(self):
@@ -111,6 +130,85 @@ class InterviewResult(models.Model):
         super().save(*args, **kwargs)
 
 
+
+# Results below this score never enter the HR review queue (results_list.py)
+REVIEW_SCORE_CUTOFF = 50
+
+
+class ReviewQueueEntry(models.Model):
+    """
+    Denormalized review-queue row per InterviewResult for the HR results list.
+    Kept in sync from InterviewResult/Interview saves (results/signals.py) and
+    results/review_queue.py for bulk writes; rebuild with `manage.py rebuild_review_queue`.
+    """
+
+    QUEUE_STATE_CHOICES = [
+        ('pending', 'Pending HR Review'),
+        ('reviewed', 'Reviewed'),
+        ('waiting', 'Waiting For Interview'),
+    ]
+    URGENCY_BUCKET_CHOICES = [
+        ('urgent', 'Urgent'),
+        ('normal', 'Normal'),
+        ('none', 'None'),
+    ]
+
+    result = models.OneToOneField(
+        InterviewResult,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='review_queue_entry',
+    )
+    queue_state = models.CharField(max_length=20, choices=QUEUE_STATE_CHOICES)
+    urgency_bucket = models.CharField(max_length=10, choices=URGENCY_BUCKET_CHOICES, default='none')
+    position_code = models.CharField(max_length=50, blank=True, null=True)
+
+    # Copies of the list's filter/display columns, so it never joins
+    applicant_display_name = models.CharField(max_length=255, blank=True)
+    result_date = models.DateTimeField()
+    final_score = models.FloatField()
+    passed = models.BooleanField(default=False)
+    hr_decision = models.CharField(max_length=20, null=True, blank=True)
+    hr_decision_at = models.DateTimeField(null=True, blank=True)
+    hold_until = models.DateTimeField(null=True, blank=True)
+    final_decision = models.CharField(max_length=20, null=True, blank=True)
+    interview_status = models.CharField(max_length=20, blank=True)
+    interview_created_at = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'review_queue_entries'
+        verbose_name = 'Review Queue Entry'
+        verbose_name_plural = 'Review Queue Entries'
+        ordering = ['-result_date']
+        # Partial on the review cutoff: the list never reads rows below it
+        indexes = [
+            models.Index(
+                fields=['-result_date'],
+                name='idx_rq_recent',
+                condition=models.Q(final_score__gte=REVIEW_SCORE_CUTOFF),
+            ),
+            models.Index(
+                fields=['queue_state', '-result_date'],
+                name='idx_rq_state_recent',
+                condition=models.Q(final_score__gte=REVIEW_SCORE_CUTOFF),
+            ),
+            models.Index(
+                fields=['hr_decision', '-result_date'],
+                name='idx_rq_decision_recent',
+                condition=models.Q(final_score__gte=REVIEW_SCORE_CUTOFF),
+            ),
+            models.Index(
+                fields=['queue_state', 'hr_decision_at'],
+                name='idx_rq_state_decided',
+                condition=models.Q(final_score__gte=REVIEW_SCORE_CUTOFF),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Result {self.result_id} - {self.queue_state} ({self.urgency_bucket})"
+
+
 class ReapplicationTracking(models.Model):
     """Model for tracking applicant reapplication eligibility"""
     
@@ -0,0 +1,151 @@
+"""
+Review-queue projection (ReviewQueueEntry) for the HR results list
+
+One row per InterviewResult holding the columns InterviewResultList filters
+and displays, plus the derived queue state, urgency bucket and position code,
+so the list and its stats are single scans over review_queue_entries.
+
+- queue_state: 'pending' when HR has not decided (or put it on hold) and the
+  interview is completed, 'reviewed' after hire/reject, 'waiting' otherwise.
+- urgency_bucket: 'urgent' for pending entries older than REVIEW_URGENT_AFTER_DAYS,
+  'normal' for other pending entries, 'none' for everything else. Entries age
+  into 'urgent' through refresh_urgency (periodic Celery task), so counts that
+  must be exact filter on result_date against urgent_cutoff() instead.
+
+Single saves are synced by results/signals.py; code that writes with
+queryset.update()/bulk_update() must call sync_review_queue afterwards.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from results.models import PENDING_HR_DECISIONS
+
+PENDING = 'pending'
+REVIEWED = 'reviewed'
+WAITING = 'waiting'
+
+URGENT = 'urgent'
+NORMAL = 'normal'
+NO_URGENCY = 'none'
+
+REVIEWED_HR_DECISIONS = {'hire', 'reject'}
+DEFAULT_URGENT_AFTER_DAYS = 3
+
+ENTRY_FIELDS = [
+    'queue_state',
+    'urgency_bucket',
+    'position_code',
+    'applicant_display_name',
+    'result_date',
+    'final_score',
+    'passed',
+    'hr_decision',
+    'hr_decision_at',
+    'hold_until',
+    'final_decision',
+    'interview_status',
+    'interview_created_at',
+    'synced_at',
+]
+
+
+def urgent_cutoff(now=None):
+    days = int(getattr(settings, 'REVIEW_URGENT_AFTER_DAYS', DEFAULT_URGENT_AFTER_DAYS))
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def queue_state_for(hr_decision, interview_status):
+    if hr_decision in REVIEWED_HR_DECISIONS:
+        return REVIEWED
+    # Same predicate as results.models.PENDING_DECISION_Q
+    if (hr_decision is None or hr_decision in PENDING_HR_DECISIONS) and interview_status == 'completed':
+        return PENDING
+    return WAITING
+
+
+def urgency_bucket_for(queue_state, result_date, cutoff):
+    if queue_state != PENDING:
+        return NO_URGENCY
+    return URGENT if result_date and result_date <= cutoff else NORMAL
+
+
+def build_entry(result, cutoff=None):
+    """Unsaved ReviewQueueEntry for a result (uses result.interview and its position_type)"""
+    from results.models import ReviewQueueEntry
+
+    interview = result.interview
+    position_type = interview.position_type if interview.position_type_id else None
+    queue_state = queue_state_for(result.hr_decision, interview.status)
+    return ReviewQueueEntry(
+        result_id=result.pk,
+        queue_state=queue_state,
+        urgency_bucket=urgency_bucket_for(queue_state, result.result_date, cutoff or urgent_cutoff()),
+        position_code=getattr(position_type, 'code', None),
+        applicant_display_name=result.applicant_display_name or '',
+        result_date=result.result_date,
+        final_score=result.final_score,
+        passed=result.passed,
+        hr_decision=result.hr_decision,
+        hr_decision_at=result.hr_decision_at,
+        hold_until=result.hold_until,
+        final_decision=result.final_decision,
+        interview_status=interview.status or '',
+        interview_created_at=interview.created_at,
+        synced_at=timezone.now(),
+    )
+
+
+def _upsert(entries, batch_size=None):
+    from results.models import ReviewQueueEntry
+
+    if not entries:
+        return 0
+    ReviewQueueEntry.objects.bulk_create(
+        entries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['result'],
+        update_fields=ENTRY_FIELDS,
+    )
+    return len(entries)
+
+
+def sync_review_queue_entry(result):
+    """Upsert the projection row for one saved InterviewResult"""
+    return _upsert([build_entry(result)])
+
+
+def sync_review_queue(result_ids=None, batch_size=500):
+    """
+    Upsert projection rows for the given InterviewResult ids (all results when
+    None). Returns the number of rows written.
+    """
+    from results.models import InterviewResult
+
+    queryset = InterviewResult.objects.select_related('interview__position_type').order_by('pk')
+    if result_ids is not None:
+        queryset = queryset.filter(pk__in=list(result_ids))
+    cutoff = urgent_cutoff()
+    written = 0
+    entries = []
+    for result in queryset.iterator(chunk_size=batch_size):
+        entries.append(build_entry(result, cutoff))
+        if len(entries) >= batch_size:
+            written += _upsert(entries, batch_size)
+            entries = []
+    written += _upsert(entries, batch_size)
+    return written
+
+
+def refresh_urgency(now=None):
+    """Move pending entries past the urgency cutoff into the 'urgent' bucket"""
+    from results.models import ReviewQueueEntry
+
+    return ReviewQueueEntry.objects.filter(
+        queue_state=PENDING,
+        urgency_bucket=NORMAL,
+        result_date__lte=urgent_cutoff(now),
+    ).update(urgency_bucket=URGENT)
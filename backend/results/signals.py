@@ -0,0 +1,34 @@
+"""
+Keep the review-queue projection (results/review_queue.py) in sync with
+InterviewResult and Interview saves.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from interviews.models import Interview
+from results import review_queue
+from results.models import InterviewResult
+
+# Interview columns copied into ReviewQueueEntry
+PROJECTED_INTERVIEW_FIELDS = {'status', 'position_type', 'position_type_id', 'created_at'}
+
+
+@receiver(post_save, sender=InterviewResult, dispatch_uid='results_sync_review_queue_result')
+def sync_result_review_queue(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    review_queue.sync_review_queue_entry(instance)
+
+
+@receiver(post_save, sender=Interview, dispatch_uid='results_sync_review_queue_interview')
+def sync_interview_review_queue(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and not PROJECTED_INTERVIEW_FIELDS.intersection(update_fields):
+        return
+    result = InterviewResult.objects.filter(interview_id=instance.pk).first()
+    if result is None:
+        return
+    result.interview = instance
+    review_queue.sync_review_queue_entry(result)
@@ -0,0 +1,20 @@
+"""
+Celery tasks for the results app
+"""
+
+import logging
+
+from celery import shared_task
+
+from results import review_queue
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="results.refresh_review_queue_urgency", ignore_result=True)
+def refresh_review_queue_urgency():
+    """Promote pending review-queue entries past REVIEW_URGENT_AFTER_DAYS to 'urgent'"""
+    promoted = review_queue.refresh_urgency()
+    if promoted:
+        logger.info("Promoted review queue entries to urgent", extra={"entries": promoted})
+    return promoted
@@ -0,0 +1,64 @@
+"""
+Tests for the HR hot-query indexes and their benchmark command.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from interviews.models import VideoResponse
+from results.models import InterviewResult
+
+
+class HRIndexBenchmarkTests(TestCase):
+    def _indexes(self, model):
+        with connection.cursor() as cursor:
+            return set(connection.introspection.get_constraints(cursor, model._meta.db_table))
+
+    def test_benchmark_reports_both_index_sets_and_rolls_back(self):
+        out = StringIO()
+
+        call_command("benchmark_hr_indexes", "--rows", "40", "--repeat", "2", stdout=out)
+
+        output = out.getvalue()
+        for name in ("pending_reviews", "review_window_page", "answers_by_status", "answer_by_question"):
+            self.assertIn(name, output)
+        self.assertIn("before plan:", output)
+        self.assertIn("speedup=", output)
+        self.assertEqual(InterviewResult.objects.count(), 0)
+        self.assertEqual(VideoResponse.objects.count(), 0)
+        result_indexes = self._indexes(InterviewResult)
+        self.assertTrue({"idx_result_date_score", "idx_result_pending_recent", "idx_result_decided"} <= result_indexes)
+        self.assertNotIn("idx_result_date", result_indexes)
+        self.assertIn("idx_vr_interview_status", self._indexes(VideoResponse))
+
+
+    def test_pending_filters_repeat_the_partial_index_predicate(self):
+        # SQLite and PostgreSQL only use a partial index when the query's WHERE
+        # contains (implies) the index condition, so the views must filter on
+        # PENDING_DECISION_Q exactly as the index declares it
+        index = next(index for index in InterviewResult._meta.indexes if index.name == "idx_result_pending_recent")
+        editor = connection.schema_editor(collect_sql=True)
+        predicate = str(index.create_sql(InterviewResult, editor)).split(" WHERE ", 1)[1]
+        table = connection.ops.quote_name(InterviewResult._meta.db_table)
+        user = User.objects.create_user(username="hr", email="hr@example.com", password="pw", is_superuser=True)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        for url in ("/api/hr/dashboard/overview/", "/api/analytics/recruiter/"):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            pending_queries = [
+                query["sql"].replace(f"{table}.", "")
+                for query in queries.captured_queries
+                if "pending_hr_review" in query["sql"]
+            ]
+            self.assertTrue(pending_queries, url)
+            for sql in pending_queries:
+                self.assertIn(predicate, sql)
@@ -0,0 +1,149 @@
+"""
+Tests for the HR review-queue projection behind the results summary list.
+"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from applicants.models import Applicant
+from interviews.batch_rescoring import rescore_results
+from interviews.models import Interview, InterviewQuestion, VideoResponse
+from interviews.type_models import PositionType, QuestionType
+from results import review_queue
+from results.models import InterviewResult, ReviewQueueEntry
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "review-queue-tests"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReviewQueueTests(TestCase):
+    def setUp(self):
+        self.position, _ = PositionType.objects.get_or_create(code="customer_service", defaults={"name": "Customer Service"})
+        self.count = 0
+
+    def _result(self, score=80.0, status="completed", hr_decision=None, age_days=0):
+        self.count += 1
+        applicant = Applicant.objects.create(
+            first_name="Queue",
+            last_name=str(self.count),
+            email=f"queue{self.count}@example.com",
+            phone=f"555100{self.count:04d}",
+            application_source="online",
+        )
+        interview = Interview.objects.create(applicant=applicant, position_type=self.position, status=status)
+        result = InterviewResult.objects.create(
+            interview=interview,
+            applicant=applicant,
+            final_score=score,
+            passed=score >= 70,
+            hr_decision=hr_decision,
+            hr_decision_at=timezone.now() if hr_decision else None,
+        )
+        if age_days:
+            # queryset.update() bypasses the signals, so re-sync like other bulk writers must
+            InterviewResult.objects.filter(pk=result.pk).update(result_date=timezone.now() - timedelta(days=age_days))
+            review_queue.sync_review_queue([result.pk])
+        return result
+
+    def test_entry_follows_result_and_interview_saves(self):
+        result = self._result(status="processing")
+        entry = ReviewQueueEntry.objects.get(result=result)
+        self.assertEqual(entry.queue_state, review_queue.WAITING)
+        self.assertEqual(entry.urgency_bucket, review_queue.NO_URGENCY)
+        self.assertEqual(entry.position_code, "customer_service")
+        self.assertEqual(entry.applicant_display_name, "Queue 1")
+
+        interview = result.interview
+        interview.status = "completed"
+        interview.save(update_fields=["status"])
+        entry.refresh_from_db()
+        self.assertEqual((entry.queue_state, entry.urgency_bucket), (review_queue.PENDING, review_queue.NORMAL))
+
+        result.hr_decision = "hire"
+        result.hr_decision_at = timezone.now()
+        result.save()
+        entry.refresh_from_db()
+        self.assertEqual((entry.queue_state, entry.hr_decision), (review_queue.REVIEWED, "hire"))
+
+    def test_pending_entries_age_into_urgent(self):
+        result = self._result()
+        InterviewResult.objects.filter(pk=result.pk).update(result_date=timezone.now() - timedelta(days=4))
+        ReviewQueueEntry.objects.filter(pk=result.pk).update(result_date=timezone.now() - timedelta(days=4))
+
+        self.assertEqual(review_queue.refresh_urgency(), 1)
+        self.assertEqual(ReviewQueueEntry.objects.get(pk=result.pk).urgency_bucket, review_queue.URGENT)
+
+    def test_blank_decision_is_not_pending(self):
+        # Same predicate as PENDING_DECISION_Q, which the pending-review filters use
+        self.assertEqual(review_queue.queue_state_for("", "completed"), review_queue.WAITING)
+        self.assertEqual(review_queue.queue_state_for(None, "completed"), review_queue.PENDING)
+        self.assertEqual(review_queue.queue_state_for("on_hold", "completed"), review_queue.PENDING)
+
+    def test_urgent_count_does_not_wait_for_the_urgency_refresh(self):
+        result = self._result(age_days=5)
+        # The beat task has not promoted it yet
+        ReviewQueueEntry.objects.filter(pk=result.pk).update(urgency_bucket=review_queue.NORMAL)
+        user = User.objects.create_user(username="hr", email="hr@example.com", password="pw", is_superuser=True)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get("/api/summary/", {"include_stats": "true"})
+
+        self.assertEqual(response.data["stats"]["urgent_count"], 1)
+
+    def test_bulk_rescoring_resyncs_entries(self):
+        result = self._result(score=80.0)
+        question_type, _ = QuestionType.objects.get_or_create(code="general", defaults={"name": "General"})
+        question = InterviewQuestion.objects.create(
+            question_text="Tell us about a difficult customer",
+            question_type=question_type,
+            position_type=self.position,
+            competency="customer_handling",
+            is_active=True,
+        )
+        VideoResponse.objects.create(
+            interview=result.interview,
+            question=question,
+            video_file_path="video_responses/queue.webm",
+            duration=timedelta(seconds=30),
+            transcript="answer",
+            ai_score=40.0,
+        )
+
+        rescore_results(passing_threshold=70.0, interview_ids=[result.interview_id])
+
+        entry = ReviewQueueEntry.objects.get(pk=result.pk)
+        self.assertEqual((entry.final_score, entry.passed), (40.0, False))
+
+    def test_list_and_stats_read_the_projection_without_joins(self):
+        pending = self._result()
+        urgent = self._result(age_days=5)
+        hold = self._result(hr_decision="hold")
+        self._result(hr_decision="reject", score=60.0)
+        self._result(score=30.0)  # below the review cutoff
+        self._result(age_days=45)  # outside the 30-day window
+        user = User.objects.create_user(username="hr", email="hr@example.com", password="pw", is_superuser=True)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/api/summary/", {"hr_decision": "pending", "include_stats": "true"})
+
+        self.assertEqual(response.status_code, 200)
+        ids = [row["id"] for row in response.data["results"]]
+        self.assertEqual(ids, [hold.id, pending.id, urgent.id])
+        self.assertEqual(response.data["results"][0]["position_code"], "customer_service")
+        self.assertEqual(
+            response.data["stats"],
+            {"pending_count": 3, "urgent_count": 1, "reviewed_today_count": 1},
+        )
+        projection_queries = [q["sql"] for q in queries.captured_queries if "review_queue_entries" in q["sql"]]
+        self.assertEqual(len(projection_queries), 3)  # page count, page rows, stats
+        self.assertFalse(any("JOIN" in sql for sql in projection_queries))
@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 
 from django.db.models import Avg, Count, Q, F, DurationField, ExpressionWrapper
 from django.db.models.functions import TruncDate
@@ -9,7 +9,7 @@ from rest_framework.response import Response
 
 from applicants.models import Applicant
 from interviews.models import Interview
-from results.models import InterviewResult
+from results.models import PENDING_DECISION_Q, InterviewResult
 from core.roles import normalize_user_type
 
 
@@ -49,11 +49,10 @@ def recruiter_insights(request):
         return Response({"detail": "You do not have access to recruiter insights."}, status=403)
 
     now = timezone.now()
-    pending_decisions = Q(hr_decision__isnull=True) | Q(
-        hr_decision__in=["pending_hr_review", "pending", "on_hold", "hold"]
-    )
-    pending_qs = InterviewResult.objects.filter(pending_decisions, interview__status="completed")
+    pending_qs = InterviewResult.objects.filter(PENDING_DECISION_Q, interview__status="completed")
     overdue_cutoff = now - timedelta(hours=48)
+    # Ranges instead of result_date__date so the pending partial index is usable
+    today_start = timezone.make_aware(datetime.combine(now.date(), time.min))
 
     avg_decision_delta = (
         InterviewResult.objects.filter(hr_decision_at__isnull=False)
@@ -76,7 +75,9 @@ def recruiter_insights(request):
         "pending_reviews": pending_qs.count(),
         "overdue_reviews": pending_qs.filter(result_date__lt=overdue_cutoff).count(),
         "avg_hr_decision_time": avg_decision_hours,
-        "interviews_waiting_today": pending_qs.filter(result_date__date=now.date()).count(),
+        "interviews_waiting_today": pending_qs.filter(
+            result_date__gte=today_start, result_date__lt=today_start + timedelta(days=1)
+        ).count(),
         "interviews_waiting_week": pending_qs.filter(result_date__gte=now - timedelta(days=7)).count(),
         "ai_hr_mismatch_count": mismatch_count,
     }
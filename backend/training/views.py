@@ -4,9 +4,9 @@ from rest_framework.response import Response
 from django.utils import timezone
 from .models import TrainingModule, TrainingSession, TrainingResponse
 from .serializers import TrainingModuleSerializer, TrainingSessionSerializer, TrainingResponseSerializer
-from interviews.ai_service import get_ai_service
-import os
+from .tasks import QUEUED, cache_feedback, get_session_feedback, process_training_response
 from django.conf import settings
+from django.db import transaction
 
 from rest_framework.permissions import IsAuthenticated
 from accounts.authentication import ApplicantTokenAuthentication
@@ -61,7 +61,12 @@ class TrainingSessionViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def submit_response(self, request, pk=None):
-        """Submit a practice video response and get AI coaching feedback"""
+        """
+        Submit a practice video response for AI coaching feedback
+        
+        Transcription and coaching run in process_training_response; the
+        response is 202 and progress is polled via feedback-status.
+        """
         import traceback
         
         try:
@@ -96,97 +101,17 @@ class TrainingSessionViewSet(viewsets.ModelViewSet):
             print(f"✓ Created TrainingResponse {response.id}")
             print(f"  - Video saved to: {response.video_file.path}")
             
-            # Process with AI immediately
-            try:
-                print(f"🔧 Initializing AI service...")
-                ai_service = get_ai_service()
-                print(f"✓ AI service initialized successfully")
-                
-                # Check if file is empty (0 bytes) - browser recording issue
-                file_size = os.path.getsize(response.video_file.path)
-                if file_size == 0:
-                    print(f"⚠️ WARNING: Video file is 0 bytes! Using mock transcription.")
-                    print(f"   This usually means the browser didn't send the video properly.")
-                    print(f"   Please hard-refresh the browser (Ctrl+F5) and try again.")
-                    
-                    # Use mock transcription for testing
-                    transcript = f"I believe that {question_text.lower().replace('?', '')} requires a thoughtful approach. In my experience, I handle such situations by staying calm, analyzing the problem systematically, and communicating clearly with my team. I prioritize tasks based on urgency and importance, and I'm not afraid to ask for help when needed."
-                    
-                    response.transcript = transcript
-                    response.save()
-                    print(f"✓ Mock transcription created: {len(transcript)} chars")
-                    
-                else:
-                    # Normal transcription flow
-                    print(f"🎤 Starting video transcription...")
-                    print(f"  - Video path: {response.video_file.path}")
-                    print(f"  - File exists: {os.path.exists(response.video_file.path)}")
-                    print(f"  - File size: {file_size} bytes")
-                    
-                    try:
-                        transcript = ai_service.transcribe_video(
-                            response.video_file.path,
-                            video_response_id=response.id
-                        )
-                        response.transcript = transcript
-                        response.save()
-                        print(f"✓ Transcription complete: {len(transcript)} chars")
-                        print(f"  - Transcript preview: {transcript[:100]}...")
-                    except Exception as transcribe_error:
-                        print(f"❌ TRANSCRIPTION FAILED: {transcribe_error}")
-                        print(f"  - Error type: {type(transcribe_error).__name__}")
-                        print(traceback.format_exc())
-                        raise Exception(f"Transcription failed: {str(transcribe_error)}")
-                
-                # 2. Generate coaching feedback (works with both real and mock transcripts)
-                print(f"🤖 Generating coaching feedback...")
-                try:
-                    feedback = ai_service.generate_coaching_feedback(transcript, question_text)
-                    response.ai_feedback = feedback
-                    response.scores = feedback.get('scores', {})
-                    response.save()
-                    print(f"✓ Coaching feedback generated successfully")
-                except Exception as feedback_error:
-                    print(f"❌ FEEDBACK GENERATION FAILED: {feedback_error}")
-                    print(f"  - Error type: {type(feedback_error).__name__}")
-                    print(traceback.format_exc())
-                    raise Exception(f"Feedback generation failed: {str(feedback_error)}")
-                
+            if getattr(settings, "TRAINING_PROCESSING_SYNC", False):
+                # Inline processing (local dev): same task body, result returned directly
+                process_training_response.apply(args=[response.id])
+                response.refresh_from_db()
                 return Response(TrainingResponseSerializer(response).data)
-                
-            except Exception as e:
-                error_message = str(e)
-                error_type = type(e).__name__
-                print(f"❌ Training AI processing error ({error_type}): {error_message}")
-                print(f"📋 Full traceback:")
-                print(traceback.format_exc())
-                
-                # Determine more specific error message
-                if "transcription" in error_message.lower():
-                    user_message = "Could not transcribe audio from video. Please check your microphone."
-                elif "api" in error_message.lower() or "key" in error_message.lower():
-                    user_message = "AI service configuration issue. Please contact support."
-                elif "timeout" in error_message.lower():
-                    user_message = "Processing timeout. Please try with a shorter video."
-                else:
-                    user_message = f"AI service error: {error_message}"
-                
-                # Save error info but still return the response
-                response.ai_feedback = {
-                    "error": error_message,
-                    "error_type": error_type,
-                    "strengths": ["Unable to analyze at this time"],
-                    "improvements": ["Please try again"],
-                    "coaching_tips": [user_message],
-                    "example_phrasing": "",
-                    "scores": {"clarity": 0, "confidence": 0, "relevance": 0}
-                }
-                response.save()
-                
-                return Response(
-                    TrainingResponseSerializer(response).data,
-                    status=status.HTTP_200_OK  # Return 200 with error in feedback
-                )
+
+            cache_feedback(response, QUEUED)
+            transaction.on_commit(lambda: process_training_response.apply_async(args=[response.id]))
+            payload = TrainingResponseSerializer(response).data
+            payload['processing_status'] = QUEUED
+            return Response(payload, status=status.HTTP_202_ACCEPTED)
                 
         except Exception as e:
             print(f"❌ Training submission error: {e}")
@@ -195,3 +120,20 @@ class TrainingSessionViewSet(viewsets.ModelViewSet):
                 {"error": str(e), "detail": traceback.format_exc()}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    @action(detail=True, methods=['get'], url_path='feedback-status')
+    def feedback_status(self, request, pk=None):
+        """
+        Coaching progress for the session's responses
+        
+        GET /api/training/sessions/{id}/feedback-status/?response_id=<id>
+        """
+        session = self.get_object()
+        responses = session.responses.order_by('id')
+        response_id = request.query_params.get('response_id')
+        if response_id:
+            responses = responses.filter(id=response_id)
+        entries = get_session_feedback(session.id, responses)
+        if response_id and not entries:
+            return Response({"error": "Response not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"session_id": session.id, "responses": entries})